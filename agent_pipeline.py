@@ -9,8 +9,14 @@ Pipeline stages:
 5) Response generation agent
 6) Intervention decision agent
 7) Clinical indicators (computed post-pipeline for research output)
+
+``process_turn_async`` runs the same stages from an event loop: only the
+model calls of stage 1 are awaited (on threads, or whatever runner the
+caller supplies); everything else is cheap pure Python and runs inline.
 """
 
+import asyncio
+
 from emotion_analyzer import EmotionAnalyzer
 from pattern_tracker import PatternTracker
 from prediction_agent import PredictionAgent, compare_models
@@ -29,8 +35,39 @@ class EmotionAnalysisAgent:
     def __init__(self, analyzer=None):
         self.analyzer = analyzer or EmotionAnalyzer()
 
-    def run(self, user_message):
-        return self.analyzer.classify_emotion_ml(user_message)
+    def run(self, user_message, inference_mode='full'):
+        return self.analyzer.classify_emotion_ml(user_message, inference_mode=inference_mode)
+
+    async def run_async(self, user_message, inference_mode='full', run=None, deadlines=None):
+        """
+        Await the model stages concurrently through *run*, then fuse inline.
+
+        *run* is an async ``run(fn, *args)`` that executes a blocking call
+        off the event loop (default :func:`asyncio.to_thread`).  A stage
+        that misses its entry in *deadlines* (seconds, by stage name) is
+        dropped and the fusion falls back to keywords for it.
+
+        Returns ``(emotion_data, missed_stages)``.
+        """
+        run = run or asyncio.to_thread
+        deadlines = deadlines or {}
+        stages = self.analyzer.model_stages(inference_mode)
+        outcomes = await asyncio.gather(
+            *(asyncio.wait_for(run(fn, user_message), deadlines.get(name)) for name, fn in stages.items()),
+            return_exceptions=True,
+        )
+        scores, missed = {}, []
+        for name, outcome in zip(stages, outcomes):
+            if isinstance(outcome, asyncio.TimeoutError):
+                missed.append(name)
+            elif isinstance(outcome, BaseException):
+                raise outcome
+            else:
+                scores[name] = outcome
+        emotion_data = self.analyzer.classify_emotion_ml(
+            user_message, inference_mode=inference_mode, model_scores=scores,
+        )
+        return emotion_data, missed
 
 
 class PatternTrackingAgent:
@@ -97,6 +134,11 @@ class WellnessAgentPipeline:
     ``process_turn()`` returns a research-ready structured dict that
     includes emotion data, pattern summary, forecasting, alerts,
     clinical indicators, emotional risk index, and the response.
+    *inference_mode* (see ``emotion_analyzer.INFERENCE_MODES``) lets a
+    serving layer trade model quality for latency under load.
+
+    ``process_turn_async()`` returns the same dict plus ``missed_stages``:
+    model stages that missed their deadline, making the result partial.
     """
 
     def __init__(self):
@@ -107,8 +149,21 @@ class WellnessAgentPipeline:
         self.response_agent = ResponseGenerationAgent()
         self.intervention_agent = InterventionAgent()
 
-    def process_turn(self, user_message, user_profile=None, context=None):
-        emotion_data = self.emotion_agent.run(user_message)
+    def process_turn(self, user_message, user_profile=None, context=None, inference_mode='full'):
+        emotion_data = self.emotion_agent.run(user_message, inference_mode=inference_mode)
+        return self._finish_turn(user_message, emotion_data, user_profile, context)
+
+    async def process_turn_async(self, user_message, user_profile=None, context=None,
+                                 inference_mode='full', run=None, deadlines=None):
+        emotion_data, missed = await self.emotion_agent.run_async(
+            user_message, inference_mode=inference_mode, run=run, deadlines=deadlines,
+        )
+        result = self._finish_turn(user_message, emotion_data, user_profile, context)
+        result['missed_stages'] = missed
+        return result
+
+    def _finish_turn(self, user_message, emotion_data, user_profile, context):
+        """Stages 2–7: pure Python, cheap enough to run on an event loop."""
         pattern_summary = self.pattern_agent.run(emotion_data)
         sentiment_history = list(self.pattern_agent.tracker.sentiment_history)
         forecasting = self.forecast_agent.run(sentiment_history)
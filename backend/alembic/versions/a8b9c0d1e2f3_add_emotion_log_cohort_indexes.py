@@ -0,0 +1,37 @@
+"""add cohort analytics indexes on emotion_logs
+
+Revision ID: a8b9c0d1e2f3
+Revises: f7a8b9c0d1e2
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8b9c0d1e2f3'
+down_revision: Union[str, Sequence[str], None] = 'f7a8b9c0d1e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add (created_at, id) and (user_id, created_at, id) indexes for SQL-side aggregation."""
+    op.create_index(
+        'ix_emotion_logs_created_id',
+        'emotion_logs',
+        ['created_at', 'id'],
+    )
+    op.create_index(
+        'ix_emotion_logs_user_created_id',
+        'emotion_logs',
+        ['user_id', 'created_at', 'id'],
+    )
+
+
+def downgrade() -> None:
+    """Drop the cohort analytics indexes."""
+    op.drop_index('ix_emotion_logs_user_created_id', table_name='emotion_logs')
+    op.drop_index('ix_emotion_logs_created_id', table_name='emotion_logs')
@@ -0,0 +1,65 @@
+"""add daily aggregate tables for retention
+
+Revision ID: b9c0d1e2f3a4
+Revises: a8b9c0d1e2f3
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9c0d1e2f3a4'
+down_revision: Union[str, Sequence[str], None] = 'a8b9c0d1e2f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create emotion_daily_aggregates and chat_daily_aggregates."""
+    op.create_table(
+        'emotion_daily_aggregates',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('primary_emotion', sa.String(length=50), nullable=False),
+        sa.Column('log_count', sa.Integer(), nullable=False),
+        sa.Column('high_risk_count', sa.Integer(), nullable=False),
+        sa.Column('confidence_sum', sa.Float(), nullable=False),
+        sa.Column('risk_score_sum', sa.Float(), nullable=False),
+        sa.Column('risk_score_max', sa.Float(), nullable=False),
+        sa.Column('personalization_score_sum', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'day', 'primary_emotion', name='uq_emotion_daily_user_day_emotion'),
+    )
+    op.create_index(op.f('ix_emotion_daily_aggregates_user_id'), 'emotion_daily_aggregates', ['user_id'], unique=False)
+    op.create_index(op.f('ix_emotion_daily_aggregates_day'), 'emotion_daily_aggregates', ['day'], unique=False)
+
+    op.create_table(
+        'chat_daily_aggregates',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('role', sa.String(length=20), nullable=False),
+        sa.Column('message_count', sa.Integer(), nullable=False),
+        sa.Column('total_chars', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'day', 'role', name='uq_chat_daily_user_day_role'),
+    )
+    op.create_index(op.f('ix_chat_daily_aggregates_user_id'), 'chat_daily_aggregates', ['user_id'], unique=False)
+    op.create_index(op.f('ix_chat_daily_aggregates_day'), 'chat_daily_aggregates', ['day'], unique=False)
+
+
+def downgrade() -> None:
+    """Drop the daily aggregate tables."""
+    op.drop_index(op.f('ix_chat_daily_aggregates_day'), table_name='chat_daily_aggregates')
+    op.drop_index(op.f('ix_chat_daily_aggregates_user_id'), table_name='chat_daily_aggregates')
+    op.drop_table('chat_daily_aggregates')
+    op.drop_index(op.f('ix_emotion_daily_aggregates_day'), table_name='emotion_daily_aggregates')
+    op.drop_index(op.f('ix_emotion_daily_aggregates_user_id'), table_name='emotion_daily_aggregates')
+    op.drop_table('emotion_daily_aggregates')
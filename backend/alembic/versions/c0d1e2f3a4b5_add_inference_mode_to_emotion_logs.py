@@ -0,0 +1,31 @@
+"""add inference_mode to emotion_logs
+
+Revision ID: c0d1e2f3a4b5
+Revises: b9c0d1e2f3a4
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c0d1e2f3a4b5'
+down_revision: Union[str, Sequence[str], None] = 'b9c0d1e2f3a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Record which AI-core inference mode (load shedding) produced each row."""
+    op.add_column(
+        'emotion_logs',
+        sa.Column('inference_mode', sa.String(length=20), nullable=False, server_default='full'),
+    )
+
+
+def downgrade() -> None:
+    """Remove inference_mode from emotion_logs."""
+    op.drop_column('emotion_logs', 'inference_mode')
@@ -0,0 +1,37 @@
+"""add keyset pagination indexes on chat_history and guardian_alerts
+
+Revision ID: f7a8b9c0d1e2
+Revises: e6f7a8b9c0d1
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7a8b9c0d1e2'
+down_revision: Union[str, Sequence[str], None] = 'e6f7a8b9c0d1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add composite (user_id, timestamp, id) indexes used by keyset pagination."""
+    op.create_index(
+        'ix_chat_history_user_created_id',
+        'chat_history',
+        ['user_id', 'created_at', 'id'],
+    )
+    op.create_index(
+        'ix_guardian_alerts_user_timestamp_id',
+        'guardian_alerts',
+        ['user_id', 'timestamp', 'id'],
+    )
+
+
+def downgrade() -> None:
+    """Drop the keyset pagination indexes."""
+    op.drop_index('ix_guardian_alerts_user_timestamp_id', table_name='guardian_alerts')
+    op.drop_index('ix_chat_history_user_created_id', table_name='chat_history')
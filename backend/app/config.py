@@ -149,6 +149,13 @@ class Settings(BaseSettings):
     # https://huggingface.co/settings/tokens
     HF_TOKEN: str = ""
 
+    # ------------------------------------------------------------------ #
+    # Research data access
+    # ------------------------------------------------------------------ #
+    # Shared key that unlocks cross-user research endpoints (bulk export,
+    # cohort analytics) via the X-Research-Key header.  Empty disables them.
+    RESEARCH_API_KEY: str = ""
+
     # ------------------------------------------------------------------ #
     # Guardian Alert — escalation thresholds
     # ------------------------------------------------------------------ #
@@ -164,6 +171,82 @@ class Settings(BaseSettings):
     # same user.  Prevents alert storms and duplicate notifications.
     GUARDIAN_ALERT_COOLDOWN_MINUTES: int = 30
 
+    # ------------------------------------------------------------------ #
+    # Model warm-up / readiness (GET /ready)
+    # ------------------------------------------------------------------ #
+    # Startup runs rounds of sample inputs through every loaded model; the
+    # worker turns ready once the round p50 latency moves by at most
+    # WARMUP_STEADY_TOLERANCE (fraction) for WARMUP_STABLE_ROUNDS rounds.
+    WARMUP_ENABLED: bool = True
+    WARMUP_MIN_ROUNDS: int = 3
+    WARMUP_MAX_ROUNDS: int = 12
+    WARMUP_STEADY_TOLERANCE: float = 0.15
+    WARMUP_STABLE_ROUNDS: int = 2
+    WARMUP_TIMEOUT_SECONDS: float = 120.0
+
+    # ------------------------------------------------------------------ #
+    # AI-core executor (app/services/inference_executor.py)
+    # ------------------------------------------------------------------ #
+    # Dedicated threads for pipeline / prediction calls and how many calls
+    # may wait for one; beyond that requests get 503 with Retry-After.
+    INFERENCE_EXECUTOR_WORKERS: int = 2
+    INFERENCE_QUEUE_LIMIT: int = 8
+    # Per-stage deadlines for /chat model calls.  A stage that misses its
+    # deadline is dropped and the reply uses keyword analysis for it.
+    PIPELINE_EMOTION_MODEL_DEADLINE_SECONDS: float = 10.0
+    PIPELINE_CRISIS_MODEL_DEADLINE_SECONDS: float = 6.0
+
+    # ------------------------------------------------------------------ #
+    # Load shedding (app/services/load_shedding.py)
+    # ------------------------------------------------------------------ #
+    # Step down to "no_nli" (skip the zero-shot crisis model) and then to
+    # "keyword_only" (no model inference) when AI-core requests in flight
+    # or the recent p95 latency reach these levels.
+    LOAD_SHED_ENABLED: bool = True
+    LOAD_SHED_NO_NLI_DEPTH: int = 4
+    LOAD_SHED_KEYWORD_DEPTH: int = 8
+    LOAD_SHED_NO_NLI_P95_SECONDS: float = 2.0
+    LOAD_SHED_KEYWORD_P95_SECONDS: float = 5.0
+    LOAD_SHED_WINDOW: int = 50
+    # Minimum time between steps back up to a more expensive mode.
+    LOAD_SHED_HOLD_SECONDS: float = 10.0
+
+    # ------------------------------------------------------------------ #
+    # Multi-worker serving (backend/gunicorn.conf.py)
+    # ------------------------------------------------------------------ #
+    # Load models in the gunicorn master so workers share them copy-on-write.
+    PREFORK_PRELOAD_MODELS: bool = True
+    # Intra-op inference threads per worker; 0 = CPU cores / workers.
+    INFERENCE_THREADS_PER_WORKER: int = 0
+
+    # ------------------------------------------------------------------ #
+    # Voice transcription
+    # ------------------------------------------------------------------ #
+    # Uploads larger than this are rejected with 413 while being read.
+    VOICE_MAX_UPLOAD_BYTES: int = 10 * 1024 * 1024
+    # Worker processes for WebM/MP3 → WAV conversion (0 = convert in a thread).
+    VOICE_CONVERSION_WORKERS: int = 2
+    VOICE_STT_TIMEOUT_SECONDS: float = 30.0
+    # "google" (Google Web Speech API) or "offline" (deterministic stand-in).
+    VOICE_STT_RECOGNIZER: str = "google"
+
+    # ------------------------------------------------------------------ #
+    # Data retention (see DATA_RETENTION.md)
+    # ------------------------------------------------------------------ #
+    # Raw emotion_logs / chat_history rows older than their *_RAW_DAYS are
+    # folded into daily aggregate tables and deleted; aggregates are kept
+    # for RETENTION_AGGREGATE_DAYS.  Deletion is irreversible, so the job
+    # only runs when explicitly enabled with RETENTION_ENABLED=true.
+    RETENTION_ENABLED: bool = False
+    RETENTION_INTERVAL_HOURS: float = 24.0
+    # First run waits this long after startup so it never competes with warm-up.
+    RETENTION_INITIAL_DELAY_SECONDS: float = 300.0
+    # Rows aggregated and deleted per transaction; keeps lock times short.
+    RETENTION_BATCH_SIZE: int = 1000
+    EMOTION_LOG_RAW_DAYS: int = 90
+    CHAT_HISTORY_RAW_DAYS: int = 180
+    RETENTION_AGGREGATE_DAYS: int = 730
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
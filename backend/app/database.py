@@ -104,6 +104,7 @@ async def init_db() -> None:
     import app.models.emotion  # noqa: F401, PLC0415
     import app.models.profile  # noqa: F401, PLC0415
     import app.models.guardian_alert  # noqa: F401, PLC0415
+    import app.models.aggregates  # noqa: F401, PLC0415
 
     _max_attempts = 3
     for attempt in range(1, _max_attempts + 1):
@@ -4,6 +4,7 @@ AI Wellness Buddy — FastAPI Application
 Microservice architecture entry point.
 Exposes:
   GET  /health
+  GET  /ready            (503 until model warm-up reaches steady state)
   GET  /metrics          (Prometheus)
   POST /api/v1/auth/signup
   POST /api/v1/auth/login
@@ -12,7 +13,9 @@ Exposes:
   POST /api/v1/predict
   POST /api/v1/chat
   GET  /api/v1/chat/history
+  GET  /api/v1/chat/history/export
   GET  /api/v1/analytics/research
+  GET  /api/v1/analytics/cohort
   POST /api/v1/voice/transcribe
   POST /api/v1/voice/tts
   GET  /api/v1/weekly-report
@@ -20,6 +23,8 @@ Exposes:
   GET  /api/v1/insights
   POST /api/v1/guardian-alert
   GET  /api/v1/guardian-alert
+  GET  /api/v1/guardian-alert/export
+  GET  /api/v1/export/{dataset}
 """
 
 from __future__ import annotations
@@ -56,11 +61,12 @@ from sqlalchemy.exc import DisconnectionError, OperationalError, TimeoutError as
 from app.config import get_settings
 from app.database import init_db
 from app.limiter import limiter
+from app.middleware.body_limit import BodySizeLimitMiddleware
 from app.middleware.logging import RequestLoggingMiddleware
 from app.middleware.security import SecurityHeadersMiddleware
 from app.middleware.timeout import TimeoutMiddleware
-from app.routers import analytics, auth, chat, health, insights, predict, profile, dashboard, voice, weekly_report, journey, guardian_alert
-from app.services import emotion_service
+from app.routers import analytics, auth, chat, export, health, insights, predict, profile, dashboard, voice, weekly_report, journey, guardian_alert
+from app.services import inference_executor, retention_service, transcription_service, warmup_service
 from app.utils import find_project_root
 
 try:
@@ -123,23 +129,9 @@ def create_app() -> FastAPI:
             os.environ.setdefault("HF_TOKEN", settings.HF_TOKEN)
             logger.info("HuggingFace token configured.")
 
-        # ── Eagerly pre-load ML models to avoid cold-start on first request ─
-        logger.info("Pre-loading ML models at startup…")
-        try:
-            await asyncio.wait_for(
-                asyncio.to_thread(emotion_service.preload_models),
-                timeout=60.0,
-            )
-            logger.info("ML models loaded successfully.")
-        except asyncio.TimeoutError:
-            logger.warning(
-                "ML model pre-load timed out after 60 s; will load on first request."
-            )
-        except Exception:
-            logger.warning(
-                "ML model pre-load failed; will retry on first request.",
-                exc_info=True,
-            )
+        # ── Load and warm up ML models; GET /ready flips when latency is steady ─
+        # Runs in the background so /health answers while the worker warms up.
+        warmup_task = asyncio.create_task(warmup_service.run_warmup(settings))
 
         # ── Voice pipeline readiness check ───────────────────────────────
         import shutil
@@ -170,7 +162,31 @@ def create_app() -> FastAPI:
         except Exception:  # noqa: BLE001
             logger.warning("Voice handler import check failed.", exc_info=True)
 
+        # ── Data retention job ────────────────────────────────────────────
+        retention_task: asyncio.Task | None = None
+        if settings.RETENTION_ENABLED:
+            retention_task = asyncio.create_task(retention_service.retention_loop(settings))
+            logger.info(
+                "Retention job scheduled every %.1f h (first run in %.0f s).",
+                settings.RETENTION_INTERVAL_HOURS,
+                settings.RETENTION_INITIAL_DELAY_SECONDS,
+            )
+
         yield
+        if not warmup_task.done():
+            warmup_task.cancel()
+            try:
+                await warmup_task
+            except asyncio.CancelledError:
+                pass
+        if retention_task is not None:
+            retention_task.cancel()
+            try:
+                await retention_task
+            except asyncio.CancelledError:
+                pass
+        transcription_service.shutdown_pipeline()
+        inference_executor.shutdown_executor()
         logger.info("Shutting down.")
 
     app = FastAPI(
@@ -186,6 +202,17 @@ def create_app() -> FastAPI:
         lifespan=lifespan,
     )
 
+    # ------------------------------------------------------------------ #
+    # Upload size limit — 413 while the voice upload body streams in.
+    # Added first so it is innermost: no BaseHTTPMiddleware task group sits
+    # between it and the form parser to wrap its 413 in an ExceptionGroup.
+    # ------------------------------------------------------------------ #
+    app.add_middleware(
+        BodySizeLimitMiddleware,
+        paths=frozenset({f"{settings.API_PREFIX}/voice/transcribe"}),
+        max_bytes=transcription_service.max_request_bytes,
+    )
+
     # ------------------------------------------------------------------ #
     # Rate limiter state + error handler
     # ------------------------------------------------------------------ #
@@ -201,6 +228,20 @@ def create_app() -> FastAPI:
 
     app.add_middleware(SlowAPIMiddleware)
 
+    # ------------------------------------------------------------------ #
+    # AI-core backpressure — 503 while the inference queue is full
+    # ------------------------------------------------------------------ #
+    @app.exception_handler(inference_executor.ExecutorSaturated)
+    async def inference_saturated_handler(
+        request: Request, exc: inference_executor.ExecutorSaturated,
+    ) -> JSONResponse:
+        logger.warning("Inference queue full on %s %s", request.method, request.url.path)
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "The service is busy. Please try again shortly."},
+            headers={"Retry-After": str(exc.retry_after)},
+        )
+
     # ------------------------------------------------------------------ #
     # DB outage handler — 503 for any SQLAlchemy connectivity failure.
     # Must be registered before the generic 500 handler so FastAPI's
@@ -276,6 +317,8 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        # Keyset cursor for paginated list endpoints (e.g. /chat/history).
+        expose_headers=["X-Next-Cursor"],
     )
 
     # ------------------------------------------------------------------ #
@@ -288,7 +331,7 @@ def create_app() -> FastAPI:
     # ------------------------------------------------------------------ #
     Instrumentator(
         should_group_status_codes=True,
-        excluded_handlers=["/health", "/metrics"],
+        excluded_handlers=["/health", "/ready", "/metrics"],
     ).instrument(app).expose(app, endpoint="/metrics", include_in_schema=False)
 
     # ------------------------------------------------------------------ #
@@ -306,6 +349,7 @@ def create_app() -> FastAPI:
     app.include_router(journey.router, prefix=settings.API_PREFIX)
     app.include_router(insights.router, prefix=settings.API_PREFIX)
     app.include_router(guardian_alert.router, prefix=settings.API_PREFIX)
+    app.include_router(export.router, prefix=settings.API_PREFIX)
 
     return app
 
@@ -0,0 +1,87 @@
+"""Request body size limit middleware — returns HTTP 413 while the body streams in.
+
+The multipart parser spools a whole upload to disk before a route handler
+sees it, so a limit checked in the handler only bounds what is *read back*.
+This pure ASGI middleware counts body bytes as they arrive on the limited
+paths and answers 413 as soon as the limit is passed — from the declared
+``Content-Length`` when there is one, otherwise mid-stream — so oversized
+uploads are never buffered.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+
+from starlette.exceptions import HTTPException
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+class _BodyTooLarge(HTTPException):
+    # An HTTPException, so FastAPI's body parsing re-raises it as a 413
+    # instead of reporting a generic 400 parse error.
+    def __init__(self, limit: int) -> None:
+        super().__init__(status_code=413, detail=f"Request body exceeds {limit} bytes.")
+
+
+class BodySizeLimitMiddleware:
+    """Reject request bodies on *paths* larger than ``max_bytes()``.
+
+    *max_bytes* is called per request so settings changes apply without a
+    restart.
+    """
+
+    def __init__(self, app: ASGIApp, paths: frozenset[str], max_bytes: Callable[[], int]) -> None:
+        self.app = app
+        self.paths = paths
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        limit = self.max_bytes()
+        declared = dict(scope["headers"]).get(b"content-length", b"")
+        if declared.isdigit() and int(declared) > limit:
+            await self._reject(scope, receive, send, limit)
+            return
+
+        received = 0
+        started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    logger.warning("Request body over %d bytes rejected: %s", limit, scope["path"])
+                    raise _BodyTooLarge(limit)
+            return message
+
+        async def tracking_send(message: Message) -> None:
+            nonlocal started
+            started = started or message["type"] == "http.response.start"
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except _BodyTooLarge:
+            # Only reached when the app let the exception escape unhandled
+            if started:
+                raise
+            await self._reject(scope, receive, send, limit, log=False)
+
+    @staticmethod
+    async def _reject(scope: Scope, receive: Receive, send: Send, limit: int, log: bool = True) -> None:
+        if log:
+            logger.warning("Request body over %d bytes rejected: %s", limit, scope["path"])
+        response = JSONResponse(
+            status_code=413,
+            content={"detail": f"Request body exceeds {limit} bytes."},
+        )
+        await response(scope, receive, send)
@@ -5,5 +5,9 @@ from app.models.chat import ChatHistory
 from app.models.emotion import EmotionLog
 from app.models.profile import UserProfile
 from app.models.guardian_alert import GuardianAlert
+from app.models.aggregates import ChatDailyAggregate, EmotionDailyAggregate
 
-__all__ = ["User", "ChatHistory", "EmotionLog", "UserProfile", "GuardianAlert"]
+__all__ = [
+    "User", "ChatHistory", "EmotionLog", "UserProfile", "GuardianAlert",
+    "EmotionDailyAggregate", "ChatDailyAggregate",
+]
@@ -0,0 +1,48 @@
+"""Daily aggregate ORM models written by the retention job.
+
+Raw ``emotion_logs`` / ``chat_history`` rows older than their retention
+window are folded into one row per (user, day, key) here and then deleted.
+Only sums and counts are stored, so repeated runs merge additively and no
+message text is kept.
+"""
+
+from __future__ import annotations
+
+from datetime import date
+
+from sqlalchemy import Date, Float, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class EmotionDailyAggregate(Base):
+    __tablename__ = "emotion_daily_aggregates"
+    __table_args__ = (
+        UniqueConstraint("user_id", "day", "primary_emotion", name="uq_emotion_daily_user_day_emotion"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True)
+    day: Mapped[date] = mapped_column(Date, index=True, nullable=False)
+    primary_emotion: Mapped[str] = mapped_column(String(50), nullable=False)
+    log_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    high_risk_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    confidence_sum: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    risk_score_sum: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    risk_score_max: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    personalization_score_sum: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+
+
+class ChatDailyAggregate(Base):
+    __tablename__ = "chat_daily_aggregates"
+    __table_args__ = (
+        UniqueConstraint("user_id", "day", "role", name="uq_chat_daily_user_day_role"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True)
+    day: Mapped[date] = mapped_column(Date, index=True, nullable=False)
+    role: Mapped[str] = mapped_column(String(20), nullable=False)
+    message_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total_chars: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
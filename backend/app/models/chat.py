@@ -2,9 +2,9 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timezone
 
-from sqlalchemy import DateTime, ForeignKey, String, Text, func
+from sqlalchemy import DateTime, ForeignKey, Index, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -12,6 +12,8 @@ from app.database import Base
 
 class ChatHistory(Base):
     __tablename__ = "chat_history"
+    # Serves keyset pagination over (created_at, id) scoped to a single user.
+    __table_args__ = (Index("ix_chat_history_user_created_id", "user_id", "created_at", "id"),)
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True)
@@ -19,8 +21,11 @@ class ChatHistory(Base):
     role: Mapped[str] = mapped_column(String(20), nullable=False)  # "user" | "assistant"
     content: Mapped[str] = mapped_column(Text, nullable=False)
     emotion: Mapped[str | None] = mapped_column(String(50), nullable=True)
+    # Python-side default gives microsecond precision (SQLite's CURRENT_TIMESTAMP
+    # is whole seconds), keeping keyset pagination on (created_at, id) exact.
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
         server_default=func.now(),
         nullable=False,
     )
@@ -2,9 +2,9 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timezone
 
-from sqlalchemy import DateTime, Float, ForeignKey, JSON, String, func
+from sqlalchemy import DateTime, Float, ForeignKey, Index, JSON, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -12,6 +12,12 @@ from app.database import Base
 
 class EmotionLog(Base):
     __tablename__ = "emotion_logs"
+    # Serve cohort analytics: date-range scans over the whole table and
+    # per-cohort scans ordered by (created_at, id).
+    __table_args__ = (
+        Index("ix_emotion_logs_created_id", "created_at", "id"),
+        Index("ix_emotion_logs_user_created_id", "user_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True)
@@ -24,8 +30,13 @@ class EmotionLog(Base):
     # Research analytics fields
     risk_score: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
     personalization_score: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    # AI-core inference mode used (full / no_nli / keyword_only, see load_shedding)
+    inference_mode: Mapped[str] = mapped_column(String(20), nullable=False, default="full")
+    # Python-side default keeps microsecond precision on SQLite so the
+    # baseline/current windows ordered by (created_at, id) are stable.
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
         server_default=func.now(),
         nullable=False,
     )
@@ -2,9 +2,9 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timezone
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, String, Text, func
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -12,6 +12,8 @@ from app.database import Base
 
 class GuardianAlert(Base):
     __tablename__ = "guardian_alerts"
+    # Serves keyset pagination over (timestamp, id) scoped to a single user.
+    __table_args__ = (Index("ix_guardian_alerts_user_timestamp_id", "user_id", "timestamp", "id"),)
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(
@@ -28,8 +30,11 @@ class GuardianAlert(Base):
     # Test alerts are excluded from cooldown calculations.
     is_test: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
 
+    # Python-side default gives microsecond precision (SQLite's CURRENT_TIMESTAMP
+    # is whole seconds), keeping keyset pagination on (timestamp, id) exact.
     timestamp: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
         server_default=func.now(),
         nullable=False,
     )
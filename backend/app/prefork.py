@@ -0,0 +1,66 @@
+"""Pre-fork model sharing for multi-worker deployments.
+
+With ``gunicorn -c gunicorn.conf.py app.main:app`` the master process loads
+every configured model through the process-wide model registry before
+forking its Uvicorn workers (:func:`preload_shared_models`).  The workers
+inherit the weights copy-on-write, so N workers hold one copy of
+DistilRoBERTa and BART-MNLI instead of N, and each worker's warm-up finds
+the models already in its registry.
+
+After fork every worker limits its inference threads
+(:func:`init_worker`) so N workers do not each start one thread per core.
+``run_prefork_memory_benchmark.py`` (project root) measures the total
+memory of N workers in both modes.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sys
+
+from app.utils import find_project_root
+
+_root = find_project_root()
+if str(_root) not in sys.path:
+    sys.path.insert(0, str(_root))
+
+logger = logging.getLogger(__name__)
+
+
+def preload_shared_models() -> dict:
+    """Load every model in this (master) process and freeze it for fork.
+
+    No inference runs here — per-worker warm-up does that after fork.
+    Returns the ``EmotionAnalyzer.warmup()`` availability report.
+    """
+    import model_registry  # noqa: PLC0415
+    from emotion_analyzer import EmotionAnalyzer  # noqa: PLC0415
+
+    status = EmotionAnalyzer().warmup()
+    frozen = model_registry.freeze_for_fork()
+    loaded = [s for s in model_registry.registry.stats() if s["loaded"]]
+    logger.info(
+        "Pre-fork: %d model(s) loaded in master (%s), %d objects frozen for copy-on-write sharing.",
+        len(loaded),
+        ", ".join(f"{s['model']} {s['param_bytes'] or 0:,} B" for s in loaded) or "none",
+        frozen,
+    )
+    return status
+
+
+def worker_threads(workers: int, configured: int = 0, cpu_count: int | None = None) -> int:
+    """Inference threads per worker: *configured*, or the cores split across *workers*."""
+    if configured > 0:
+        return configured
+    cpu_count = cpu_count or os.cpu_count() or 1
+    return max(1, cpu_count // max(1, workers))
+
+
+def init_worker(workers: int, configured: int = 0) -> int:
+    """Called in each worker right after fork; returns the thread count applied."""
+    import model_registry  # noqa: PLC0415
+
+    threads = model_registry.set_inference_threads(worker_threads(workers, configured))
+    logger.info("Worker %d: %d inference thread(s).", os.getpid(), threads)
+    return threads
@@ -5,14 +5,20 @@ Endpoint:
         Returns emotion distribution, average confidence, average
         personalization score, risk trend, research summary, and
         export-ready plot data (base64 PNG).
+
+    GET /api/v1/analytics/cohort
+        Returns the same metrics (without plots) aggregated in SQL across
+        all users or a user cohort / date range.  Requires the
+        ``X-Research-Key`` header.
 """
 
 from __future__ import annotations
 
 import logging
+from datetime import datetime
 from typing import Any
 
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Query, Request
 from pydantic import BaseModel
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -21,8 +27,8 @@ from app.config import get_settings
 from app.database import get_db
 from app.limiter import limiter
 from app.models.emotion import EmotionLog
-from app.routers.auth import get_current_user
-from app.services import analytics_service
+from app.routers.auth import get_current_user, require_research_access
+from app.services import analytics_service, cohort_analytics_service
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/analytics", tags=["Analytics"])
@@ -79,8 +85,19 @@ class ResearchAnalyticsResponse(BaseModel):
     total_sessions: int
 
 
+class CohortAnalyticsResponse(BaseModel):
+    emotion_distribution: list[EmotionDistributionItem]
+    average_confidence: float
+    average_personalization_score: float
+    high_risk_rate_pct: float
+    risk_trend: list[RiskTrendPoint]
+    research_summary: ResearchSummary
+    total_sessions: int
+    user_count: int
+
+
 # --------------------------------------------------------------------------- #
-# Endpoint
+# Endpoints
 # --------------------------------------------------------------------------- #
 
 @router.get("/research", response_model=ResearchAnalyticsResponse)
@@ -156,3 +173,33 @@ async def get_research_analytics(
         plot_data=plot_data,
         total_sessions=len(logs),
     )
+
+
+@router.get(
+    "/cohort",
+    response_model=CohortAnalyticsResponse,
+    dependencies=[Depends(require_research_access)],
+)
+@limiter.limit("10/minute")
+async def get_cohort_analytics(
+    request: Request,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    user_ids: list[int] | None = Query(default=None),
+    db: AsyncSession = Depends(get_db),
+) -> Any:
+    """Return research analytics aggregated across a cohort of users.
+
+    Unlike ``/research`` this is not capped at the most recent 500 logs:
+    distribution, averages, high-risk rate, daily risk trend and the
+    baseline-vs-current summary are all computed with ``GROUP BY`` queries
+    inside the database.
+
+    - **start** / **end**: ISO-8601 timestamps; logs with
+      ``start <= created_at < end`` are included.
+    - **user_ids**: repeat the parameter to restrict to a cohort; omit for
+      all users.
+    """
+    return await cohort_analytics_service.compute_cohort_analytics(
+        db, user_ids=user_ids, start=start, end=end,
+    )
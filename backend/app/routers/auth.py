@@ -3,8 +3,9 @@
 from __future__ import annotations
 
 import logging
+import secrets
 
-from fastapi import APIRouter, Cookie, Depends, HTTPException, Request, Response, status
+from fastapi import APIRouter, Cookie, Depends, Header, HTTPException, Request, Response, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError
 from slowapi import Limiter
@@ -150,6 +151,28 @@ async def get_optional_user(
         return None
 
 
+async def require_research_access(
+    x_research_key: str | None = Header(default=None),
+) -> None:
+    """Gate cross-user research endpoints behind ``settings.RESEARCH_API_KEY``.
+
+    Returns 403 when the key is not configured (feature disabled) and 401
+    when the supplied ``X-Research-Key`` header does not match.
+    """
+    if not settings.RESEARCH_API_KEY:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Research data access is not enabled on this server.",
+        )
+    if not x_research_key or not secrets.compare_digest(
+        x_research_key.encode("utf-8"), settings.RESEARCH_API_KEY.encode("utf-8")
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid research access key.",
+        )
+
+
 # --------------------------------------------------------------------------- #
 # Endpoints
 # --------------------------------------------------------------------------- #
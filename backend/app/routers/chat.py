@@ -4,7 +4,8 @@ from __future__ import annotations
 
 import logging
 
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 from sqlalchemy import select
@@ -14,6 +15,7 @@ from app.config import get_settings
 from app.database import get_db
 from app.limiter import limiter
 from app.models.chat import ChatHistory
+from app.pagination import apply_keyset, decode_cursor, iter_keyset, ndjson_lines, split_page
 from app.routers.auth import get_current_user
 from app.schemas.chat import ChatMessage, ChatRequest, ChatResponse
 from app.services import chat_service
@@ -42,21 +44,60 @@ async def chat(
 
 @router.get("/history", response_model=list[ChatMessage])
 async def history(
+    response: Response,
     session_id: str | None = None,
     limit: int = 50,
+    cursor: str | None = None,
     db: AsyncSession = Depends(get_db),
     user=Depends(get_current_user),
 ):
-    """Return the authenticated user's chat history, optionally filtered by session."""
-    stmt = (
-        select(ChatHistory)
-        .where(ChatHistory.user_id == user.id)
-        .order_by(ChatHistory.created_at.asc())
-        .limit(max(1, min(limit, 200)))
-    )
+    """Return the authenticated user's chat history, optionally filtered by session.
+
+    Messages are returned oldest-first and keyset-paginated on
+    ``(created_at, id)``.  When more messages exist, the opaque cursor for
+    the next page is returned in the ``X-Next-Cursor`` response header;
+    pass it back as ``cursor`` to continue.
+    """
+    try:
+        position = decode_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor.",
+        )
+    page_size = max(1, min(limit, 200))
+    stmt = select(ChatHistory).where(ChatHistory.user_id == user.id)
     if session_id:
         stmt = stmt.where(ChatHistory.session_id == session_id)
+    stmt = apply_keyset(
+        stmt, ChatHistory.created_at, ChatHistory.id,
+        cursor=position, limit=page_size, descending=False,
+    )
 
     result = await db.execute(stmt)
-    rows = result.scalars().all()
+    rows, next_cursor = split_page(result.scalars().all(), page_size, "created_at")
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return [ChatMessage.model_validate(row) for row in rows]
+
+
+@router.get("/history/export")
+async def export_history(
+    session_id: str | None = None,
+    db: AsyncSession = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    """Stream the authenticated user's full chat history as newline-delimited
+    JSON (oldest first), optionally filtered by session.
+    """
+    stmt = select(ChatHistory).where(ChatHistory.user_id == user.id)
+    if session_id:
+        stmt = stmt.where(ChatHistory.session_id == session_id)
+    rows = iter_keyset(
+        db, stmt, ChatHistory.created_at, ChatHistory.id,
+        ts_attr="created_at", descending=False,
+    )
+    return StreamingResponse(
+        ndjson_lines(rows, ChatMessage),
+        media_type="application/x-ndjson",
+    )
@@ -0,0 +1,68 @@
+"""Research export router — bulk, streaming dataset downloads.
+
+Endpoint:
+    GET /api/v1/export/{dataset}
+        Streams ``emotion_logs``, ``chat_history`` or ``guardian_alerts`` as
+        CSV, NDJSON, Parquet or Arrow IPC with optional date-range and user
+        cohort filters.  Requires the ``X-Research-Key`` header.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db
+from app.routers.auth import require_research_access
+from app.services import export_service
+
+logger = logging.getLogger(__name__)
+router = APIRouter(
+    prefix="/export",
+    tags=["Export"],
+    dependencies=[Depends(require_research_access)],
+)
+
+_MEDIA_TYPES: dict[str, str] = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+
+@router.get("/{dataset}")
+async def export_dataset(
+    dataset: Literal["emotion_logs", "chat_history", "guardian_alerts"],
+    format: Literal["csv", "ndjson", "parquet", "arrow"] = "csv",  # noqa: A002
+    start: datetime | None = None,
+    end: datetime | None = None,
+    user_ids: list[int] | None = Query(default=None),
+    db: AsyncSession = Depends(get_db),
+):
+    """Stream a research dataset with bounded server memory.
+
+    - **start** / **end**: ISO-8601 timestamps; rows with
+      ``start <= timestamp < end`` are exported.
+    - **user_ids**: repeat the parameter to restrict export to a cohort.
+    - **format**: ``parquet`` and ``arrow`` require ``pyarrow`` on the server
+      and return 501 otherwise.
+    """
+    try:
+        body = export_service.stream_export(
+            db, dataset, format, start=start, end=end, user_ids=user_ids,
+        )
+    except RuntimeError as exc:
+        raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail=str(exc))
+
+    filename = f"{dataset}.{format}"
+    return StreamingResponse(
+        body,
+        media_type=_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -2,17 +2,20 @@
 
 Endpoints:
   POST /api/v1/guardian-alert          — manually trigger a guardian alert
-  GET  /api/v1/guardian-alert          — list alerts for the current user
+  GET  /api/v1/guardian-alert          — list alerts for the current user (keyset-paginated)
+  GET  /api/v1/guardian-alert/export   — stream the full alert history as NDJSON
 """
 
 from __future__ import annotations
 
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
+from app.pagination import ndjson_lines
 from app.routers.auth import get_current_user
 from app.schemas.guardian_alert import (
     GuardianAlertListResponse,
@@ -66,12 +69,43 @@ async def trigger_guardian_alert(
 
 @router.get("", response_model=GuardianAlertListResponse)
 async def list_guardian_alerts(
+    cursor: str | None = None,
+    limit: int = Query(default=50, ge=1, le=200),
     db: AsyncSession = Depends(get_db),
     user=Depends(get_current_user),
 ):
-    """Return the authenticated user's guardian alert history (most recent first)."""
-    alerts = await guardian_alert_service.get_alerts_for_user(db, user.id)
+    """Return one page of the authenticated user's guardian alert history
+    (most recent first).
+
+    Pass ``next_cursor`` from the previous response as ``cursor`` to fetch
+    the next, older page.
+    """
+    try:
+        alerts, next_cursor = await guardian_alert_service.get_alerts_for_user(
+            db, user.id, limit=limit, cursor=cursor
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor.",
+        )
     return GuardianAlertListResponse(
         alerts=[GuardianAlertResponse.model_validate(a) for a in alerts],
         total=len(alerts),
+        next_cursor=next_cursor,
+    )
+
+
+@router.get("/export")
+async def export_guardian_alerts(
+    db: AsyncSession = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    """Stream the authenticated user's full guardian alert history as
+    newline-delimited JSON (most recent first).
+    """
+    rows = guardian_alert_service.iter_alerts_for_user(db, user.id)
+    return StreamingResponse(
+        ndjson_lines(rows, GuardianAlertResponse),
+        media_type="application/x-ndjson",
     )
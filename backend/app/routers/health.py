@@ -2,12 +2,12 @@
 
 import logging
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
 from sqlalchemy import text
 
 from app.config import get_settings
 from app.database import AsyncSessionLocal
-from app.services import emotion_service
+from app.services import emotion_service, warmup_service
 
 router = APIRouter(tags=["Health"])
 settings = get_settings()
@@ -24,6 +24,19 @@ async def health():
     }
 
 
+@router.get("/ready")
+async def ready(response: Response):
+    """Readiness probe — 503 until model warm-up latency has reached steady state.
+
+    The body carries the warm-up report (per-component first-call and
+    per-round p50 latencies) either way.
+    """
+    state = warmup_service.get_state()
+    if not state.ready:
+        response.status_code = 503
+    return state.to_dict()
+
+
 @router.get("/health/full")
 async def health_full():
     """Readiness probe — checks DB connectivity and ML model state.
@@ -17,7 +17,7 @@ from app.limiter import limiter
 from app.models.emotion import EmotionLog
 from app.routers.auth import get_optional_user
 from app.schemas.emotion import PredictRequest, PredictResponse
-from app.services import emotion_service
+from app.services import emotion_service, inference_executor, load_shedding
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/predict", tags=["Predict"])
@@ -51,10 +51,12 @@ async def predict(
     """
     t0 = time.perf_counter()
     try:
-        result = await asyncio.wait_for(
-            asyncio.to_thread(emotion_service.predict, req.text),
-            timeout=15.0,
-        )
+        with load_shedding.get_controller().track() as inference_mode:
+            result = await inference_executor.get_executor().run(
+                emotion_service.predict, req.text, inference_mode, timeout=15.0,
+            )
+    except inference_executor.ExecutorSaturated:
+        raise
     except asyncio.TimeoutError:
         logger.warning("Prediction timed out after 15 s for text_len=%d", len(req.text))
         raise HTTPException(
@@ -92,6 +94,7 @@ async def predict(
                 all_scores=all_scores_dict,
                 risk_score=round(risk_score, 4),
                 personalization_score=personalization_score,
+                inference_mode=result.inference_mode,
             ))
         except Exception:
             # Persistence failure must not block the prediction response.
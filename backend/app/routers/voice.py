@@ -16,7 +16,14 @@ from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, s
 from fastapi.responses import Response
 from pydantic import BaseModel
 
+from app.config import get_settings
 from app.routers.auth import get_current_user
+from app.services.transcription_service import (
+    TranscriptionPipeline,
+    UploadTooLarge,
+    get_pipeline,
+    read_limited,
+)
 from app.utils import find_project_root
 
 logger = logging.getLogger(__name__)
@@ -69,52 +76,62 @@ async def transcribe_audio(
     audio: UploadFile = File(..., description="Audio recording from the microphone (WAV/WebM/MP3/FLAC/OGG)"),
     language_preference: str = Form(default="english"),
     _user=Depends(get_current_user),
+    pipeline: TranscriptionPipeline = Depends(get_pipeline),
 ):
     """Transcribe uploaded audio to text using Google Speech Recognition.
 
     The ``language_preference`` form field can be ``english``, ``tamil``, or
-    ``bilingual``.  Bilingual / Tanglish input is attempted first with the
-    ``en-IN`` locale (Latin-script Tamil / code-switching) and then with
-    ``ta-IN`` as a fallback.
+    ``bilingual``.  Bilingual / Tanglish input is recognised with the
+    ``en-IN`` and ``ta-IN`` locales concurrently and the first non-empty
+    transcript is returned.
 
     Supported formats: WAV, AIFF, FLAC (native); WebM, MP3, OGG, MP4
-    (via pydub + ffmpeg when installed).  An empty string is returned when
-    speech cannot be recognised or when the STT dependency is not installed.
+    (via pydub + ffmpeg when installed, in a worker process).  An empty
+    string is returned when speech cannot be recognised or when the STT
+    dependency is not installed.  Uploads over ``VOICE_MAX_UPLOAD_BYTES``
+    are rejected with 413.
     """
-    handler = _get_handler()
+    _get_handler()
+    settings = get_settings()
 
     lang = language_preference.lower()
     if lang not in _SUPPORTED_LANGUAGES:
         lang = "english"
 
-    audio_bytes = await audio.read()
+    # The raw body is already bounded by BodySizeLimitMiddleware; this
+    # enforces the exact limit on the audio part.
+    try:
+        audio_bytes = await read_limited(audio, settings.VOICE_MAX_UPLOAD_BYTES)
+    except UploadTooLarge:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Audio upload exceeds {settings.VOICE_MAX_UPLOAD_BYTES} bytes.",
+        )
     if not audio_bytes:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="No audio data received.",
         )
 
-    # Offload blocking SpeechRecognition (network I/O to Google STT) to a
-    # thread so the async event loop stays responsive during transcription.
-    # A 30-second timeout guards against hung STT connections.
+    # Conversion runs in a process pool and recognition in threads, so the
+    # event loop stays responsive; the timeout guards against hung STT calls.
+    timeout = settings.VOICE_STT_TIMEOUT_SECONDS
     t0 = time.perf_counter()
     try:
-        transcript: str = await asyncio.wait_for(
-            asyncio.to_thread(handler.transcribe_audio, audio_bytes, lang),
-            timeout=30.0,
-        )
+        result = await asyncio.wait_for(pipeline.transcribe(audio_bytes, lang), timeout=timeout)
     except asyncio.TimeoutError:
-        logger.warning("STT timeout after 30s (lang=%s, bytes=%d)", lang, len(audio_bytes))
+        logger.warning("STT timeout after %.0fs (lang=%s, bytes=%d)", timeout, lang, len(audio_bytes))
         raise HTTPException(
             status_code=status.HTTP_504_GATEWAY_TIMEOUT,
             detail="Speech recognition timed out. Please try a shorter recording.",
         )
     elapsed = time.perf_counter() - t0
+    transcript = result.transcript
 
     if transcript:
         logger.info(
-            "STT lang=%s transcript_length=%d latency=%.3fs",
-            lang, len(transcript), elapsed,
+            "STT lang=%s locale=%s transcript_length=%d latency=%.3fs",
+            lang, result.locale, len(transcript), elapsed,
         )
     else:
         logger.warning(
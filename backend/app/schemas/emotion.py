@@ -23,3 +23,5 @@ class PredictResponse(BaseModel):
     escalation_message: str | None = None
     scores: list[EmotionScore]
     explanation: str | None = None
+    # full / no_nli / keyword_only (load shedding) or fallback
+    inference_mode: str = "full"
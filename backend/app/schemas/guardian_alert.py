@@ -34,4 +34,7 @@ class GuardianAlertResponse(BaseModel):
 
 class GuardianAlertListResponse(BaseModel):
     alerts: list[GuardianAlertResponse]
+    # Number of alerts on this page (not the user's lifetime total).
     total: int
+    # Opaque keyset cursor for the next (older) page; None on the last page.
+    next_cursor: str | None = None
@@ -106,7 +106,57 @@ def generate_research_summary(logs: list[EmotionLog]) -> dict[str, Any]:
     improvements.  Falls back gracefully when there are too few sessions.
     """
     n = len(logs)
-    total_sessions = n
+
+    if n < _MIN_SESSIONS_FOR_SUMMARY:
+        return build_research_summary(total_sessions=n)
+
+    # Split into baseline and current windows
+    window = baseline_window_size(n)
+    baseline_logs = logs[:window]
+    current_logs = logs[-window:]
+
+    emotion_counter = Counter(l.primary_emotion for l in logs)
+    dominant_emotion, dominant_count = emotion_counter.most_common(1)[0]
+
+    return build_research_summary(
+        total_sessions=n,
+        baseline_risk=sum(l.risk_score for l in baseline_logs) / len(baseline_logs),
+        current_risk=sum(l.risk_score for l in current_logs) / len(current_logs),
+        baseline_conf=sum(l.confidence for l in baseline_logs) / len(baseline_logs),
+        current_conf=sum(l.confidence for l in current_logs) / len(current_logs),
+        baseline_pers=sum(l.personalization_score for l in baseline_logs) / len(baseline_logs),
+        current_pers=sum(l.personalization_score for l in current_logs) / len(current_logs),
+        high_risk_count=sum(1 for l in logs if l.is_high_risk),
+        dominant_emotion=dominant_emotion,
+        dominant_count=dominant_count,
+    )
+
+
+def baseline_window_size(total_sessions: int) -> int:
+    """Return the number of sessions in each of the baseline / current windows."""
+    return max(1, int(total_sessions * _BASELINE_FRACTION))
+
+
+def build_research_summary(
+    *,
+    total_sessions: int,
+    baseline_risk: float = 0.0,
+    current_risk: float = 0.0,
+    baseline_conf: float = 0.0,
+    current_conf: float = 0.0,
+    baseline_pers: float = 0.0,
+    current_pers: float = 0.0,
+    high_risk_count: int = 0,
+    dominant_emotion: str = "neutral",
+    dominant_count: int = 0,
+) -> dict[str, Any]:
+    """Render the research summary from pre-computed window aggregates.
+
+    Shared by :func:`generate_research_summary` (aggregates computed in
+    Python over ORM rows) and the cohort analytics service (aggregates
+    computed in SQL), so both produce identical findings for the same data.
+    """
+    n = total_sessions
 
     if n < _MIN_SESSIONS_FOR_SUMMARY:
         return {
@@ -119,19 +169,6 @@ def generate_research_summary(logs: list[EmotionLog]) -> dict[str, Any]:
             "generated_at": datetime.now(timezone.utc).isoformat(),
         }
 
-    # Split into baseline and current windows
-    window = max(1, int(n * _BASELINE_FRACTION))
-    baseline_logs = logs[:window]
-    current_logs = logs[-window:]
-
-    # Average metrics per window
-    baseline_risk = sum(l.risk_score for l in baseline_logs) / len(baseline_logs)
-    current_risk = sum(l.risk_score for l in current_logs) / len(current_logs)
-    baseline_conf = sum(l.confidence for l in baseline_logs) / len(baseline_logs)
-    current_conf = sum(l.confidence for l in current_logs) / len(current_logs)
-    baseline_pers = sum(l.personalization_score for l in baseline_logs) / len(baseline_logs)
-    current_pers = sum(l.personalization_score for l in current_logs) / len(current_logs)
-
     # Risk detection improvement (lower risk in current = system working better)
     if baseline_risk > 0:
         risk_improvement_pct = round((baseline_risk - current_risk) / baseline_risk * 100, 1)
@@ -151,7 +188,6 @@ def generate_research_summary(logs: list[EmotionLog]) -> dict[str, Any]:
         pers_improvement_pct = 0.0
 
     # High-risk session rate
-    high_risk_count = sum(1 for l in logs if l.is_high_risk)
     high_risk_rate = round(high_risk_count / n * 100, 1)
 
     # Build human-readable key findings
@@ -193,8 +229,6 @@ def generate_research_summary(logs: list[EmotionLog]) -> dict[str, Any]:
     )
 
     # Insights
-    emotion_counter = Counter(l.primary_emotion for l in logs)
-    dominant_emotion, dominant_count = emotion_counter.most_common(1)[0]
     insights: list[str] = [
         f"The most frequently detected emotion was '{dominant_emotion}' "
         f"({round(dominant_count / n * 100, 1)}% of sessions).",
@@ -14,7 +14,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.chat import ChatHistory
 from app.models.emotion import EmotionLog
 from app.schemas.chat import ChatRequest, ChatResponse
-from app.services.emotion_service import predict
+from app.services import emotion_service, inference_executor, load_shedding
 from app.utils import find_project_root
 
 # Add the AI core (project root) to sys.path once.
@@ -59,6 +59,36 @@ def _get_pipeline(user_id: int):
     return _pipelines[user_id]
 
 
+def _degraded_result(message: str, context: dict, pipeline=None) -> dict | None:
+    """Keyword-only emotion + templated reply used when the full pipeline cannot answer.
+
+    Uses the shared ``EmotionAnalyzer`` in ``keyword_only`` mode (no model
+    inference, crisis keywords still checked).  The reply comes from the
+    user's own pipeline response agent when there is one, otherwise from a
+    fresh ``ConversationHandler``; either way the message is added to the
+    conversation first, so the reply reflects what the user wrote and no
+    state is shared between users.  Returns ``None`` if the AI core is
+    unavailable.
+    """
+    analyzer = emotion_service._get_analyzer()
+    if analyzer is None:
+        return None
+    try:
+        emotion_data = analyzer.classify_emotion_ml(message, inference_mode="keyword_only")
+        response_agent = getattr(pipeline, "response_agent", None)
+        if response_agent is not None:
+            response = response_agent.run(message, emotion_data, context=context)
+        else:
+            from conversation_handler import ConversationHandler  # noqa: PLC0415
+            handler = ConversationHandler()
+            handler.add_message(message, emotion_data)
+            response = handler.generate_response(emotion_data, user_context=context)
+    except Exception:
+        logger.exception("Keyword-only fallback failed")
+        return None
+    return {"response": response, "emotion": emotion_data, "patterns": {}}
+
+
 async def _load_profile_context(db: AsyncSession, user_id: int) -> dict:
     """Load the user profile and return a context dict for the pipeline."""
     from app.models.profile import UserProfile  # noqa: PLC0415
@@ -272,41 +302,61 @@ async def handle_chat(
     if req.language_preference:
         context["language_preference"] = req.language_preference
 
-    # Run full agent pipeline (emotion → pattern → response)
+    # Run full agent pipeline (emotion → pattern → response).  Only the model
+    # calls go to the inference executor; the other stages run inline.  The
+    # load shedding controller picks a cheaper inference mode under load; if
+    # the pipeline still cannot answer, a keyword-only reply is used instead.
+    from app.config import get_settings
+    settings = get_settings()
+    deadlines = {
+        "emotion_model": settings.PIPELINE_EMOTION_MODEL_DEADLINE_SECONDS,
+        "crisis_model": settings.PIPELINE_CRISIS_MODEL_DEADLINE_SECONDS,
+    }
     t_nlp_start = time.perf_counter()
     _pipeline_fallback = {
         "response": "I'm here for you. Could you tell me more about how you're feeling?",
-        "emotion": {"primary_emotion": "neutral", "confidence_score": 0.5},
+        "emotion": {"primary_emotion": "neutral", "confidence_score": 0.5, "inference_mode": "fallback"},
         "patterns": {},
     }
-    if pipeline is None:
-        logger.warning("Pipeline unavailable for user_id=%d; using fallback response.", user_id)
-        result = _pipeline_fallback
-    else:
-        try:
-            result = await asyncio.wait_for(
-                asyncio.to_thread(pipeline.process_turn, req.message, context=context),
-                timeout=15.0,
+    with load_shedding.get_controller().track() as inference_mode:
+        result = None
+        if pipeline is None:
+            logger.warning("Pipeline unavailable for user_id=%d; using keyword-only reply.", user_id)
+        else:
+            try:
+                result = await asyncio.wait_for(
+                    pipeline.process_turn_async(
+                        req.message, context=context, inference_mode=inference_mode,
+                        run=inference_executor.get_executor().run, deadlines=deadlines,
+                    ),
+                    timeout=15.0,
+                )
+                if result.get("missed_stages"):
+                    logger.warning("Partial pipeline result for user_id=%d: %s missed deadline",
+                                   user_id, ", ".join(result["missed_stages"]))
+            except inference_executor.ExecutorSaturated:
+                raise
+            except asyncio.TimeoutError:
+                logger.warning("Pipeline timed out for user_id=%d; using keyword-only reply.", user_id)
+            except Exception:
+                logger.exception("Pipeline error for user_id=%d", user_id)
+        if result is None:
+            result = (
+                await asyncio.to_thread(_degraded_result, req.message, context, pipeline)
+                or _pipeline_fallback
             )
-        except asyncio.TimeoutError:
-            logger.warning("Pipeline timed out for user_id=%d; using fallback response.", user_id)
-            result = _pipeline_fallback
-        except Exception:
-            logger.exception("Pipeline error for user_id=%d", user_id)
-            result = _pipeline_fallback
     t_nlp_end = time.perf_counter()
-    logger.info("timing nlp=%.3fs user_id=%d", t_nlp_end - t_nlp_start, user_id)
+    logger.info("timing nlp=%.3fs user_id=%d mode=%s", t_nlp_end - t_nlp_start, user_id, inference_mode)
 
     emotion_data: dict = result.get("emotion") or {}
     primary = emotion_data.get("primary_emotion", "neutral")
     confidence = float(emotion_data.get("confidence_score", 0.5))
     reply_text: str = result.get("response", "")
     patterns: dict = result.get("patterns") or {}
+    inference_mode = emotion_data.get("inference_mode", inference_mode)
 
     # Safety gate
     crisis_score = (emotion_data.get("final_probabilities") or {}).get("crisis", 0.0)
-    from app.config import get_settings
-    settings = get_settings()
     is_high_risk = (
         primary == "crisis"
         or float(crisis_score) >= settings.CRISIS_CONFIDENCE_THRESHOLD
@@ -347,6 +397,7 @@ async def handle_chat(
         uncertainty=round(float(emotion_data.get("uncertainty_score", 0.5)), 4),
         is_high_risk=is_high_risk,
         all_scores=raw_scores,
+        inference_mode=inference_mode,
     ))
     # Flush all three inserts in a single round-trip instead of separate flushes.
     await db.flush()
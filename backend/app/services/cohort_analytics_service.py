@@ -0,0 +1,192 @@
+"""Cohort analytics service — research metrics aggregated inside the database.
+
+The per-user analytics in :mod:`app.services.analytics_service` load ORM rows
+and aggregate in Python, which does not scale to the whole user base.  This
+module computes the same metrics for a cohort (all users, or a filtered
+subset) with ``GROUP BY`` / ``AVG`` / ``LIMIT`` queries so that only a
+handful of aggregate rows ever leave the database:
+
+- Emotion distribution (counts + percentages)
+- Average confidence / personalization score and high-risk rate
+- Daily average risk trend
+- Baseline-vs-current research summary, rendered by
+  :func:`analytics_service.build_research_summary` so the wording and
+  rounding match :func:`analytics_service.generate_research_summary`
+  exactly.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import date, datetime
+from typing import Any
+
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.emotion import EmotionLog
+from app.services import analytics_service
+
+logger = logging.getLogger(__name__)
+
+
+def _cohort_filters(
+    *,
+    user_ids: list[int] | None,
+    start: datetime | None,
+    end: datetime | None,
+) -> list[Any]:
+    clauses: list[Any] = []
+    if user_ids:
+        clauses.append(EmotionLog.user_id.in_(user_ids))
+    if start is not None:
+        clauses.append(EmotionLog.created_at >= start)
+    if end is not None:
+        clauses.append(EmotionLog.created_at < end)
+    return clauses
+
+
+async def _window_averages(
+    db: AsyncSession,
+    filters: list[Any],
+    window: int,
+    *,
+    latest: bool,
+) -> tuple[float, float, float]:
+    """Average risk / confidence / personalization over the first or last *window* logs."""
+    order = (
+        (EmotionLog.created_at.desc(), EmotionLog.id.desc())
+        if latest
+        else (EmotionLog.created_at.asc(), EmotionLog.id.asc())
+    )
+    sub = (
+        select(
+            EmotionLog.risk_score,
+            EmotionLog.confidence,
+            EmotionLog.personalization_score,
+        )
+        .where(*filters)
+        .order_by(*order)
+        .limit(window)
+        .subquery()
+    )
+    row = (
+        await db.execute(
+            select(
+                func.avg(sub.c.risk_score),
+                func.avg(sub.c.confidence),
+                func.avg(sub.c.personalization_score),
+            )
+        )
+    ).one()
+    return float(row[0] or 0.0), float(row[1] or 0.0), float(row[2] or 0.0)
+
+
+async def compute_cohort_analytics(
+    db: AsyncSession,
+    *,
+    user_ids: list[int] | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+) -> dict[str, Any]:
+    """Return cohort-level research metrics computed with SQL aggregation.
+
+    The result mirrors the per-user ``/analytics/research`` payload (minus
+    plots) plus ``user_count`` and ``high_risk_rate_pct``.
+    """
+    filters = _cohort_filters(user_ids=user_ids, start=start, end=end)
+
+    totals = (
+        await db.execute(
+            select(
+                func.count(EmotionLog.id),
+                func.count(func.distinct(EmotionLog.user_id)),
+                func.avg(EmotionLog.confidence),
+                func.avg(EmotionLog.personalization_score),
+                func.sum(case((EmotionLog.is_high_risk.is_(True), 1), else_=0)),
+            ).where(*filters)
+        )
+    ).one()
+    n = int(totals[0] or 0)
+    user_count = int(totals[1] or 0)
+    high_risk_count = int(totals[4] or 0)
+
+    # Ties are broken by first occurrence so the ordering matches the
+    # Counter-based per-user implementation.
+    dist_rows = (
+        await db.execute(
+            select(EmotionLog.primary_emotion, func.count(EmotionLog.id).label("n"))
+            .where(*filters)
+            .group_by(EmotionLog.primary_emotion)
+            .order_by(
+                func.count(EmotionLog.id).desc(),
+                func.min(EmotionLog.created_at).asc(),
+                func.min(EmotionLog.id).asc(),
+            )
+        )
+    ).all()
+    emotion_distribution = [
+        {
+            "emotion": emotion,
+            "count": count,
+            "percentage": round(count / n * 100, 2),
+        }
+        for emotion, count in dist_rows
+    ]
+
+    ts = EmotionLog.created_at
+    if db.get_bind().dialect.name == "postgresql":
+        # Bucket by UTC day regardless of the connection's TimeZone setting.
+        ts = func.timezone("UTC", ts)
+    day = func.date(ts).label("day")
+    trend_rows = (
+        await db.execute(
+            select(day, func.avg(EmotionLog.risk_score))
+            .where(*filters)
+            .group_by(day)
+            .order_by(day)
+        )
+    ).all()
+    risk_trend = [
+        {
+            "date": d.isoformat() if isinstance(d, date) else str(d),
+            "avg_risk_score": round(float(avg), 4),
+        }
+        for d, avg in trend_rows
+    ]
+
+    if n >= analytics_service._MIN_SESSIONS_FOR_SUMMARY:
+        window = analytics_service.baseline_window_size(n)
+        baseline = await _window_averages(db, filters, window, latest=False)
+        current = await _window_averages(db, filters, window, latest=True)
+        dominant_emotion, dominant_count = dist_rows[0]
+        summary = analytics_service.build_research_summary(
+            total_sessions=n,
+            baseline_risk=baseline[0],
+            current_risk=current[0],
+            baseline_conf=baseline[1],
+            current_conf=current[1],
+            baseline_pers=baseline[2],
+            current_pers=current[2],
+            high_risk_count=high_risk_count,
+            dominant_emotion=dominant_emotion,
+            dominant_count=dominant_count,
+        )
+    else:
+        summary = analytics_service.build_research_summary(total_sessions=n)
+
+    logger.info(
+        "cohort_analytics users=%d sessions=%d cohort_filter=%s",
+        user_count, n, bool(user_ids),
+    )
+
+    return {
+        "total_sessions": n,
+        "user_count": user_count,
+        "emotion_distribution": emotion_distribution,
+        "average_confidence": round(float(totals[2] or 0.0), 4),
+        "average_personalization_score": round(float(totals[3] or 0.0), 4),
+        "high_risk_rate_pct": round(high_risk_count / n * 100, 1) if n else 0.0,
+        "risk_trend": risk_trend,
+        "research_summary": summary,
+    }
@@ -61,8 +61,11 @@ def preload_models() -> None:
     Calling this during the application lifespan event ensures the first
     API request does not pay the model-load cost (cold-start delay).
     The singleton is reused for every subsequent call to :func:`predict`.
+    The AI core loads models lazily, so they are warmed explicitly here.
     """
-    _get_analyzer()
+    analyzer = _get_analyzer()
+    if analyzer is not None:
+        logger.info("EmotionAnalyzer warm-up: %s", analyzer.warmup())
 
 
 def is_model_loaded() -> bool:
@@ -74,18 +77,25 @@ def is_model_loaded() -> bool:
 # Public interface
 # --------------------------------------------------------------------------- #
 
-def predict(text: str) -> PredictResponse:
-    """Run the hybrid emotion pipeline and return a structured response."""
+def predict(text: str, inference_mode: str = "full") -> PredictResponse:
+    """Run the hybrid emotion pipeline and return a structured response.
+
+    *inference_mode* is a key of ``emotion_analyzer.INFERENCE_MODES``,
+    normally chosen by :mod:`app.services.load_shedding`.
+    """
     analyzer = _get_analyzer()
 
     if analyzer is None:
         result = _fallback_result(text)
+        inference_mode = "fallback"
     else:
         try:
-            result = analyzer.classify_emotion(text)
+            from emotion_analyzer import INFERENCE_MODES  # noqa: PLC0415
+            result = analyzer.classify_emotion(text, **INFERENCE_MODES[inference_mode])
         except Exception:
             logger.exception("EmotionAnalyzer.classify_emotion failed; falling back")
             result = _fallback_result(text)
+            inference_mode = "fallback"
 
     primary = result.get("emotion", "neutral")
     confidence = float(result.get("confidence_score", 0.5))
@@ -112,11 +122,12 @@ def predict(text: str) -> PredictResponse:
     explanation = result.get("explanation") or result.get("explanation_text")
 
     logger.info(
-        "predict text_len=%d emotion=%s confidence=%.3f is_high_risk=%s",
+        "predict text_len=%d emotion=%s confidence=%.3f is_high_risk=%s mode=%s",
         len(text),
         primary,
         confidence,
         is_high_risk,
+        inference_mode,
     )
 
     return PredictResponse(
@@ -128,6 +139,7 @@ def predict(text: str) -> PredictResponse:
         escalation_message=escalation_message,
         scores=scores,
         explanation=explanation,
+        inference_mode=inference_mode,
     )
 
 
@@ -0,0 +1,345 @@
+"""Research data export service — streaming, bounded-memory dataset dumps.
+
+Exports the ``emotion_logs``, ``chat_history`` and ``guardian_alerts`` tables
+for offline analysis without a database dump.  Rows are read through a
+server-side cursor (``AsyncSession.stream`` with ``yield_per``) and encoded
+one chunk at a time, so memory use is bounded by ``chunk_size`` regardless of
+table size.
+
+Supported formats
+-----------------
+* ``csv``     — header row followed by one row per record
+* ``ndjson``  — one JSON object per line
+* ``parquet`` — one row group per chunk (requires ``pyarrow``)
+* ``arrow``   — Arrow IPC stream, one record batch per chunk (requires ``pyarrow``)
+
+``EmotionLog.all_scores`` is expanded into one ``score_<emotion>`` column per
+canonical emotion label; any non-canonical keys are kept as a JSON string in
+``score_other`` so no information is lost.
+
+Filters: inclusive ``start`` / exclusive ``end`` on the row timestamp, and an
+optional user cohort (list of user ids).
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import logging
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.chat import ChatHistory
+from app.models.emotion import EmotionLog
+from app.models.guardian_alert import GuardianAlert
+
+logger = logging.getLogger(__name__)
+
+# Rows fetched from the server-side cursor and encoded per chunk.
+DEFAULT_CHUNK_SIZE = 1000
+
+# Canonical label set produced by EmotionAnalyzer.classify_emotion().
+EMOTION_SCORE_LABELS: tuple[str, ...] = (
+    "joy", "sadness", "anger", "fear", "anxiety", "neutral", "crisis",
+)
+
+EXPORT_FORMATS: tuple[str, ...] = ("csv", "ndjson", "parquet", "arrow")
+
+# Column kinds map onto both CSV text rendering and Arrow types.
+_INT, _FLOAT, _BOOL, _STR, _TS = "int", "float", "bool", "str", "ts"
+
+
+@dataclass(frozen=True)
+class _Dataset:
+    model: Any
+    ts_column: Any
+    columns: tuple[tuple[str, str], ...]
+    to_record: Callable[[Any], dict[str, Any]]
+
+
+_EMOTION_BASE_COLUMNS: tuple[tuple[str, str], ...] = (
+    ("id", _INT),
+    ("user_id", _INT),
+    ("created_at", _TS),
+    ("input_text", _STR),
+    ("primary_emotion", _STR),
+    ("confidence", _FLOAT),
+    ("uncertainty", _FLOAT),
+    ("is_high_risk", _BOOL),
+    ("risk_score", _FLOAT),
+    ("personalization_score", _FLOAT),
+)
+
+_CHAT_COLUMNS: tuple[tuple[str, str], ...] = (
+    ("id", _INT),
+    ("user_id", _INT),
+    ("session_id", _STR),
+    ("created_at", _TS),
+    ("role", _STR),
+    ("content", _STR),
+    ("emotion", _STR),
+)
+
+_ALERT_COLUMNS: tuple[tuple[str, str], ...] = (
+    ("id", _INT),
+    ("user_id", _INT),
+    ("timestamp", _TS),
+    ("risk_level", _STR),
+    ("risk_reason", _STR),
+    ("channel", _STR),
+    ("delivery_status", _STR),
+    ("is_test", _BOOL),
+)
+
+
+def _plain_record(names: tuple[str, ...]) -> Callable[[Any], dict[str, Any]]:
+    def _convert(row: Any) -> dict[str, Any]:
+        return {name: row[name] for name in names}
+    return _convert
+
+
+def _emotion_record(row: Any) -> dict[str, Any]:
+    record = {name: row[name] for name, _ in _EMOTION_BASE_COLUMNS}
+    scores: dict = dict(row["all_scores"] or {})
+    for label in EMOTION_SCORE_LABELS:
+        value = scores.pop(label, None)
+        record[f"score_{label}"] = float(value) if value is not None else None
+    record["score_other"] = json.dumps(scores, sort_keys=True) if scores else None
+    return record
+
+
+DATASETS: dict[str, _Dataset] = {
+    "emotion_logs": _Dataset(
+        model=EmotionLog,
+        ts_column=EmotionLog.created_at,
+        columns=(
+            *_EMOTION_BASE_COLUMNS,
+            *((f"score_{label}", _FLOAT) for label in EMOTION_SCORE_LABELS),
+            ("score_other", _STR),
+        ),
+        to_record=_emotion_record,
+    ),
+    "chat_history": _Dataset(
+        model=ChatHistory,
+        ts_column=ChatHistory.created_at,
+        columns=_CHAT_COLUMNS,
+        to_record=_plain_record(tuple(name for name, _ in _CHAT_COLUMNS)),
+    ),
+    "guardian_alerts": _Dataset(
+        model=GuardianAlert,
+        ts_column=GuardianAlert.timestamp,
+        columns=_ALERT_COLUMNS,
+        to_record=_plain_record(tuple(name for name, _ in _ALERT_COLUMNS)),
+    ),
+}
+
+
+# --------------------------------------------------------------------------- #
+# Row source
+# --------------------------------------------------------------------------- #
+
+def _source_columns(dataset: _Dataset) -> list[Any]:
+    """Return the table columns to select (``all_scores`` instead of its expansion)."""
+    if dataset.model is EmotionLog:
+        names = [name for name, _ in _EMOTION_BASE_COLUMNS] + ["all_scores"]
+    else:
+        names = [name for name, _ in dataset.columns]
+    return [getattr(dataset.model, name) for name in names]
+
+
+async def iter_record_chunks(
+    db: AsyncSession,
+    dataset_name: str,
+    *,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    user_ids: list[int] | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> AsyncIterator[list[dict[str, Any]]]:
+    """Yield lists of at most *chunk_size* flat records, oldest first.
+
+    Raises ``ValueError`` for an unknown *dataset_name*.
+    """
+    dataset = DATASETS.get(dataset_name)
+    if dataset is None:
+        raise ValueError(f"Unknown export dataset: {dataset_name!r}")
+
+    stmt = select(*_source_columns(dataset))
+    if start is not None:
+        stmt = stmt.where(dataset.ts_column >= start)
+    if end is not None:
+        stmt = stmt.where(dataset.ts_column < end)
+    if user_ids:
+        stmt = stmt.where(dataset.model.user_id.in_(user_ids))
+    stmt = stmt.order_by(dataset.ts_column.asc(), dataset.model.id.asc())
+
+    result = await db.stream(stmt.execution_options(yield_per=chunk_size))
+    async for partition in result.mappings().partitions(chunk_size):
+        yield [dataset.to_record(row) for row in partition]
+
+
+# --------------------------------------------------------------------------- #
+# Encoders
+# --------------------------------------------------------------------------- #
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return "" if value is None else value
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+async def _encode_csv(chunks: AsyncIterator[list[dict]], names: list[str]) -> AsyncIterator[bytes]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(names)
+    yield buf.getvalue().encode("utf-8")
+    async for chunk in chunks:
+        buf.seek(0)
+        buf.truncate()
+        writer.writerows([_csv_value(rec[n]) for n in names] for rec in chunk)
+        yield buf.getvalue().encode("utf-8")
+
+
+async def _encode_ndjson(chunks: AsyncIterator[list[dict]]) -> AsyncIterator[bytes]:
+    async for chunk in chunks:
+        yield "".join(
+            json.dumps(rec, default=_json_default, ensure_ascii=False) + "\n"
+            for rec in chunk
+        ).encode("utf-8")
+
+
+def _try_import_pyarrow():
+    """Return the pyarrow module or None when it is not installed."""
+    try:
+        import pyarrow  # noqa: PLC0415
+        import pyarrow.ipc  # noqa: F401, PLC0415
+        import pyarrow.parquet  # noqa: F401, PLC0415
+        return pyarrow
+    except ImportError:
+        return None
+
+
+def is_format_available(fmt: str) -> bool:
+    """Return True if *fmt* can be produced in this environment."""
+    if fmt in ("parquet", "arrow"):
+        return _try_import_pyarrow() is not None
+    return fmt in EXPORT_FORMATS
+
+
+class _ChunkSink:
+    """Minimal writable file object that hands written bytes back per chunk."""
+
+    closed = False
+
+    def __init__(self) -> None:
+        self._parts: list[bytes] = []
+        self._pos = 0
+
+    def write(self, data: Any) -> int:
+        raw = bytes(data)
+        self._parts.append(raw)
+        self._pos += len(raw)
+        return len(raw)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        out = b"".join(self._parts)
+        self._parts.clear()
+        return out
+
+
+def _arrow_schema(pa: Any, columns: tuple[tuple[str, str], ...]) -> Any:
+    types = {
+        _INT: pa.int64(),
+        _FLOAT: pa.float64(),
+        _BOOL: pa.bool_(),
+        _STR: pa.string(),
+        _TS: pa.timestamp("us", tz="UTC"),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in columns])
+
+
+async def _encode_arrow(
+    chunks: AsyncIterator[list[dict]],
+    columns: tuple[tuple[str, str], ...],
+    fmt: str,
+) -> AsyncIterator[bytes]:
+    pa = _try_import_pyarrow()
+    schema = _arrow_schema(pa, columns)
+    sink = _ChunkSink()
+    if fmt == "parquet":
+        writer = pa.parquet.ParquetWriter(sink, schema)
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+    try:
+        async for chunk in chunks:
+            table = pa.Table.from_pylist(chunk, schema=schema)
+            writer.write_table(table)
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    tail = sink.drain()
+    if tail:
+        yield tail
+
+
+def stream_export(
+    db: AsyncSession,
+    dataset_name: str,
+    fmt: str,
+    *,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    user_ids: list[int] | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> AsyncIterator[bytes]:
+    """Return an async byte stream encoding *dataset_name* as *fmt*.
+
+    Raises ``ValueError`` for an unknown dataset or format, and
+    ``RuntimeError`` when a columnar format is requested without pyarrow.
+    Validation happens eagerly so callers can map errors to HTTP status
+    codes before the response starts.
+    """
+    dataset = DATASETS.get(dataset_name)
+    if dataset is None:
+        raise ValueError(f"Unknown export dataset: {dataset_name!r}")
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt!r}")
+    if not is_format_available(fmt):
+        raise RuntimeError(f"{fmt} export requires the optional 'pyarrow' package")
+
+    logger.info(
+        "export dataset=%s format=%s start=%s end=%s cohort_size=%s",
+        dataset_name, fmt, start, end, len(user_ids) if user_ids else "all",
+    )
+    chunks = iter_record_chunks(
+        db, dataset_name,
+        start=start, end=end, user_ids=user_ids, chunk_size=chunk_size,
+    )
+    if fmt == "csv":
+        return _encode_csv(chunks, [name for name, _ in dataset.columns])
+    if fmt == "ndjson":
+        return _encode_ndjson(chunks)
+    return _encode_arrow(chunks, dataset.columns, fmt)
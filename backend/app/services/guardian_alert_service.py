@@ -35,6 +35,7 @@ from __future__ import annotations
 
 import logging
 import smtplib
+from collections.abc import AsyncIterator
 from datetime import datetime, timedelta, timezone
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
@@ -45,6 +46,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.config import get_settings
 from app.models.guardian_alert import GuardianAlert
 from app.models.profile import UserProfile
+from app.pagination import apply_keyset, decode_cursor, iter_keyset, split_page
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -488,12 +490,34 @@ async def get_alerts_for_user(
     db: AsyncSession,
     user_id: int,
     limit: int = 50,
-) -> list[GuardianAlert]:
-    """Return the most recent guardian alerts for a user."""
-    result = await db.execute(
-        select(GuardianAlert)
-        .where(GuardianAlert.user_id == user_id)
-        .order_by(GuardianAlert.timestamp.desc())
-        .limit(limit)
+    cursor: str | None = None,
+) -> tuple[list[GuardianAlert], str | None]:
+    """Return one page of guardian alerts for a user, most recent first.
+
+    Pages are keyset-paginated on ``(timestamp, id)``; pass the returned
+    cursor back in to fetch the next page.  The second element is ``None``
+    once the oldest alert has been returned.  Raises ``ValueError`` for a
+    malformed *cursor*.
+    """
+    stmt = apply_keyset(
+        select(GuardianAlert).where(GuardianAlert.user_id == user_id),
+        GuardianAlert.timestamp,
+        GuardianAlert.id,
+        cursor=decode_cursor(cursor) if cursor else None,
+        limit=limit,
+        descending=True,
+    )
+    result = await db.execute(stmt)
+    return split_page(result.scalars().all(), limit, "timestamp")
+
+
+def iter_alerts_for_user(db: AsyncSession, user_id: int) -> AsyncIterator[GuardianAlert]:
+    """Yield every guardian alert for a user, most recent first, page by page."""
+    return iter_keyset(
+        db,
+        select(GuardianAlert).where(GuardianAlert.user_id == user_id),
+        GuardianAlert.timestamp,
+        GuardianAlert.id,
+        ts_attr="timestamp",
+        descending=True,
     )
-    return list(result.scalars().all())
@@ -0,0 +1,205 @@
+"""Inference executor — bounded thread pool with admission control for AI-core work.
+
+``asyncio.to_thread`` shares the loop's default executor with every other
+blocking call, and a timed-out ``wait_for`` leaves the thread running, so
+under overload abandoned pipeline runs pile up and throughput collapses.
+:class:`InferenceExecutor` instead
+
+* runs AI-core calls on ``INFERENCE_EXECUTOR_WORKERS`` dedicated threads;
+* admits at most ``INFERENCE_QUEUE_LIMIT`` calls waiting for a thread and
+  rejects the rest up front with :class:`ExecutorSaturated` (HTTP 503 with
+  ``Retry-After``, see ``app.main``);
+* on timeout or client disconnect, drops calls that have not started; a
+  call that is already running keeps its slot until its thread really is
+  free, so abandoned work cannot pile up beyond the pool;
+* records queue wait and execution time separately
+  (``wellness_inference_queue_wait_seconds`` /
+  ``wellness_inference_execution_seconds`` on ``/metrics``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import threading
+import time
+from collections import Counter, deque
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+from prometheus_client import Counter as PromCounter
+from prometheus_client import Histogram
+
+from app.config import Settings, get_settings
+
+logger = logging.getLogger(__name__)
+
+_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 15.0, 30.0)
+QUEUE_WAIT = Histogram(
+    "wellness_inference_queue_wait_seconds",
+    "Time AI-core calls wait for an inference thread.", buckets=_BUCKETS,
+)
+EXECUTION = Histogram(
+    "wellness_inference_execution_seconds",
+    "Time AI-core calls run on an inference thread.", buckets=_BUCKETS,
+)
+OUTCOMES = PromCounter(
+    "wellness_inference_calls_total",
+    "AI-core calls by outcome (completed, failed, rejected, timed_out, dropped).", ["outcome"],
+)
+
+
+class ExecutorSaturated(Exception):
+    """The admission queue is full; retry after ``retry_after`` seconds."""
+
+    def __init__(self, retry_after: int) -> None:
+        super().__init__(f"inference queue full; retry after {retry_after} s")
+        self.retry_after = retry_after
+
+
+class InferenceExecutor:
+    def __init__(self, workers: int = 2, queue_limit: int = 8) -> None:
+        self.workers = max(1, workers)
+        self.queue_limit = max(0, queue_limit)
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="inference")
+        self._lock = threading.Lock()
+        self._pending = 0   # admitted and not finished (queued + running)
+        self._running = 0
+        self._queue_waits: deque[float] = deque(maxlen=200)
+        self._exec_times: deque[float] = deque(maxlen=200)
+        self.outcomes: Counter[str] = Counter()
+
+    # ------------------------------------------------------------------ #
+    # Admission
+    # ------------------------------------------------------------------ #
+
+    def _retry_after(self) -> int:
+        """Seconds until a queue slot is likely free: one mean execution time per queued call per thread."""
+        mean = sum(self._exec_times) / len(self._exec_times) if self._exec_times else 1.0
+        queued = max(self._pending - self._running, 1)
+        return max(1, math.ceil(mean * queued / self.workers))
+
+    def _admit(self) -> None:
+        with self._lock:
+            if self._pending >= self.workers + self.queue_limit:
+                self._count("rejected")
+                raise ExecutorSaturated(self._retry_after())
+            self._pending += 1
+
+    def _release(self, _future: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    def _count(self, outcome: str) -> None:
+        self.outcomes[outcome] += 1
+        OUTCOMES.labels(outcome).inc()
+
+    # ------------------------------------------------------------------ #
+    # Execution
+    # ------------------------------------------------------------------ #
+
+    async def run(
+        self,
+        fn: Callable[..., Any],
+        /,
+        *args: Any,
+        timeout: float | None = None,
+        **kwargs: Any,
+    ) -> Any:
+        """Run ``fn(*args, **kwargs)`` on an inference thread.
+
+        Raises :class:`ExecutorSaturated` when the queue is full and
+        ``asyncio.TimeoutError`` after *timeout* seconds.
+        """
+        self._admit()
+        submitted = time.perf_counter()
+
+        def _call() -> Any:
+            started = time.perf_counter()
+            self._observe(self._queue_waits, QUEUE_WAIT, started - submitted)
+            with self._lock:
+                self._running += 1
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                self._observe(self._exec_times, EXECUTION, time.perf_counter() - started)
+
+        try:
+            future = self._pool.submit(_call)
+        except RuntimeError:  # pool shut down
+            with self._lock:
+                self._pending -= 1
+            raise
+        future.add_done_callback(self._release)
+        try:
+            result = await asyncio.wait_for(asyncio.wrap_future(future), timeout=timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as exc:
+            dropped = future.cancel()  # only succeeds if the call has not started
+            self._count("dropped" if dropped else "timed_out")
+            if isinstance(exc, asyncio.TimeoutError):
+                logger.warning("Inference call timed out after %.1f s (%s).",
+                               timeout, "dropped from queue" if dropped else "left running")
+            raise
+        except Exception:
+            self._count("failed")
+            raise
+        self._count("completed")
+        return result
+
+    @staticmethod
+    def _observe(window: deque[float], histogram: Histogram, seconds: float) -> None:
+        window.append(seconds)
+        histogram.observe(seconds)
+
+    # ------------------------------------------------------------------ #
+    # Introspection / lifecycle
+    # ------------------------------------------------------------------ #
+
+    def stats(self) -> dict[str, Any]:
+        def p95(window: deque[float]) -> float | None:
+            if not window:
+                return None
+            ordered = sorted(window)
+            return round(ordered[min(len(ordered) - 1, math.ceil(0.95 * len(ordered)) - 1)], 4)
+
+        with self._lock:
+            pending, running = self._pending, self._running
+        return {
+            "workers": self.workers,
+            "queue_limit": self.queue_limit,
+            "running": running,
+            "queued": pending - running,
+            "queue_wait_p95_seconds": p95(self._queue_waits),
+            "execution_p95_seconds": p95(self._exec_times),
+            "outcomes": dict(self.outcomes),
+        }
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+# Module-level singleton — one inference pool per worker process.
+_executor: InferenceExecutor | None = None
+
+
+def build_executor(settings: Settings | None = None) -> InferenceExecutor:
+    settings = settings or get_settings()
+    return InferenceExecutor(settings.INFERENCE_EXECUTOR_WORKERS, settings.INFERENCE_QUEUE_LIMIT)
+
+
+def get_executor() -> InferenceExecutor:
+    global _executor
+    if _executor is None:
+        _executor = build_executor()
+    return _executor
+
+
+def shutdown_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
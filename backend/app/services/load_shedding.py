@@ -0,0 +1,118 @@
+"""Load shedding — adaptive inference mode for the AI core.
+
+Under load the worker trades model quality for latency instead of timing
+out into a canned reply.  :class:`AdaptiveController` watches
+
+* the number of AI-core requests in flight (queued or running), and
+* the p95 latency of the last ``LOAD_SHED_WINDOW`` requests,
+
+and picks one of ``emotion_analyzer.INFERENCE_MODES`` per request:
+
+``full``          hybrid fusion + zero-shot (NLI) crisis model
+``no_nli``        hybrid fusion, crisis keywords only
+``keyword_only``  keyword fusion, no model inference at all
+
+Crisis keyword detection runs in every mode.  The controller steps down
+as soon as a ``LOAD_SHED_*`` threshold is crossed and steps back up one
+level at a time, at most every ``LOAD_SHED_HOLD_SECONDS``, so it does not
+oscillate when the cheaper mode immediately brings latency down.  The mode
+used is recorded on every ``EmotionLog`` row.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import time
+from collections import Counter, deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+from app.config import Settings, get_settings
+
+logger = logging.getLogger(__name__)
+
+MODES: tuple[str, ...] = ("full", "no_nli", "keyword_only")
+
+
+class AdaptiveController:
+    """Picks the inference mode per request from queue depth and recent p95 latency."""
+
+    def __init__(self, settings: Settings | None = None, clock: Callable[[], float] = time.monotonic) -> None:
+        settings = settings or get_settings()
+        self.enabled = settings.LOAD_SHED_ENABLED
+        # Thresholds to enter MODES[1] and MODES[2]
+        self.depth_thresholds = (settings.LOAD_SHED_NO_NLI_DEPTH, settings.LOAD_SHED_KEYWORD_DEPTH)
+        self.p95_thresholds = (settings.LOAD_SHED_NO_NLI_P95_SECONDS, settings.LOAD_SHED_KEYWORD_P95_SECONDS)
+        self.hold_seconds = settings.LOAD_SHED_HOLD_SECONDS
+        self._clock = clock
+        self._latencies: deque[float] = deque(maxlen=settings.LOAD_SHED_WINDOW)
+        self._level = 0
+        self._changed_at = clock()
+        self.in_flight = 0
+        self.mode_counts: Counter[str] = Counter()
+
+    def p95(self) -> float | None:
+        if not self._latencies:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, math.ceil(0.95 * len(ordered)) - 1)]
+
+    def _target_level(self) -> int:
+        p95 = self.p95()
+        level = 0
+        for i, (depth, latency) in enumerate(zip(self.depth_thresholds, self.p95_thresholds), start=1):
+            if self.in_flight >= depth or (p95 is not None and p95 >= latency):
+                level = i
+        return level
+
+    def choose_mode(self) -> str:
+        """Inference mode for the next request."""
+        if not self.enabled:
+            return MODES[0]
+        now = self._clock()
+        target = self._target_level()
+        if target > self._level:
+            logger.warning("Load shedding: %s → %s (in_flight=%d, p95=%s)",
+                           MODES[self._level], MODES[target], self.in_flight, self.p95())
+            self._level, self._changed_at = target, now
+        elif target < self._level and now - self._changed_at >= self.hold_seconds:
+            self._level, self._changed_at = self._level - 1, now
+            logger.info("Load shedding: recovering to %s", MODES[self._level])
+        return MODES[self._level]
+
+    def record(self, seconds: float) -> None:
+        self._latencies.append(seconds)
+
+    @contextmanager
+    def track(self) -> Iterator[str]:
+        """Count one AI-core request in flight; yields its inference mode and records its latency."""
+        mode = self.choose_mode()
+        self.mode_counts[mode] += 1
+        self.in_flight += 1
+        t0 = time.perf_counter()
+        try:
+            yield mode
+        finally:
+            self.in_flight -= 1
+            self.record(time.perf_counter() - t0)
+
+    def snapshot(self) -> dict:
+        p95 = self.p95()
+        return {
+            "mode": MODES[self._level],
+            "in_flight": self.in_flight,
+            "p95_seconds": round(p95, 4) if p95 is not None else None,
+            "mode_counts": dict(self.mode_counts),
+        }
+
+
+# Module-level singleton — one controller per worker process.
+_controller: AdaptiveController | None = None
+
+
+def get_controller() -> AdaptiveController:
+    global _controller
+    if _controller is None:
+        _controller = AdaptiveController()
+    return _controller
@@ -0,0 +1,266 @@
+"""Retention service — keeps the raw log tables bounded.
+
+``emotion_logs`` and ``chat_history`` grow by a row per message.  Rows older
+than a per-table window (``EMOTION_LOG_RAW_DAYS`` / ``CHAT_HISTORY_RAW_DAYS``)
+are folded into daily aggregate rows (:mod:`app.models.aggregates`) and
+deleted, so the hot tables — and their indexes — only ever hold recent data.
+
+Work is done in bounded batches (``RETENTION_BATCH_SIZE`` rows): each batch
+deletes its raw rows (``DELETE … RETURNING``) and folds exactly the rows the
+delete removed into the aggregates, in one transaction, so locks are short
+and an interrupted run neither loses nor double-counts rows.  Aggregates
+older than ``RETENTION_AGGREGATE_DAYS`` are deleted last.
+
+Every worker process runs the lifespan, so on PostgreSQL a run first takes
+a transaction-scoped advisory lock (``pg_try_advisory_xact_lock``); a worker
+that finds it held skips that run.  SQLite has a single writer and needs no
+lock.
+
+:func:`retention_loop` runs the job every ``RETENTION_INTERVAL_HOURS`` and is
+started from the application lifespan when ``RETENTION_ENABLED`` is set.
+Retention deletes raw rows irreversibly, so it is off by default.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import delete, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import Settings, get_settings
+from app.models.aggregates import ChatDailyAggregate, EmotionDailyAggregate
+from app.models.chat import ChatHistory
+from app.models.emotion import EmotionLog
+
+logger = logging.getLogger(__name__)
+
+# Rough per-row storage overhead (row header, ids, timestamps, index
+# entries) added to the text size when estimating reclaimed bytes.
+_ROW_OVERHEAD_BYTES = 96
+
+# pg advisory lock key shared by every worker ("wbret" in ASCII)
+_ADVISORY_LOCK_KEY = 0x7762726574
+
+
+@dataclass(frozen=True)
+class _Policy:
+    model: Any
+    aggregate: Any
+    key: str                      # column grouped on besides (user_id, day)
+    columns: tuple[str, ...]      # raw columns the accumulator reads
+    zeros: dict[str, Any]         # initial values of a new aggregate row
+    accumulate: Callable[[Any, Any], int]  # fold a raw row in; returns its estimated bytes
+    raw_days: Callable[[Settings], int]
+
+
+def _utc_day(ts: datetime) -> date:
+    # SQLite hands back naive UTC datetimes, PostgreSQL aware ones
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc)
+    return ts.date()
+
+
+def _add_emotion(agg: EmotionDailyAggregate, row: Any) -> int:
+    agg.log_count += 1
+    agg.high_risk_count += int(bool(row.is_high_risk))
+    agg.confidence_sum += row.confidence or 0.0
+    agg.risk_score_sum += row.risk_score or 0.0
+    agg.risk_score_max = max(agg.risk_score_max, row.risk_score or 0.0)
+    agg.personalization_score_sum += row.personalization_score or 0.0
+    return len(row.input_text.encode("utf-8")) + _ROW_OVERHEAD_BYTES
+
+
+def _add_chat(agg: ChatDailyAggregate, row: Any) -> int:
+    agg.message_count += 1
+    agg.total_chars += len(row.content)
+    return len(row.content.encode("utf-8")) + _ROW_OVERHEAD_BYTES
+
+
+POLICIES: dict[str, _Policy] = {
+    "emotion_logs": _Policy(
+        model=EmotionLog,
+        aggregate=EmotionDailyAggregate,
+        key="primary_emotion",
+        columns=("input_text", "confidence", "is_high_risk", "risk_score", "personalization_score"),
+        zeros={"log_count": 0, "high_risk_count": 0, "confidence_sum": 0.0,
+               "risk_score_sum": 0.0, "risk_score_max": 0.0, "personalization_score_sum": 0.0},
+        accumulate=_add_emotion,
+        raw_days=lambda s: s.EMOTION_LOG_RAW_DAYS,
+    ),
+    "chat_history": _Policy(
+        model=ChatHistory,
+        aggregate=ChatDailyAggregate,
+        key="role",
+        columns=("content",),
+        zeros={"message_count": 0, "total_chars": 0},
+        accumulate=_add_chat,
+        raw_days=lambda s: s.CHAT_HISTORY_RAW_DAYS,
+    ),
+}
+
+
+async def _load_aggregates(
+    db: AsyncSession,
+    policy: _Policy,
+    keys: set[tuple[int, date, str]],
+) -> dict[tuple[int, date, str], Any]:
+    agg = policy.aggregate
+    key_col = getattr(agg, policy.key)
+    result = await db.execute(
+        select(agg).where(
+            agg.user_id.in_({k[0] for k in keys}),
+            agg.day.in_({k[1] for k in keys}),
+            key_col.in_({k[2] for k in keys}),
+        )
+    )
+    existing = {(a.user_id, a.day, getattr(a, policy.key)): a for a in result.scalars()}
+    for key in keys - existing.keys():
+        user_id, day, value = key
+        existing[key] = agg(user_id=user_id, day=day, **{policy.key: value}, **policy.zeros)
+        db.add(existing[key])
+    return existing
+
+
+async def compact_table(
+    db: AsyncSession,
+    table: str,
+    cutoff: datetime,
+    batch_size: int,
+) -> dict[str, int]:
+    """Fold rows of *table* created before *cutoff* into daily aggregates and delete them.
+
+    Rows are taken oldest-first, *batch_size* per committed transaction.
+    Returns ``{"rows_deleted": n, "bytes_estimated": b}``.
+    """
+    policy = POLICIES[table]
+    model = policy.model
+    columns = [model.id, model.user_id, model.created_at, getattr(model, policy.key)]
+    columns += [getattr(model, name) for name in policy.columns]
+
+    rows_deleted = bytes_estimated = 0
+    while True:
+        rows = (
+            await db.execute(
+                select(*columns)
+                .where(model.created_at < cutoff)
+                .order_by(model.created_at, model.id)
+                .limit(batch_size)
+            )
+        ).all()
+        if not rows:
+            break
+        # Fold only rows this transaction actually removed; a row deleted by
+        # a concurrent run is skipped rather than counted twice
+        removed = set(
+            (
+                await db.execute(
+                    delete(model)
+                    .where(model.id.in_([row.id for row in rows]))
+                    .returning(model.id)
+                )
+            ).scalars()
+        )
+        keyed = [
+            ((row.user_id, _utc_day(row.created_at), getattr(row, policy.key)), row)
+            for row in rows
+            if row.id in removed
+        ]
+        if keyed:
+            aggregates = await _load_aggregates(db, policy, {key for key, _ in keyed})
+            for key, row in keyed:
+                bytes_estimated += policy.accumulate(aggregates[key], row)
+        await db.commit()
+        rows_deleted += len(keyed)
+        if len(rows) < batch_size:
+            break
+    if rows_deleted:
+        logger.info("Retention: folded %d %s rows into daily aggregates", rows_deleted, table)
+    return {"rows_deleted": rows_deleted, "bytes_estimated": bytes_estimated}
+
+
+async def prune_aggregates(db: AsyncSession, horizon: date) -> int:
+    """Delete aggregate rows for days before *horizon*; returns rows deleted."""
+    deleted = 0
+    for policy in POLICIES.values():
+        result = await db.execute(delete(policy.aggregate).where(policy.aggregate.day < horizon))
+        deleted += result.rowcount or 0
+    await db.commit()
+    return deleted
+
+
+@asynccontextmanager
+async def _single_runner(session_factory: async_sessionmaker) -> AsyncIterator[bool]:
+    """Yield whether this process may run retention now.
+
+    On PostgreSQL the advisory lock is held by a dedicated session's open
+    transaction and released when it ends, however the run exits.
+    """
+    async with session_factory() as lock_db:
+        if lock_db.bind.dialect.name != "postgresql":
+            yield True
+            return
+        acquired = (
+            await lock_db.execute(
+                text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": _ADVISORY_LOCK_KEY}
+            )
+        ).scalar_one()
+        try:
+            yield bool(acquired)
+        finally:
+            await lock_db.rollback()
+
+
+async def run_retention(
+    session_factory: async_sessionmaker | None = None,
+    *,
+    now: datetime | None = None,
+    settings: Settings | None = None,
+) -> dict[str, Any]:
+    """Apply every table policy once and report what was reclaimed.
+
+    Returns ``{"skipped": True}`` when another worker holds the run lock.
+    """
+    if session_factory is None:
+        from app.database import AsyncSessionLocal  # noqa: PLC0415
+        session_factory = AsyncSessionLocal
+    settings = settings or get_settings()
+    now = now or datetime.now(timezone.utc)
+    started = time.perf_counter()
+
+    report: dict[str, Any] = {"tables": {}}
+    async with _single_runner(session_factory) as acquired:
+        if not acquired:
+            logger.info("Retention run skipped: another worker holds the lock.")
+            return {"skipped": True}
+        async with session_factory() as db:
+            for table, policy in POLICIES.items():
+                cutoff = now - timedelta(days=policy.raw_days(settings))
+                report["tables"][table] = await compact_table(db, table, cutoff, settings.RETENTION_BATCH_SIZE)
+            report["aggregates_pruned"] = await prune_aggregates(
+                db, (now - timedelta(days=settings.RETENTION_AGGREGATE_DAYS)).date()
+            )
+    report["rows_deleted"] = sum(t["rows_deleted"] for t in report["tables"].values())
+    report["bytes_estimated"] = sum(t["bytes_estimated"] for t in report["tables"].values())
+    report["seconds"] = round(time.perf_counter() - started, 3)
+    logger.info("Retention run complete: %s", report)
+    return report
+
+
+async def retention_loop(settings: Settings | None = None) -> None:
+    """Run :func:`run_retention` every ``RETENTION_INTERVAL_HOURS`` until cancelled."""
+    settings = settings or get_settings()
+    await asyncio.sleep(settings.RETENTION_INITIAL_DELAY_SECONDS)
+    while True:
+        try:
+            await run_retention(settings=settings)
+        except Exception:  # noqa: BLE001
+            logger.error("Retention run failed; retrying next interval.", exc_info=True)
+        await asyncio.sleep(settings.RETENTION_INTERVAL_HOURS * 3600)
@@ -0,0 +1,232 @@
+"""Transcription service — non-blocking speech-to-text for the voice router.
+
+Pipeline for one upload:
+
+1. ``BodySizeLimitMiddleware`` answers 413 while the request body streams
+   in once it passes ``VOICE_MAX_UPLOAD_BYTES`` plus multipart framing
+   (:func:`max_request_bytes`), so an oversized upload is never spooled;
+   the router then reads the audio part itself within the exact limit
+   (:func:`read_limited`).
+2. WebM / MP3 / OGG / MP4 audio is converted to WAV in a process pool
+   (``VOICE_CONVERSION_WORKERS``), so pydub/ffmpeg never holds the GIL of
+   the serving worker.  Pool processes are started with ``forkserver``
+   (``spawn`` where unavailable), never forked from the threaded server.
+3. Every locale for the user's language (``en-IN`` + ``ta-IN`` for
+   bilingual) is recognised concurrently; the first non-empty transcript
+   wins and the remaining attempts are cancelled, so bilingual users wait
+   for the faster locale instead of both in sequence.
+
+Recognition backends implement :class:`Recognizer`.  ``google`` wraps
+``VoiceHandler`` (Google Web Speech API); ``offline`` is a deterministic
+stand-in used by tests and local development (``VOICE_STT_RECOGNIZER``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import sys
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Protocol
+
+from fastapi import UploadFile
+
+from app.config import Settings, get_settings
+from app.utils import find_project_root
+
+_root = find_project_root()
+if str(_root) not in sys.path:
+    sys.path.insert(0, str(_root))
+
+logger = logging.getLogger(__name__)
+
+# Formats SpeechRecognition reads directly; everything else is converted.
+_NATIVE_FORMATS = ("wav", "flac", "aiff", "unknown")
+
+# Allowance for multipart boundaries, part headers and form fields on top
+# of the audio itself.
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class Recognizer(Protocol):
+    name: str
+
+    def recognize(self, wav_bytes: bytes, locale: str) -> str:
+        """Blocking recognition of one locale; returns '' when nothing is understood."""
+
+
+class GoogleRecognizer:
+    """Google Web Speech API via the project-root ``VoiceHandler``."""
+
+    name = "google"
+
+    def __init__(self, handler) -> None:
+        self._handler = handler
+
+    def recognize(self, wav_bytes: bytes, locale: str) -> str:
+        return self._handler._recognize_once(wav_bytes, locale)
+
+
+class OfflineRecognizer:
+    """Deterministic stand-in: fixed transcript (and optional delay) per locale."""
+
+    name = "offline"
+
+    def __init__(
+        self,
+        transcripts: dict[str, str] | None = None,
+        delays: dict[str, float] | None = None,
+    ) -> None:
+        self.transcripts = transcripts or {}
+        self.delays = delays or {}
+        self.calls: list[str] = []
+
+    def recognize(self, wav_bytes: bytes, locale: str) -> str:
+        self.calls.append(locale)
+        delay = self.delays.get(locale, 0.0)
+        if delay:
+            time.sleep(delay)
+        return self.transcripts.get(locale, "")
+
+
+class UploadTooLarge(Exception):
+    """Raised by :func:`read_limited` once the byte limit is exceeded."""
+
+
+@dataclass(frozen=True)
+class TranscriptionResult:
+    transcript: str
+    locale: str | None
+
+
+def max_request_bytes() -> int:
+    """Largest /voice/transcribe request body accepted (audio + framing)."""
+    return get_settings().VOICE_MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES
+
+
+def _pool_context():
+    # Forking a process that runs the event loop and executor threads can
+    # copy held locks into the child; a fresh interpreter cannot.
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
+
+
+async def read_limited(upload: UploadFile, max_bytes: int, chunk_size: int = 64 * 1024) -> bytes:
+    """Read *upload* chunk by chunk, raising :class:`UploadTooLarge` past *max_bytes*."""
+    chunks: list[bytes] = []
+    total = 0
+    while chunk := await upload.read(chunk_size):
+        total += len(chunk)
+        if total > max_bytes:
+            raise UploadTooLarge(total)
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+class TranscriptionPipeline:
+    def __init__(
+        self,
+        recognizer: Recognizer | None,
+        *,
+        conversion_workers: int = 2,
+        converter: Callable[[bytes, str], bytes | None] | None = None,
+    ) -> None:
+        from voice_handler import VoiceHandler, convert_to_wav  # noqa: PLC0415
+
+        self.recognizer = recognizer
+        self._converter = converter or convert_to_wav
+        self._conversion_workers = conversion_workers
+        self._pool: ProcessPoolExecutor | None = None
+        self._formats = VoiceHandler()
+
+    async def transcribe(self, audio_bytes: bytes, language_preference: str) -> TranscriptionResult:
+        if self.recognizer is None or not audio_bytes:
+            return TranscriptionResult("", None)
+        fmt = self._formats._detect_format(audio_bytes)
+        if fmt not in _NATIVE_FORMATS:
+            audio_bytes = await self._to_wav(audio_bytes, fmt)
+            if audio_bytes is None:
+                logger.warning("Cannot transcribe %s audio: conversion to WAV failed.", fmt)
+                return TranscriptionResult("", None)
+        locales = self._formats._STT_LOCALES.get(language_preference, ["en-IN"])
+        return await self._recognize_first(audio_bytes, locales)
+
+    async def _to_wav(self, audio_bytes: bytes, fmt: str) -> bytes | None:
+        loop = asyncio.get_running_loop()
+        if self._conversion_workers > 0:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self._conversion_workers, mp_context=_pool_context(),
+                )
+            try:
+                return await loop.run_in_executor(self._pool, self._converter, audio_bytes, fmt)
+            except BrokenProcessPool:
+                logger.warning("Audio conversion pool broke; converting in a thread.", exc_info=True)
+                self._pool = None
+        return await asyncio.to_thread(self._converter, audio_bytes, fmt)
+
+    async def _recognize_first(self, wav_bytes: bytes, locales: list[str]) -> TranscriptionResult:
+        """Recognise all *locales* concurrently; the first non-empty transcript wins."""
+        tasks = {
+            asyncio.create_task(asyncio.to_thread(self.recognizer.recognize, wav_bytes, locale)): locale
+            for locale in locales
+        }
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # Several may finish together: keep the locale preference order
+                for task in sorted(done, key=lambda t: locales.index(tasks[t])):
+                    if task.exception() is not None:
+                        logger.warning("STT %s failed (locale=%s): %s",
+                                       self.recognizer.name, tasks[task], task.exception())
+                        continue
+                    if task.result():
+                        logger.debug("STT succeeded with locale=%s", tasks[task])
+                        return TranscriptionResult(task.result(), tasks[task])
+            return TranscriptionResult("", None)
+        finally:
+            # The recogniser threads run to completion; their results are dropped.
+            for task in pending:
+                task.cancel()
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+# Module-level singleton — one pipeline (and conversion pool) per worker.
+_pipeline: TranscriptionPipeline | None = None
+
+
+def build_pipeline(settings: Settings | None = None) -> TranscriptionPipeline:
+    settings = settings or get_settings()
+    recognizer: Recognizer | None = None
+    if settings.VOICE_STT_RECOGNIZER == "offline":
+        recognizer = OfflineRecognizer()
+    else:
+        from voice_handler import _SR_AVAILABLE, VoiceHandler  # noqa: PLC0415
+        if _SR_AVAILABLE:
+            recognizer = GoogleRecognizer(VoiceHandler())
+    return TranscriptionPipeline(recognizer, conversion_workers=settings.VOICE_CONVERSION_WORKERS)
+
+
+def get_pipeline() -> TranscriptionPipeline:
+    """FastAPI dependency returning the shared pipeline (overridable in tests)."""
+    global _pipeline
+    if _pipeline is None:
+        _pipeline = build_pipeline()
+    return _pipeline
+
+
+def shutdown_pipeline() -> None:
+    global _pipeline
+    if _pipeline is not None:
+        _pipeline.shutdown()
+        _pipeline = None
@@ -0,0 +1,201 @@
+"""Warm-up service — readiness gating for cold workers.
+
+Loading a model is not the whole cold start: the first forward passes
+also pay for tokenizer set-up, allocator growth and lazy initialisation
+inside the AI core.  :func:`run_warmup` is started from the application
+lifespan and
+
+1. builds the ``EmotionAnalyzer`` singleton and loads every configured
+   model (``emotion_service.preload_models``), then
+2. runs rounds of representative inputs (English, Tanglish, Tamil, crisis,
+   long messages) through each available component — the full fusion
+   path, the transformer classifier, the contextual crisis model and
+   sentiment analysis — recording per-component latencies.
+
+The worker is *ready* once the p50 latency of a round stays within
+``WARMUP_STEADY_TOLERANCE`` of the previous round for
+``WARMUP_STABLE_ROUNDS`` consecutive rounds (at least ``WARMUP_MIN_ROUNDS``
+rounds).  ``GET /ready`` answers 503 until then, so load balancers keep
+traffic away from cold workers; ``GET /health`` stays a pure liveness
+probe.
+
+A warm-up that fails, times out (``WARMUP_TIMEOUT_SECONDS``) or does not
+settle within ``WARMUP_MAX_ROUNDS`` still marks the worker ready — requests
+then load lazily or use the keyword fallback — and says so in the report.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import statistics
+import time
+from collections.abc import Callable
+from typing import Any
+
+from app.config import Settings, get_settings
+from app.services import emotion_service
+
+logger = logging.getLogger(__name__)
+
+WARMUP_INPUTS: tuple[str, ...] = (
+    "I feel really low and tired today, nothing seems to go right.",
+    "Had a great day with my friends, I'm so happy!",
+    "I'm anxious about my exams next week and can't sleep.",
+    "My manager keeps yelling at me and I'm furious about it.",
+    "I don't want to live anymore, everything feels hopeless.",
+    "naan romba kashtam ah feel panren, yaarum illa",
+    "இன்று எனக்கு மிகவும் கவலையாக இருக்கிறது",
+    "It was an ordinary day, nothing special.",
+    " ".join(
+        ["Work has been overwhelming lately and I keep replaying every conversation in my head."] * 6
+    ),
+)
+
+
+def is_steady(p50s: list[float], tolerance: float, stable_rounds: int) -> bool:
+    """Whether the last *stable_rounds* round-to-round p50 changes are all within *tolerance*."""
+    if stable_rounds < 1 or len(p50s) < stable_rounds + 1:
+        return False
+    recent = p50s[-(stable_rounds + 1):]
+    return all(
+        abs(cur - prev) <= tolerance * max(prev, 1e-9)
+        for prev, cur in zip(recent, recent[1:])
+    )
+
+
+class WarmupState:
+    """Progress and timings of the warm-up; backs ``GET /ready``."""
+
+    def __init__(self) -> None:
+        self.status = "pending"   # pending | warming | ready
+        self.ready = False
+        self.steady = False
+        self.detail: str | None = None
+        self.preload_seconds: float | None = None
+        self.round_p50_ms: list[float] = []
+        self.components: dict[str, dict[str, Any]] = {}
+        self.started_at: float | None = None
+        self.duration_seconds: float | None = None
+
+    def mark_ready(self, detail: str | None = None) -> None:
+        self.status = "ready"
+        self.ready = True
+        self.detail = detail
+        if self.started_at is not None:
+            self.duration_seconds = round(time.monotonic() - self.started_at, 3)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "status": self.status,
+            "ready": self.ready,
+            "steady": self.steady,
+            "detail": self.detail,
+            "preload_seconds": self.preload_seconds,
+            "rounds": len(self.round_p50_ms),
+            "round_p50_ms": self.round_p50_ms,
+            "components": self.components,
+            "duration_seconds": self.duration_seconds,
+        }
+
+
+# Module-level singleton — one warm-up per worker process.
+_state = WarmupState()
+
+
+def get_state() -> WarmupState:
+    return _state
+
+
+def _targets(analyzer) -> dict[str, Callable[[str], Any]]:
+    """Callables exercising every available model / backend of *analyzer*."""
+    targets: dict[str, Callable[[str], Any]] = {"emotion_analyzer": analyzer.classify_emotion}
+    transformer = getattr(analyzer, "_emotion_transformer", None)
+    if transformer is not None and transformer.available:
+        def _transformer(text: str) -> Any:
+            transformer.invalidate_cache()  # time the forward pass, not the one-message cache
+            return transformer.classify(text)
+        targets["emotion_transformer"] = _transformer
+    crisis = getattr(analyzer, "crisis_adapter", None)
+    if crisis is not None and crisis.available:
+        targets["crisis_adapter"] = crisis.classify
+    if hasattr(analyzer, "analyze_sentiment"):
+        targets["sentiment"] = analyzer.analyze_sentiment
+    return targets
+
+
+def _run_round(targets: dict[str, Callable[[str], Any]], inputs: tuple[str, ...]) -> dict[str, list[float]]:
+    """Time every target on every input; returns ``{target: [ms, ...], '_total': [...]}``."""
+    timings: dict[str, list[float]] = {name: [] for name in targets}
+    totals: list[float] = []
+    for text in inputs:
+        total = 0.0
+        for name, fn in targets.items():
+            t0 = time.perf_counter()
+            fn(text)
+            elapsed = (time.perf_counter() - t0) * 1000
+            timings[name].append(elapsed)
+            total += elapsed
+        totals.append(total)
+    timings["_total"] = totals
+    return timings
+
+
+def _record(state: WarmupState, timings: dict[str, list[float]]) -> None:
+    for name, values in timings.items():
+        if name == "_total":
+            continue
+        entry = state.components.setdefault(name, {"first_ms": round(values[0], 2), "p50_ms": []})
+        entry["p50_ms"].append(round(statistics.median(values), 2))
+    state.round_p50_ms.append(round(statistics.median(timings["_total"]), 2))
+
+
+async def _warm(state: WarmupState, settings: Settings, inputs: tuple[str, ...]) -> None:
+    t0 = time.perf_counter()
+    await asyncio.to_thread(emotion_service.preload_models)
+    state.preload_seconds = round(time.perf_counter() - t0, 3)
+    analyzer = emotion_service._get_analyzer()
+    if analyzer is None:
+        state.mark_ready("EmotionAnalyzer unavailable; serving keyword fallback")
+        return
+
+    targets = await asyncio.to_thread(_targets, analyzer)
+    for _ in range(settings.WARMUP_MAX_ROUNDS):
+        timings = await asyncio.to_thread(_run_round, targets, inputs)
+        _record(state, timings)
+        if len(state.round_p50_ms) >= settings.WARMUP_MIN_ROUNDS and is_steady(
+            state.round_p50_ms, settings.WARMUP_STEADY_TOLERANCE, settings.WARMUP_STABLE_ROUNDS,
+        ):
+            state.steady = True
+            state.mark_ready()
+            return
+    state.mark_ready(f"p50 not steady after {settings.WARMUP_MAX_ROUNDS} rounds")
+
+
+async def run_warmup(settings: Settings | None = None, inputs: tuple[str, ...] = WARMUP_INPUTS) -> WarmupState:
+    """Warm every model up and flip the readiness state; never raises."""
+    settings = settings or get_settings()
+    state = _state
+    if not settings.WARMUP_ENABLED:
+        state.mark_ready("warm-up disabled")
+        return state
+
+    state.status = "warming"
+    state.started_at = time.monotonic()
+    logger.info("Warming up ML models…")
+    try:
+        await asyncio.wait_for(_warm(state, settings, inputs), timeout=settings.WARMUP_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        logger.warning("Warm-up timed out after %.0f s; models load on first request.",
+                       settings.WARMUP_TIMEOUT_SECONDS)
+        state.mark_ready(f"timed out after {settings.WARMUP_TIMEOUT_SECONDS:.0f} s")
+    except Exception:
+        logger.warning("Warm-up failed; models load on first request.", exc_info=True)
+        state.mark_ready("warm-up failed")
+    else:
+        logger.info(
+            "Warm-up finished in %.1f s (%d rounds, p50 %s ms, steady=%s).",
+            state.duration_seconds or 0.0, len(state.round_p50_ms),
+            state.round_p50_ms[-1] if state.round_p50_ms else "-", state.steady,
+        )
+    return state
@@ -0,0 +1,32 @@
+"""Gunicorn configuration for multi-worker serving with shared models.
+
+    cd backend && gunicorn -c gunicorn.conf.py app.main:app
+
+Models are loaded once in the master and shared copy-on-write by the
+``WEB_CONCURRENCY`` Uvicorn workers (see app/prefork.py).  Set
+PREFORK_PRELOAD_MODELS=false to let every worker load its own copy.
+"""
+
+import os
+
+from app.config import get_settings
+from app.prefork import init_worker, preload_shared_models
+
+_settings = get_settings()
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", "2"))
+worker_class = "uvicorn.workers.UvicornWorker"
+# Model load + warm-up can exceed gunicorn's default 30 s worker timeout.
+timeout = 120
+preload_app = True
+
+
+def when_ready(server):
+    # Runs in the master after the app is imported and before workers fork.
+    if _settings.PREFORK_PRELOAD_MODELS:
+        preload_shared_models()
+
+
+def post_fork(server, worker):
+    init_worker(workers, _settings.INFERENCE_THREADS_PER_WORKER)
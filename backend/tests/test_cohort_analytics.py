@@ -0,0 +1,153 @@
+"""Cohort analytics tests.
+
+Covers:
+  - SQL aggregation matches the per-user Python implementation on the same logs
+  - Insufficient-data summary for tiny cohorts
+  - Date-range / cohort filters
+  - X-Research-Key gating on GET /analytics/cohort
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+
+from app.config import get_settings
+from app.models.emotion import EmotionLog
+from app.models.user import User
+from app.services import analytics_service, cohort_analytics_service
+
+_KEY = "research-test-key"
+_BASE = datetime(2024, 3, 1, 9, 0, 0, tzinfo=timezone.utc)
+_EMOTIONS = ["sadness", "joy", "anxiety", "sadness", "joy", "neutral", "fear", "joy"]
+
+
+@pytest.fixture
+def research_key(monkeypatch):
+    monkeypatch.setattr(get_settings(), "RESEARCH_API_KEY", _KEY)
+    return {"X-Research-Key": _KEY}
+
+
+async def _seed(db_session, tag: str, users: int = 3, per_user: int = 8) -> list[int]:
+    ids = []
+    for u in range(users):
+        user = User(
+            email=f"{tag}{u}@example.com",
+            username=f"{tag}{u}",
+            hashed_password="hashed",
+            is_active=True,
+        )
+        db_session.add(user)
+        await db_session.flush()
+        ids.append(user.id)
+        for i in range(per_user):
+            risk = round(0.9 - 0.1 * i + 0.02 * u, 3)
+            db_session.add(EmotionLog(
+                user_id=user.id,
+                input_text=f"{tag}-{u}-{i}",
+                primary_emotion=_EMOTIONS[(i + u) % len(_EMOTIONS)],
+                confidence=0.5 + 0.05 * i,
+                uncertainty=0.1,
+                is_high_risk=risk >= 0.7,
+                risk_score=risk,
+                personalization_score=0.4 + 0.03 * i,
+                created_at=_BASE + timedelta(hours=7 * i + u),
+            ))
+    await db_session.commit()
+    return ids
+
+
+async def _python_reference(db_session, user_ids: list[int]) -> dict:
+    result = await db_session.execute(
+        select(EmotionLog)
+        .where(EmotionLog.user_id.in_(user_ids))
+        .order_by(EmotionLog.created_at.asc(), EmotionLog.id.asc())
+    )
+    logs = list(result.scalars().all())
+    return {
+        "emotion_distribution": analytics_service.compute_emotion_distribution(logs),
+        "average_confidence": analytics_service.compute_average_confidence(logs),
+        "average_personalization_score":
+            analytics_service.compute_average_personalization_score(logs),
+        "risk_trend": analytics_service.compute_risk_trend(logs),
+        "research_summary": analytics_service.generate_research_summary(logs),
+    }
+
+
+def _without_timestamp(summary: dict) -> dict:
+    return {k: v for k, v in summary.items() if k != "generated_at"}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Parity with the Python implementation
+# ─────────────────────────────────────────────────────────────────────────────
+
+async def test_sql_aggregation_matches_python(db_session):
+    ids = await _seed(db_session, "parity")
+
+    sql = await cohort_analytics_service.compute_cohort_analytics(db_session, user_ids=ids)
+    ref = await _python_reference(db_session, ids)
+
+    assert sql["total_sessions"] == 24
+    assert sql["user_count"] == 3
+    assert sql["emotion_distribution"] == ref["emotion_distribution"]
+    assert sql["average_confidence"] == pytest.approx(ref["average_confidence"])
+    assert sql["average_personalization_score"] == pytest.approx(
+        ref["average_personalization_score"]
+    )
+    assert sql["risk_trend"] == ref["risk_trend"]
+    assert _without_timestamp(sql["research_summary"]) == _without_timestamp(
+        ref["research_summary"]
+    )
+
+
+async def test_small_cohort_returns_insufficient_data_summary(db_session):
+    ids = await _seed(db_session, "tiny", users=1, per_user=2)
+
+    sql = await cohort_analytics_service.compute_cohort_analytics(db_session, user_ids=ids)
+
+    assert sql["total_sessions"] == 2
+    assert sql["research_summary"]["improvement_percentage"] is None
+    assert sql["research_summary"]["key_findings"]
+
+
+async def test_date_range_filter(db_session):
+    ids = await _seed(db_session, "range", users=2, per_user=4)
+
+    sql = await cohort_analytics_service.compute_cohort_analytics(
+        db_session,
+        user_ids=ids,
+        start=_BASE + timedelta(hours=7),
+        end=_BASE + timedelta(hours=15),
+    )
+
+    # Logs at hours 7, 8 (i=1) and 14, 15 (i=2) minus the excluded hour 15.
+    assert sql["total_sessions"] == 3
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Endpoint
+# ─────────────────────────────────────────────────────────────────────────────
+
+async def test_cohort_endpoint_requires_research_key(client):
+    resp = await client.get("/api/v1/analytics/cohort")
+    assert resp.status_code == 403
+
+
+async def test_cohort_endpoint_returns_aggregates(client, db_session, research_key):
+    ids = await _seed(db_session, "endpoint", users=2, per_user=8)
+
+    resp = await client.get(
+        "/api/v1/analytics/cohort",
+        params={"user_ids": ids},
+        headers=research_key,
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["total_sessions"] == 16
+    assert data["user_count"] == 2
+    assert sum(item["count"] for item in data["emotion_distribution"]) == 16
+    assert 0.0 <= data["high_risk_rate_pct"] <= 100.0
+    assert data["research_summary"]["total_sessions"] == 16
@@ -0,0 +1,177 @@
+"""Research export endpoint tests.
+
+Covers:
+  - X-Research-Key gating (disabled → 403, wrong key → 401)
+  - CSV export with all_scores expanded into score_<emotion> columns
+  - NDJSON export with date-range and user-cohort filters
+  - Parquet / Arrow export round-trips through pyarrow
+  - Chunked streaming: chunk_size smaller than the table still yields every row
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.config import get_settings
+from app.models.chat import ChatHistory
+from app.models.emotion import EmotionLog
+from app.models.user import User
+from app.services import export_service
+
+_KEY = "research-test-key"
+_BASE = datetime(2023, 6, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def research_key(monkeypatch):
+    monkeypatch.setattr(get_settings(), "RESEARCH_API_KEY", _KEY)
+    return {"X-Research-Key": _KEY}
+
+
+async def _seed_cohort(db_session, tag: str) -> tuple[int, int]:
+    """Create two users with three emotion logs and one chat row each."""
+    ids = []
+    for n in range(2):
+        user = User(
+            email=f"{tag}{n}@example.com",
+            username=f"{tag}{n}",
+            hashed_password="hashed",
+            is_active=True,
+        )
+        db_session.add(user)
+        await db_session.flush()
+        ids.append(user.id)
+        for day in range(3):
+            db_session.add(EmotionLog(
+                user_id=user.id,
+                input_text=f"{tag}-{n}-{day}",
+                primary_emotion="sadness",
+                confidence=0.7,
+                uncertainty=0.2,
+                is_high_risk=False,
+                all_scores={"sadness": 0.7, "joy": 0.1, "surprise": 0.2},
+                risk_score=0.3,
+                personalization_score=0.5,
+                created_at=_BASE + timedelta(days=day),
+            ))
+        db_session.add(ChatHistory(
+            user_id=user.id,
+            session_id=f"{tag}-sess",
+            role="user",
+            content=f"{tag} hello {n}",
+            created_at=_BASE,
+        ))
+    await db_session.commit()
+    return ids[0], ids[1]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Access control
+# ─────────────────────────────────────────────────────────────────────────────
+
+async def test_export_disabled_without_configured_key(client):
+    resp = await client.get("/api/v1/export/emotion_logs")
+    assert resp.status_code == 403
+
+
+async def test_export_rejects_wrong_key(client, research_key):
+    resp = await client.get(
+        "/api/v1/export/emotion_logs", headers={"X-Research-Key": "nope"}
+    )
+    assert resp.status_code == 401
+
+
+async def test_export_unknown_dataset_returns_422(client, research_key):
+    resp = await client.get("/api/v1/export/users", headers=research_key)
+    assert resp.status_code == 422
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Formats
+# ─────────────────────────────────────────────────────────────────────────────
+
+async def test_emotion_log_csv_expands_scores(client, db_session, research_key):
+    uid, _ = await _seed_cohort(db_session, "csvx")
+
+    resp = await client.get(
+        "/api/v1/export/emotion_logs",
+        params={"format": "csv", "user_ids": uid},
+        headers=research_key,
+    )
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(resp.text)))
+    assert len(rows) == 3
+    first = rows[0]
+    assert float(first["score_sadness"]) == pytest.approx(0.7)
+    assert first["score_crisis"] == ""
+    assert json.loads(first["score_other"]) == {"surprise": 0.2}
+    assert "all_scores" not in first
+
+
+async def test_ndjson_filters_by_date_range_and_cohort(client, db_session, research_key):
+    uid_a, uid_b = await _seed_cohort(db_session, "ndj")
+
+    resp = await client.get(
+        "/api/v1/export/emotion_logs",
+        params={
+            "format": "ndjson",
+            "user_ids": [uid_a, uid_b],
+            "start": (_BASE + timedelta(days=1)).isoformat(),
+            "end": (_BASE + timedelta(days=2)).isoformat(),
+        },
+        headers=research_key,
+    )
+    assert resp.status_code == 200
+    records = [json.loads(line) for line in resp.text.splitlines()]
+    assert sorted(r["input_text"] for r in records) == ["ndj-0-1", "ndj-1-1"]
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+async def test_columnar_formats_round_trip(client, db_session, research_key, fmt):
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.ipc  # noqa: F401
+    import pyarrow.parquet  # noqa: F401
+
+    uid, _ = await _seed_cohort(db_session, f"col{fmt}")
+    resp = await client.get(
+        "/api/v1/export/chat_history",
+        params={"format": fmt, "user_ids": uid},
+        headers=research_key,
+    )
+    assert resp.status_code == 200
+    buf = io.BytesIO(resp.content)
+    if fmt == "parquet":
+        table = pa.parquet.read_table(buf)
+    else:
+        table = pa.ipc.open_stream(buf).read_all()
+    assert table.num_rows == 1
+    assert table.column("content").to_pylist() == [f"col{fmt} hello 0"]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Chunking
+# ─────────────────────────────────────────────────────────────────────────────
+
+async def test_iter_record_chunks_respects_chunk_size(db_session):
+    uid_a, uid_b = await _seed_cohort(db_session, "chunk")
+
+    chunks = [
+        chunk
+        async for chunk in export_service.iter_record_chunks(
+            db_session, "emotion_logs", user_ids=[uid_a, uid_b], chunk_size=4
+        )
+    ]
+    assert [len(c) for c in chunks] == [4, 2]
+    timestamps = [r["created_at"] for c in chunks for r in c]
+    assert timestamps == sorted(timestamps)
+
+
+async def test_stream_export_rejects_unknown_format(db_session):
+    with pytest.raises(ValueError):
+        export_service.stream_export(db_session, "emotion_logs", "xlsx")
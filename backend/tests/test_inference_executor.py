@@ -0,0 +1,150 @@
+"""Inference executor / backpressure tests.
+
+Covers:
+  - Calls beyond workers + queue limit are rejected with a Retry-After hint
+  - A timed-out call that has not started is dropped from the queue
+  - A timed-out running call keeps its slot until its thread is free
+  - Queue wait and execution time are recorded separately
+  - A full queue answers 503 with Retry-After over HTTP
+  - /chat runs only the model stages on the executor and returns a partial
+    result when an optional stage misses its deadline
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.config import get_settings
+from app.schemas.chat import ChatRequest
+from app.services import chat_service, inference_executor
+from app.services.inference_executor import ExecutorSaturated, InferenceExecutor
+
+
+def _blocker(release: threading.Event, started: threading.Event | None = None):
+    def fn():
+        if started is not None:
+            started.set()
+        release.wait(5)
+        return "done"
+    return fn
+
+
+async def _until(predicate, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        await asyncio.sleep(0.005)
+
+
+async def test_rejects_beyond_queue_limit():
+    ex = InferenceExecutor(workers=1, queue_limit=1)
+    release = threading.Event()
+    try:
+        first = asyncio.create_task(ex.run(_blocker(release)))
+        second = asyncio.create_task(ex.run(_blocker(release)))
+        await asyncio.sleep(0.02)
+        with pytest.raises(ExecutorSaturated) as exc_info:
+            await ex.run(_blocker(release))
+        assert exc_info.value.retry_after >= 1
+        release.set()
+        assert await first == "done" and await second == "done"
+        assert ex.stats()["outcomes"] == {"rejected": 1, "completed": 2}
+    finally:
+        release.set()
+        ex.shutdown()
+
+
+async def test_timed_out_queued_call_is_dropped():
+    ex = InferenceExecutor(workers=1, queue_limit=2)
+    release, ran = threading.Event(), []
+    try:
+        running = asyncio.create_task(ex.run(_blocker(release)))
+        await asyncio.sleep(0.02)
+        with pytest.raises(asyncio.TimeoutError):
+            await ex.run(lambda: ran.append(1), timeout=0.05)
+        assert ex.stats()["queued"] == 0
+        release.set()
+        await running
+        assert ran == [] and ex.outcomes["dropped"] == 1
+    finally:
+        release.set()
+        ex.shutdown()
+
+
+async def test_timed_out_running_call_keeps_its_slot():
+    ex = InferenceExecutor(workers=1, queue_limit=0)
+    release, stopped = threading.Event(), threading.Event()
+
+    def stage():
+        release.wait(5)
+        stopped.set()
+
+    try:
+        with pytest.raises(asyncio.TimeoutError):
+            await ex.run(stage, timeout=0.05)
+        # The thread is still busy: no new admissions until it is free
+        with pytest.raises(ExecutorSaturated):
+            await ex.run(lambda: None)
+        release.set()
+        await _until(lambda: ex.stats()["running"] == 0 and ex.stats()["queued"] == 0)
+        assert stopped.is_set()
+        assert await ex.run(lambda: "ok") == "ok"
+        assert ex.outcomes["timed_out"] == 1
+    finally:
+        ex.shutdown()
+
+
+async def test_queue_wait_and_execution_recorded_separately():
+    ex = InferenceExecutor(workers=1, queue_limit=1)
+    try:
+        await asyncio.gather(ex.run(time.sleep, 0.05), ex.run(time.sleep, 0.05))
+        stats = ex.stats()
+        assert stats["execution_p95_seconds"] >= 0.04
+        assert stats["queue_wait_p95_seconds"] >= 0.04  # second call waited for the first
+    finally:
+        ex.shutdown()
+
+
+async def test_predict_returns_503_with_retry_after_when_full(client, monkeypatch):
+    ex = InferenceExecutor(workers=1, queue_limit=0)
+    release = threading.Event()
+    monkeypatch.setattr(inference_executor, "_executor", ex)
+    try:
+        busy = asyncio.create_task(ex.run(_blocker(release)))
+        await asyncio.sleep(0.02)
+        resp = await client.post("/api/v1/predict", json={"text": "I feel anxious"})
+        assert resp.status_code == 503
+        assert int(resp.headers["Retry-After"]) >= 1
+        release.set()
+        await busy
+    finally:
+        release.set()
+        ex.shutdown()
+
+
+async def test_chat_awaits_model_stages_with_deadlines(db_session, monkeypatch):
+    from agent_pipeline import WellnessAgentPipeline
+
+    class _SlowCrisisModel:
+        def classify(self, text):
+            time.sleep(0.3)
+            return {"crisis_probability": 0.9}
+
+    pipeline = WellnessAgentPipeline()
+    pipeline.emotion_agent.analyzer.crisis_adapter = _SlowCrisisModel()
+    ex = InferenceExecutor(workers=2, queue_limit=2)
+    settings = get_settings().model_copy(update={"PIPELINE_CRISIS_MODEL_DEADLINE_SECONDS": 0.05})
+    monkeypatch.setattr(inference_executor, "_executor", ex)
+    monkeypatch.setattr(chat_service, "_get_pipeline", lambda user_id: pipeline)
+    monkeypatch.setattr("app.config.get_settings", lambda: settings)
+    try:
+        resp = await chat_service.handle_chat(db_session, user_id=5, req=ChatRequest(message="I feel low"))
+        assert resp.reply and resp.primary_emotion != "crisis"
+        # emotion_model completed, crisis_model missed its deadline; nothing else used a thread
+        assert ex.stats()["outcomes"] == {"completed": 1, "timed_out": 1}
+    finally:
+        ex.shutdown()
@@ -114,7 +114,8 @@ def _make_crisis_pipeline():
     """Return a minimal mock pipeline that signals a crisis-level emotion."""
 
     class _MockPipeline:
-        def process_turn(self, message, context=None):
+        async def process_turn_async(self, message, context=None, inference_mode="full",
+                                     run=None, deadlines=None):
             return {
                 "response": "Please reach out for help.",
                 "emotion": {
@@ -0,0 +1,160 @@
+"""Load shedding tests.
+
+Covers:
+  - The controller steps down on queue depth / p95 latency and recovers
+    one level at a time after the hold period
+  - handle_chat passes the chosen mode to the pipeline and records it
+  - A failing pipeline yields a keyword-only reply instead of a canned one,
+    from the user's own response agent (or a fresh handler) given the message
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import select
+
+from app.config import get_settings
+from app.models.emotion import EmotionLog
+from app.schemas.chat import ChatRequest
+from app.services import chat_service, load_shedding
+from app.services.load_shedding import AdaptiveController
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _controller(clock=None, **overrides) -> AdaptiveController:
+    settings = get_settings().model_copy(update={
+        "LOAD_SHED_NO_NLI_DEPTH": 2, "LOAD_SHED_KEYWORD_DEPTH": 4,
+        "LOAD_SHED_NO_NLI_P95_SECONDS": 1.0, "LOAD_SHED_KEYWORD_P95_SECONDS": 3.0,
+        "LOAD_SHED_WINDOW": 20, "LOAD_SHED_HOLD_SECONDS": 10.0, **overrides,
+    })
+    return AdaptiveController(settings, clock=clock or _Clock())
+
+
+def test_steps_down_on_queue_depth():
+    ctl = _controller()
+    assert ctl.choose_mode() == "full"
+    ctl.in_flight = 2
+    assert ctl.choose_mode() == "no_nli"
+    ctl.in_flight = 5
+    assert ctl.choose_mode() == "keyword_only"
+
+
+def test_steps_down_on_p95_and_recovers_gradually():
+    clock = _Clock()
+    ctl = _controller(clock)
+    for _ in range(20):
+        ctl.record(4.0)
+    assert ctl.choose_mode() == "keyword_only"
+
+    for _ in range(20):
+        ctl.record(0.1)
+    clock.now = 5.0  # inside the hold period
+    assert ctl.choose_mode() == "keyword_only"
+    clock.now = 11.0
+    assert ctl.choose_mode() == "no_nli"
+    clock.now = 15.0
+    assert ctl.choose_mode() == "no_nli"
+    clock.now = 22.0
+    assert ctl.choose_mode() == "full"
+
+
+def test_disabled_always_full():
+    ctl = _controller(LOAD_SHED_ENABLED=False)
+    ctl.in_flight = 100
+    assert ctl.choose_mode() == "full"
+
+
+def test_track_counts_in_flight():
+    ctl = _controller()
+    with ctl.track() as mode:
+        assert mode == "full" and ctl.in_flight == 1
+    snap = ctl.snapshot()
+    assert snap["in_flight"] == 0 and snap["mode_counts"] == {"full": 1}
+    assert snap["p95_seconds"] is not None
+
+
+async def test_handle_chat_uses_controller_mode(db_session, monkeypatch):
+    seen = []
+
+    class _Pipeline:
+        async def process_turn_async(self, message, context=None, inference_mode="full",
+                                     run=None, deadlines=None):
+            seen.append(inference_mode)
+            return {
+                "response": "ok",
+                "emotion": {"primary_emotion": "neutral", "confidence_score": 0.6,
+                            "inference_mode": inference_mode},
+                "patterns": {},
+            }
+
+    ctl = _controller()
+    ctl.in_flight = 2  # becomes 3 once this request is counted
+    monkeypatch.setattr(load_shedding, "_controller", ctl)
+    monkeypatch.setattr(chat_service, "_get_pipeline", lambda user_id: _Pipeline())
+
+    await chat_service.handle_chat(db_session, user_id=7, req=ChatRequest(message="hello there"))
+    assert seen == ["no_nli"]
+    log = (await db_session.execute(select(EmotionLog).where(EmotionLog.user_id == 7))).scalar_one()
+    assert log.inference_mode == "no_nli"
+
+
+async def test_failing_pipeline_gets_keyword_only_reply(db_session, monkeypatch):
+    class _BrokenPipeline:
+        async def process_turn_async(self, message, context=None, inference_mode="full",
+                                     run=None, deadlines=None):
+            raise RuntimeError("model crashed")
+
+    monkeypatch.setattr(load_shedding, "_controller", _controller())
+    monkeypatch.setattr(chat_service, "_get_pipeline", lambda user_id: _BrokenPipeline())
+
+    resp = await chat_service.handle_chat(
+        db_session, user_id=8, req=ChatRequest(message="I feel so sad and lonely, I keep crying"),
+    )
+    assert resp.primary_emotion == "sadness"
+    assert resp.reply and resp.reply != "I'm here for you. Could you tell me more about how you're feeling?"
+    log = (await db_session.execute(select(EmotionLog).where(EmotionLog.user_id == 8))).scalar_one()
+    assert log.inference_mode == "keyword_only"
+
+
+def test_degraded_reply_uses_users_response_agent():
+    calls = []
+
+    class _Agent:
+        def run(self, message, emotion_data, context=None):
+            calls.append((message, emotion_data["primary_emotion"], context))
+            return "agent reply"
+
+    class _Pipeline:
+        response_agent = _Agent()
+
+    context = {"user_id": 9}
+    result = chat_service._degraded_result("I feel so sad and lonely", context, _Pipeline())
+    assert result["response"] == "agent reply"
+    assert calls == [("I feel so sad and lonely", "sadness", context)]
+
+
+def test_degraded_reply_without_pipeline_sees_the_message(monkeypatch):
+    import conversation_handler
+
+    handlers = []
+    real = conversation_handler.ConversationHandler
+
+    class _Recording(real):
+        def __init__(self):
+            super().__init__()
+            handlers.append(self)
+
+    monkeypatch.setattr(conversation_handler, "ConversationHandler", _Recording)
+    for message in ("my boss keeps shouting at me", "I miss my family"):
+        assert chat_service._degraded_result(message, {})["response"]
+    # A fresh handler per request, each holding only that user's message
+    assert len(handlers) == 2
+    assert handlers[0] is not handlers[1]
+    assert [h.conversation_history.recent_messages(5) for h in handlers] == [
+        ["my boss keeps shouting at me"], ["I miss my family"]]
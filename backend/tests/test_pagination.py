@@ -0,0 +1,182 @@
+"""Keyset pagination and NDJSON export tests.
+
+Covers:
+  - Cursor encode/decode round-trip and malformed-cursor rejection
+  - GET /api/v1/chat/history         — X-Next-Cursor paging, ties on created_at
+  - GET /api/v1/chat/history/export  — full NDJSON stream
+  - GET /api/v1/guardian-alert       — next_cursor paging (most recent first)
+  - GET /api/v1/guardian-alert/export
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+
+from app.models.chat import ChatHistory
+from app.models.guardian_alert import GuardianAlert
+from app.models.user import User
+from app.pagination import decode_cursor, encode_cursor
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Helpers
+# ─────────────────────────────────────────────────────────────────────────────
+
+async def _auth_user(client, db_session, name: str) -> tuple[int, dict]:
+    """Sign up + log in *name*; return (user_id, auth headers)."""
+    email = f"{name}@example.com"
+    await client.post(
+        "/api/v1/auth/signup",
+        json={"email": email, "username": name, "password": "Passw0rd!"},
+    )
+    login = await client.post(
+        "/api/v1/auth/login",
+        json={"email": email, "password": "Passw0rd!"},
+    )
+    token = login.json()["access_token"]
+    user = (
+        await db_session.execute(select(User).where(User.email == email))
+    ).scalar_one()
+    return user.id, {"Authorization": f"Bearer {token}"}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Cursor encoding
+# ─────────────────────────────────────────────────────────────────────────────
+
+def test_cursor_round_trip():
+    ts = datetime(2024, 5, 1, 8, 30, 15, 123456, tzinfo=timezone.utc)
+    assert decode_cursor(encode_cursor(ts, 42)) == (ts, 42)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "e30", "WyJ4Il0"])
+def test_malformed_cursor_raises_value_error(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Chat history
+# ─────────────────────────────────────────────────────────────────────────────
+
+async def test_chat_history_pages_cover_all_rows_once(client, db_session):
+    user_id, headers = await _auth_user(client, db_session, "pageuser")
+
+    base = datetime(2024, 2, 1, 9, 0, 0, tzinfo=timezone.utc)
+    # Pairs of rows share a timestamp so page boundaries fall inside ties.
+    for i in range(7):
+        db_session.add(ChatHistory(
+            user_id=user_id,
+            session_id="paged",
+            role="user",
+            content=f"msg-{i}",
+            created_at=base + timedelta(seconds=i // 2),
+        ))
+    await db_session.commit()
+
+    seen: list[str] = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {"session_id": "paged", "limit": 3}
+        if cursor:
+            params["cursor"] = cursor
+        resp = await client.get("/api/v1/chat/history", params=params, headers=headers)
+        assert resp.status_code == 200
+        seen.extend(m["content"] for m in resp.json())
+        pages += 1
+        cursor = resp.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert pages == 3
+    assert seen == [f"msg-{i}" for i in range(7)]
+
+
+async def test_chat_history_invalid_cursor_returns_400(client, db_session):
+    _, headers = await _auth_user(client, db_session, "badcursor")
+    resp = await client.get(
+        "/api/v1/chat/history", params={"cursor": "garbage"}, headers=headers
+    )
+    assert resp.status_code == 400
+
+
+async def test_chat_history_export_streams_ndjson(client, db_session):
+    user_id, headers = await _auth_user(client, db_session, "exportuser")
+
+    base = datetime(2024, 3, 1, 9, 0, 0, tzinfo=timezone.utc)
+    for i in range(5):
+        db_session.add(ChatHistory(
+            user_id=user_id,
+            session_id="export",
+            role="assistant" if i % 2 else "user",
+            content=f"line-{i}",
+            created_at=base + timedelta(minutes=i),
+        ))
+    await db_session.commit()
+
+    resp = await client.get(
+        "/api/v1/chat/history/export", params={"session_id": "export"}, headers=headers
+    )
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in resp.text.splitlines()]
+    assert [r["content"] for r in records] == [f"line-{i}" for i in range(5)]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Guardian alerts
+# ─────────────────────────────────────────────────────────────────────────────
+
+async def _seed_alerts(db_session, user_id: int, n: int) -> None:
+    base = datetime(2024, 4, 1, 9, 0, 0, tzinfo=timezone.utc)
+    for i in range(n):
+        db_session.add(GuardianAlert(
+            user_id=user_id,
+            risk_level="high",
+            risk_reason=f"alert-{i}",
+            channel="email",
+            delivery_status="test",
+            is_test=True,
+            timestamp=base + timedelta(minutes=i),
+        ))
+    await db_session.commit()
+
+
+async def test_guardian_alerts_paginate_most_recent_first(client, db_session):
+    user_id, headers = await _auth_user(client, db_session, "alertpager")
+    await _seed_alerts(db_session, user_id, 5)
+
+    first = await client.get("/api/v1/guardian-alert", params={"limit": 2}, headers=headers)
+    assert first.status_code == 200
+    body = first.json()
+    assert [a["risk_reason"] for a in body["alerts"]] == ["alert-4", "alert-3"]
+    assert body["total"] == 2
+    assert body["next_cursor"]
+
+    reasons = [a["risk_reason"] for a in body["alerts"]]
+    cursor = body["next_cursor"]
+    while cursor:
+        resp = await client.get(
+            "/api/v1/guardian-alert", params={"limit": 2, "cursor": cursor}, headers=headers
+        )
+        body = resp.json()
+        reasons.extend(a["risk_reason"] for a in body["alerts"])
+        cursor = body["next_cursor"]
+
+    assert reasons == [f"alert-{i}" for i in reversed(range(5))]
+
+
+async def test_guardian_alert_export_streams_ndjson(client, db_session):
+    user_id, headers = await _auth_user(client, db_session, "alertexport")
+    await _seed_alerts(db_session, user_id, 3)
+
+    resp = await client.get("/api/v1/guardian-alert/export", headers=headers)
+    assert resp.status_code == 200
+    records = [json.loads(line) for line in resp.text.splitlines()]
+    assert [r["risk_reason"] for r in records] == ["alert-2", "alert-1", "alert-0"]
+    assert all(r["user_id"] == user_id for r in records)
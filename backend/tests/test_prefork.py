@@ -0,0 +1,46 @@
+"""Pre-fork model sharing tests.
+
+Covers:
+  - Inference threads split across workers
+  - Master preload loads every model through the registry once
+"""
+
+from __future__ import annotations
+
+import gc
+import os
+
+import model_registry
+from app import prefork
+
+
+def test_worker_threads():
+    assert prefork.worker_threads(4, cpu_count=8) == 2
+    assert prefork.worker_threads(16, cpu_count=8) == 1
+    assert prefork.worker_threads(4, configured=3, cpu_count=8) == 3
+
+
+def test_preload_shared_models_loads_each_model_once(monkeypatch):
+    loaded = []
+
+    def loader(task, model):
+        loaded.append(model)
+        return lambda *args, **kwargs: None
+
+    monkeypatch.setattr(model_registry, "registry", model_registry.ModelRegistry())
+    monkeypatch.setitem(model_registry._BACKEND_LOADERS, "transformers", loader)
+    try:
+        status = prefork.preload_shared_models()
+    finally:
+        gc.unfreeze()
+    assert status["ml_adapter"] and status["crisis_adapter"]
+    assert sorted(loaded) == [
+        "facebook/bart-large-mnli", "j-hartmann/emotion-english-distilroberta-base",
+    ]
+
+
+def test_init_worker_sets_thread_env(monkeypatch):
+    monkeypatch.setenv("OMP_NUM_THREADS", "64")
+    monkeypatch.setenv("MKL_NUM_THREADS", "64")
+    assert prefork.init_worker(workers=2, configured=1) == 1
+    assert os.environ["OMP_NUM_THREADS"] == "1"
@@ -0,0 +1,151 @@
+"""Retention service tests.
+
+Covers:
+  - Old emotion_logs / chat_history rows folded into daily aggregates and deleted
+  - Recent rows untouched; small batches and repeated runs merge additively
+  - Aggregates pruned past RETENTION_AGGREGATE_DAYS
+  - A run is skipped while another worker holds the lock; retention is opt-in
+"""
+
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.config import get_settings
+from app.models.aggregates import ChatDailyAggregate, EmotionDailyAggregate
+from app.models.chat import ChatHistory
+from app.models.emotion import EmotionLog
+from app.models.user import User
+from app.services import retention_service
+
+# Far enough in the past that rows seeded by other test modules are never
+# older than the cutoffs used here.
+_NOW = datetime(2019, 6, 1, 12, 0, 0, tzinfo=timezone.utc)
+_OLD = datetime(2018, 1, 10, 8, 0, 0, tzinfo=timezone.utc)
+
+
+async def _user(db_session, tag: str) -> int:
+    user = User(email=f"{tag}@example.com", username=tag, hashed_password="hashed", is_active=True)
+    db_session.add(user)
+    await db_session.flush()
+    return user.id
+
+
+def _emotion(user_id: int, when: datetime, emotion: str, risk: float) -> EmotionLog:
+    return EmotionLog(
+        user_id=user_id, input_text="private text", primary_emotion=emotion,
+        confidence=0.5, uncertainty=0.1, is_high_risk=risk >= 0.7,
+        risk_score=risk, personalization_score=0.2, created_at=when,
+    )
+
+
+def _chat(user_id: int, when: datetime, role: str, content: str) -> ChatHistory:
+    return ChatHistory(user_id=user_id, session_id="s", role=role, content=content, created_at=when)
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    s = get_settings()
+    monkeypatch.setattr(s, "RETENTION_BATCH_SIZE", 3)
+    return s
+
+
+async def test_old_rows_folded_into_daily_aggregates(db_session, async_engine, settings):
+    uid = await _user(db_session, "retention_a")
+    recent = _NOW - timedelta(days=1)
+    for i, (emotion, risk) in enumerate([("sadness", 0.9), ("sadness", 0.3), ("joy", 0.1), ("sadness", 0.5)]):
+        db_session.add(_emotion(uid, _OLD + timedelta(minutes=i), emotion, risk))
+    db_session.add(_emotion(uid, recent, "joy", 0.1))
+    for i in range(5):
+        db_session.add(_chat(uid, _OLD + timedelta(minutes=i), "user" if i % 2 == 0 else "assistant", "x" * 10))
+    db_session.add(_chat(uid, recent, "user", "kept"))
+    await db_session.commit()
+
+    factory = async_sessionmaker(async_engine, expire_on_commit=False)
+    report = await retention_service.run_retention(factory, now=_NOW, settings=settings)
+    assert report["tables"]["emotion_logs"]["rows_deleted"] == 4
+    assert report["tables"]["chat_history"]["rows_deleted"] == 5
+    assert report["bytes_estimated"] > 0
+
+    async with factory() as db:
+        remaining = (await db.execute(select(EmotionLog.primary_emotion).where(EmotionLog.user_id == uid))).scalars().all()
+        assert remaining == ["joy"]
+        chats = (await db.execute(select(ChatHistory.content).where(ChatHistory.user_id == uid))).scalars().all()
+        assert chats == ["kept"]
+
+        sad = (await db.execute(select(EmotionDailyAggregate).where(
+            EmotionDailyAggregate.user_id == uid,
+            EmotionDailyAggregate.primary_emotion == "sadness",
+        ))).scalar_one()
+        assert sad.day == date(2018, 1, 10)
+        assert sad.log_count == 3
+        assert sad.high_risk_count == 1
+        assert sad.risk_score_sum == pytest.approx(1.7)
+        assert sad.risk_score_max == pytest.approx(0.9)
+
+        by_role = dict((await db.execute(
+            select(ChatDailyAggregate.role, ChatDailyAggregate.message_count)
+            .where(ChatDailyAggregate.user_id == uid)
+        )).all())
+        assert by_role == {"user": 3, "assistant": 2}
+
+    # A later run merges into the existing aggregate row
+    async with factory() as db:
+        db.add(_emotion(uid, _OLD + timedelta(hours=5), "sadness", 0.2))
+        await db.commit()
+    again = await retention_service.run_retention(factory, now=_NOW, settings=settings)
+    assert again["tables"]["emotion_logs"]["rows_deleted"] == 1
+    async with factory() as db:
+        count = (await db.execute(select(func.count()).select_from(EmotionDailyAggregate).where(
+            EmotionDailyAggregate.user_id == uid,
+            EmotionDailyAggregate.primary_emotion == "sadness",
+        ))).scalar_one()
+        log_count = (await db.execute(select(EmotionDailyAggregate.log_count).where(
+            EmotionDailyAggregate.user_id == uid,
+            EmotionDailyAggregate.primary_emotion == "sadness",
+        ))).scalar_one()
+        assert (count, log_count) == (1, 4)
+
+
+async def test_aggregates_pruned_past_horizon(db_session, async_engine, settings):
+    uid = await _user(db_session, "retention_b")
+    db_session.add(ChatDailyAggregate(user_id=uid, day=date(2016, 1, 1), role="user",
+                                      message_count=1, total_chars=3))
+    db_session.add(ChatDailyAggregate(user_id=uid, day=date(2019, 1, 1), role="user",
+                                      message_count=1, total_chars=3))
+    await db_session.commit()
+
+    factory = async_sessionmaker(async_engine, expire_on_commit=False)
+    report = await retention_service.run_retention(factory, now=_NOW, settings=settings)
+    assert report["aggregates_pruned"] >= 1
+    async with factory() as db:
+        days = (await db.execute(select(ChatDailyAggregate.day).where(ChatDailyAggregate.user_id == uid))).scalars().all()
+        assert days == [date(2019, 1, 1)]
+
+
+async def test_run_skipped_while_another_worker_holds_lock(db_session, async_engine, settings, monkeypatch):
+    uid = await _user(db_session, "retention_c")
+    db_session.add(_chat(uid, _OLD, "user", "old"))
+    await db_session.commit()
+
+    @asynccontextmanager
+    async def _held(_factory):
+        yield False
+
+    monkeypatch.setattr(retention_service, "_single_runner", _held)
+    factory = async_sessionmaker(async_engine, expire_on_commit=False)
+    assert await retention_service.run_retention(factory, now=_NOW, settings=settings) == {"skipped": True}
+    async with factory() as db:
+        chats = (await db.execute(select(ChatHistory.content).where(ChatHistory.user_id == uid))).scalars().all()
+        assert chats == ["old"]
+
+
+def test_retention_is_opt_in():
+    from app.config import Settings
+
+    assert Settings.model_fields["RETENTION_ENABLED"].default is False
@@ -0,0 +1,132 @@
+"""Voice transcription pipeline tests.
+
+Covers:
+  - Bilingual locales recognised concurrently; first success wins
+  - Non-native formats converted in the process pool
+  - POST /api/v1/voice/transcribe with the offline recognizer
+  - Uploads over VOICE_MAX_UPLOAD_BYTES rejected with 413
+  - Oversized streamed bodies rejected by the middleware before parsing
+"""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from app.config import get_settings
+from app.services import transcription_service
+from app.services.transcription_service import OfflineRecognizer, TranscriptionPipeline
+
+pytestmark = pytest.mark.asyncio
+
+_WAV = b"RIFF" + b"\x00" * 60
+_WEBM = b"\x1a\x45\xdf\xa3" + b"\x00" * 60
+
+
+def _fake_convert(audio_bytes: bytes, src_format: str) -> bytes:
+    # Module-level so it can be sent to the conversion process
+    return _WAV
+
+
+async def test_bilingual_first_success_wins():
+    recognizer = OfflineRecognizer(
+        transcripts={"en-IN": "", "ta-IN": "வணக்கம்"},
+        delays={"en-IN": 0.05, "ta-IN": 0.05},
+    )
+    pipeline = TranscriptionPipeline(recognizer, conversion_workers=0)
+    result = await pipeline.transcribe(_WAV, "bilingual")
+    assert (result.transcript, result.locale) == ("வணக்கம்", "ta-IN")
+    assert sorted(recognizer.calls) == ["en-IN", "ta-IN"]
+
+    # A fast success does not wait for the slower locale
+    recognizer = OfflineRecognizer(
+        transcripts={"en-IN": "naan okay", "ta-IN": "slow"},
+        delays={"en-IN": 0.01, "ta-IN": 1.0},
+    )
+    pipeline = TranscriptionPipeline(recognizer, conversion_workers=0)
+    t0 = time.perf_counter()
+    result = await pipeline.transcribe(_WAV, "bilingual")
+    assert (result.transcript, result.locale) == ("naan okay", "en-IN")
+    assert time.perf_counter() - t0 < 0.5
+
+
+async def test_non_native_format_converted_in_process_pool():
+    pipeline = TranscriptionPipeline(
+        OfflineRecognizer(transcripts={"en-IN": "hello"}),
+        conversion_workers=1,
+        converter=_fake_convert,
+    )
+    try:
+        result = await pipeline.transcribe(_WEBM, "english")
+    finally:
+        pipeline.shutdown()
+    assert result.transcript == "hello"
+    assert pipeline._pool is None
+
+
+async def _auth_headers(client, tag: str) -> dict[str, str]:
+    await client.post(
+        "/api/v1/auth/signup",
+        json={"email": f"{tag}@example.com", "username": tag, "password": "Passw0rd!"},
+    )
+    resp = await client.post(
+        "/api/v1/auth/login", json={"email": f"{tag}@example.com", "password": "Passw0rd!"},
+    )
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+async def test_transcribe_endpoint_and_size_limit(client, monkeypatch):
+    headers = await _auth_headers(client, "voiceuser")
+    pipeline = TranscriptionPipeline(
+        OfflineRecognizer(transcripts={"ta-IN": "சரி"}), conversion_workers=0,
+    )
+    monkeypatch.setattr(transcription_service, "_pipeline", pipeline)
+
+    resp = await client.post(
+        "/api/v1/voice/transcribe",
+        files={"audio": ("clip.wav", _WAV, "audio/wav")},
+        data={"language_preference": "tamil"},
+        headers=headers,
+    )
+    assert resp.status_code == 200
+    assert resp.json() == {"transcript": "சரி", "language_used": "tamil"}
+
+    monkeypatch.setattr(get_settings(), "VOICE_MAX_UPLOAD_BYTES", 32)
+    resp = await client.post(
+        "/api/v1/voice/transcribe",
+        files={"audio": ("clip.wav", _WAV, "audio/wav")},
+        headers=headers,
+    )
+    assert resp.status_code == 413
+
+
+async def test_streamed_body_over_limit_rejected_while_reading(client, monkeypatch):
+    headers = await _auth_headers(client, "voicestream")
+    monkeypatch.setattr(get_settings(), "VOICE_MAX_UPLOAD_BYTES", 32)
+    limit = transcription_service.max_request_bytes()
+    sent = []
+
+    async def body():
+        # No Content-Length: the limit has to be enforced mid-stream
+        yield (b'--b\r\nContent-Disposition: form-data; name="audio"; filename="clip.wav"\r\n'
+               b"Content-Type: audio/wav\r\n\r\n")
+        for _ in range(8):
+            sent.append(limit // 4)
+            yield b"x" * (limit // 4)
+
+    resp = await client.post(
+        "/api/v1/voice/transcribe",
+        content=body(),
+        headers={**headers, "Content-Type": "multipart/form-data; boundary=b"},
+    )
+    assert resp.status_code == 413
+    assert sum(sent) <= limit + limit // 4 * 2
+
+    # A declared Content-Length over the limit is refused before any read
+    resp = await client.post(
+        "/api/v1/voice/transcribe",
+        content=b"x" * (limit + 1),
+        headers={**headers, "Content-Type": "multipart/form-data; boundary=b"},
+    )
+    assert resp.status_code == 413
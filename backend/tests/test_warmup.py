@@ -0,0 +1,76 @@
+"""Model warm-up and readiness gating tests.
+
+Covers:
+  - Steady-state detection on round p50 latencies
+  - Warm-up runs rounds until the p50 settles, then flips ready
+  - GET /ready answers 503 while warming and 200 once ready
+"""
+
+from __future__ import annotations
+
+import time
+
+from app.config import get_settings
+from app.services import emotion_service, warmup_service
+from app.services.warmup_service import WarmupState, is_steady, run_warmup
+
+
+class _ColdAnalyzer:
+    """Stand-in analyzer whose first calls are slow, like a cold model."""
+
+    def __init__(self, cold_calls: int) -> None:
+        self.calls = 0
+        self.cold_calls = cold_calls
+
+    def classify_emotion(self, text: str) -> dict:
+        self.calls += 1
+        time.sleep(0.02 if self.calls <= self.cold_calls else 0.001)
+        return {"emotion": "neutral"}
+
+    def warmup(self) -> dict:
+        return {}
+
+
+def test_is_steady():
+    assert not is_steady([50.0, 10.0], tolerance=0.15, stable_rounds=1)
+    assert not is_steady([50.0, 10.0, 2.0], tolerance=0.15, stable_rounds=2)
+    assert is_steady([50.0, 10.0, 10.5, 10.2], tolerance=0.15, stable_rounds=2)
+    assert not is_steady([10.0], tolerance=0.15, stable_rounds=1)
+
+
+async def test_warmup_waits_for_steady_p50(monkeypatch):
+    analyzer = _ColdAnalyzer(cold_calls=6)
+    monkeypatch.setattr(emotion_service, "_analyzer", analyzer)
+    monkeypatch.setattr(warmup_service, "_state", WarmupState())
+    settings = get_settings().model_copy(update={
+        "WARMUP_MIN_ROUNDS": 2, "WARMUP_MAX_ROUNDS": 10,
+        "WARMUP_STEADY_TOLERANCE": 0.5, "WARMUP_STABLE_ROUNDS": 2,
+    })
+
+    state = await run_warmup(settings, inputs=("a", "b", "c"))
+    report = state.to_dict()
+    assert report["ready"] and report["steady"] and report["status"] == "ready"
+    # Two cold rounds, then three warm ones (two stable round-to-round steps)
+    assert report["rounds"] == 5
+    assert report["round_p50_ms"][0] > 5 * report["round_p50_ms"][-1]
+    assert report["components"]["emotion_analyzer"]["first_ms"] >= 15
+
+
+async def test_warmup_disabled_is_ready_immediately(monkeypatch):
+    monkeypatch.setattr(warmup_service, "_state", WarmupState())
+    settings = get_settings().model_copy(update={"WARMUP_ENABLED": False})
+    state = await run_warmup(settings)
+    assert state.ready and state.round_p50_ms == []
+
+
+async def test_ready_endpoint(client, monkeypatch):
+    monkeypatch.setattr(warmup_service, "_state", WarmupState())
+    resp = await client.get("/ready")
+    assert resp.status_code == 503
+    assert resp.json()["status"] == "pending"
+    # Liveness is independent of warm-up
+    assert (await client.get("/health")).status_code == 200
+
+    warmup_service.get_state().mark_ready()
+    resp = await client.get("/ready")
+    assert resp.status_code == 200 and resp.json()["ready"] is True
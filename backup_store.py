@@ -0,0 +1,447 @@
+"""
+Content-addressed, compressed, incremental backups
+
+A backup of one user is a *snapshot*: the profile's bytes are split into
+content-defined chunks, each chunk is stored once under its SHA-256 digest,
+and a small JSON manifest lists the chunk digests in order plus their Merkle
+root.  Layout under the backup directory::
+
+    chunks/ab/abcdef…            one file per distinct chunk
+    manifests/<user>/<id>.json   one manifest per snapshot
+    verified.json                Merkle roots of snapshots already verified
+
+Chunk boundaries depend on the content (gear rolling hash), not on offsets,
+so inserting or appending data only changes the chunks around the edit and a
+new snapshot stores roughly the size of the change.  Chunks are compressed
+with zstd when ``zstandard`` is installed, otherwise zlib (gzip's deflate);
+chunks that do not shrink (e.g. encrypted containers) are stored raw.
+
+Verification recomputes each manifest's Merkle root and re-hashes chunk
+files.  Snapshots whose root is already in ``verified.json`` are skipped,
+and chunks shared with a verified snapshot are not read again, so checking
+a new incremental snapshot costs only its changed chunks.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import zstandard as _zstd
+    _ZSTD_AVAILABLE = True
+except ImportError:
+    _zstd = None
+    _ZSTD_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+# Content-defined chunking parameters (bytes)
+CHUNK_MIN_SIZE = 4 * 1024
+CHUNK_AVG_SIZE = 16 * 1024
+CHUNK_MAX_SIZE = 64 * 1024
+
+COMPRESSION_CODECS = ('auto', 'zstd', 'zlib', 'none')
+
+# One-byte codec tag at the start of every chunk file
+_TAG_RAW = b'0'
+_TAG_ZLIB = b'z'
+_TAG_ZSTD = b's'
+
+_SNAPSHOT_ID = re.compile(r'^\d{8}T\d{12}(-\d+)?$')
+
+
+def _gear_table():
+    # Deterministic pseudo-random 64-bit value per byte: boundaries must be
+    # identical across runs and machines for chunks to deduplicate.
+    return tuple(int.from_bytes(hashlib.sha256(bytes((i,))).digest()[:8], 'big')
+                 for i in range(256))
+
+
+_GEAR = _gear_table()
+_HASH_MASK = (1 << 64) - 1
+
+
+def chunk_boundaries(data, min_size=CHUNK_MIN_SIZE, avg_size=CHUNK_AVG_SIZE,
+                     max_size=CHUNK_MAX_SIZE):
+    """Return the end offsets of the content-defined chunks of *data*
+
+    A boundary is placed where the top ``log2(avg_size)`` bits of a gear
+    rolling hash are zero, never before ``min_size`` and at most
+    ``max_size`` bytes after the previous boundary.
+    """
+    bits = max(avg_size.bit_length() - 1, 1)
+    mask = ((1 << bits) - 1) << (64 - bits)
+    gear = _GEAR
+    length = len(data)
+    ends = []
+    start = 0
+    while start < length:
+        end = min(start + max_size, length)
+        cut = end
+        h = 0
+        # Bytes before min_size cannot end a chunk, so they are not hashed
+        for offset, byte in enumerate(data[start + min_size:end], start + min_size):
+            h = ((h << 1) + gear[byte]) & _HASH_MASK
+            if not h & mask:
+                cut = offset + 1
+                break
+        ends.append(cut)
+        start = cut
+    return ends
+
+
+def merkle_root(digests):
+    """Merkle root (hex) over hex chunk digests, in order
+
+    Leaves and interior nodes are domain-separated; an odd node is promoted
+    unchanged.  The empty list has the root of zero bytes.
+    """
+    level = [hashlib.sha256(b'\x00' + bytes.fromhex(d)).digest() for d in digests]
+    if not level:
+        return hashlib.sha256(b'').hexdigest()
+    while len(level) > 1:
+        paired = [hashlib.sha256(b'\x01' + level[i] + level[i + 1]).digest()
+                  for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            paired.append(level[-1])
+        level = paired
+    return level[0].hex()
+
+
+class BackupStore:
+    """Snapshots of opaque per-user payloads in a chunk store
+
+    ``compression`` is one of ``COMPRESSION_CODECS``; ``'auto'`` picks zstd
+    when available, otherwise zlib.
+    """
+
+    def __init__(self, backup_dir, compression='auto', compression_level=None):
+        if compression not in COMPRESSION_CODECS:
+            raise ValueError(f"compression must be one of {COMPRESSION_CODECS}, got {compression!r}")
+        if compression == 'zstd' and not _ZSTD_AVAILABLE:
+            raise ValueError("zstd compression requires the 'zstandard' package")
+        if compression == 'auto':
+            compression = 'zstd' if _ZSTD_AVAILABLE else 'zlib'
+        self.compression = compression
+        self.compression_level = compression_level
+        self.backup_dir = Path(backup_dir)
+        self.chunk_dir = self.backup_dir / 'chunks'
+        self.manifest_dir = self.backup_dir / 'manifests'
+        self.chunk_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest_dir.mkdir(parents=True, exist_ok=True)
+        os.chmod(self.backup_dir, 0o700)
+
+    # ------------------------------------------------------------------
+    # Files
+    # ------------------------------------------------------------------
+
+    def _write_atomic(self, path, data):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(tmp_name, 0o600)
+            os.replace(tmp_name, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+
+    def _chunk_path(self, digest):
+        return self.chunk_dir / digest[:2] / digest
+
+    def manifest_path(self, user_id, snapshot_id):
+        """Path of a snapshot's manifest file"""
+        if not _SNAPSHOT_ID.match(snapshot_id):
+            raise ValueError(f"Invalid snapshot id {snapshot_id!r}")
+        return self.manifest_dir / user_id / f"{snapshot_id}.json"
+
+    # ------------------------------------------------------------------
+    # Chunks
+    # ------------------------------------------------------------------
+
+    def _compress(self, chunk):
+        if self.compression == 'zstd':
+            level = self.compression_level if self.compression_level is not None else 3
+            packed, tag = _zstd.ZstdCompressor(level=level).compress(chunk), _TAG_ZSTD
+        elif self.compression == 'zlib':
+            level = self.compression_level if self.compression_level is not None else 6
+            packed, tag = zlib.compress(chunk, level), _TAG_ZLIB
+        else:
+            return _TAG_RAW + chunk
+        if len(packed) >= len(chunk):
+            return _TAG_RAW + chunk
+        return tag + packed
+
+    @staticmethod
+    def _decompress(blob):
+        tag, payload = blob[:1], blob[1:]
+        if tag == _TAG_RAW:
+            return payload
+        if tag == _TAG_ZLIB:
+            return zlib.decompress(payload)
+        if tag == _TAG_ZSTD:
+            if not _ZSTD_AVAILABLE:
+                raise ValueError("Chunk is zstd-compressed but 'zstandard' is not installed")
+            return _zstd.ZstdDecompressor().decompress(payload)
+        raise ValueError(f"Unknown chunk codec {tag!r}")
+
+    def _read_chunk(self, digest):
+        """Return the chunk's bytes, raising ``ValueError`` if it is damaged"""
+        try:
+            chunk = self._decompress(self._chunk_path(digest).read_bytes())
+        except Exception as e:
+            raise ValueError(f"Chunk {digest} unreadable: {e}")
+        if hashlib.sha256(chunk).hexdigest() != digest:
+            raise ValueError(f"Chunk {digest} is corrupted")
+        return chunk
+
+    # ------------------------------------------------------------------
+    # Snapshots
+    # ------------------------------------------------------------------
+
+    def snapshot(self, user_id, data, suffix=''):
+        """Back up *data* (bytes) for *user_id*; returns the manifest
+
+        Only chunks not already in the store are written.  If *data* is
+        identical to the latest snapshot, that snapshot is returned and
+        nothing is written.  *suffix* records the payload format (e.g. the
+        profile file's suffix) for :meth:`restore`.
+        """
+        digests = []
+        written = 0
+        start = 0
+        for end in chunk_boundaries(data):
+            chunk = data[start:end]
+            start = end
+            digest = hashlib.sha256(chunk).hexdigest()
+            digests.append(digest)
+            path = self._chunk_path(digest)
+            if not path.exists():
+                self._write_atomic(path, self._compress(chunk))
+                written += len(chunk)
+        root = merkle_root(digests)
+
+        latest = self.latest(user_id)
+        if latest is not None and latest['merkle_root'] == root and latest['suffix'] == suffix:
+            return latest
+
+        now = datetime.now()
+        snapshot_id = now.strftime('%Y%m%dT%H%M%S%f')
+        n = 1
+        while self.manifest_path(user_id, snapshot_id).exists():
+            snapshot_id = f"{now.strftime('%Y%m%dT%H%M%S%f')}-{n}"
+            n += 1
+        manifest = {
+            'version': MANIFEST_VERSION,
+            'user_id': user_id,
+            'snapshot_id': snapshot_id,
+            'created_at': now.isoformat(),
+            'suffix': suffix,
+            'size': len(data),
+            'new_bytes': written,
+            'chunks': digests,
+            'merkle_root': root,
+        }
+        self._write_atomic(self.manifest_path(user_id, snapshot_id),
+                           json.dumps(manifest, indent=2).encode('utf-8'))
+        logger.info("Backed up %s as snapshot %s (%d chunks, %d new bytes)",
+                    user_id, snapshot_id, len(digests), written)
+        return manifest
+
+    def list_snapshots(self, user_id):
+        """Snapshot ids of *user_id*, oldest first"""
+        user_dir = self.manifest_dir / user_id
+        if not user_dir.is_dir():
+            return []
+        return sorted(p.stem for p in user_dir.glob('*.json') if _SNAPSHOT_ID.match(p.stem))
+
+    def list_users(self):
+        return sorted(p.name for p in self.manifest_dir.iterdir()
+                      if p.is_dir() and any(p.glob('*.json')))
+
+    def load_manifest(self, user_id, snapshot_id):
+        path = self.manifest_path(user_id, snapshot_id)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise KeyError(f"No snapshot {snapshot_id!r} for {user_id!r}")
+
+    def latest(self, user_id):
+        """Manifest of the newest snapshot, or ``None``"""
+        snapshots = self.list_snapshots(user_id)
+        return self.load_manifest(user_id, snapshots[-1]) if snapshots else None
+
+    def read(self, user_id, snapshot_id=None):
+        """Reassemble a snapshot (default: the latest); returns ``(data, manifest)``
+
+        Raises ``ValueError`` if a chunk is missing or corrupted, or the
+        chunk list does not match the manifest's Merkle root.
+        """
+        manifest = (self.load_manifest(user_id, snapshot_id) if snapshot_id
+                    else self.latest(user_id))
+        if manifest is None:
+            raise KeyError(f"No snapshots for {user_id!r}")
+        if merkle_root(manifest['chunks']) != manifest['merkle_root']:
+            raise ValueError(f"Manifest {manifest['snapshot_id']} does not match its Merkle root")
+        data = b''.join(self._read_chunk(d) for d in manifest['chunks'])
+        if len(data) != manifest['size']:
+            raise ValueError(f"Snapshot {manifest['snapshot_id']} has the wrong size")
+        return data, manifest
+
+    def delete_snapshot(self, user_id, snapshot_id):
+        """Remove a manifest; its chunks go at the next :meth:`collect_garbage`"""
+        self.manifest_path(user_id, snapshot_id).unlink(missing_ok=True)
+        ledger = self._load_verified()
+        if ledger.get(user_id, {}).pop(snapshot_id, None) is not None:
+            self._save_verified(ledger)
+
+    def delete_user(self, user_id):
+        """Remove every snapshot of *user_id*; returns the number removed"""
+        snapshots = self.list_snapshots(user_id)
+        for snapshot_id in snapshots:
+            self.delete_snapshot(user_id, snapshot_id)
+        self.collect_garbage()
+        return len(snapshots)
+
+    # ------------------------------------------------------------------
+    # Retention
+    # ------------------------------------------------------------------
+
+    def apply_retention(self, user_id, keep_last=10, keep_daily=7, keep_weekly=4):
+        """Delete snapshots outside the retention policy; returns the deleted ids
+
+        Kept: the ``keep_last`` newest snapshots, plus the newest snapshot of
+        each of the ``keep_daily`` most recent days and ``keep_weekly`` most
+        recent ISO weeks that have snapshots.  Unreferenced chunks are then
+        removed.
+        """
+        snapshots = self.list_snapshots(user_id)
+        if not snapshots:
+            return []
+        keep = set(snapshots[-keep_last:]) if keep_last > 0 else set()
+        days, weeks = {}, {}
+        for snapshot_id in reversed(snapshots):
+            day = datetime.strptime(snapshot_id[:8], '%Y%m%d').date()
+            if day not in days and len(days) < keep_daily:
+                days[day] = snapshot_id
+            week = day.isocalendar()[:2]
+            if week not in weeks and len(weeks) < keep_weekly:
+                weeks[week] = snapshot_id
+        keep.update(days.values())
+        keep.update(weeks.values())
+        deleted = [s for s in snapshots if s not in keep]
+        for snapshot_id in deleted:
+            self.delete_snapshot(user_id, snapshot_id)
+        if deleted:
+            self.collect_garbage()
+        return deleted
+
+    def collect_garbage(self):
+        """Delete chunks no manifest references; returns the number deleted"""
+        referenced = set()
+        for manifest_file in self.manifest_dir.glob('*/*.json'):
+            try:
+                with open(manifest_file, 'r', encoding='utf-8') as f:
+                    referenced.update(json.load(f)['chunks'])
+            except (OSError, ValueError, KeyError) as e:
+                # Never delete chunks while a manifest cannot be read
+                logger.error("Skipping garbage collection, unreadable manifest %s: %s",
+                             manifest_file, e)
+                return 0
+        removed = 0
+        for chunk_file in self.chunk_dir.glob('*/*'):
+            if chunk_file.name.startswith('.') or chunk_file.name in referenced:
+                continue
+            chunk_file.unlink(missing_ok=True)
+            removed += 1
+        return removed
+
+    # ------------------------------------------------------------------
+    # Verification
+    # ------------------------------------------------------------------
+
+    def _load_verified(self):
+        try:
+            with open(self.backup_dir / 'verified.json', 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _save_verified(self, ledger):
+        self._write_atomic(self.backup_dir / 'verified.json',
+                           json.dumps(ledger, indent=2, sort_keys=True).encode('utf-8'))
+
+    def verify(self, user_id=None, full=False):
+        """Check snapshots (all users by default); returns a report dict
+
+        ``full=False`` skips snapshots whose Merkle root was verified before
+        and chunks belonging to such snapshots, so only new chunks are read.
+        ``full=True`` re-reads every chunk.  The report has ``ok``,
+        ``snapshots``, ``chunks_checked``, ``chunks_skipped`` and ``errors``.
+        """
+        users = [user_id] if user_id is not None else self.list_users()
+        ledger = {} if full else self._load_verified()
+        new_ledger = self._load_verified()
+        report = {'ok': True, 'snapshots': 0, 'chunks_checked': 0,
+                  'chunks_skipped': 0, 'errors': []}
+
+        manifests = []
+        trusted = set()
+        for uid in users:
+            for snapshot_id in self.list_snapshots(uid):
+                try:
+                    manifest = self.load_manifest(uid, snapshot_id)
+                except (OSError, ValueError) as e:
+                    report['errors'].append(f"{uid}/{snapshot_id}: unreadable manifest: {e}")
+                    continue
+                root = merkle_root(manifest['chunks'])
+                if root != manifest['merkle_root']:
+                    report['errors'].append(f"{uid}/{snapshot_id}: Merkle root mismatch")
+                    new_ledger.get(uid, {}).pop(snapshot_id, None)
+                    continue
+                if ledger.get(uid, {}).get(snapshot_id) == root:
+                    trusted.update(manifest['chunks'])
+                else:
+                    manifests.append(manifest)
+                report['snapshots'] += 1
+
+        checked = {}
+        for manifest in manifests:
+            uid, snapshot_id = manifest['user_id'], manifest['snapshot_id']
+            healthy = True
+            for digest in manifest['chunks']:
+                if digest in trusted:
+                    report['chunks_skipped'] += 1
+                    continue
+                if digest not in checked:
+                    try:
+                        self._read_chunk(digest)
+                        checked[digest] = True
+                    except ValueError as e:
+                        checked[digest] = False
+                        report['errors'].append(f"{uid}/{snapshot_id}: {e}")
+                    report['chunks_checked'] += 1
+                healthy = healthy and checked[digest]
+            if healthy:
+                new_ledger.setdefault(uid, {})[snapshot_id] = manifest['merkle_root']
+            else:
+                new_ledger.get(uid, {}).pop(snapshot_id, None)
+
+        self._save_verified(new_ledger)
+        report['ok'] = not report['errors']
+        return report
@@ -11,6 +11,29 @@ PATTERN_TRACKING_WINDOW = 10  # Number of recent messages to analyze for pattern
 EMOTIONAL_HISTORY_DAYS = 365  # Keep emotional history for 1 year (was 90 days)
 CONVERSATION_ARCHIVE_DAYS = 180  # Archive conversations after 6 months
 MAX_EMOTIONAL_SNAPSHOTS = 365  # Maximum number of emotional snapshots to keep
+EMOTIONAL_HISTORY_RAW_DAYS = 90  # Older emotional snapshots are merged into one aggregate per day
+CHAT_HISTORY_MAX_MESSAGES = 2000  # Oldest stored chat messages beyond this are counted per day and removed
+SESSION_LOG_RAW_DAYS = 30  # Older session log entries are folded into daily summaries (no message text)
+RETENTION_AGGREGATE_DAYS = 730  # Daily aggregates and summaries are kept for 2 years
+RETENTION_BATCH_SIZE = 500  # Session log rows summarized and deleted per transaction (SQLite engine)
+RETENTION_INTERVAL_HOURS = 24  # How often RetentionScheduler runs (or schedule `python retention.py`)
+
+# Profile persistence
+DATA_STORE_ENGINE = 'json'  # 'json' (one file per user) or 'sqlite' (single WAL database)
+PROFILE_CONTAINER_COMPACT_RECORDS = 256  # Rewrite an encrypted profile container once it holds this many records
+PROFILE_WRITE_BACK_MS = 0  # >0: coalesce profile saves in memory, flush at most this many ms later (0 = write-through)
+
+# Incremental profile backups (content-addressed chunks under <data_dir>/backups)
+BACKUP_COMPRESSION = 'auto'  # 'auto' (zstd if installed, else zlib), 'zstd', 'zlib' or 'none'
+BACKUP_KEEP_LAST = 10  # Always keep this many newest snapshots per user
+BACKUP_KEEP_DAILY = 7  # Plus the newest snapshot of each of the last N days
+BACKUP_KEEP_WEEKLY = 4  # Plus the newest snapshot of each of the last N weeks
+
+# Research session log (append-only JSON Lines, one file per user)
+SESSION_LOG_FSYNC = 'interval'  # 'always' (every append), 'interval', or 'never' (OS decides)
+SESSION_LOG_FSYNC_INTERVAL_SECONDS = 1.0  # Max seconds between fsyncs in 'interval' mode
+SESSION_LOG_MAX_BYTES = 10 * 1024 * 1024  # Rotate the active log file above this size
+SESSION_LOG_BACKUP_COUNT = 5  # Rotated files kept per user (<user>_session_log.N.jsonl)
 
 # Security settings
 ENABLE_PROFILE_PASSWORD = True  # Require password for profile access
@@ -96,10 +119,26 @@ GREETING_MESSAGES = [
 SUPPORTED_LANGUAGES = ('english', 'tamil', 'bilingual')
 DEFAULT_LANGUAGE = 'english'   # 'english', 'tamil', or 'bilingual' (Tamil+English)
 
+# ML model loading (see model_registry.py)
+MODEL_LOAD_RETRY_SECONDS = 60  # After a failed model load, wait this long before retrying
+MODEL_LOAD_RETRY_MAX_SECONDS = 3600  # Backoff doubles per consecutive failure up to this cap
+CONTEXTUAL_CRISIS_MODEL_ENABLED = True  # Zero-shot crisis classifier (bart-large-mnli, ~1.6 GB); off = keyword crisis detection only
+
+# Transformer inputs (see text_windows.py) – long texts are classified in
+# overlapping token windows instead of being cut at a character count
+TRANSFORMER_WINDOW_TOKENS = 510  # Emotion model: 512 positions minus <s> and </s>
+CRISIS_WINDOW_TOKENS = 400     # Zero-shot crisis model: premise budget, leaving room for the hypothesis
+TRANSFORMER_WINDOW_OVERLAP = 64  # Tokens shared by consecutive windows
+TRANSFORMER_BATCH_SIZE = 16    # Windows per length-bucketed batch in bulk scoring
+
 # Voice / TTS settings
 TTS_ENABLED = True             # Enable text-to-speech responses (requires internet)
 STT_ENABLED = True             # Enable speech-to-text input (requires internet)
 TTS_DEFAULT_LANG = 'en'       # BCP-47 language code used by gTTS
+TTS_CACHE_ENABLED = True       # Cache synthesized speech by (text, language, engine)
+TTS_CACHE_DIR = None           # None = ~/.wellness_buddy/tts_cache
+TTS_CACHE_MAX_BYTES = 200 * 1024 * 1024  # Least recently used clips are deleted above this size
+TTS_CACHE_MEMORY_ITEMS = 256   # Most recently used clips also kept in memory
 
 # Prediction agent
 PREDICTION_WINDOW = 10         # Alias for PATTERN_TRACKING_WINDOW (used by PredictionAgent)
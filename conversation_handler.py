@@ -6,9 +6,11 @@ and response-style preferences (short/detailed/balanced).
 
 import logging
 import random
+import re
 from collections import deque
 from datetime import datetime
 import config
+from conversation_memory import ConversationMemory, RollingCounter
 from empathetic_responder import EmpatheticResponder
 _logger = logging.getLogger(__name__)
 
@@ -385,19 +387,185 @@ _ESCALATION_FOLLOWUPS = {
 }
 
 
+# -----------------------------------------------------------------------
+# Precompiled template index
+# -----------------------------------------------------------------------
+# Every template string above is interned once at import with a small
+# integer id, and each pool becomes a tuple of ids plus a bitmask of them,
+# keyed by (slot, emotion, style, language, stage, topic).  Selecting a
+# template is then one dict lookup, and the per-handler "recently used"
+# set is a bitmask, so no-repeat checks cost the same for any library size.
+
+_EMPATHY_EMOTIONS = ('anxiety', 'stress', 'sadness', 'fear', 'neutral')
+_LANGUAGES = ('english', 'tamil', 'bilingual')
+# Rejection-sampling tries before falling back to filtering the pool.
+_SAMPLE_ATTEMPTS = 8
+
+
+class _TemplatePool:
+    """Template ids of one pool and the bitmask of those ids"""
+
+    __slots__ = ('ids', 'mask')
+
+    def __init__(self, ids):
+        self.ids = tuple(ids)
+        mask = 0
+        for template_id in self.ids:
+            mask |= 1 << template_id
+        self.mask = mask
+
+    def __len__(self):
+        return len(self.ids)
+
+
+_EMPTY_POOL = _TemplatePool(())
+
+
+class _TemplateIndex:
+    """Interned templates grouped into pools keyed by
+    ``(slot, emotion, style, language, stage, topic)`` (``None`` = any)."""
+
+    def __init__(self):
+        self.templates = []
+        self._ids = {}
+        self._pools = {}
+
+    def intern(self, text):
+        template_id = self._ids.get(text)
+        if template_id is None:
+            template_id = self._ids[text] = len(self.templates)
+            self.templates.append(text)
+        return template_id
+
+    def add(self, templates, slot, emotion=None, style=None, language=None, stage=None, topic=None):
+        pool = _TemplatePool(self.intern(t) for t in templates)
+        self._pools[(slot, emotion, style, language, stage, topic)] = pool
+        return pool
+
+    def get(self, slot, emotion=None, style=None, language=None, stage=None, topic=None):
+        return self._pools.get((slot, emotion, style, language, stage, topic), _EMPTY_POOL)
+
+    def __len__(self):
+        return len(self.templates)
+
+
+def _suggestion_templates(topic, emotion, calm_mode_active):
+    """Pool picked by ``_get_adaptive_suggestion`` for one combination"""
+    if topic == 'work_stress':
+        return _WORK_STRESS_COPING
+    if topic == 'relationship_issues':
+        return _RELATIONSHIP_REFLECTION
+    if emotion in ('anxiety', 'stress') or calm_mode_active:
+        return _ANXIETY_GROUNDING
+    if emotion in ('sadness', 'fear'):
+        return _LOW_MOOD_SUPPORT
+    return _TOPIC_SUGGESTIONS.get(topic, [])
+
+
+def _build_template_index():
+    index = _TemplateIndex()
+    for emotion, styles in _RESPONSES.items():
+        for style, templates in styles.items():
+            index.add(templates, 'response', emotion=emotion, style=style)
+
+    empathy = {'anxiety': ANXIETY_RESPONSES, 'stress': STRESS_RESPONSES,
+               'sadness': SADNESS_RESPONSES, 'fear': FEAR_RESPONSES,
+               'neutral': NEUTRAL_SUPPORT_RESPONSES}
+    for emotion, templates in empathy.items():
+        index.add(templates, 'empathy', emotion=emotion, language='english')
+    index.add(TAMIL_EMPATHY_VARIATIONS, 'empathy', language='tamil')
+
+    reflections = {
+        0: ["I'm listening and staying with you in this moment.",
+            "We can take this one gentle step at a time."],
+        1: ["I can see this has been continuing and weighing on you.",
+            "It sounds like this isn't just a passing moment — it's been persisting."],
+        2: ["Since this feeling keeps returning, let's focus on one grounding step right now.",
+            "Because this has stayed with you, a small coping action could help ease the intensity."],
+        3: ["You've been carrying this for a while, so steady support and a practical plan may help.",
+            "Given how persistent this is, we can combine emotional support with a simple action plan."],
+    }
+    style_extras = {
+        'exploratory': {0: ["What part of this feels the hardest right now?"],
+                        1: ["What has felt most draining about this lately?"]},
+        'coping_guidance': {2: ["Let's try one practical coping step and keep it manageable."],
+                            3: ["We'll combine emotional support with a clear, gentle action plan."]},
+        'reflective': {0: ["It sounds like you're carrying quite a lot right now."]},
+        'supportive': {0: ["I'm really glad you're sharing this here."]},
+    }
+    for style in _CONVERSATIONAL_STYLES:
+        for stage, templates in reflections.items():
+            index.add(templates + style_extras[style].get(stage, []),
+                      'reflection', style=style, stage=stage)
+
+    index.add([
+        "If this keeps feeling intense, reaching out to a trusted person or professional support can be a strong next step.",
+        "You deserve sustained support here — we can keep planning practical steps together.",
+    ], 'guidance', stage=3)
+
+    closings = ["I'm here with you.", "You're not alone in this.",
+                "We'll move through this together.", "Your feelings matter, and I'm with you."]
+    index.add(closings, 'closing', language='english')
+    for language in ('tamil', 'bilingual'):
+        index.add(closings + ["நீங்கள் தனியாக இல்லை.", "நான் தொடர்ந்து உங்களுடன் இருக்கிறேன்."],
+                  'closing', language=language)
+
+    for topic in (None,) + tuple(_TOPIC_KEYWORDS):
+        for emotion in _EMPATHY_EMOTIONS:
+            for calm in (False, True):
+                index.add(_suggestion_templates(topic, emotion, calm), 'suggestion',
+                          emotion=emotion, style='calm' if calm else None, topic=topic)
+
+    index.add(_EMPATHY_AMPLIFICATION_POOL, 'amplification')
+    index.add(_ANXIETY_GROUNDING, 'grounding')
+    return index
+
+
+_TEMPLATE_INDEX = _build_template_index()
+
+# Topic detection: one compiled alternation per topic, tried in
+# _TOPIC_KEYWORDS order (the first topic with any keyword wins).
+_TOPIC_ORDER = tuple(_TOPIC_KEYWORDS)
+_TOPIC_PATTERNS = tuple(
+    re.compile('|'.join(re.escape(keyword) for keyword in _TOPIC_KEYWORDS[topic]))
+    for topic in _TOPIC_ORDER
+)
+
+
+def _topic_mask(text):
+    """Bitmask of the topics whose keywords occur in *text* (bit i = _TOPIC_ORDER[i])"""
+    text_lower = text.lower()
+    mask = 0
+    for bit, pattern in enumerate(_TOPIC_PATTERNS):
+        if pattern.search(text_lower):
+            mask |= 1 << bit
+    return mask
+
+
+def _first_topic(mask):
+    if not mask:
+        return None
+    return _TOPIC_ORDER[(mask & -mask).bit_length() - 1]
+
+
 class ConversationHandler:
     """Manages conversation flow and responses"""
 
     def __init__(self):
-        self.conversation_history = []
-        self._last_pool_choice = None  # last base template chosen (for dedup)
+        self.conversation_history = ConversationMemory(config.MAX_CONVERSATION_HISTORY)
+        self._last_template_id = None  # last base template chosen (for dedup)
         self._last_response = None     # full last assistant response (for anti-repeat)
         self._support_idx = 0          # rotating index into _SUPPORT_VARIATIONS
         self._style_idx = 0
         self._recent_responses = deque(maxlen=5)
-        self._recent_pool_choices = deque(maxlen=5)
-        self._topic_history = deque(maxlen=_MEMORY_WINDOW)
-        self._emotion_history = deque(maxlen=_MEMORY_WINDOW)
+        self._recent_response_set = set()
+        # Last 5 template ids chosen, and the same set as a bitmask
+        self._recent_template_ids = deque(maxlen=5)
+        self._recent_template_mask = 0
+        self._topic_history = RollingCounter(_MEMORY_WINDOW)
+        # Topic mask per message of the current topic context window only
+        self._topic_masks = {}
+        self._emotion_history = RollingCounter(_MEMORY_WINDOW)
         self._recent_user_messages = deque(maxlen=_MEMORY_WINDOW)
         self._emotion_timeline = deque(maxlen=config.MAX_CONVERSATION_HISTORY)
         self._last_response_metadata = {}
@@ -414,7 +582,7 @@ class ConversationHandler:
             'timestamp': datetime.now(),
             'user_message': user_message,
             'emotion_data': emotion_data
-        })
+        }, emotion=emotion_data.get('primary_emotion'), topic=detected_topic)
         self._recent_user_messages.append(user_message)
         self._emotion_history.append(primary_emotion)
         if detected_topic:
@@ -425,20 +593,13 @@ class ConversationHandler:
             'risk_score': round(risk_score, 3),
         })
 
-        # Limit history size
-        if len(self.conversation_history) > config.MAX_CONVERSATION_HISTORY:
-            self.conversation_history = self.conversation_history[-config.MAX_CONVERSATION_HISTORY:]
-
     # ------------------------------------------------------------------
     # Conversation context helpers
     # ------------------------------------------------------------------
 
     def get_chat_history(self):
         """Return structured chat history as a list of role/content dicts."""
-        result = []
-        for entry in self.conversation_history:
-            result.append({"role": "user", "content": entry['user_message']})
-        return result
+        return self.conversation_history.chat_history()
 
     def get_emotion_timeline(self):
         """Return timeline entries for UI analytics charts."""
@@ -458,14 +619,7 @@ class ConversationHandler:
 
     def _consecutive_emotion_count(self, emotion):
         """Count how many of the most recent messages share the same primary emotion."""
-        count = 0
-        for entry in reversed(self.conversation_history):
-            e = entry.get('emotion_data', {}).get('primary_emotion')
-            if e == emotion:
-                count += 1
-            else:
-                break
-        return count
+        return self.conversation_history.streak(emotion)
 
     def _detect_emotion_trend(self, history=None):
         """Detect short-horizon emotion trend from recent states."""
@@ -481,29 +635,43 @@ class ConversationHandler:
         return 'stable'
 
     def _choose_unique(self, pool):
-        """Pick a random item from pool, avoiding recently used templates."""
-        if len(pool) <= 1:
-            return pool[0] if pool else ''
-        recent_used = set(self._recent_pool_choices)
-        candidates = [t for t in pool if t not in recent_used]
-        if not candidates:
-            candidates = [t for t in pool if t != self._last_pool_choice]
-        if not candidates:
-            candidates = pool
-        chosen = random.choice(candidates)
-        self._last_pool_choice = chosen
-        self._recent_pool_choices.append(chosen)
-        return chosen
+        """Pick a random template from a ``_TemplatePool``, avoiding recently used ones.
+
+        Uniform over the pool's templates not among the last 5 chosen; when
+        all of them were used recently, anything but the very last choice.
+        """
+        ids = pool.ids
+        if len(ids) <= 1:
+            return _TEMPLATE_INDEX.templates[ids[0]] if ids else ''
+        recent = self._recent_template_mask
+        if pool.mask & ~recent:
+            for _ in range(_SAMPLE_ATTEMPTS):
+                chosen = random.choice(ids)
+                if not recent >> chosen & 1:
+                    break
+            else:
+                chosen = random.choice([i for i in ids if not recent >> i & 1])
+        else:
+            # Every template in the pool is recent, so the pool has at most 5
+            chosen = random.choice([i for i in ids if i != self._last_template_id] or ids)
+        self._remember_template(chosen)
+        return _TEMPLATE_INDEX.templates[chosen]
+
+    def _remember_template(self, template_id):
+        recent_ids = self._recent_template_ids
+        evicted = recent_ids[0] if len(recent_ids) == recent_ids.maxlen else None
+        recent_ids.append(template_id)
+        self._recent_template_mask |= 1 << template_id
+        if evicted is not None and evicted != template_id and evicted not in recent_ids:
+            self._recent_template_mask &= ~(1 << evicted)
+        self._last_template_id = template_id
 
     def _detect_topic(self, text):
         """Lightweight topic detection using keyword matching."""
         if not text:
             return None
-        text_lower = text.lower()
-        for topic, keywords in _TOPIC_KEYWORDS.items():
-            if any(keyword in text_lower for keyword in keywords):
-                return topic
-        return None
+        mask = self._topic_masks.get(text)
+        return _first_topic(_topic_mask(text) if mask is None else mask)
 
     @staticmethod
     def _escalation_stage(consecutive_count):
@@ -548,17 +716,11 @@ class ConversationHandler:
         """Return optional context-aware coping suggestion."""
         if stage < 1 and not calm_mode_active and random.random() < _EARLY_STAGE_SUGGESTION_SKIP_PROBABILITY:
             return ""
-        if topic == 'work_stress':
-            return self._choose_unique(_WORK_STRESS_COPING)
-        if topic == 'relationship_issues':
-            return self._choose_unique(_RELATIONSHIP_REFLECTION)
-        if emotion in ('anxiety', 'stress') or calm_mode_active:
-            return self._choose_unique(_ANXIETY_GROUNDING)
-        if emotion in ('sadness', 'fear'):
-            return self._choose_unique(_LOW_MOOD_SUPPORT)
-        if topic in _TOPIC_SUGGESTIONS:
-            return self._choose_unique(_TOPIC_SUGGESTIONS[topic])
-        return ""
+        emotion = emotion if emotion in _EMPATHY_EMOTIONS else 'neutral'
+        pool = _TEMPLATE_INDEX.get('suggestion', emotion=emotion,
+                                   style='calm' if calm_mode_active else None,
+                                   topic=topic if topic in _TOPIC_KEYWORDS else None)
+        return self._choose_unique(pool) if pool else ""
 
     @staticmethod
     def _avatar_state_for(emotion, trend):
@@ -580,76 +742,28 @@ class ConversationHandler:
     def _build_response_segments(self, emotion, topic, lang_pref, stage, conversation_style='supportive',
                                  calm_mode_active=False):
         """Compose response from modular empathy/reflection/suggestion/closing segments."""
-        emotion_key = emotion if emotion in {'anxiety', 'stress', 'sadness', 'fear'} else 'neutral'
-        empathy_map = {
-            'anxiety': ANXIETY_RESPONSES,
-            'stress': STRESS_RESPONSES,
-            'sadness': SADNESS_RESPONSES,
-            'fear': FEAR_RESPONSES,
-            'neutral': NEUTRAL_SUPPORT_RESPONSES,
-        }
+        emotion_key = emotion if emotion in _EMPATHY_EMOTIONS else 'neutral'
+        index = _TEMPLATE_INDEX
         if lang_pref == 'tamil':
-            tamil_empathy = self._choose_unique(TAMIL_EMPATHY_VARIATIONS)
-            empathy = tamil_empathy
+            empathy = self._choose_unique(index.get('empathy', language='tamil'))
         else:
-            empathy = self._choose_unique(empathy_map[emotion_key])
+            empathy = self._choose_unique(index.get('empathy', emotion=emotion_key, language='english'))
             if lang_pref == 'bilingual':
-                tamil_empathy = self._choose_unique(TAMIL_EMPATHY_VARIATIONS)
+                tamil_empathy = self._choose_unique(index.get('empathy', language='tamil'))
                 empathy = f"{tamil_empathy} {empathy}"
 
-        reflection_pool = {
-            0: [
-                "I'm listening and staying with you in this moment.",
-                "We can take this one gentle step at a time.",
-            ],
-            1: [
-                "I can see this has been continuing and weighing on you.",
-                "It sounds like this isn't just a passing moment — it's been persisting.",
-            ],
-            2: [
-                "Since this feeling keeps returning, let's focus on one grounding step right now.",
-                "Because this has stayed with you, a small coping action could help ease the intensity.",
-            ],
-            3: [
-                "You've been carrying this for a while, so steady support and a practical plan may help.",
-                "Given how persistent this is, we can combine emotional support with a simple action plan.",
-            ],
-        }
-        style_extras = {0: [], 1: [], 2: [], 3: []}
-        if conversation_style == 'exploratory':
-            style_extras[0].append("What part of this feels the hardest right now?")
-            style_extras[1].append("What has felt most draining about this lately?")
-        elif conversation_style == 'coping_guidance':
-            style_extras[2].append("Let's try one practical coping step and keep it manageable.")
-            style_extras[3].append("We'll combine emotional support with a clear, gentle action plan.")
-        elif conversation_style == 'reflective':
-            style_extras[0].append("It sounds like you're carrying quite a lot right now.")
-        else:  # supportive
-            style_extras[0].append("I'm really glad you're sharing this here.")
-        reflection_candidates = reflection_pool[stage] + style_extras[stage]
-        reflection = self._choose_unique(reflection_candidates)
+        if conversation_style not in _CONVERSATIONAL_STYLES:
+            conversation_style = 'supportive'
+        reflection = self._choose_unique(index.get('reflection', style=conversation_style, stage=stage))
 
         suggestion = self._get_adaptive_suggestion(topic, emotion_key, stage, calm_mode_active=calm_mode_active)
 
         if stage >= 3:
-            guidance_pool = [
-                "If this keeps feeling intense, reaching out to a trusted person or professional support can be a strong next step.",
-                "You deserve sustained support here — we can keep planning practical steps together.",
-            ]
-            suggestion = f"{suggestion} {self._choose_unique(guidance_pool)}".strip()
-
-        closing_pool = [
-            "I'm here with you.",
-            "You're not alone in this.",
-            "We'll move through this together.",
-            "Your feelings matter, and I'm with you.",
-        ]
-        if lang_pref in ('tamil', 'bilingual'):
-            closing_pool.extend([
-                "நீங்கள் தனியாக இல்லை.",
-                "நான் தொடர்ந்து உங்களுடன் இருக்கிறேன்.",
-            ])
-        closing = self._choose_unique(closing_pool)
+            guidance = self._choose_unique(index.get('guidance', stage=3))
+            suggestion = f"{suggestion} {guidance}".strip()
+
+        closing_language = lang_pref if lang_pref in _LANGUAGES else 'english'
+        closing = self._choose_unique(index.get('closing', language=closing_language))
 
         segments = [empathy, reflection]
         if suggestion:
@@ -660,20 +774,26 @@ class ConversationHandler:
     def _ensure_no_repeat(self, response, emotion, regenerate_fn=None):
         """Avoid duplicates across the most recent assistant replies."""
         _ = emotion  # kept for backward-compatible call signature
+        recent = self._recent_response_set
         attempts = 0
         while (
-            response and response in self._recent_responses and regenerate_fn
+            response and response in recent and regenerate_fn
             and attempts < _MAX_REGEN_ATTEMPTS
         ):
             response = regenerate_fn()
             attempts += 1
-        if response and response in self._recent_responses:
+        if response and response in recent:
             variation = _SUPPORT_VARIATIONS[self._support_idx % len(_SUPPORT_VARIATIONS)]
             self._support_idx += 1
             response = response + " " + variation
         self._last_response = response
         if response:
-            self._recent_responses.append(response)
+            recent_responses = self._recent_responses
+            evicted = recent_responses[0] if len(recent_responses) == recent_responses.maxlen else None
+            recent_responses.append(response)
+            recent.add(response)
+            if evicted is not None and evicted not in recent_responses:
+                recent.discard(evicted)
         return response
 
     def generate_response(self, emotion_data, user_context=None, return_metadata=False):
@@ -734,12 +854,20 @@ class ConversationHandler:
                 for m in user_context['context'][-_TOPIC_CONTEXT_WINDOW:]
                 if m.get('role') == 'user'
             ]
-        history_msgs = [
-            e.get('user_message', '')
-            for e in self.conversation_history[-_TOPIC_CONTEXT_WINDOW:]
-        ]
-        context_blob = " ".join([m for m in (context_msgs + history_msgs) if m])
-        detected_topic = self._detect_topic(context_blob)
+        history_msgs = self.conversation_history.recent_messages(_TOPIC_CONTEXT_WINDOW)
+        # Masks of messages still in the window are reused, so only new
+        # messages are scanned; those that left the window are dropped
+        topic_mask = 0
+        window_masks = {}
+        for m in context_msgs + history_msgs:
+            if m:
+                mask = self._topic_masks.get(m)
+                if mask is None:
+                    mask = _topic_mask(m)
+                window_masks[m] = mask
+                topic_mask |= mask
+        self._topic_masks = window_masks
+        detected_topic = _first_topic(topic_mask)
         emotion_trend = self._detect_emotion_trend()
 
         normalized_emotion = primary_emotion
@@ -759,12 +887,14 @@ class ConversationHandler:
 
         # Crisis response remains explicit and immediate
         if primary_emotion == 'crisis':
-            crisis_pool = _RESPONSES['crisis'].get(style, _RESPONSES['crisis']['balanced'])
+            crisis_pool = (_TEMPLATE_INDEX.get('response', emotion='crisis', style=style)
+                           or _TEMPLATE_INDEX.get('response', emotion='crisis', style='balanced'))
             response = self._choose_unique(crisis_pool)
             template_label = f"crisis/{style}"
         # Positive emotion uses existing joy templates
         elif coarse_emotion == 'positive' and primary_emotion not in ('anxiety', 'stress', 'sadness', 'fear'):
-            joy_pool = _RESPONSES['joy'].get(style, _RESPONSES['joy']['balanced'])
+            joy_pool = (_TEMPLATE_INDEX.get('response', emotion='joy', style=style)
+                        or _TEMPLATE_INDEX.get('response', emotion='joy', style='balanced'))
             response = self._choose_unique(joy_pool)
             template_label = f"joy/{style}"
         else:
@@ -841,7 +971,7 @@ class ConversationHandler:
         concern_level = emotion_data.get('concern_level', 'low')
         if lang_pref != 'tamil' and primary_emotion in ('sadness', 'fear', 'anxiety'):
             if emotion_confidence > 0.6 or concern_level in ('high', 'critical'):
-                response += "\n\n" + self._choose_unique(_EMPATHY_AMPLIFICATION_POOL)
+                response += "\n\n" + self._choose_unique(_TEMPLATE_INDEX.get('amplification'))
 
         # ---- Intensity adjustment based on sentiment score ----
         if lang_pref != 'tamil' and primary_emotion in ('sadness', 'fear', 'anxiety'):
@@ -963,7 +1093,7 @@ class ConversationHandler:
             and primary_emotion in ('sadness', 'fear')
             and lang_pref != 'tamil'
         ):
-            response += "\n\n" + self._choose_unique(_ANXIETY_GROUNDING)
+            response += "\n\n" + self._choose_unique(_TEMPLATE_INDEX.get('grounding'))
             if not suggestion_type:
                 suggestion_type = 'grounding_exercise'
 
@@ -0,0 +1,185 @@
+"""
+Bounded conversation memory for ConversationHandler.
+
+``ConversationMemory`` keeps the last ``maxlen`` turns in a fixed-size ring
+buffer and maintains everything the response generator asks about while
+entries are appended and evicted: the trailing same-emotion streak, emotion
+and topic histograms over the retained turns, per-message membership, and
+the ``{"role", "content"}`` dicts returned by ``get_chat_history``.  Adding
+a turn and answering any of those questions therefore costs the same no
+matter how long the session is or how large ``MAX_CONVERSATION_HISTORY`` is.
+
+``RollingCounter`` is the same idea for the short recent-emotion and
+recent-topic windows: a bounded deque with a Counter kept in step, so
+``count()`` is a dict lookup instead of a scan.
+"""
+
+from collections import Counter, deque
+from collections.abc import Sequence
+
+
+def _decrement(counts, key):
+    remaining = counts[key] - 1
+    if remaining:
+        counts[key] = remaining
+    else:
+        del counts[key]
+
+
+class RollingCounter:
+    """Last *maxlen* values appended, with their occurrence counts."""
+
+    __slots__ = ('_items', '_counts')
+
+    def __init__(self, maxlen):
+        self._items = deque(maxlen=maxlen)
+        self._counts = Counter()
+
+    def append(self, value):
+        items = self._items
+        if len(items) == items.maxlen:
+            _decrement(self._counts, items[0])
+        items.append(value)
+        self._counts[value] += 1
+
+    def count(self, value):
+        return self._counts.get(value, 0)
+
+    def most_common(self, n=None):
+        return self._counts.most_common(n)
+
+    def clear(self):
+        self._items.clear()
+        self._counts.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __getitem__(self, index):
+        return self._items[index]
+
+    def __repr__(self):
+        return f"RollingCounter({list(self._items)!r}, maxlen={self._items.maxlen})"
+
+
+class ConversationMemory(Sequence):
+    """Ring buffer of conversation turns with incrementally maintained stats.
+
+    Behaves as a read-only sequence of the stored entry dicts (oldest first),
+    so ``memory[-1]``, ``memory[-6:]``, ``len(memory)`` and iteration work as
+    they did on the plain list it replaces.
+    """
+
+    def __init__(self, maxlen):
+        if maxlen < 1:
+            raise ValueError("maxlen must be at least 1")
+        self.maxlen = maxlen
+        self._entries = [None] * maxlen
+        self._emotions = [None] * maxlen
+        self._topics = [None] * maxlen
+        self._chat = [None] * maxlen
+        self._head = 0   # slot of the oldest entry
+        self._size = 0
+        self.emotion_counts = Counter()
+        self.topic_counts = Counter()
+        self._message_counts = Counter()
+        self._streak_emotion = None
+        self._streak = 0
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def append(self, entry, emotion=None, topic=None):
+        """Store *entry* (a dict with ``user_message``) and update the stats."""
+        if self._size == self.maxlen:
+            slot = self._head
+            self._evict(slot)
+            self._head = (slot + 1) % self.maxlen
+        else:
+            slot = (self._head + self._size) % self.maxlen
+            self._size += 1
+
+        message = entry.get('user_message', '')
+        self._entries[slot] = entry
+        self._emotions[slot] = emotion
+        self._topics[slot] = topic
+        self._chat[slot] = {"role": "user", "content": message}
+        self.emotion_counts[emotion] += 1
+        if topic:
+            self.topic_counts[topic] += 1
+        self._message_counts[message] += 1
+
+        if emotion == self._streak_emotion:
+            self._streak += 1
+        else:
+            self._streak_emotion = emotion
+            self._streak = 1
+
+    def _evict(self, slot):
+        _decrement(self.emotion_counts, self._emotions[slot])
+        topic = self._topics[slot]
+        if topic:
+            _decrement(self.topic_counts, topic)
+        _decrement(self._message_counts, self._entries[slot].get('user_message', ''))
+
+    def clear(self):
+        self.__init__(self.maxlen)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def streak(self, emotion):
+        """Number of most recent retained turns whose emotion is *emotion*."""
+        if emotion != self._streak_emotion or not self._size:
+            return 0
+        return min(self._streak, self._size)
+
+    def has_message(self, text):
+        return text in self._message_counts
+
+    def tail(self, n):
+        """The last *n* entries, oldest first."""
+        n = max(0, min(n, self._size))
+        return [self._entries[self._slot(i)] for i in range(self._size - n, self._size)]
+
+    def recent_messages(self, n):
+        """User message text of the last *n* entries, oldest first."""
+        return [entry.get('user_message', '') for entry in self.tail(n)]
+
+    def chat_history(self):
+        """``{"role": "user", "content": ...}`` dicts for all retained turns.
+
+        The dicts are built once per turn and shared between calls; treat
+        them as read-only.
+        """
+        chat, head, maxlen = self._chat, self._head, self.maxlen
+        if head + self._size <= maxlen:
+            return chat[head:head + self._size]
+        return chat[head:] + chat[:head + self._size - maxlen]
+
+    def _slot(self, index):
+        return (self._head + index) % self.maxlen
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._entries[self._slot(i)] for i in range(*index.indices(self._size))]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("conversation memory index out of range")
+        return self._entries[self._slot(index)]
+
+    def __iter__(self):
+        for i in range(self._size):
+            yield self._entries[self._slot(i)]
+
+    def __repr__(self):
+        return f"ConversationMemory(len={self._size}, maxlen={self.maxlen})"
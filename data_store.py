@@ -4,21 +4,64 @@ Uses JSON files for simple, private local storage
 Includes encryption for sensitive data when enabled
 """
 
+import atexit
 import json
+import logging
 import os
-from datetime import datetime
+import re
+import tempfile
+import threading
+import time
+import weakref
 from pathlib import Path
 import base64
 import hashlib
-from cryptography.fernet import Fernet
+from cryptography.fernet import Fernet, MultiFernet
 import config
+import retention
+import serialization
+from backup_store import BackupStore
+from encrypted_container import (
+    CONTAINER_SUFFIX, HISTORY_SECTIONS, EncryptedContainer, diff_profile,
+)
+
+logger = logging.getLogger(__name__)
+
+SESSION_LOG_FSYNC_POLICIES = ('always', 'interval', 'never')
+
+DATA_STORE_ENGINES = ('json', 'sqlite')
+
+# *.json files in data_dir that are not user profiles.
+_NON_PROFILE_STEM = re.compile(r'_backup_\d{8}_\d{6}$|_session_data$')
+
+# Active and rotated session log files: <user>_session_log[.N].jsonl
+_SESSION_LOG_NAME = re.compile(r'^(.+)_session_log(?:\.\d+)?\.jsonl$')
+
+# Stores with unflushed write-back data, flushed once at interpreter exit.
+_WRITE_BACK_STORES = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_write_back_stores():
+    for store in list(_WRITE_BACK_STORES):
+        try:
+            store.flush()
+        except Exception as e:
+            logger.error("Flushing data store %s at exit failed: %s", store.data_dir, e)
 
 
 class DataStore:
     """Manages persistent storage of user data with optional encryption"""
     
-    def __init__(self, data_dir=None, encryption_key=None):
-        """Initialize data store with directory path"""
+    def __init__(self, data_dir=None, encryption_key=None, session_log_fsync=None,
+                 session_log_max_bytes=None, session_log_backup_count=None,
+                 write_back_ms=None):
+        """Initialize data store with directory path
+
+        The ``session_log_*`` and ``write_back_ms`` arguments override the
+        ``SESSION_LOG_*`` / ``PROFILE_WRITE_BACK_MS`` settings in
+        :mod:`config` for this instance.
+        """
         if data_dir is None:
             # Use user's home directory for privacy
             self.data_dir = Path.home() / '.wellness_buddy'
@@ -34,14 +77,53 @@ class DataStore:
             self._setup_encryption(encryption_key)
         else:
             self.cipher = None
+
+        self.session_log_fsync = session_log_fsync or config.SESSION_LOG_FSYNC
+        if self.session_log_fsync not in SESSION_LOG_FSYNC_POLICIES:
+            raise ValueError(
+                f"session_log_fsync must be one of {SESSION_LOG_FSYNC_POLICIES}, "
+                f"got {self.session_log_fsync!r}"
+            )
+        self.session_log_fsync_interval = config.SESSION_LOG_FSYNC_INTERVAL_SECONDS
+        self.session_log_max_bytes = (
+            session_log_max_bytes if session_log_max_bytes is not None
+            else config.SESSION_LOG_MAX_BYTES)
+        self.session_log_backup_count = (
+            session_log_backup_count if session_log_backup_count is not None
+            else config.SESSION_LOG_BACKUP_COUNT)
+        self._session_log_last_fsync = {}
+        # Serialises appends/rotation with retention rewrites of the log
+        self._session_log_lock = threading.Lock()
+
+        # Profile cache: user_id -> (encoded JSON bytes, file signature).
+        # With write_back_ms > 0 saves only update the cache and mark the
+        # user dirty; dirty profiles are flushed together at most
+        # write_back_ms later, on flush(), or at interpreter exit.
+        self.write_back_ms = (
+            write_back_ms if write_back_ms is not None
+            else config.PROFILE_WRITE_BACK_MS)
+        self._profile_cache = {}
+        self._dirty = set()
+        # Last state written to / read from each encrypted container:
+        # user_id -> (serialized data, file signature, record count).  Lets a
+        # save append only the records that changed.
+        self._persisted = {}
+        self.container_compact_records = config.PROFILE_CONTAINER_COMPACT_RECORDS
+        self._cache_lock = threading.RLock()
+        self._flush_timer = None
+        self._backup_store = None
     
     def _setup_encryption(self, key=None):
-        """Set up encryption with a key"""
+        """Set up encryption with a key
+
+        Keys retired by :meth:`rotate_encryption_key` that are still listed
+        in ``.encryption_key.retired`` remain usable for decryption.
+        """
         key_file = self.data_dir / '.encryption_key'
         
         if key:
             # Use provided key
-            self.encryption_key = key
+            self.encryption_key = key.encode() if isinstance(key, str) else key
         elif key_file.exists():
             # Load existing key
             with open(key_file, 'rb') as f:
@@ -55,26 +137,76 @@ class DataStore:
             # Restrict permissions to owner only
             os.chmod(key_file, 0o600)
         
-        self.cipher = Fernet(self.encryption_key)
-    
-    def _encrypt_data(self, data):
-        """Encrypt data before saving"""
-        if not self.encryption_enabled or not self.cipher:
-            return data
-        
-        json_data = json.dumps(data).encode()
-        encrypted = self.cipher.encrypt(json_data)
-        return base64.b64encode(encrypted).decode()
+        retired_file = self.data_dir / '.encryption_key.retired'
+        retired = []
+        if retired_file.exists():
+            retired = [line for line in retired_file.read_bytes().split() if line]
+        self._use_keys(self.encryption_key, retired)
+
+    def _use_keys(self, primary, retired=()):
+        fernets = [Fernet(primary)] + [Fernet(k) for k in retired if k != primary]
+        self.cipher = fernets[0] if len(fernets) == 1 else MultiFernet(fernets)
+
+    def rotate_encryption_key(self, new_key=None):
+        """Re-encrypt every profile under a new key; returns the number rewritten
+
+        The old key is kept in ``.encryption_key.retired`` until every
+        profile has been rewritten, so an interrupted rotation can simply be
+        run again.  The new key is stored in ``.encryption_key``.
+        """
+        self.flush()
+        retired_file = self._begin_key_rotation(new_key)
+        rewritten = 0
+        with self._cache_lock:
+            for user_id in self.list_users():
+                self._profile_cache.pop(user_id, None)
+                data = self.load_user_data(user_id)
+                if data is None:
+                    continue
+                # Forget the loaded state so the container is rewritten
+                # (re-encrypted) rather than appended to.
+                self._persisted.pop(user_id, None)
+                encoded = serialization.dumps(data)
+                signature = self._write_user_file(user_id, encoded)
+                self._profile_cache[user_id] = (encoded, signature)
+                rewritten += 1
+
+        self._finish_key_rotation(retired_file)
+        logger.info("Rotated encryption key; re-encrypted %d profile(s)", rewritten)
+        return rewritten
+
+    def _begin_key_rotation(self, new_key=None):
+        """Store *new_key* as primary, keeping old keys for decryption"""
+        if not self.encryption_enabled:
+            raise ValueError("Encryption is disabled; there is no key to rotate")
+        new_key = new_key or Fernet.generate_key()
+        if isinstance(new_key, str):
+            new_key = new_key.encode()
+        key_file = self.data_dir / '.encryption_key'
+        retired_file = self.data_dir / '.encryption_key.retired'
+
+        retired = [self.encryption_key]
+        if retired_file.exists():
+            retired += [k for k in retired_file.read_bytes().split() if k and k not in retired]
+        self._write_atomic(retired_file, b'\n'.join(retired).decode())
+        self._write_atomic(key_file, new_key.decode())
+        self.encryption_key = new_key
+        self.cipher = MultiFernet([Fernet(new_key)] + [Fernet(k) for k in retired])
+        return retired_file
+
+    def _finish_key_rotation(self, retired_file):
+        retired_file.unlink(missing_ok=True)
+        self._use_keys(self.encryption_key)
     
     def _decrypt_data(self, encrypted_data):
-        """Decrypt data after loading"""
+        """Decrypt a legacy profile (base64 of a single Fernet token)"""
         if not self.encryption_enabled or not self.cipher:
             return encrypted_data
         
         try:
             encrypted_bytes = base64.b64decode(encrypted_data.encode())
             decrypted = self.cipher.decrypt(encrypted_bytes)
-            return json.loads(decrypted.decode())
+            return serialization.loads(decrypted)
         except (base64.binascii.Error, json.JSONDecodeError) as e:
             # Likely legacy unencrypted data - return as is
             import logging
@@ -87,113 +219,343 @@ class DataStore:
             raise ValueError(f"Failed to decrypt data. The encryption key may be incorrect or the data may be corrupted: {e}")
     
     def _get_user_file(self, user_id):
-        """Get the file path for a user's data"""
+        """Get the file path for a user's data (plain or legacy JSON)"""
         return self.data_dir / f"{user_id}.json"
+
+    def _get_container_file(self, user_id):
+        """Get the file path for a user's encrypted profile container"""
+        return self.data_dir / f"{user_id}{CONTAINER_SUFFIX}"
+
+    def _profile_file(self, user_id):
+        """Return whichever profile file exists, preferring the container"""
+        container_file = self._get_container_file(user_id)
+        if container_file.exists():
+            return container_file
+        return self._get_user_file(user_id)
     
-    def save_user_data(self, user_id, data):
-        """Save user profile and history data with optional encryption"""
-        user_file = self._get_user_file(user_id)
-        
-        # Convert datetime objects to strings for JSON serialization
-        serializable_data = self._prepare_for_serialization(data)
-        
+    def _write_atomic(self, path, data):
+        """Write *data* (``str`` or ``bytes``) to *path* via a temp file, fsync and ``os.replace``.
+
+        Readers see either the old or the new file, never a partial one,
+        even if the process dies mid-write.
+        """
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        fd, tmp_name = tempfile.mkstemp(dir=self.data_dir, prefix=f".{path.name}.", suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(tmp_name, 0o600)
+            os.replace(tmp_name, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+
+    @staticmethod
+    def _file_signature(path):
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _write_user_file(self, user_id, encoded):
+        """Write a profile given as encoded JSON bytes; returns the file signature"""
         if self.encryption_enabled and self.cipher:
-            # Save encrypted data
-            encrypted_data = self._encrypt_data(serializable_data)
-            with open(user_file, 'w') as f:
-                json.dump({'encrypted': True, 'data': encrypted_data}, f)
+            return self._write_container(user_id, serialization.loads(encoded))
+        # Save unencrypted data
+        user_file = self._get_user_file(user_id)
+        self._write_atomic(user_file, encoded)
+        # Encryption was switched off: the container is now stale
+        self._get_container_file(user_id).unlink(missing_ok=True)
+        self._persisted.pop(user_id, None)
+        return self._file_signature(user_file)
+
+    def _write_container(self, user_id, serializable_data):
+        """Append the changed records, or rewrite the container compactly
+
+        Appends are only safe when this store knows the file's current
+        contents (same signature as its last read/write); otherwise, and
+        once ``container_compact_records`` records have accumulated, the
+        file is rewritten atomically.
+        """
+        container_file = self._get_container_file(user_id)
+        container = EncryptedContainer(container_file, self.cipher)
+        previous = self._persisted.get(user_id)
+        plan = None
+        if (previous is not None
+                and previous[1] == self._file_signature(container_file)
+                and previous[2] < self.container_compact_records):
+            plan = diff_profile(previous[0], serializable_data)
+        if plan is None:
+            records = container.rewrite(serializable_data)
         else:
-            # Save unencrypted data
-            with open(user_file, 'w') as f:
-                json.dump(serializable_data, f, indent=2)
-        
-        # Set file permissions to owner-only
-        os.chmod(user_file, 0o600)
-    
+            header, appends, snapshots, trims = plan
+            records = previous[2] + container.append(header, appends, snapshots, trims)
+        # A legacy single-token JSON file is superseded by the container
+        self._get_user_file(user_id).unlink(missing_ok=True)
+        signature = self._file_signature(container_file)
+        self._persisted[user_id] = (serializable_data, signature, records)
+        return signature
+
+    def save_user_data(self, user_id, data):
+        """Save user profile and history data with optional encryption
+
+        Writes are atomic.  In write-back mode the profile is only cached
+        and marked dirty; see :meth:`flush`.
+        """
+        # Encoded once (datetimes as ISO strings); the cache holds the bytes,
+        # so it never aliases *data*.
+        encoded = serialization.dumps(data)
+
+        with self._cache_lock:
+            if self.write_back_ms > 0:
+                self._profile_cache[user_id] = (encoded, None)
+                self._dirty.add(user_id)
+                self._schedule_flush()
+                return
+            signature = self._write_user_file(user_id, encoded)
+            self._profile_cache[user_id] = (encoded, signature)
+            self._dirty.discard(user_id)
+
+    def _schedule_flush(self):
+        _WRITE_BACK_STORES.add(self)
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(self.write_back_ms / 1000.0, self._timed_flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def _timed_flush(self):
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error("Write-back flush failed: %s", e)
+
+    def flush(self, user_id=None):
+        """Write dirty cached profiles to disk; returns the number written.
+
+        Flushes only *user_id* when given, otherwise every dirty profile.
+        A no-op in write-through mode.
+        """
+        with self._cache_lock:
+            if user_id is None:
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+                pending = sorted(self._dirty)
+            else:
+                pending = [user_id] if user_id in self._dirty else []
+            for uid in pending:
+                encoded, _ = self._profile_cache[uid]
+                self._profile_cache[uid] = (encoded, self._write_user_file(uid, encoded))
+                self._dirty.discard(uid)
+            if not self._dirty and self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            return len(pending)
+
     def load_user_data(self, user_id):
-        """Load user profile and history data with optional decryption"""
-        user_file = self._get_user_file(user_id)
-        
-        if not user_file.exists():
+        """Load user profile and history data with optional decryption
+
+        Served from the decoded-profile cache when the entry is dirty or the
+        file is unchanged since it was cached; otherwise read from disk.
+        """
+        user_file = self._profile_file(user_id)
+
+        with self._cache_lock:
+            cached = self._profile_cache.get(user_id)
+            if cached is not None and (user_id in self._dirty
+                                       or cached[1] == self._file_signature(user_file)):
+                # Decoding builds new containers, so callers may mutate
+                # the result freely.
+                return serialization.decode_profile(cached[0])
+
+        signature = self._file_signature(user_file)
+        if signature is None:
             return None
-        
-        with open(user_file, 'r') as f:
-            data = json.load(f)
-        
-        # Check if data is encrypted
-        if isinstance(data, dict) and data.get('encrypted'):
-            # Decrypt the data
-            decrypted_data = self._decrypt_data(data['data'])
-            return self._restore_from_serialization(decrypted_data)
+
+        if user_file.suffix == CONTAINER_SUFFIX:
+            container = self._open_container(user_file)
+            plain, records = container.load()
+            with self._cache_lock:
+                if not container.truncated:
+                    self._persisted[user_id] = (plain, signature, records)
+            # _persisted keeps *plain* for diffing, so decode a fresh copy
+            encoded = serialization.dumps(plain)
+            data = serialization.loads(encoded)
         else:
-            # Unencrypted legacy data
-            return self._restore_from_serialization(data)
-    
+            encoded = user_file.read_bytes()
+            data = serialization.loads(encoded)
+
+            # Check if data is encrypted (legacy single-token format)
+            if isinstance(data, dict) and data.get('encrypted'):
+                # Decrypt the data
+                data = self._decrypt_data(data['data'])
+                encoded = serialization.dumps(data)
+
+        with self._cache_lock:
+            if user_id not in self._dirty:
+                self._profile_cache[user_id] = (encoded, signature)
+        return serialization.restore_datetimes(data)
+
+    def _open_container(self, path):
+        if not self.cipher:
+            raise ValueError(
+                f"{path.name} is encrypted but data encryption is disabled; "
+                "enable ENABLE_DATA_ENCRYPTION to read it")
+        return EncryptedContainer(path, self.cipher)
+
+    def load_user_section(self, user_id, section):
+        """Load one part of a profile, e.g. ``'chat_history'``
+
+        Nested keys use dots (``'session.chat_history'``).  For encrypted
+        containers only the records of a history section are decrypted.
+        Returns ``None`` when the user or the section does not exist.
+        """
+        user_file = self._profile_file(user_id)
+        with self._cache_lock:
+            cached = self._profile_cache.get(user_id)
+            use_cache = cached is not None and (
+                user_id in self._dirty or cached[1] == self._file_signature(user_file))
+        if use_cache:
+            data = serialization.loads(cached[0])
+        elif section in HISTORY_SECTIONS and user_file.suffix == CONTAINER_SUFFIX:
+            items = self._open_container(user_file).load_section(section)
+            if items is None:
+                return None
+            return serialization.restore_datetimes(items, serialization.schema_for(section))
+        else:
+            # Already decoded, datetimes included
+            data = self.load_user_data(user_id)
+            if data is None:
+                return None
+        for key in section.split('.'):
+            if not isinstance(data, dict) or key not in data:
+                return None
+            data = data[key]
+        if use_cache:
+            data = serialization.restore_datetimes(data, serialization.schema_for(section))
+        return data
+
     def user_exists(self, user_id):
         """Check if a user profile exists"""
-        return self._get_user_file(user_id).exists()
-    
+        return (user_id in self._dirty
+                or self._get_container_file(user_id).exists()
+                or self._get_user_file(user_id).exists())
+
     def list_users(self):
         """List all user IDs with profiles"""
         users = []
-        for file in self.data_dir.glob("*.json"):
-            users.append(file.stem)
+        for pattern in ("*.json", f"*{CONTAINER_SUFFIX}"):
+            for file in self.data_dir.glob(pattern):
+                # Skip backups and legacy session logs that share the directory
+                if _NON_PROFILE_STEM.search(file.stem) or file.stem in users:
+                    continue
+                users.append(file.stem)
+        users.extend(uid for uid in sorted(self._dirty) if uid not in users)
         return users
-    
+
     def delete_user_data(self, user_id):
         """Delete a user's data (user control)"""
-        user_file = self._get_user_file(user_id)
-        if user_file.exists():
-            user_file.unlink()
-            return True
-        return False
+        with self._cache_lock:
+            self._profile_cache.pop(user_id, None)
+            self._persisted.pop(user_id, None)
+            was_dirty = user_id in self._dirty
+            self._dirty.discard(user_id)
+        deleted = False
+        for user_file in (self._get_container_file(user_id), self._get_user_file(user_id)):
+            if user_file.exists():
+                user_file.unlink()
+                deleted = True
+        return deleted or was_dirty
     
-    def _prepare_for_serialization(self, data):
-        """Convert datetime objects to ISO format strings"""
-        if isinstance(data, dict):
-            return {k: self._prepare_for_serialization(v) for k, v in data.items()}
-        elif isinstance(data, list):
-            return [self._prepare_for_serialization(item) for item in data]
-        elif isinstance(data, datetime):
-            return data.isoformat()
-        else:
-            return data
-    
-    def _restore_from_serialization(self, data):
-        """Restore datetime objects from ISO format strings"""
-        if isinstance(data, dict):
-            # Check if this dict has datetime fields to restore
-            result = {}
-            datetime_fields = ['timestamp', 'created_at', 'last_session', 'added_at', 'marked_at', 
-                             'last_activity', 'lockout_until']
-            for k, v in data.items():
-                if k in datetime_fields and isinstance(v, str):
-                    try:
-                        result[k] = datetime.fromisoformat(v)
-                    except (ValueError, TypeError):
-                        result[k] = v
-                else:
-                    result[k] = self._restore_from_serialization(v)
-            return result
-        elif isinstance(data, list):
-            return [self._restore_from_serialization(item) for item in data]
+    # ------------------------------------------------------------------
+    # Backups
+    # ------------------------------------------------------------------
+
+    @property
+    def backup_store(self):
+        """Incremental chunk store in ``<data_dir>/backups`` (created on first use)"""
+        if self._backup_store is None:
+            self._backup_store = BackupStore(
+                self.data_dir / 'backups',
+                compression=config.BACKUP_COMPRESSION)
+        return self._backup_store
+
+    def _backup_payload(self, user_id):
+        """Return ``(bytes, suffix)`` of the stored profile, or ``None``"""
+        user_file = self._profile_file(user_id)
+        try:
+            return user_file.read_bytes(), user_file.suffix
+        except FileNotFoundError:
+            return None
+
+    def _restore_payload(self, user_id, data, suffix):
+        if suffix == CONTAINER_SUFFIX:
+            target, stale = self._get_container_file(user_id), self._get_user_file(user_id)
         else:
-            return data
-    
+            target, stale = self._get_user_file(user_id), self._get_container_file(user_id)
+        self._write_atomic(target, data)
+        stale.unlink(missing_ok=True)
+
     def create_backup(self, user_id):
-        """Create a backup of user data"""
-        user_file = self._get_user_file(user_id)
-        if user_file.exists():
-            backup_file = self.data_dir / f"{user_id}_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            import shutil
-            shutil.copy2(user_file, backup_file)
-            os.chmod(backup_file, 0o600)
-            return backup_file
-        return None
+        """Create an incremental backup snapshot of user data
+
+        Only chunks that changed since earlier snapshots are stored (see
+        :mod:`backup_store`); the ``BACKUP_KEEP_*`` retention policy is
+        applied afterwards.  Returns the snapshot's manifest path, or
+        ``None`` if the user has no stored profile.
+        """
+        self.flush(user_id)
+        payload = self._backup_payload(user_id)
+        if payload is None:
+            return None
+        manifest = self.backup_store.snapshot(user_id, *payload)
+        self.prune_backups(user_id)
+        return self.backup_store.manifest_path(user_id, manifest['snapshot_id'])
+
+    def list_backups(self, user_id):
+        """Snapshot ids of the user's backups, oldest first"""
+        return self.backup_store.list_snapshots(user_id)
+
+    def restore_backup(self, user_id, snapshot_id=None):
+        """Replace the user's profile with a backup (default: the latest)
+
+        Unflushed write-back changes for the user are discarded.  Raises
+        ``KeyError`` if there is no such snapshot and ``ValueError`` if it
+        fails verification.  Returns the snapshot's manifest.
+        """
+        data, manifest = self.backup_store.read(user_id, snapshot_id)
+        with self._cache_lock:
+            self._dirty.discard(user_id)
+            self._profile_cache.pop(user_id, None)
+            self._persisted.pop(user_id, None)
+            self._restore_payload(user_id, data, manifest['suffix'])
+        logger.info("Restored %s from backup snapshot %s", user_id, manifest['snapshot_id'])
+        return manifest
+
+    def verify_backups(self, user_id=None, full=False):
+        """Verify backup snapshots; see :meth:`BackupStore.verify`"""
+        return self.backup_store.verify(user_id, full=full)
+
+    def prune_backups(self, user_id, keep_last=None, keep_daily=None, keep_weekly=None):
+        """Apply the retention policy (``BACKUP_KEEP_*`` by default); returns deleted ids"""
+        return self.backup_store.apply_retention(
+            user_id,
+            keep_last=keep_last if keep_last is not None else config.BACKUP_KEEP_LAST,
+            keep_daily=keep_daily if keep_daily is not None else config.BACKUP_KEEP_DAILY,
+            keep_weekly=keep_weekly if keep_weekly is not None else config.BACKUP_KEEP_WEEKLY,
+        )
     
     def get_data_integrity_hash(self, user_id):
         """Calculate integrity hash for user data"""
-        user_file = self._get_user_file(user_id)
+        self.flush(user_id)
+        user_file = self._profile_file(user_id)
         if not user_file.exists():
             return None
         
@@ -205,23 +567,345 @@ class DataStore:
     # Research session logging
     # ------------------------------------------------------------------
 
+    def _session_log_file(self, user_id, index=0):
+        """Path of the active (``index=0``) or a rotated session log file."""
+        if index:
+            return self.data_dir / f"{user_id}_session_log.{index}.jsonl"
+        return self.data_dir / f"{user_id}_session_log.jsonl"
+
+    def _legacy_session_log_file(self, user_id):
+        return self.data_dir / f"{user_id}_session_data.json"
+
     def save_session_log(self, user_id: str, entry: dict) -> None:
-        """Append a research log entry to the user's ``session_data.json``.
+        """Append a research log entry to the user's session log.
 
         Each entry is a dict with at least ``timestamp``, ``message``,
-        ``emotion``, ``confidence``, ``risk_level``.  The file is a JSON
-        array of such entries, suitable for offline research analysis.
+        ``emotion``, ``confidence``, ``risk_level``.  Entries are written
+        as one JSON object per line (JSON Lines) to
+        ``<user>_session_log.jsonl``, so an append costs O(1) regardless
+        of how long the session has been running.  Durability follows
+        ``session_log_fsync``; the file is rotated once it exceeds
+        ``session_log_max_bytes``.  A legacy ``<user>_session_data.json``
+        array is migrated on first use.
         """
-        log_file = self.data_dir / f"{user_id}_session_data.json"
-        entries: list = []
-        if log_file.exists():
+        if self._legacy_session_log_file(user_id).exists():
+            self.migrate_legacy_session_log(user_id)
+
+        line = serialization.dumps(entry) + b'\n'
+        log_file = self._session_log_file(user_id)
+        with self._session_log_lock:
+            try:
+                size = log_file.stat().st_size
+            except FileNotFoundError:
+                size = 0
+            if size and self.session_log_max_bytes and size + len(line) > self.session_log_max_bytes:
+                self._rotate_session_log(user_id)
+
+            fd = os.open(log_file, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o600)
             try:
-                with open(log_file, "r", encoding="utf-8") as fh:
-                    entries = json.load(fh)
-            except (json.JSONDecodeError, OSError):
-                entries = []
-
-        entries.append(self._prepare_for_serialization(entry))
-        with open(log_file, "w", encoding="utf-8") as fh:
-            json.dump(entries, fh, indent=2)
-        os.chmod(log_file, 0o600)
+                # A crash mid-write leaves a torn last line; terminate it so
+                # this entry starts a line of its own instead of being glued
+                # onto the fragment and skipped with it.
+                end = os.fstat(fd).st_size
+                if end and os.pread(fd, 1, end - 1) != b'\n':
+                    line = b'\n' + line
+                # A single write() on an O_APPEND descriptor keeps lines whole
+                # even with several writers.
+                os.write(fd, line)
+                if self._should_fsync(user_id):
+                    os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    def _should_fsync(self, user_id):
+        if self.session_log_fsync == 'always':
+            return True
+        if self.session_log_fsync == 'never':
+            return False
+        now = time.monotonic()
+        last = self._session_log_last_fsync.get(user_id)
+        if last is None or now - last >= self.session_log_fsync_interval:
+            self._session_log_last_fsync[user_id] = now
+            return True
+        return False
+
+    def _rotate_session_log(self, user_id):
+        """Shift ``.jsonl`` → ``.1.jsonl`` → … dropping the oldest beyond the backup count."""
+        keep = self.session_log_backup_count
+        if keep <= 0:
+            self._session_log_file(user_id).unlink(missing_ok=True)
+            return
+        self._session_log_file(user_id, keep).unlink(missing_ok=True)
+        for index in range(keep - 1, 0, -1):
+            src = self._session_log_file(user_id, index)
+            if src.exists():
+                os.replace(src, self._session_log_file(user_id, index + 1))
+        os.replace(self._session_log_file(user_id), self._session_log_file(user_id, 1))
+
+    def iter_session_log(self, user_id: str, include_rotated: bool = True,
+                         migrate_legacy: bool = True):
+        """Yield session log entries oldest-first without loading the whole log.
+
+        Rotated files are read before the active one when
+        ``include_rotated`` is true.  A truncated trailing line (e.g. after a
+        crash mid-write) is skipped rather than raising.  A legacy JSON
+        array is migrated first, or read in place when ``migrate_legacy``
+        is false.
+        """
+        legacy = self._legacy_session_log_file(user_id)
+        if legacy.exists():
+            if migrate_legacy:
+                self.migrate_legacy_session_log(user_id)
+            else:
+                try:
+                    with open(legacy, 'r', encoding='utf-8') as fh:
+                        entries = json.load(fh)
+                except (json.JSONDecodeError, OSError):
+                    entries = []
+                if isinstance(entries, list):
+                    yield from entries
+
+        files = []
+        if include_rotated:
+            files.extend(self._session_log_file(user_id, index)
+                         for index in range(self.session_log_backup_count, 0, -1))
+        files.append(self._session_log_file(user_id))
+
+        for path in files:
+            try:
+                fh = open(path, 'r', encoding='utf-8')
+            except FileNotFoundError:
+                continue
+            with fh:
+                for lineno, line in enumerate(fh, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        yield serialization.loads(line)
+                    except json.JSONDecodeError:
+                        logger.warning("Skipping malformed session log line %s:%d", path.name, lineno)
+
+    def migrate_legacy_session_log(self, user_id: str) -> int:
+        """Convert a legacy ``<user>_session_data.json`` array to JSON Lines.
+
+        Legacy entries are placed before any entries already in the active
+        JSONL file.  The new file is written beside the old one and swapped
+        in with ``os.replace``; the legacy file is then renamed to
+        ``<user>_session_data.json.migrated``.  Returns the number of
+        entries migrated (0 when there is nothing to migrate).
+        """
+        legacy = self._legacy_session_log_file(user_id)
+        if not legacy.exists():
+            return 0
+        # Held across the copy and both renames: a concurrent append would
+        # otherwise land in the file being replaced and be lost, and a
+        # second migration would copy the legacy entries again.
+        with self._session_log_lock:
+            if not legacy.exists():
+                return 0
+            return self._migrate_legacy_session_log_locked(user_id, legacy)
+
+    def _migrate_legacy_session_log_locked(self, user_id, legacy):
+        try:
+            with open(legacy, 'r', encoding='utf-8') as fh:
+                entries = json.load(fh)
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning("Legacy session log %s unreadable, not migrated: %s", legacy.name, e)
+            entries = []
+        if not isinstance(entries, list):
+            entries = []
+
+        log_file = self._session_log_file(user_id)
+        fd, tmp_name = tempfile.mkstemp(
+            dir=self.data_dir, prefix=f".{log_file.name}.", suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                for entry in entries:
+                    out.write(serialization.dumps(entry) + b'\n')
+                if log_file.exists():
+                    with open(log_file, 'rb') as current:
+                        for chunk in iter(lambda: current.read(1 << 16), b''):
+                            out.write(chunk)
+                out.flush()
+                os.fsync(out.fileno())
+            os.chmod(tmp_name, 0o600)
+            os.replace(tmp_name, log_file)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+        os.replace(legacy, legacy.with_name(legacy.name + '.migrated'))
+        logger.info("Migrated %d legacy session log entries for %s", len(entries), user_id)
+        return len(entries)
+
+    def migrate_legacy_session_logs(self) -> dict:
+        """Run :meth:`migrate_legacy_session_log` for every legacy file in ``data_dir``.
+
+        Returns a mapping of user id to number of entries migrated.
+        """
+        suffix = '_session_data.json'
+        migrated = {}
+        for path in sorted(self.data_dir.glob(f"*{suffix}")):
+            user_id = path.name[:-len(suffix)]
+            migrated[user_id] = self.migrate_legacy_session_log(user_id)
+        return migrated
+
+    # ------------------------------------------------------------------
+    # Retention (see retention.py)
+    # ------------------------------------------------------------------
+
+    def list_session_log_users(self):
+        """User ids with a session log, including ones without a profile"""
+        users = set()
+        for path in self.data_dir.glob('*_session_log*.jsonl'):
+            match = _SESSION_LOG_NAME.match(path.name)
+            if match:
+                users.add(match.group(1))
+        for path in self.data_dir.glob('*_session_data.json'):
+            users.add(path.name[:-len('_session_data.json')])
+        return sorted(users)
+
+    def _session_summary_file(self, user_id):
+        return self.data_dir / f"{user_id}_session_summary.jsonl"
+
+    def iter_session_summary(self, user_id):
+        """Yield the daily session log summaries written by retention, oldest day first"""
+        try:
+            fh = open(self._session_summary_file(user_id), 'rb')
+        except FileNotFoundError:
+            return
+        with fh:
+            for line in fh:
+                if line.strip():
+                    yield serialization.loads(line)
+
+    def _merge_session_summaries(self, user_id, summaries, summary_cutoff=None):
+        """Add *summaries* (day → summary) to the stored ones, dropping days before *summary_cutoff*"""
+        merged = {s['date']: s for s in self.iter_session_summary(user_id)}
+        for day, summary in summaries.items():
+            if day in merged:
+                retention.merge_session_summary(merged[day], summary)
+            else:
+                merged[day] = summary
+        if summary_cutoff is not None:
+            merged = {day: s for day, s in merged.items()
+                      if day == retention.UNDATED or day >= summary_cutoff}
+        path = self._session_summary_file(user_id)
+        if merged:
+            self._write_atomic(path, b''.join(
+                serialization.dumps(merged[day]) + b'\n' for day in sorted(merged)))
+        else:
+            path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _is_before(entry, before):
+        sent = retention.parse_timestamp(entry.get('timestamp')) if isinstance(entry, dict) else None
+        return sent is not None and sent < before
+
+    def compact_session_log(self, user_id, before, summary_cutoff=None):
+        """Fold session log entries older than *before* into daily summaries
+
+        Log files are read oldest-first; a file whose first entry is recent
+        ends the scan (the log is append-ordered), so a run with nothing to
+        do reads one line.  Files holding only old entries are deleted, the
+        file with the boundary is rewritten atomically without them.
+        Summaries are merged into ``<user>_session_summary.jsonl`` first,
+        and days before ISO date *summary_cutoff* are dropped from it.
+
+        Returns ``{'entries': summarized, 'days': day summaries touched}``.
+        """
+        if self._legacy_session_log_file(user_id).exists():
+            self.migrate_legacy_session_log(user_id)
+        files = [self._session_log_file(user_id, index)
+                 for index in range(self.session_log_backup_count, 0, -1)]
+        files.append(self._session_log_file(user_id))
+
+        removed, days = 0, set()
+        with self._session_log_lock:
+            for path in files:
+                try:
+                    fh = open(path, 'rb')
+                except FileNotFoundError:
+                    continue
+                summaries, kept, old = {}, [], 0
+                with fh:
+                    for line in fh:
+                        if not line.strip():
+                            continue
+                        try:
+                            entry = serialization.loads(line)
+                        except json.JSONDecodeError:
+                            continue  # unreadable lines are dropped on rewrite
+                        if self._is_before(entry, before):
+                            retention.summarize_session_entries((entry,), summaries)
+                            old += 1
+                        elif not old and not kept:
+                            break  # first entry is recent: nothing to compact
+                        else:
+                            kept.append(line)
+                if not old:
+                    break
+                self._merge_session_summaries(user_id, summaries)
+                days.update(summaries)
+                removed += old
+                if kept:
+                    self._write_atomic(path, b''.join(kept))
+                    break
+                path.unlink()
+            if summary_cutoff is not None and self._session_summary_file(user_id).exists():
+                self._merge_session_summaries(user_id, {}, summary_cutoff)
+        if removed:
+            logger.info("Summarized %d session log entries for %s", removed, user_id)
+        return {'entries': removed, 'days': len(days)}
+
+    def compact_profile(self, user_id):
+        """Rewrite an encrypted profile container without superseded records
+
+        Containers grow by appending changed records; retention calls this
+        after shrinking a profile so the space is actually reclaimed.
+        Returns ``True`` if the container was rewritten.
+        """
+        with self._cache_lock:
+            self.flush(user_id)
+            if not self._get_container_file(user_id).exists():
+                return False
+            data = self.load_user_data(user_id)
+            if not isinstance(data, dict):
+                return False
+            self._persisted.pop(user_id, None)
+            encoded = serialization.dumps(data)
+            self._profile_cache[user_id] = (encoded, self._write_user_file(user_id, encoded))
+            return True
+
+    def vacuum(self):
+        """Return free space to the OS (files are rewritten in place: nothing to do)"""
+        return 0
+
+    def storage_bytes(self):
+        """Bytes used by profiles, session logs and summaries (not backups or keys)"""
+        total = 0
+        for path in self.data_dir.iterdir():
+            if path.name.startswith('.') or not path.is_file():
+                continue
+            if path.suffix in ('.json', '.jsonl', CONTAINER_SUFFIX):
+                total += path.stat().st_size
+        return total
+
+
+def open_data_store(data_dir=None, engine=None, **kwargs):
+    """Return a data store using the configured storage *engine*.
+
+    ``engine`` defaults to ``config.DATA_STORE_ENGINE``: ``'json'`` gives a
+    :class:`DataStore` (one file per user), ``'sqlite'`` a
+    :class:`sqlite_store.SQLiteDataStore` (single WAL-mode database in
+    *data_dir*).  Both expose the same API.
+    """
+    engine = engine or config.DATA_STORE_ENGINE
+    if engine not in DATA_STORE_ENGINES:
+        raise ValueError(f"engine must be one of {DATA_STORE_ENGINES}, got {engine!r}")
+    if engine == 'sqlite':
+        from sqlite_store import SQLiteDataStore
+        return SQLiteDataStore(data_dir, **kwargs)
+    return DataStore(data_dir, **kwargs)
@@ -15,81 +15,50 @@ standalone, lazy-loading transformer classifier that is now the primary ML
 backend used by :class:`EmotionAnalyzer`.  The legacy :class:`MLEmotionAdapter`
 is kept for backward compatibility but the main ``classify_emotion()`` flow
 delegates to ``EmotionTransformer``.
+
+Importing this module is cheap: the sentiment lexicon is compiled on the
+first sentiment call (see :mod:`sentiment_lexicon`; TextBlob and NLTK are
+never imported), and no model is loaded until an adapter is first used or
+:meth:`EmotionAnalyzer.warmup` is called.
 """
 
-try:
-    from textblob import TextBlob
-except ImportError as _tb_err:
-    raise ImportError(
-        "TextBlob not installed. Run: pip install textblob && python -m textblob.download_corpora"
-    ) from _tb_err
 from datetime import datetime
 import math
 import re
+import config
+import model_registry
+import sentiment_lexicon
+import text_windows
 from language_handler import (
     TANGLISH_EMOTION_KEYWORDS,
     TAMIL_UNICODE_EMOTION_KEYWORDS,
     LanguageHandler,
 )
 from models.emotion_transformer import EmotionTransformer
-from explainability import generate_explanation
+from emotion_result import EmotionResult
 
 
 # ---------------------------------------------------------------------------
-# Cached pipeline loaders – @st.cache_resource when Streamlit is available
+# Pipeline loaders – shared process-wide through model_registry
 # ---------------------------------------------------------------------------
 
-def _load_ml_emotion_pipeline_impl():
-    """Load the HuggingFace emotion text-classification pipeline."""
-    from transformers import pipeline as _hf_pipeline
-    return _hf_pipeline(
-        'text-classification',
-        model='j-hartmann/emotion-english-distilroberta-base',
-        top_k=None,
-        device=-1,
-    )
-
-
-def _load_crisis_pipeline_impl():
-    """Load the HuggingFace zero-shot crisis classification pipeline."""
-    from transformers import pipeline as _hf_pipeline
-    return _hf_pipeline(
-        'zero-shot-classification',
-        model='facebook/bart-large-mnli',
-        device=-1,
-    )
-
-
-# Process-level pipeline cache for non-Streamlit environments (FastAPI, CLI,
-# tests).  Prevents redundant model loads when multiple EmotionAnalyzer
-# instances are created in the same worker process.
-_PROCESS_ANALYZER_PIPELINE_CACHE: dict[str, object] = {}
+_ML_EMOTION_MODEL = 'j-hartmann/emotion-english-distilroberta-base'
+_CRISIS_MODEL = 'facebook/bart-large-mnli'
 
 
 def load_ml_emotion_pipeline():
     """Process-cached emotion pipeline loader.
 
-    Uses a process-level dict so the heavy HuggingFace model is downloaded
-    and initialised only once per worker process.  Streamlit apps should
-    wrap this with ``@st.cache_resource`` in their own module.
+    The model is held once per process by :mod:`model_registry` and shared
+    with :class:`models.emotion_transformer.EmotionTransformer`.  Raises
+    :class:`model_registry.ModelUnavailable` while a failed load is backing off.
     """
-    key = "ml_emotion"
-    if key not in _PROCESS_ANALYZER_PIPELINE_CACHE:
-        _PROCESS_ANALYZER_PIPELINE_CACHE[key] = _load_ml_emotion_pipeline_impl()
-    return _PROCESS_ANALYZER_PIPELINE_CACHE[key]
+    return model_registry.get_model('text-classification', _ML_EMOTION_MODEL)
 
 
 def load_crisis_pipeline():
-    """Process-cached crisis classification pipeline loader.
-
-    Uses a process-level dict so the heavy HuggingFace model is downloaded
-    and initialised only once per worker process.  Streamlit apps should
-    wrap this with ``@st.cache_resource`` in their own module.
-    """
-    key = "crisis"
-    if key not in _PROCESS_ANALYZER_PIPELINE_CACHE:
-        _PROCESS_ANALYZER_PIPELINE_CACHE[key] = _load_crisis_pipeline_impl()
-    return _PROCESS_ANALYZER_PIPELINE_CACHE[key]
+    """Process-cached crisis classification pipeline loader (see :mod:`model_registry`)."""
+    return model_registry.get_model('zero-shot-classification', _CRISIS_MODEL)
 
 
 class MLEmotionAdapter:
@@ -102,9 +71,14 @@ class MLEmotionAdapter:
 
     Usage
     -----
-    The adapter is instantiated once inside :class:`EmotionAnalyzer`.
-    Call :meth:`classify` to get a ``{emotion: confidence}`` dict or ``None``
-    when the library is unavailable.
+    The adapter is instantiated once inside :class:`EmotionAnalyzer`;
+    construction is free and the model is loaded on the first
+    :meth:`classify` (or ``available`` check).  Call :meth:`classify` to get
+    a ``{emotion: confidence}`` dict or ``None`` when the library is
+    unavailable, or :meth:`classify_batch` to score many texts at once.
+
+    Long texts are classified in overlapping token windows whose scores are
+    averaged (see :mod:`text_windows`), not cut at a character count.
 
     Graceful fallback
     -----------------
@@ -132,17 +106,25 @@ class MLEmotionAdapter:
         'surprise': 'joy',
         'neutral':  'neutral',
     }
-    _MODEL = 'j-hartmann/emotion-english-distilroberta-base'
+    _MODEL = _ML_EMOTION_MODEL
 
     def __init__(self):
-        self.available = False
         self._pipeline = None
-        try:
-            self._pipeline = load_ml_emotion_pipeline()
-            self.available = True
-        except Exception:
-            # ImportError, OSError (model not cached), RuntimeError — any failure
-            pass
+
+    def _load(self):
+        if self._pipeline is None:
+            try:
+                self._pipeline = load_ml_emotion_pipeline()
+            except Exception:
+                # ImportError, OSError (model not cached), RuntimeError — any
+                # failure; the registry backs off before the next attempt.
+                pass
+        return self._pipeline
+
+    @property
+    def available(self):
+        """Whether the model is loaded (loads it on first access)."""
+        return self._load() is not None
 
     def classify(self, text):
         """
@@ -154,17 +136,43 @@ class MLEmotionAdapter:
             ``{emotion_label: confidence_score}`` with labels mapped to the
             internal 7-class schema, or ``None`` when unavailable.
         """
-        if not self.available or self._pipeline is None:
-            return None
+        return self.classify_batch([text])[0]
+
+    def classify_batch(self, texts, batch_size=None):
+        """
+        Classify many texts, batching their token windows by length.
+
+        Returns one :meth:`classify` result per text (all ``None`` when
+        unavailable).
+        """
+        pipeline = self._load()
+        if pipeline is None:
+            return [None] * len(texts)
         try:
-            results = self._pipeline(text[:512])[0]   # top_k=None → list
-            mapped = {}
-            for r in results:
-                label = self._LABEL_MAP.get(r['label'].lower(), r['label'].lower())
-                mapped[label] = mapped.get(label, 0.0) + r['score']
-            return mapped
+            per_text = text_windows.run_windowed(
+                texts,
+                lambda batch: self._per_window(pipeline(batch, truncation=True, batch_size=len(batch))),
+                tokenizer=getattr(pipeline, 'tokenizer', None),
+                max_tokens=config.TRANSFORMER_WINDOW_TOKENS,
+                batch_size=batch_size,
+            )
+            return [text_windows.mean_scores([self._map_labels(r) for r in windows])
+                    for windows in per_text]
         except Exception:
-            return None
+            return [None] * len(texts)
+
+    @staticmethod
+    def _per_window(raw):
+        # top_k=None → one list of label scores per window; a single-window
+        # batch may come back unwrapped
+        return [raw] if raw and isinstance(raw[0], dict) else raw
+
+    def _map_labels(self, results):
+        mapped = {}
+        for r in results:
+            label = self._LABEL_MAP.get(r['label'].lower(), r['label'].lower())
+            mapped[label] = mapped.get(label, 0.0) + r['score']
+        return mapped
 
 
 class ContextualCrisisAdapter:
@@ -172,41 +180,91 @@ class ContextualCrisisAdapter:
     Optional contextual crisis classifier using zero-shot transformer inference.
 
     Falls back gracefully to keyword-only crisis detection if transformers
-    are unavailable.
+    are unavailable.  The model (bart-large-mnli, ~1.6 GB) is loaded on first
+    use, and never when ``config.CONTEXTUAL_CRISIS_MODEL_ENABLED`` is off.
+
+    Long texts are scored in overlapping token windows and the most alarming
+    window wins (see :mod:`text_windows`), so a disclosure late in a long
+    message is not dropped.
     """
 
     _CRISIS_LABELS = ['suicidal ideation', 'severe distress', 'safe statement']
 
     def __init__(self):
-        self.available = False
         self._pipeline = None
-        try:
-            self._pipeline = load_crisis_pipeline()
-            self.available = True
-        except Exception:
-            pass
+
+    def _load(self):
+        if self._pipeline is None and config.CONTEXTUAL_CRISIS_MODEL_ENABLED:
+            try:
+                self._pipeline = load_crisis_pipeline()
+            except Exception:
+                pass
+        return self._pipeline
+
+    @property
+    def available(self):
+        """Whether the model is loaded (loads it on first access)."""
+        return self._load() is not None
 
     def classify(self, text):
         """
         Return contextual crisis probabilities or ``None`` when unavailable.
         """
-        if not self.available or self._pipeline is None:
-            return None
+        return self.classify_batch([text])[0]
+
+    def classify_batch(self, texts, batch_size=None):
+        """
+        Score many texts, batching their token windows by length.
+
+        Returns one :meth:`classify` result per text (all ``None`` when
+        unavailable).
+        """
+        pipeline = self._load()
+        if pipeline is None:
+            return [None] * len(texts)
         try:
-            result = self._pipeline(text[:512], self._CRISIS_LABELS, multi_label=True)
-            scores = dict(zip(result.get('labels', []), result.get('scores', [])))
-            suicidal = float(scores.get('suicidal ideation', 0.0))
-            severe = float(scores.get('severe distress', 0.0))
-            safe = float(scores.get('safe statement', 0.0))
-            crisis_probability = max(suicidal, severe)
-            return {
-                'crisis_probability': round(crisis_probability, 4),
-                'suicidal_ideation_probability': round(suicidal, 4),
-                'severe_distress_probability': round(severe, 4),
-                'safety_probability': round(safe, 4),
-            }
+            per_text = text_windows.run_windowed(
+                texts,
+                lambda batch: self._per_window(pipeline(batch, self._CRISIS_LABELS, multi_label=True,
+                                                        batch_size=len(batch))),
+                tokenizer=getattr(pipeline, 'tokenizer', None),
+                max_tokens=config.CRISIS_WINDOW_TOKENS,
+                batch_size=batch_size,
+            )
+            return [self._aggregate(windows) for windows in per_text]
         except Exception:
-            return None
+            return [None] * len(texts)
+
+    @staticmethod
+    def _per_window(raw):
+        # One result dict per window; a single-window batch may come back unwrapped
+        return [raw] if isinstance(raw, dict) else raw
+
+    @staticmethod
+    def _aggregate(window_results):
+        """Crisis scores of the most alarming window; safety of the least safe one."""
+        windows = [dict(zip(r.get('labels', []), r.get('scores', []))) for r in window_results]
+        peak = text_windows.max_scores(windows)
+        suicidal = float(peak.get('suicidal ideation', 0.0))
+        severe = float(peak.get('severe distress', 0.0))
+        safe = float(min(w.get('safe statement', 0.0) for w in windows))
+        crisis_probability = max(suicidal, severe)
+        return {
+            'crisis_probability': round(crisis_probability, 4),
+            'suicidal_ideation_probability': round(suicidal, 4),
+            'severe_distress_probability': round(severe, 4),
+            'safety_probability': round(safe, 4),
+        }
+
+
+# Inference modes, from full quality to cheapest.  A serving layer under load
+# steps down this list (see backend load shedding); crisis keyword detection
+# runs in every mode.
+INFERENCE_MODES = {
+    'full':         {'fusion_mode': 'hybrid'},
+    'no_nli':       {'fusion_mode': 'hybrid', 'use_crisis_model': False},
+    'keyword_only': {'fusion_mode': 'keyword_only', 'use_transformer': False, 'use_crisis_model': False},
+}
 
 
 class EmotionAnalyzer:
@@ -339,19 +397,61 @@ class EmotionAnalyzer:
         # Transformer-based emotion classifier (lazy-loading, with keyword fallback)
         self._emotion_transformer = EmotionTransformer()
 
-        # Legacy ML adapter kept for backward compatibility (e.g. direct imports)
+        # Legacy ML adapter kept for backward compatibility (e.g. direct imports).
+        # Both adapters load their model on first use; see warmup().
         self.ml_adapter = MLEmotionAdapter()
         self.crisis_adapter = ContextualCrisisAdapter()
 
+    def warmup(self):
+        """Load every model up front instead of on the first message.
+
+        Returns ``{component: available}`` so callers can log what loaded.
+        """
+        try:
+            sentiment_lexicon.load_lexicon()
+            sentiment = True
+        except ImportError:
+            sentiment = False
+        return {
+            'sentiment': sentiment,
+            'emotion_transformer': self._emotion_transformer.available,
+            'ml_adapter': self.ml_adapter.available,
+            'crisis_adapter': self.crisis_adapter.available,
+        }
+
     # ------------------------------------------------------------------
     # ML-fused primary emotion detection (uses ML when available)
     # ------------------------------------------------------------------
 
-    def classify_emotion_ml(self, text):
+    def model_stages(self, inference_mode='full'):
+        """
+        Return the blocking model calls *inference_mode* needs, by stage name.
+
+        ``emotion_model`` is the transformer classifier and ``crisis_model``
+        the zero-shot crisis model; each takes the message text.  Callers
+        that run them elsewhere (e.g. concurrently on worker threads) pass
+        the results to :meth:`classify_emotion_ml` as *model_scores*.
+        """
+        options = INFERENCE_MODES[inference_mode]
+        stages = {}
+        if options.get('use_transformer', True):
+            stages['emotion_model'] = self._emotion_transformer.classify
+        if options.get('use_crisis_model', True):
+            stages['crisis_model'] = self.crisis_adapter.classify
+        return stages
+
+    def classify_emotion_ml(self, text, inference_mode='full', model_scores=None):
         """
         Return the primary emotion using the transformer model when available,
         otherwise fall back to :meth:`detect_primary_emotion`.
 
+        *inference_mode* is a key of :data:`INFERENCE_MODES`; it is echoed in
+        the result as ``inference_mode``.
+
+        *model_scores* holds precomputed results of :meth:`model_stages`.
+        When given, no model is called here: a stage missing from it (e.g.
+        one that missed its deadline) is treated as unavailable.
+
         The ML confidence score is fused with the heuristic keyword score
         (weighted 70 % ML + 30 % keyword) when both are available.
 
@@ -362,10 +462,23 @@ class EmotionAnalyzer:
            inside :meth:`classify_emotion` (via the single-message cache in
            :class:`EmotionTransformer`) so no extra inference pass is needed.
         """
-        result = self.classify_emotion(text)
-        # Reuse cached transformer scores — no duplicate inference
-        transformer_scores = self._emotion_transformer.classify(text)
-        ml_available = self._emotion_transformer.available
+        options = dict(INFERENCE_MODES[inference_mode])
+        if model_scores is not None:
+            options['transformer_scores'] = model_scores.get('emotion_model')
+            options['crisis_scores'] = model_scores.get('crisis_model')
+            options['use_transformer'] = (options.get('use_transformer', True)
+                                          and options['transformer_scores'] is not None)
+            options['use_crisis_model'] = (options.get('use_crisis_model', True)
+                                           and options['crisis_scores'] is not None)
+        result = self.classify_emotion(text, **options)
+        result['inference_mode'] = inference_mode
+        if options.get('use_transformer', True):
+            # Reuse cached transformer scores — no duplicate inference
+            transformer_scores = (options['transformer_scores'] if model_scores is not None
+                                  else self._emotion_transformer.classify(text))
+            ml_available = self._emotion_transformer.available
+        else:
+            transformer_scores, ml_available = None, False
         result['ml_available'] = ml_available
         result['ml_scores'] = transformer_scores if ml_available else None
 
@@ -447,18 +560,18 @@ class EmotionAnalyzer:
         }
 
     # ------------------------------------------------------------------
-    # Sentiment analysis (TextBlob)
+    # Sentiment analysis (TextBlob-compatible lexicon scorer)
     # ------------------------------------------------------------------
 
     def analyze_sentiment(self, text):
         """
-        Analyze sentiment of text using TextBlob.
+        Analyze sentiment of text (same scores as TextBlob, see sentiment_lexicon).
         Returns polarity (-1 to 1) and subjectivity (0 to 1).
         """
-        blob = TextBlob(text)
+        polarity, subjectivity = sentiment_lexicon.sentiment(text)
         return {
-            'polarity': blob.sentiment.polarity,
-            'subjectivity': blob.sentiment.subjectivity,
+            'polarity': polarity,
+            'subjectivity': subjectivity,
             'timestamp': datetime.now()
         }
 
@@ -476,13 +589,20 @@ class EmotionAnalyzer:
         text_lower = text.lower()
         return [kw for kw in self.abuse_keywords if kw in text_lower]
 
-    def detect_crisis_indicators(self, text):
-        """Detect crisis / self-harm keywords requiring immediate escalation"""
+    def detect_crisis_indicators(self, text, contextual=True):
+        """Detect crisis / self-harm keywords requiring immediate escalation.
+
+        With *contextual* off the zero-shot crisis model is skipped; the
+        keyword check always runs.
+        """
+        context_scores = self.crisis_adapter.classify(text) if contextual else None
+        return self._crisis_indicators(text, context_scores)
+
+    def _crisis_indicators(self, text, context_scores):
         text_lower = text.lower()
         matched_keywords = [kw for kw in self.crisis_keywords if kw in text_lower]
 
         # Contextual escalation: catches self-harm intent without explicit keywords
-        context_scores = self.crisis_adapter.classify(text)
         if context_scores and context_scores['crisis_probability'] >= 0.75:
             matched_keywords.append('contextual_crisis_signal')
 
@@ -505,12 +625,13 @@ class EmotionAnalyzer:
                     scores[emo] += 1
         return scores
 
-    def get_emotion_confidence(self, text):
+    def get_emotion_confidence(self, text, polarity=None):
         """
         Return normalized confidence scores (0.0–1.0) per emotion,
         representing the proportion of matched keywords belonging to each class.
         Scores for all emotion classes (including 'crisis') sum to 1.0.
-        Falls back to polarity-based distribution when no keywords match.
+        Falls back to polarity-based distribution when no keywords match;
+        *polarity* supplies a sentiment score already computed for *text*.
         """
         text_lower = text.lower()
         # Initialise with all emotion classes plus 'crisis' explicitly upfront
@@ -530,8 +651,8 @@ class EmotionAnalyzer:
 
         if total == 0:
             # Polarity-based fallback when no keywords matched
-            sentiment = self.analyze_sentiment(text)
-            polarity = sentiment['polarity']
+            if polarity is None:
+                polarity = self.analyze_sentiment(text)['polarity']
             base = {emo: 0.0 for emo in raw_scores}
             if polarity > 0.2:
                 base['joy'] = 1.0
@@ -736,12 +857,16 @@ class EmotionAnalyzer:
     # Main classification entry point
     # ------------------------------------------------------------------
 
-    def classify_emotion(self, text, *, fusion_mode: str = "hybrid"):
+    def classify_emotion(self, text, *, fusion_mode: str = "hybrid",
+                         use_transformer: bool = True, use_crisis_model: bool = True,
+                         transformer_scores=None, crisis_scores=None):
         """Classify emotional state based on sentiment and keywords.
 
-        Handles English, Tamil Unicode, and Tanglish input.  Returns a dict
+        Handles English, Tamil Unicode, and Tanglish input.  Returns an
+        :class:`~emotion_result.EmotionResult` (a dict-compatible mapping)
         with both coarse (backward-compat) and fine-grained emotion data, plus
-        XAI explanation and crisis flag.
+        XAI explanation and crisis flag; the explanations and aliases are
+        computed on first access.
 
         Fusion equation (hybrid mode)
         ------------------------------
@@ -761,6 +886,15 @@ class EmotionAnalyzer:
         - ``"transformer_only"`` — use P_t only (α = 1.0).
         - ``"keyword_only"`` — use P_k only (α = 0.0).
 
+        Load shedding
+        -------------
+        ``use_transformer=False`` replaces the transformer distribution with
+        its keyword fallback and ``use_crisis_model=False`` skips the
+        zero-shot crisis model; crisis keyword detection always runs.  See
+        :data:`INFERENCE_MODES` and :meth:`classify_emotion_ml`.
+        *transformer_scores* / *crisis_scores* supply model outputs computed
+        elsewhere (see :meth:`model_stages`) instead of calling the models.
+
         Intermediate outputs logged in the returned dict
         ------------------------------------------------
         ``pk_distribution``, ``pt_distribution``, ``fusion_alpha``
@@ -768,19 +902,21 @@ class EmotionAnalyzer:
         sentiment = self.analyze_sentiment(text)
         distress_keywords = self.detect_distress_keywords(text)
         abuse_keywords = self.detect_abuse_indicators(text)
-        crisis_keywords_found = self.detect_crisis_indicators(text)
+        # One zero-shot pass serves both the crisis flag and contextual_crisis
+        if use_crisis_model and crisis_scores is None:
+            crisis_scores = self.crisis_adapter.classify(text)
+        contextual_crisis = (crisis_scores if use_crisis_model else None) or {}
+        crisis_keywords_found = self._crisis_indicators(text, contextual_crisis)
 
         polarity = sentiment['polarity']
 
         # --- Script detection for Tamil / Tanglish ---
-        detected_script = self._lang_handler.detect_script(text)
+        # (script and Tamil/Tanglish keyword emotion come from one scan)
+        language_scan = self._lang_handler.scan(text)
+        detected_script = language_scan['script']
 
         # Override primary emotion with Tamil/Tanglish if detected
-        tanglish_emotion = None
-        if detected_script == 'tanglish':
-            tanglish_emotion = self._lang_handler.detect_tanglish_emotion(text)
-        elif detected_script == 'tamil':
-            tanglish_emotion = self._lang_handler.detect_tamil_unicode_emotion(text)
+        tanglish_emotion = language_scan['emotion']
 
         # --- Coarse emotion (backward-compatible) ---
         if crisis_keywords_found:
@@ -815,7 +951,7 @@ class EmotionAnalyzer:
         emotion_scores = self.detect_emotion_scores(text)
 
         # Pk: normalized keyword frequency distribution (sums to 1.0)
-        emotion_probabilities = self.get_emotion_confidence(text)
+        emotion_probabilities = self.get_emotion_confidence(text, polarity)
 
         # Calibrate Pk: re-normalise to ensure a proper probability distribution
         _pk_total = sum(emotion_probabilities.values())
@@ -823,8 +959,9 @@ class EmotionAnalyzer:
             emotion_probabilities = {k: v / _pk_total for k, v in emotion_probabilities.items()}
 
         # Capture Pk before fusion — stored as intermediate output and used for
-        # the adaptive override check
-        pk_distribution = dict(emotion_probabilities)
+        # the adaptive override check.  Every fusion branch below rebinds
+        # emotion_probabilities, so Pk is never mutated and needs no copy.
+        pk_distribution = emotion_probabilities
 
         if pk_distribution:
             _pk_max_label = max(pk_distribution, key=pk_distribution.get)
@@ -836,15 +973,20 @@ class EmotionAnalyzer:
             _keyword_override = False
 
         # Pt: transformer probability distribution
-        transformer_probs = self._emotion_transformer.classify(text)
+        transformer_active = use_transformer and self._emotion_transformer.available
+        if use_transformer:
+            transformer_probs = (dict(transformer_scores) if transformer_scores is not None
+                                 else self._emotion_transformer.classify(text))
+        else:
+            transformer_probs = self._emotion_transformer.classify_keywords_only(text)
 
         # Calibrate Pt: normalise to a proper probability distribution before fusion
         _pt_total = sum(transformer_probs.values())
         if _pt_total > 0 and abs(_pt_total - 1.0) > 1e-6:
             transformer_probs = {k: v / _pt_total for k, v in transformer_probs.items()}
 
-        # Capture Pt before fusion as intermediate output
-        pt_distribution = dict(transformer_probs)
+        # Capture Pt before fusion as intermediate output (read-only below)
+        pt_distribution = transformer_probs
 
         # --- Hybrid fusion: P_final = alpha * P_t + (1 - alpha) * P_k ---
         _alpha = self._TRANSFORMER_WEIGHT  # default; overwritten below per mode
@@ -861,7 +1003,7 @@ class EmotionAnalyzer:
 
         # Default hybrid mode: dynamic alpha + weighted blend
         else:
-            if self._emotion_transformer.available:
+            if transformer_active:
                 # Compute entropy-adjusted alpha for the fusion equation
                 _alpha = self._compute_alpha_dynamic(transformer_probs)
             else:
@@ -919,91 +1061,55 @@ class EmotionAnalyzer:
         uncertainty_score = uncertainty['uncertainty_score']
         is_uncertain = uncertainty['is_uncertain']
 
-        explanation = self.explain_emotion(text, primary_emotion)
-        contextual_crisis = self.crisis_adapter.classify(text) or {}
-
-        # Structured XAI explanation (explainability.py)
-        xai_explanation = generate_explanation(
-            text,
-            {
-                'primary_emotion': primary_emotion,
-                'emotion_probabilities': emotion_probabilities,
-                'polarity': polarity,
-                'subjectivity': sentiment['subjectivity'],
-            },
-            emotion_keywords=self.emotion_keywords,
-            crisis_keywords=self.crisis_keywords,
-            transformer_available=self._emotion_transformer.available,
-        )
-
         has_abuse_indicators = len(abuse_keywords) > 0
         is_crisis = len(crisis_keywords_found) > 0
 
-        # Numeric severity score (0-10) for backward compatibility
-        if is_crisis:
-            severity_score = 10.0
-        elif severity == 'high':
-            severity_score = 7.0
-        elif severity == 'medium':
-            severity_score = 4.0
-        elif polarity > 0:
-            severity_score = 0.0
-        else:
-            severity_score = 2.0
-
         # Concern level classification (low / medium / high / critical)
         concern_level = self._compute_concern_level(
             primary_emotion, emotion_probabilities, is_crisis,
             distress_keywords, severity,
         )
 
-        # Confidence of the primary emotion
-        emotion_confidence = emotion_probabilities.get(primary_emotion, 0.0)
-
-        return {
+        # The explanations, backward-compat aliases (dominant_emotion,
+        # crisis_detected, severity_score, keyword_explanation) and
+        # emotion_confidence are computed by EmotionResult on first access.
+        return EmotionResult(
+            self, text, transformer_active,
             # Coarse fields (backward-compatible)
-            'emotion': emotion,
-            'severity': severity,
-            'polarity': polarity,
-            'subjectivity': sentiment['subjectivity'],
-            'distress_keywords': distress_keywords,
-            'abuse_indicators': abuse_keywords,
-            'has_abuse_indicators': has_abuse_indicators,
-            'timestamp': sentiment['timestamp'],
+            emotion=emotion,
+            severity=severity,
+            polarity=polarity,
+            subjectivity=sentiment['subjectivity'],
+            distress_keywords=distress_keywords,
+            abuse_indicators=abuse_keywords,
+            has_abuse_indicators=has_abuse_indicators,
+            timestamp=sentiment['timestamp'],
             # Fine-grained fields (new)
-            'primary_emotion': primary_emotion,
-            'emotion_scores': emotion_scores,
-            'emotion_probabilities': emotion_probabilities,
-            'explanation': explanation,
-            'is_crisis': is_crisis,
-            'crisis_probability': contextual_crisis.get('crisis_probability', 1.0 if is_crisis else 0.0),
-            'suicidal_ideation_probability': contextual_crisis.get('suicidal_ideation_probability', 1.0 if is_crisis else 0.0),
-            'severe_distress_probability': contextual_crisis.get('severe_distress_probability', 1.0 if is_crisis else 0.0),
-            'crisis_keywords': crisis_keywords_found,
+            primary_emotion=primary_emotion,
+            emotion_scores=emotion_scores,
+            emotion_probabilities=emotion_probabilities,
+            is_crisis=is_crisis,
+            crisis_probability=contextual_crisis.get('crisis_probability', 1.0 if is_crisis else 0.0),
+            suicidal_ideation_probability=contextual_crisis.get('suicidal_ideation_probability', 1.0 if is_crisis else 0.0),
+            severe_distress_probability=contextual_crisis.get('severe_distress_probability', 1.0 if is_crisis else 0.0),
+            crisis_keywords=crisis_keywords_found,
             # Concern level
-            'concern_level': concern_level,
-            'emotion_confidence': round(emotion_confidence, 4),
+            concern_level=concern_level,
             # Language / script metadata
-            'detected_script': detected_script,
-            # Backward-compatibility aliases (for test_full_coverage and external callers)
-            'dominant_emotion': primary_emotion,
-            'crisis_detected': is_crisis,
-            'severity_score': severity_score,
-            'keyword_explanation': explanation,
-            'xai_explanation': xai_explanation,
+            detected_script=detected_script,
             # Hybrid fusion model outputs
-            'final_emotion': final_emotion,
-            'final_probabilities': final_probabilities,
-            'fusion_weights': fusion_weights,
+            final_emotion=final_emotion,
+            final_probabilities=final_probabilities,
+            fusion_weights=fusion_weights,
             # Intermediate fusion outputs (for logging and IEEE-grade reproducibility)
-            'pk_distribution': pk_distribution,
-            'pt_distribution': pt_distribution,
-            'fusion_alpha': _alpha,
+            pk_distribution=pk_distribution,
+            pt_distribution=pt_distribution,
+            fusion_alpha=_alpha,
             # Uncertainty modeling
-            'confidence_score': confidence_score,
-            'uncertainty_score': uncertainty_score,
-            'is_uncertain': is_uncertain,
-        }
+            confidence_score=confidence_score,
+            uncertainty_score=uncertainty_score,
+            is_uncertain=is_uncertain,
+        )
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,177 @@
+"""
+Per-turn result of EmotionAnalyzer.classify_emotion.
+
+EmotionResult behaves like the dict classify_emotion used to return (same
+keys, same order, mutable), but stores its fields in ``__slots__`` and
+computes the fields few callers read — the explanations, backward-compat
+aliases and rounded duplicates — on first access from the state captured
+at classification time.  Pickling / copying yields a plain dict.
+"""
+
+from collections.abc import Mapping, MutableMapping
+
+from explainability import generate_explanation
+
+# Every key, in the order the legacy dict had them
+FIELDS = (
+    # Coarse fields (backward-compatible)
+    'emotion', 'severity', 'polarity', 'subjectivity', 'distress_keywords',
+    'abuse_indicators', 'has_abuse_indicators', 'timestamp',
+    # Fine-grained fields
+    'primary_emotion', 'emotion_scores', 'emotion_probabilities', 'explanation',
+    'is_crisis', 'crisis_probability', 'suicidal_ideation_probability',
+    'severe_distress_probability', 'crisis_keywords',
+    'concern_level', 'emotion_confidence', 'detected_script',
+    # Backward-compatibility aliases
+    'dominant_emotion', 'crisis_detected', 'severity_score', 'keyword_explanation',
+    'xai_explanation',
+    # Hybrid fusion model outputs
+    'final_emotion', 'final_probabilities', 'fusion_weights',
+    'pk_distribution', 'pt_distribution', 'fusion_alpha',
+    # Uncertainty modeling
+    'confidence_score', 'uncertainty_score', 'is_uncertain',
+)
+
+# Fields computed on first access, by the method computing them
+LAZY_FIELDS = {
+    'explanation': '_explanation',
+    'keyword_explanation': '_explanation',
+    'emotion_confidence': '_emotion_confidence',
+    'dominant_emotion': '_dominant_emotion',
+    'crisis_detected': '_crisis_detected',
+    'severity_score': '_severity_score',
+    'xai_explanation': '_xai_explanation',
+}
+
+_FIELD_SET = frozenset(FIELDS)
+_UNSET = object()    # lazy field not computed yet
+_ABSENT = object()   # field deleted by the caller
+
+
+class EmotionResult(MutableMapping):
+    """Dict-compatible classify_emotion result with lazily computed fields."""
+
+    __slots__ = FIELDS + ('_analyzer', '_text', '_primary', '_transformer_active', '_extra')
+
+    def __init__(self, analyzer, text, transformer_active, **fields):
+        self._analyzer = analyzer
+        self._text = text
+        self._transformer_active = transformer_active
+        self._extra = None
+        for key in LAZY_FIELDS:
+            setattr(self, key, _UNSET)
+        for key, value in fields.items():
+            setattr(self, key, value)
+        # Lazy fields describe the classification, not later overrides
+        # (classify_emotion_ml replaces primary_emotion with the ML label)
+        self._primary = self.primary_emotion
+
+    # ------------------------------------------------------------------
+    # Lazy fields
+    # ------------------------------------------------------------------
+
+    def _explanation(self):
+        return self._analyzer.explain_emotion(self._text, self._primary)
+
+    def _emotion_confidence(self):
+        return round(self.emotion_probabilities.get(self._primary, 0.0), 4)
+
+    def _dominant_emotion(self):
+        return self._primary
+
+    def _crisis_detected(self):
+        return self.is_crisis
+
+    def _severity_score(self):
+        """Numeric severity score (0-10) for backward compatibility"""
+        if self.is_crisis:
+            return 10.0
+        if self.severity == 'high':
+            return 7.0
+        if self.severity == 'medium':
+            return 4.0
+        return 0.0 if self.polarity > 0 else 2.0
+
+    def _xai_explanation(self):
+        """Structured XAI explanation (explainability.py)"""
+        return generate_explanation(
+            self._text,
+            {
+                'primary_emotion': self._primary,
+                'emotion_probabilities': self.emotion_probabilities,
+                'polarity': self.polarity,
+                'subjectivity': self.subjectivity,
+            },
+            emotion_keywords=self._analyzer.emotion_keywords,
+            crisis_keywords=self._analyzer.crisis_keywords,
+            transformer_available=self._transformer_active,
+        )
+
+    # ------------------------------------------------------------------
+    # Mapping interface
+    # ------------------------------------------------------------------
+
+    def __getitem__(self, key):
+        if key in _FIELD_SET:
+            value = getattr(self, key, _ABSENT)
+            if value is _UNSET:
+                value = getattr(self, LAZY_FIELDS[key])()
+                setattr(self, key, value)
+            if value is not _ABSENT:
+                return value
+        elif self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in _FIELD_SET:
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        if key in _FIELD_SET and getattr(self, key, _ABSENT) is not _ABSENT:
+            setattr(self, key, _ABSENT)
+        elif self._extra is not None and key in self._extra:
+            del self._extra[key]
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        if key in _FIELD_SET:
+            return getattr(self, key, _ABSENT) is not _ABSENT
+        return self._extra is not None and key in self._extra
+
+    def __iter__(self):
+        for key in FIELDS:
+            if getattr(self, key, _ABSENT) is not _ABSENT:
+                yield key
+        if self._extra is not None:
+            yield from list(self._extra)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def copy(self):
+        return dict(self)
+
+    def __eq__(self, other):
+        if isinstance(other, Mapping):
+            return dict(self) == dict(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self)!r})"
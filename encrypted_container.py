@@ -0,0 +1,294 @@
+"""
+Encrypted profile container: independently encrypted, length-prefixed records.
+
+Layout::
+
+    b'WBX1'                                   magic / format version
+    repeated:
+        uint32 big-endian   payload length
+        uint8               record kind (H, S, A or T)
+        payload             raw Fernet token (AES-CBC + HMAC-SHA256)
+
+Each payload decrypts to JSON:
+
+* ``H`` (header)   — the profile without its history sections
+* ``S`` (snapshot) — ``{"p": path, "v": [...]}`` replaces a history section
+* ``A`` (append)   — ``{"p": path, "v": [...]}`` extends a history section
+* ``T`` (trim)     — ``{"p": path, "n": k}`` drops the first *k* items
+
+History sections are the growing lists in ``HISTORY_SECTIONS``; paths use
+``.`` for nesting (``session.chat_history``).  Loading replays the records in
+order: the last header wins, snapshots reset a section, trims drop its
+oldest items and appends extend it.  Adding one chat message therefore
+encrypts one small record instead of the whole profile — also for capped
+sections such as ``emotional_history`` that shed their oldest item as they
+grow — and :meth:`EncryptedContainer.load_section` only decrypts
+the records of the requested section.
+
+Fernet tokens are stored base64-decoded, so the file holds no base64 at all.
+A truncated trailing record (crash during append) is ignored; any other
+authentication failure raises ``ValueError``.
+"""
+
+import base64
+import os
+import struct
+import tempfile
+
+import serialization
+
+MAGIC = b'WBX1'
+CONTAINER_SUFFIX = '.wbx'
+
+KIND_HEADER = b'H'
+KIND_SNAPSHOT = b'S'
+KIND_APPEND = b'A'
+KIND_TRIM = b'T'
+
+HISTORY_SECTIONS = (
+    'chat_history',
+    'emotional_history',
+    'session.chat_history',
+    'session.emotion_history',
+    'session.risk_history',
+)
+
+_RECORD_HEAD = struct.Struct('>IB')
+
+
+def split_profile(data):
+    """Split a serialized profile into ``(core, {path: list})``
+
+    Only list-valued sections are split out; *data* is not modified.
+    """
+    core = dict(data)
+    sections = {}
+    for path in HISTORY_SECTIONS:
+        parent_key, _, key = path.rpartition('.')
+        if parent_key:
+            parent = core.get(parent_key)
+            if not isinstance(parent, dict) or not isinstance(parent.get(key), list):
+                continue
+            parent = core[parent_key] = dict(parent)
+        else:
+            parent = core
+            if not isinstance(parent.get(key), list):
+                continue
+        sections[path] = parent.pop(key)
+    return core, sections
+
+
+def merge_profile(core, sections):
+    """Inverse of :func:`split_profile` (mutates and returns *core*)"""
+    for path, items in sections.items():
+        parent_key, _, key = path.rpartition('.')
+        parent = core.setdefault(parent_key, {}) if parent_key else core
+        if isinstance(parent, dict):
+            parent[key] = items
+    return core
+
+
+class EncryptedContainer:
+    """Read, append to and rewrite one container file
+
+    ``cipher`` is a ``Fernet`` or ``MultiFernet``; with ``MultiFernet`` any
+    of its keys can decrypt and the first one encrypts (key rotation).
+    """
+
+    def __init__(self, path, cipher):
+        self.path = path
+        self.cipher = cipher
+        # Set by a read that hit a partial trailing record; appending after
+        # it would be unreadable, so callers must rewrite instead.
+        self.truncated = False
+
+    # ------------------------------------------------------------------
+    # Record encoding
+    # ------------------------------------------------------------------
+
+    def _record(self, kind, obj):
+        token = self.cipher.encrypt(serialization.dumps(obj))
+        payload = base64.urlsafe_b64decode(token)
+        return _RECORD_HEAD.pack(len(payload), kind[0]) + payload
+
+    def _decrypt(self, payload):
+        try:
+            plain = self.cipher.decrypt(base64.urlsafe_b64encode(payload))
+        except Exception as e:
+            raise ValueError(
+                f"Failed to decrypt data. The encryption key may be incorrect "
+                f"or the data may be corrupted: {e}")
+        return serialization.loads(plain)
+
+    def iter_records(self, kinds=None):
+        """Yield ``(kind, payload_or_None)`` in file order
+
+        Only records whose kind is in *kinds* (default: all) are decrypted;
+        the others are yielded with ``None``.
+        """
+        self.truncated = False
+        with open(self.path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{self.path} is not an encrypted profile container")
+            while True:
+                head = f.read(_RECORD_HEAD.size)
+                if len(head) < _RECORD_HEAD.size:
+                    self.truncated = bool(head)
+                    return
+                length, kind = _RECORD_HEAD.unpack(head)
+                payload = f.read(length)
+                if len(payload) < length:
+                    self.truncated = True
+                    return
+                kind = bytes((kind,))
+                if kinds is None or kind in kinds:
+                    yield kind, self._decrypt(payload)
+                else:
+                    yield kind, None
+
+    def record_count(self):
+        return sum(1 for _ in self.iter_records(kinds=()))
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def load(self):
+        """Return ``(profile, record_count)`` by replaying every record"""
+        core = {}
+        sections = {}
+        count = 0
+        for kind, obj in self.iter_records():
+            count += 1
+            if kind == KIND_HEADER:
+                core = obj
+            elif kind == KIND_SNAPSHOT:
+                sections[obj['p']] = list(obj['v'])
+            elif kind == KIND_TRIM:
+                del sections.setdefault(obj['p'], [])[:obj['n']]
+            elif kind == KIND_APPEND:
+                sections.setdefault(obj['p'], []).extend(obj['v'])
+        return merge_profile(core, sections), count
+
+    def load_section(self, path):
+        """Replay only the records of one history section
+
+        Header records are skipped without decryption.  Returns ``None``
+        when the section was never written.
+        """
+        items = None
+        for kind, obj in self.iter_records(kinds=(KIND_SNAPSHOT, KIND_TRIM, KIND_APPEND)):
+            if obj is None or obj.get('p') != path:
+                continue
+            if kind == KIND_SNAPSHOT:
+                items = list(obj['v'])
+            elif kind == KIND_TRIM:
+                items = (items or [])[obj['n']:]
+            elif kind == KIND_APPEND:
+                items = (items or []) + list(obj['v'])
+        return items
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def rewrite(self, data):
+        """Atomically replace the file with a compact header + snapshots
+
+        Returns the number of records written.
+        """
+        core, sections = split_profile(data)
+        records = [self._record(KIND_HEADER, core)]
+        records.extend(self._record(KIND_SNAPSHOT, {'p': p, 'v': v})
+                       for p, v in sections.items())
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_name = tempfile.mkstemp(
+            dir=directory, prefix=f".{os.path.basename(self.path)}.", suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(MAGIC)
+                f.write(b''.join(records))
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(tmp_name, 0o600)
+            os.replace(tmp_name, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+        return len(records)
+
+    def append(self, core=None, appends=None, snapshots=None, trims=None):
+        """Append header / snapshot / trim / append records in one write
+
+        Returns the number of records appended.
+        """
+        records = []
+        if core is not None:
+            records.append(self._record(KIND_HEADER, core))
+        for path, items in (snapshots or {}).items():
+            records.append(self._record(KIND_SNAPSHOT, {'p': path, 'v': items}))
+        for path, count in (trims or {}).items():
+            records.append(self._record(KIND_TRIM, {'p': path, 'n': count}))
+        for path, items in (appends or {}).items():
+            if items:
+                records.append(self._record(KIND_APPEND, {'p': path, 'v': items}))
+        if not records:
+            return 0
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND)
+        try:
+            os.write(fd, b''.join(records))
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        return len(records)
+
+
+def _dropped_prefix(old, items):
+    """Smallest ``k`` such that *items* continues ``old[k:]``, else ``None``
+
+    Recognizes a capped history that lost its oldest items (and possibly
+    gained new ones), e.g. ``del history[:-max_snapshots]``.
+    """
+    if not items:
+        return None
+    for k in range(1, len(old)):
+        kept = len(old) - k
+        if old[k] == items[0] and len(items) >= kept and items[:kept] == old[k:]:
+            return k
+    return None
+
+
+def diff_profile(previous, current):
+    """Plan an incremental write from *previous* to *current* (both serialized)
+
+    Returns ``(core_or_None, appends, snapshots, trims)``: the header to
+    append if the non-history part changed, new items per section that
+    grew, full replacements for sections that were otherwise edited, and
+    the number of oldest items dropped per section whose head was trimmed.
+    Returns ``None`` when a section disappeared and the file must be
+    rewritten.
+    """
+    prev_core, prev_sections = split_profile(previous)
+    core, sections = split_profile(current)
+    if any(path not in sections for path in prev_sections):
+        return None
+    appends = {}
+    snapshots = {}
+    trims = {}
+    for path, items in sections.items():
+        old = prev_sections.get(path)
+        if old is not None and len(items) >= len(old) and items[:len(old)] == old:
+            if len(items) > len(old):
+                appends[path] = items[len(old):]
+            continue
+        dropped = _dropped_prefix(old, items) if old else None
+        if dropped is None:
+            snapshots[path] = items
+            continue
+        trims[path] = dropped
+        if len(items) > len(old) - dropped:
+            appends[path] = items[len(old) - dropped:]
+    return (core if core != prev_core else None), appends, snapshots, trims
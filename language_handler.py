@@ -88,6 +88,84 @@ TAMIL_UNICODE_EMOTION_KEYWORDS = {
 }
 
 
+# Most severe first: the emotion reported when several are matched.
+_SEVERITY_ORDER = ('crisis', 'sadness', 'fear', 'anxiety', 'anger', 'joy')
+
+
+# ---------------------------------------------------------------------------
+# Keyword matcher
+# ---------------------------------------------------------------------------
+
+class _KeywordMatcher:
+    """
+    Finds every keyword occurring in a text in a single scan.
+
+    Matching is by substring (``kw in text``), exactly as the keyword
+    tables have always been applied, so overlapping keywords such as
+    ``vali`` / ``valikudu`` / ``thalai valikudu`` are all reported.  One
+    compiled zero-width pattern locates the positions where any keyword
+    starts; a character trie then collects all keywords starting there.
+    Text without keywords costs a single regex scan.
+    """
+
+    __slots__ = ('_starts', '_trie')
+
+    def __init__(self, keywords: dict[str, str]):
+        self._trie: dict = {}
+        for kw, emotion in keywords.items():
+            node = self._trie
+            for ch in kw:
+                node = node.setdefault(ch, {})
+            node[None] = (kw, emotion)
+        self._starts = re.compile(f'(?={self._pattern(self._trie)})')
+
+    @classmethod
+    def _pattern(cls, node: dict) -> str:
+        # Prefix-factored alternation mirroring the trie, so the regex engine
+        # tries one branch per distinct next character instead of every
+        # keyword.  A keyword ending here is enough for a start position,
+        # so longer continuations are not needed in the pattern.
+        if None in node:
+            return ''
+        branches = [re.escape(ch) + cls._pattern(child) for ch, child in sorted(node.items())]
+        return branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+
+    def search(self, text: str) -> bool:
+        """True if any keyword occurs in ``text``."""
+        return self._starts.search(text) is not None
+
+    def matches(self, text: str) -> dict[str, str]:
+        """Matched keyword → emotion, in order of first occurrence."""
+        found: dict[str, str] = {}
+        end = len(text)
+        for m in self._starts.finditer(text):
+            node = self._trie
+            for i in range(m.start(), end):
+                node = node.get(text[i])
+                if node is None:
+                    break
+                hit = node.get(None)
+                if hit is not None:
+                    found.setdefault(*hit)
+        return found
+
+
+def _emotion_counts(matched: dict[str, str]) -> dict[str, int]:
+    counts: dict[str, int] = {}
+    for emotion in matched.values():
+        counts[emotion] = counts.get(emotion, 0) + 1
+    return counts
+
+
+def _most_severe(counts: dict[str, int]) -> str | None:
+    if not counts:
+        return None
+    for emo in _SEVERITY_ORDER:
+        if emo in counts:
+            return emo
+    return max(counts, key=counts.get)
+
+
 # ---------------------------------------------------------------------------
 # Bilingual response templates  (Tamil + English)
 # ---------------------------------------------------------------------------
@@ -191,6 +269,8 @@ class LanguageHandler:
         for emotion, words in TAMIL_UNICODE_EMOTION_KEYWORDS.items():
             for w in words:
                 self._tamil_flat[w] = emotion
+        self._tanglish_matcher = _KeywordMatcher(self._tanglish_flat)
+        self._tamil_matcher = _KeywordMatcher(self._tamil_flat)
 
     # ------------------------------------------------------------------
     # Language detection
@@ -208,12 +288,35 @@ class LanguageHandler:
         """
         if _TAMIL_UNICODE_RANGE.search(text):
             return 'tamil'
-        text_lower = text.lower()
-        for kw in self._tanglish_flat:
-            if kw in text_lower:
-                return 'tanglish'
+        if self._tanglish_matcher.search(text.lower()):
+            return 'tanglish'
         return 'english'
 
+    def scan(self, text: str) -> dict:
+        """
+        Script detection and keyword emotion matching in one pass.
+
+        Returns a dict with ``script`` (as :meth:`detect_script`),
+        ``keywords`` (matched Tamil keywords for Tamil script, Tanglish
+        keywords otherwise), ``emotion_counts`` (matched keywords per
+        emotion) and ``emotion`` (as :meth:`detect_tanglish_emotion` /
+        :meth:`detect_tamil_unicode_emotion` for that script; ``None`` for
+        English).
+        """
+        if _TAMIL_UNICODE_RANGE.search(text):
+            script = 'tamil'
+            matched = self._tamil_matcher.matches(text)
+        else:
+            matched = self._tanglish_matcher.matches(text.lower())
+            script = 'tanglish' if matched else 'english'
+        counts = _emotion_counts(matched)
+        return {
+            'script': script,
+            'keywords': list(matched),
+            'emotion_counts': counts,
+            'emotion': _most_severe(counts),
+        }
+
     def is_tanglish(self, text: str) -> bool:
         return self.detect_script(text) == 'tanglish'
 
@@ -229,36 +332,14 @@ class LanguageHandler:
         Return the most severe emotion matched by Tanglish keywords,
         or ``None`` if no match.
         """
-        text_lower = text.lower()
-        severity_order = ['crisis', 'sadness', 'fear', 'anxiety', 'anger', 'joy']
-        matched: dict[str, int] = {}
-        for kw, emotion in self._tanglish_flat.items():
-            if kw in text_lower:
-                matched[emotion] = matched.get(emotion, 0) + 1
-        if not matched:
-            return None
-        # Return by severity
-        for emo in severity_order:
-            if emo in matched:
-                return emo
-        return max(matched, key=matched.get)
+        return _most_severe(_emotion_counts(self._tanglish_matcher.matches(text.lower())))
 
     def detect_tamil_unicode_emotion(self, text: str) -> str | None:
         """
         Return the most severe emotion matched by Tamil Unicode keywords,
         or ``None`` if no match.
         """
-        severity_order = ['crisis', 'sadness', 'fear', 'anxiety', 'anger', 'joy']
-        matched: dict[str, int] = {}
-        for kw, emotion in self._tamil_flat.items():
-            if kw in text:
-                matched[emotion] = matched.get(emotion, 0) + 1
-        if not matched:
-            return None
-        for emo in severity_order:
-            if emo in matched:
-                return emo
-        return max(matched, key=matched.get)
+        return _most_severe(_emotion_counts(self._tamil_matcher.matches(text)))
 
     def get_tanglish_keywords_for_emotion(self, emotion: str) -> list[str]:
         """Return the Tanglish keywords for a given emotion."""
@@ -0,0 +1,248 @@
+"""
+Process-wide registry of loaded ML models.
+
+Every heavy model in the AI core (the DistilRoBERTa emotion classifier, the
+BART-MNLI zero-shot crisis classifier) is obtained through :func:`get_model`,
+keyed by ``(task, model, backend)``, so each one is held in memory once per
+process no matter how many ``EmotionAnalyzer`` / ``EmotionTransformer``
+instances ask for it.
+
+  - **Single-flight loading** – concurrent callers for the same key wait on
+    one load instead of each starting their own.
+  - **Negative caching** – a failed load (``transformers`` missing, model
+    not downloaded, out of memory) is remembered and re-raised as
+    :class:`ModelUnavailable` without retrying until a backoff expires
+    (``MODEL_LOAD_RETRY_SECONDS``, doubling per failure up to
+    ``MODEL_LOAD_RETRY_MAX_SECONDS``).
+  - **Memory accounting** – parameter bytes (torch models) and the process
+    RSS growth observed during the load are recorded per model; see
+    :meth:`ModelRegistry.stats`.
+  - **Unloading** – :meth:`ModelRegistry.unload` drops a model (and its
+    negative-cache entry) so memory can be reclaimed or a load retried.
+  - **Pre-fork sharing** – a server master can load models, call
+    :func:`freeze_for_fork` and fork workers that inherit the weights
+    copy-on-write; each worker then calls :func:`set_inference_threads`.
+"""
+
+import gc
+import logging
+import os
+import sys
+import threading
+import time
+
+import config
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BACKEND = 'transformers'
+
+# Extra pipeline() arguments per task for the transformers backend.
+_PIPELINE_KWARGS = {
+    'text-classification': {'top_k': None},
+}
+
+
+class ModelUnavailable(RuntimeError):
+    """A model could not be loaded (possibly a cached failure)."""
+
+    def __init__(self, key, cause, retry_at):
+        super().__init__(f"model {key} unavailable: {cause!r}")
+        self.key = key
+        self.cause = cause
+        self.retry_at = retry_at
+
+
+def _load_transformers_pipeline(task, model):
+    from transformers import pipeline as _hf_pipeline
+    return _hf_pipeline(task, model=model, device=-1, **_PIPELINE_KWARGS.get(task, {}))
+
+
+_BACKEND_LOADERS = {
+    'transformers': _load_transformers_pipeline,
+}
+
+
+def _rss_bytes():
+    """Current resident set size (Linux /proc), or ``None``."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def _param_bytes(obj):
+    """Bytes held by torch parameters/buffers of *obj* (a model or pipeline)."""
+    module = getattr(obj, 'model', obj)
+    try:
+        tensors = list(module.parameters()) + list(module.buffers())
+    except Exception:
+        return None
+    return sum(t.numel() * t.element_size() for t in tensors)
+
+
+class _Entry:
+    __slots__ = ('lock', 'model', 'loaded_at', 'load_seconds', 'param_bytes', 'rss_delta_bytes',
+                 'hits', 'failures', 'error', 'retry_at')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.model = None
+        self.loaded_at = None
+        self.load_seconds = None
+        self.param_bytes = None
+        self.rss_delta_bytes = None
+        self.hits = 0
+        self.failures = 0
+        self.error = None
+        self.retry_at = 0.0
+
+
+class ModelRegistry:
+    """Thread-safe ``(task, model, backend)`` → loaded model cache."""
+
+    def __init__(self, retry_seconds=None, retry_max_seconds=None, clock=time.monotonic):
+        self.retry_seconds = config.MODEL_LOAD_RETRY_SECONDS if retry_seconds is None else retry_seconds
+        self.retry_max_seconds = (config.MODEL_LOAD_RETRY_MAX_SECONDS
+                                  if retry_max_seconds is None else retry_max_seconds)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def _entry(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry()
+            return entry
+
+    def get(self, task, model, backend=DEFAULT_BACKEND, loader=None):
+        """Return the loaded model for ``(task, model, backend)``, loading it once.
+
+        *loader* ``(task, model) -> object`` overrides the backend's loader.
+        Raises :class:`ModelUnavailable` when loading fails or a recent
+        failure is still within its retry backoff.
+        """
+        key = (task, model, backend)
+        entry = self._entry(key)
+        if entry.model is not None:
+            entry.hits += 1
+            return entry.model
+        with entry.lock:
+            if entry.model is not None:  # loaded while we waited
+                entry.hits += 1
+                return entry.model
+            if entry.error is not None and self._clock() < entry.retry_at:
+                raise ModelUnavailable(key, entry.error, entry.retry_at)
+            return self._load(key, entry, loader or _BACKEND_LOADERS[backend])
+
+    def _load(self, key, entry, loader):
+        rss_before = _rss_bytes()
+        started = time.perf_counter()
+        try:
+            model = loader(key[0], key[1])
+        except Exception as exc:
+            entry.failures += 1
+            entry.error = exc
+            backoff = min(self.retry_seconds * 2 ** (entry.failures - 1), self.retry_max_seconds)
+            entry.retry_at = self._clock() + backoff
+            logger.warning("Loading model %s failed (%s); next attempt in %.0fs", key, exc, backoff)
+            raise ModelUnavailable(key, exc, entry.retry_at) from exc
+        entry.load_seconds = time.perf_counter() - started
+        rss_after = _rss_bytes()
+        entry.rss_delta_bytes = (rss_after - rss_before
+                                 if rss_before is not None and rss_after is not None else None)
+        entry.param_bytes = _param_bytes(model)
+        entry.loaded_at = time.time()
+        entry.failures = 0
+        entry.error = None
+        entry.model = model
+        logger.info("Loaded model %s in %.2fs (params=%s bytes, rss +%s bytes)",
+                    key, entry.load_seconds, entry.param_bytes, entry.rss_delta_bytes)
+        return model
+
+    def is_loaded(self, task, model, backend=DEFAULT_BACKEND):
+        entry = self._entries.get((task, model, backend))
+        return entry is not None and entry.model is not None
+
+    def unload(self, task, model, backend=DEFAULT_BACKEND):
+        """Drop a model (or its cached failure). Returns ``True`` if a model was held."""
+        with self._lock:
+            entry = self._entries.pop((task, model, backend), None)
+        if entry is None:
+            return False
+        held = entry.model is not None
+        entry.model = None
+        if held:
+            gc.collect()
+        return held
+
+    def unload_all(self):
+        """Drop every model and cached failure; returns the number of models dropped."""
+        with self._lock:
+            keys = list(self._entries)
+        return sum(self.unload(*key) for key in keys)
+
+    def stats(self):
+        """One dict per known key: load state, timings, memory and failures."""
+        with self._lock:
+            items = list(self._entries.items())
+        report = []
+        for (task, model, backend), entry in items:
+            report.append({
+                'task': task, 'model': model, 'backend': backend,
+                'loaded': entry.model is not None,
+                'load_seconds': entry.load_seconds,
+                'param_bytes': entry.param_bytes,
+                'rss_delta_bytes': entry.rss_delta_bytes,
+                'hits': entry.hits,
+                'failures': entry.failures,
+                'error': repr(entry.error) if entry.error is not None else None,
+                'retry_in_seconds': (max(0.0, entry.retry_at - self._clock())
+                                     if entry.error is not None else None),
+            })
+        return report
+
+
+# Process-wide registry used by the AI core.
+registry = ModelRegistry()
+
+
+def get_model(task, model, backend=DEFAULT_BACKEND, loader=None):
+    """Shortcut for ``registry.get(...)``."""
+    return registry.get(task, model, backend, loader)
+
+
+# ---------------------------------------------------------------------------
+# Pre-fork sharing
+# ---------------------------------------------------------------------------
+
+def freeze_for_fork():
+    """Prepare loaded models to be inherited copy-on-write by forked workers.
+
+    Moves every live object into the GC's permanent generation so collections
+    in the workers never write to (and so privately copy) the pages holding
+    the master's model objects.  Call in the master after loading, before fork,
+    and without having run inference there (OpenMP thread pools do not
+    survive ``fork``).
+    """
+    gc.collect()
+    gc.freeze()
+    return gc.get_freeze_count()
+
+
+def set_inference_threads(n):
+    """Limit this process to *n* intra-op inference threads; returns *n*.
+
+    Forked workers otherwise each start one thread per core and oversubscribe
+    the CPU.  Applies to torch if it is already imported and to OpenMP/MKL
+    pools started later.
+    """
+    n = max(1, int(n))
+    for var in ('OMP_NUM_THREADS', 'MKL_NUM_THREADS'):
+        os.environ[var] = str(n)
+    torch = sys.modules.get('torch')
+    if torch is not None:
+        torch.set_num_threads(n)
+    return n
@@ -19,47 +19,31 @@ Design principles
   always receive a valid probability distribution.
 * **Normalised output** – every return value is a ``dict`` whose values
   sum to 1.0 (within floating-point tolerance).
+* **Token windows** – texts longer than the model's 512 word-piece tokens
+  are classified in overlapping windows whose probabilities are averaged
+  (see :mod:`text_windows`); :meth:`EmotionTransformer.classify_batch`
+  scores many texts in length-bucketed batches.
 """
 
 from __future__ import annotations
 
 
 # ---------------------------------------------------------------------------
-# Cached pipeline loader – uses @st.cache_resource when Streamlit is
-# available so that the heavy HuggingFace model is downloaded and
-# initialised only once per process, surviving Streamlit script reruns.
-# In non-Streamlit contexts (FastAPI, tests, CLI) a process-level dict
-# cache prevents redundant model loads across multiple WellnessAgentPipeline
-# instances in the same worker (critical for sub-2 s warm-request latency).
+# Pipeline loader – models are held once per process by model_registry, so
+# EmotionTransformer and emotion_analyzer.MLEmotionAdapter share a single
+# copy of the DistilRoBERTa weights, and a failed load is not retried by
+# every new instance (critical for sub-2 s warm-request latency).
 # ---------------------------------------------------------------------------
 
-# Process-level model cache for non-Streamlit environments.
-_PROCESS_PIPELINE_CACHE: dict[str, object] = {}
-
-
-def _load_emotion_pipeline_impl(model_name: str):
-    """Load the HuggingFace emotion pipeline (uncached helper)."""
-    from transformers import pipeline as _hf_pipeline
-    return _hf_pipeline(
-        "text-classification",
-        model=model_name,
-        top_k=None,
-        device=-1,
-    )
-
 
 def load_emotion_pipeline(model_name: str = "j-hartmann/emotion-english-distilroberta-base"):
     """Process-cached emotion pipeline loader.
 
-    Uses a process-level dict so the heavy HuggingFace model is downloaded
-    and initialised only once per worker process.  This is the correct
-    caching strategy for FastAPI (and CLI/test) contexts; Streamlit apps
-    that need ``@st.cache_resource`` should call this function from their
-    own module and wrap it there.
+    Delegates to :func:`model_registry.get_model`; raises
+    :class:`model_registry.ModelUnavailable` when the model cannot be loaded.
     """
-    if model_name not in _PROCESS_PIPELINE_CACHE:
-        _PROCESS_PIPELINE_CACHE[model_name] = _load_emotion_pipeline_impl(model_name)
-    return _PROCESS_PIPELINE_CACHE[model_name]
+    import model_registry
+    return model_registry.get_model("text-classification", model_name)
 
 
 class EmotionTransformer:
@@ -74,11 +58,6 @@ class EmotionTransformer:
 
     _DEFAULT_MODEL = "j-hartmann/emotion-english-distilroberta-base"
 
-    # Maximum input length (characters) — the underlying DistilRoBERTa model
-    # supports up to 512 word-piece tokens; character-level truncation is a
-    # simple safeguard against excessively long inputs.
-    _MAX_INPUT_LENGTH = 512
-
     # GoEmotions 7-class → internal schema mapping
     _LABEL_MAP: dict[str, str] = {
         "joy":      "joy",
@@ -161,9 +140,9 @@ class EmotionTransformer:
     def _try_load(self) -> None:
         """Attempt to load the HuggingFace pipeline (once).
 
-        Uses the module-level :func:`load_emotion_pipeline` which is
-        decorated with ``@st.cache_resource`` when Streamlit is available,
-        ensuring the heavy model is loaded only once per process.
+        Uses the module-level :func:`load_emotion_pipeline`, backed by the
+        process-wide model registry, so the heavy model is loaded only once
+        per process.
         """
         if self._load_attempted:
             return
@@ -208,25 +187,66 @@ class EmotionTransformer:
         self._cache_value = result
         return dict(result)  # return a copy
 
+    def classify_batch(
+        self, texts: list[str], batch_size: int | None = None,
+    ) -> list[dict[str, float]]:
+        """Return one :meth:`classify` distribution per text.
+
+        Token windows of all *texts* are run through the transformer in
+        batches of similar length (``config.TRANSFORMER_BATCH_SIZE`` windows
+        by default).  Bypasses the single-message cache.
+        """
+        if not self._load_attempted:
+            self._try_load()
+        if not (self._available and self._pipeline is not None):
+            return [self._classify_keywords(text) for text in texts]
+        return self._classify_transformer_batch(texts, batch_size)
+
     # ------------------------------------------------------------------
     # Internal classifiers
     # ------------------------------------------------------------------
 
     def _classify_transformer(self, text: str) -> dict[str, float]:
         """Run transformer inference and map labels to internal schema."""
+        return self._classify_transformer_batch([text])[0]
+
+    def _classify_transformer_batch(
+        self, texts: list[str], batch_size: int | None = None,
+    ) -> list[dict[str, float]]:
+        import config
+        import text_windows
+
+        pipeline = self._pipeline
+
+        def run(batch: list[str]) -> list:
+            raw = pipeline(batch, truncation=True, batch_size=len(batch))
+            # top_k=None → one list of label scores per window
+            return [raw] if raw and isinstance(raw[0], dict) else raw
+
         try:
-            raw = self._pipeline(text[:self._MAX_INPUT_LENGTH])[0]
-            mapped: dict[str, float] = {e: 0.0 for e in self.EMOTIONS}
-            for entry in raw:
-                label = self._LABEL_MAP.get(
-                    entry["label"].lower(), entry["label"].lower(),
-                )
-                if label in mapped:
-                    mapped[label] += entry["score"]
-            return self._normalize(mapped)
+            per_text = text_windows.run_windowed(
+                texts, run,
+                tokenizer=getattr(pipeline, "tokenizer", None),
+                max_tokens=config.TRANSFORMER_WINDOW_TOKENS,
+                batch_size=batch_size,
+            )
         except Exception:
             # Any runtime failure → fall back to keywords
-            return self._classify_keywords(text)
+            return [self._classify_keywords(text) for text in texts]
+        return [
+            self._normalize(text_windows.mean_scores([self._map_labels(raw) for raw in windows]))
+            for windows in per_text
+        ]
+
+    def _map_labels(self, raw: list[dict]) -> dict[str, float]:
+        mapped: dict[str, float] = {e: 0.0 for e in self.EMOTIONS}
+        for entry in raw:
+            label = self._LABEL_MAP.get(
+                entry["label"].lower(), entry["label"].lower(),
+            )
+            if label in mapped:
+                mapped[label] += entry["score"]
+        return mapped
 
     def _classify_keywords(self, text: str) -> dict[str, float]:
         """Simple keyword-count classifier (rule-based fallback)."""
@@ -0,0 +1,380 @@
+"""
+Retention and compaction for stored profiles and research session logs
+
+Applies the retention policies described in DATA_RETENTION.md to a local
+data store (JSON files or SQLite):
+
+* ``emotional_history`` – snapshots older than ``EMOTIONAL_HISTORY_RAW_DAYS``
+  are merged into one aggregate snapshot per day; snapshots older than
+  ``EMOTIONAL_HISTORY_DAYS`` are dropped.
+* ``chat_history`` – messages older than ``CONVERSATION_ARCHIVE_DAYS``, and
+  the oldest messages beyond ``CHAT_HISTORY_MAX_MESSAGES``, are removed and
+  counted into ``chat_history_daily`` (per-day message and character
+  counts, no text).
+* session logs – entries older than ``SESSION_LOG_RAW_DAYS`` are folded into
+  per-day summaries (entry count, emotion and risk-level counts, summed
+  confidence; no message text) by the store's ``compact_session_log``.
+
+Daily aggregates themselves are kept for ``RETENTION_AGGREGATE_DAYS``.
+
+Run it from cron::
+
+    python retention.py [DATA_DIR] [--engine json|sqlite]
+
+or in-process with :class:`RetentionScheduler`.
+"""
+
+import argparse
+import logging
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+import config
+
+logger = logging.getLogger(__name__)
+
+# Worst-first merge order for risk-like string fields
+_SEVERITY = {'low': 0, 'moderate': 1, 'medium': 1, 'high': 2, 'critical': 3}
+
+UNDATED = 'undated'
+
+
+def _day_of(value):
+    """ISO date string of a datetime / ISO string, or ``None``"""
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, str) and len(value) >= 10:
+        try:
+            return date.fromisoformat(value[:10]).isoformat()
+        except ValueError:
+            return None
+    return None
+
+
+def parse_timestamp(value):
+    """Naive local ``datetime`` for a datetime or ISO string, or ``None``"""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone().replace(tzinfo=None)
+    return value
+
+
+# ---------------------------------------------------------------------------
+# Aggregation
+# ---------------------------------------------------------------------------
+
+def _merge_values(values, weights):
+    present = [(v, w) for v, w in zip(values, weights) if v is not None]
+    if not present:
+        return None
+    first = present[0][0]
+    if isinstance(first, bool):
+        return any(v for v, _ in present)
+    if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v, _ in present):
+        if all(isinstance(v, int) for v, _ in present):
+            return sum(v for v, _ in present)  # counts
+        total = sum(w for _, w in present)
+        return sum(v * w for v, w in present) / total  # ratios / scores
+    if all(isinstance(v, dict) for v, _ in present):
+        return merge_summaries([v for v, _ in present], [w for _, w in present])
+    if all(isinstance(v, str) for v, _ in present) and all(v in _SEVERITY for v, _ in present):
+        return max((v for v, _ in present), key=_SEVERITY.__getitem__)
+    return present[-1][0]
+
+
+def merge_summaries(summaries, weights=None):
+    """Merge computed summary dicts into one
+
+    Integer fields are summed (counts), float fields averaged weighted by
+    *weights* (ratios, scores), nested dicts merged recursively, risk-like
+    strings reduced to the most severe, and anything else takes the last
+    value.
+    """
+    summaries = [s if isinstance(s, dict) else {} for s in summaries]
+    if weights is None:
+        weights = [1] * len(summaries)
+    keys = []
+    for summary in summaries:
+        keys.extend(k for k in summary if k not in keys)
+    merged = {}
+    for key in keys:
+        value = _merge_values([s.get(key) for s in summaries], weights)
+        if value is not None:
+            merged[key] = value
+    return merged
+
+
+def merge_snapshots(snapshots):
+    """Merge one day's emotional snapshots into a single aggregate snapshot"""
+    weights = [s.get('snapshots', 1) for s in snapshots]
+    last = snapshots[-1]
+    return {
+        'date': last.get('date') or _day_of(last.get('timestamp')),
+        'timestamp': last.get('timestamp'),
+        'snapshots': sum(weights),
+        'emotion_data': merge_summaries([s.get('emotion_data') for s in snapshots], weights),
+        'session_summary': merge_summaries([s.get('session_summary') for s in snapshots], weights),
+    }
+
+
+def summarize_session_entries(entries, summaries=None):
+    """Fold session log entries into per-day summaries keyed by ISO date
+
+    Updates and returns *summaries*.  Summaries hold only counts and sums,
+    so summaries of disjoint entry sets merge with
+    :func:`merge_session_summary`.
+    """
+    if summaries is None:
+        summaries = {}
+    for entry in entries:
+        day = _day_of(entry.get('timestamp')) or UNDATED
+        summary = summaries.get(day)
+        if summary is None:
+            summary = summaries[day] = {'date': day, 'entries': 0, 'confidence_sum': 0.0,
+                                        'emotions': {}, 'risk_levels': {}}
+        summary['entries'] += 1
+        confidence = entry.get('confidence')
+        if isinstance(confidence, (int, float)) and not isinstance(confidence, bool):
+            summary['confidence_sum'] += confidence
+        emotion = str(entry.get('emotion') or 'neutral')
+        summary['emotions'][emotion] = summary['emotions'].get(emotion, 0) + 1
+        risk = str(entry.get('risk_level') or 'low')
+        summary['risk_levels'][risk] = summary['risk_levels'].get(risk, 0) + 1
+    return summaries
+
+
+def merge_session_summary(into, other):
+    """Add the counts of day summary *other* to *into*; returns *into*"""
+    into['entries'] = into.get('entries', 0) + other.get('entries', 0)
+    into['confidence_sum'] = into.get('confidence_sum', 0.0) + other.get('confidence_sum', 0.0)
+    for field in ('emotions', 'risk_levels'):
+        counts = into.setdefault(field, {})
+        for key, n in other.get(field, {}).items():
+            counts[key] = counts.get(key, 0) + n
+    return into
+
+
+# ---------------------------------------------------------------------------
+# Profile policies
+# ---------------------------------------------------------------------------
+
+def compact_emotional_history(history, now, raw_days=None, keep_days=None):
+    """Downsample *history* in place; returns the number of snapshots removed
+
+    Days older than *raw_days* holding several snapshots are merged into
+    one; snapshots older than *keep_days* are dropped.
+    """
+    raw_days = config.EMOTIONAL_HISTORY_RAW_DAYS if raw_days is None else raw_days
+    keep_days = config.EMOTIONAL_HISTORY_DAYS if keep_days is None else keep_days
+    raw_cutoff = (now - timedelta(days=raw_days)).date().isoformat()
+    keep_cutoff = (now - timedelta(days=keep_days)).date().isoformat()
+
+    old_days, recent = {}, []
+    for snapshot in history:
+        day = (snapshot.get('date') or _day_of(snapshot.get('timestamp'))
+               if isinstance(snapshot, dict) else None)
+        if day is None or day >= raw_cutoff:
+            recent.append(snapshot)
+        elif day >= keep_cutoff:
+            old_days.setdefault(day, []).append(snapshot)
+
+    compacted = [group[0] if len(group) == 1 else merge_snapshots(group)
+                 for _, group in sorted(old_days.items())]
+    removed = len(history) - len(compacted) - len(recent)
+    if removed:
+        history[:] = compacted + recent
+    return removed
+
+
+def compact_chat_history(profile, now, raw_days=None, max_messages=None):
+    """Remove old chat messages from *profile*; returns the number removed
+
+    Removed messages are counted into ``profile['chat_history_daily']``.
+    Messages are stored oldest-first, so removal stops at the first message
+    newer than *raw_days* (undated messages only go when over
+    *max_messages*).
+    """
+    chat = profile.get('chat_history')
+    if not chat:
+        return 0
+    raw_days = config.CONVERSATION_ARCHIVE_DAYS if raw_days is None else raw_days
+    max_messages = config.CHAT_HISTORY_MAX_MESSAGES if max_messages is None else max_messages
+    cutoff = now - timedelta(days=raw_days)
+
+    start = 0
+    while start < len(chat):
+        sent = parse_timestamp(chat[start].get('timestamp')) if isinstance(chat[start], dict) else None
+        if sent is None or sent >= cutoff:
+            break
+        start += 1
+    if max_messages:
+        start = max(start, len(chat) - max_messages)
+    if not start:
+        return 0
+
+    daily = profile.setdefault('chat_history_daily', {})
+    for message in chat[:start]:
+        message = message if isinstance(message, dict) else {}
+        day = _day_of(message.get('timestamp')) or UNDATED
+        counts = daily.setdefault(day, {'messages': 0, 'user_messages': 0, 'characters': 0})
+        counts['messages'] += 1
+        if message.get('role') == 'user':
+            counts['user_messages'] += 1
+        counts['characters'] += len(message.get('content') or '')
+    del chat[:start]
+    return start
+
+
+def prune_daily_counts(daily, now, keep_days=None):
+    """Drop ``chat_history_daily`` days older than *keep_days*; returns the number dropped"""
+    keep_days = config.RETENTION_AGGREGATE_DAYS if keep_days is None else keep_days
+    cutoff = (now - timedelta(days=keep_days)).date().isoformat()
+    expired = [day for day in daily if day != UNDATED and day < cutoff]
+    for day in expired:
+        del daily[day]
+    return len(expired)
+
+
+def apply_profile_retention(profile, now=None):
+    """Apply the profile policies to *profile* in place
+
+    Returns ``{'emotional_snapshots_removed': n, 'chat_messages_removed': m}``.
+    """
+    now = now or datetime.now()
+    stats = {'emotional_snapshots_removed': 0, 'chat_messages_removed': 0}
+    history = profile.get('emotional_history')
+    if isinstance(history, list):
+        stats['emotional_snapshots_removed'] = compact_emotional_history(history, now)
+    if isinstance(profile.get('chat_history'), list):
+        stats['chat_messages_removed'] = compact_chat_history(profile, now)
+    if isinstance(profile.get('chat_history_daily'), dict):
+        prune_daily_counts(profile['chat_history_daily'], now)
+    return stats
+
+
+# ---------------------------------------------------------------------------
+# Store-wide job
+# ---------------------------------------------------------------------------
+
+def run_retention(store, now=None):
+    """Apply every retention policy to *store* and report what was reclaimed
+
+    Profiles are compacted one user at a time and session logs in bounded
+    batches, so the job can run alongside the app.  Returns a report dict
+    with per-policy counts and ``bytes_reclaimed`` (storage size before
+    minus after).
+    """
+    now = now or datetime.now()
+    started = time.perf_counter()
+    before = store.storage_bytes()
+    report = {'users': 0, 'profiles_changed': 0, 'emotional_snapshots_removed': 0,
+              'chat_messages_removed': 0, 'session_entries_summarized': 0,
+              'session_summary_days': 0}
+
+    for user_id in store.list_users():
+        try:
+            profile = store.load_user_data(user_id)
+        except ValueError as e:
+            logger.warning("Retention skipped unreadable profile %s: %s", user_id, e)
+            continue
+        if not isinstance(profile, dict):
+            continue
+        report['users'] += 1
+        stats = apply_profile_retention(profile, now)
+        if any(stats.values()):
+            store.save_user_data(user_id, profile)
+            store.compact_profile(user_id)
+            report['profiles_changed'] += 1
+            for key, value in stats.items():
+                report[key] += value
+
+    cutoff = datetime.combine((now - timedelta(days=config.SESSION_LOG_RAW_DAYS)).date(),
+                              datetime.min.time())
+    summary_cutoff = (now - timedelta(days=config.RETENTION_AGGREGATE_DAYS)).date().isoformat()
+    for user_id in store.list_session_log_users():
+        result = store.compact_session_log(user_id, cutoff, summary_cutoff)
+        report['session_entries_summarized'] += result['entries']
+        report['session_summary_days'] += result['days']
+
+    store.vacuum()
+    report['bytes_reclaimed'] = before - store.storage_bytes()
+    report['seconds'] = round(time.perf_counter() - started, 3)
+    logger.info("Retention run: %s", report)
+    return report
+
+
+class RetentionScheduler:
+    """Run :func:`run_retention` on a store every *interval_hours* in a daemon thread"""
+
+    def __init__(self, store, interval_hours=None, initial_delay_seconds=60.0):
+        self.store = store
+        self.interval = 3600.0 * (config.RETENTION_INTERVAL_HOURS
+                                  if interval_hours is None else interval_hours)
+        self.initial_delay = initial_delay_seconds
+        self.last_report = None
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Schedule the first run (no-op if already started)"""
+        with self._lock:
+            if self._timer is None:
+                self._schedule(self.initial_delay)
+        return self
+
+    def stop(self):
+        """Cancel the next run"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    def _schedule(self, delay):
+        self._timer = threading.Timer(delay, self._run)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _run(self):
+        try:
+            self.last_report = run_retention(self.store)
+        except Exception as e:
+            logger.error("Retention run failed: %s", e)
+        with self._lock:
+            if self._timer is not None:
+                self._schedule(self.interval)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apply data retention policies to a data directory")
+    parser.add_argument('data_dir', nargs='?', default=None,
+                        help="Data directory (default: ~/.wellness_buddy)")
+    parser.add_argument('--engine', choices=('json', 'sqlite'), default=None,
+                        help="Storage engine (default: config.DATA_STORE_ENGINE)")
+    args = parser.parse_args(argv)
+
+    from data_store import open_data_store
+
+    store = open_data_store(args.data_dir, engine=args.engine)
+    try:
+        report = run_retention(store)
+    finally:
+        store.flush()
+        close = getattr(store, 'close', None)
+        if close is not None:
+            close()
+    for key, value in report.items():
+        print(f"{key:28s} {value}")
+    return report
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""Benchmark SQL-side cohort analytics against in-Python aggregation.
+
+Seeds a synthetic ``emotion_logs`` table (default 1,000,000 rows spread over
+1,000 users) and times two ways of producing the cohort research metrics:
+
+* ``python`` — load every ORM row and aggregate with ``analytics_service``
+  (what ``/analytics/research`` does per user, applied to the whole cohort)
+* ``sql``    — ``cohort_analytics_service.compute_cohort_analytics``
+  (GROUP BY / AVG / LIMIT inside the database)
+
+Works against SQLite (default, a temp file) or PostgreSQL via
+``--database-url postgresql+asyncpg://…``.  Results are printed and saved to
+results/cohort_analytics_benchmark.json.
+
+Usage: python run_cohort_analytics_benchmark.py [--rows N] [--users N]
+           [--database-url URL] [--skip-python] [--repeat N]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+_ROOT = os.path.abspath(os.path.dirname(__file__))
+_BACKEND = os.path.join(_ROOT, "backend")
+if _BACKEND not in sys.path:
+    sys.path.insert(0, _BACKEND)
+
+_EMOTIONS = ("joy", "sadness", "anger", "fear", "anxiety", "neutral", "crisis")
+_EMOTION_WEIGHTS = (20, 25, 10, 10, 20, 14, 1)
+_INSERT_BATCH = 20_000
+
+
+def _synthetic_rows(rows: int, users: int, seed: int):
+    """Yield EmotionLog insert dicts in batches of ``_INSERT_BATCH``."""
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    span_s = 180 * 24 * 3600
+    batch = []
+    for _ in range(rows):
+        risk = round(rng.random(), 4)
+        batch.append({
+            "user_id": rng.randint(1, users),
+            "input_text": "synthetic",
+            "primary_emotion": rng.choices(_EMOTIONS, _EMOTION_WEIGHTS)[0],
+            "confidence": round(rng.uniform(0.3, 0.99), 4),
+            "uncertainty": round(rng.uniform(0.0, 0.5), 4),
+            "is_high_risk": risk >= 0.7,
+            "all_scores": None,
+            "risk_score": risk,
+            "personalization_score": round(rng.uniform(0.2, 0.9), 4),
+            "created_at": start + timedelta(seconds=rng.randrange(span_s)),
+        })
+        if len(batch) >= _INSERT_BATCH:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def _seed(engine, rows: int, users: int, seed: int) -> float:
+    from sqlalchemy import insert
+
+    from app.database import Base
+    from app.models.emotion import EmotionLog
+    from app.models.user import User
+
+    t0 = time.perf_counter()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(User), [
+            {
+                "email": f"bench{i}@example.com",
+                "username": f"bench{i}",
+                "hashed_password": "x",
+                "is_active": True,
+            }
+            for i in range(1, users + 1)
+        ])
+        for batch in _synthetic_rows(rows, users, seed):
+            await conn.execute(insert(EmotionLog), batch)
+    return time.perf_counter() - t0
+
+
+async def _python_path(session) -> dict:
+    from sqlalchemy import select
+
+    from app.models.emotion import EmotionLog
+    from app.services import analytics_service
+
+    logs = list((await session.execute(
+        select(EmotionLog).order_by(EmotionLog.created_at.asc(), EmotionLog.id.asc())
+    )).scalars().all())
+    return {
+        "total_sessions": len(logs),
+        "emotion_distribution": analytics_service.compute_emotion_distribution(logs),
+        "average_confidence": analytics_service.compute_average_confidence(logs),
+        "risk_trend": analytics_service.compute_risk_trend(logs),
+        "research_summary": analytics_service.generate_research_summary(logs),
+    }
+
+
+async def _sql_path(session) -> dict:
+    from app.services import cohort_analytics_service
+
+    return await cohort_analytics_service.compute_cohort_analytics(session)
+
+
+async def _time(session_factory, fn, repeat: int) -> tuple[float, dict]:
+    best = float("inf")
+    out: dict = {}
+    for _ in range(repeat):
+        async with session_factory() as session:
+            t0 = time.perf_counter()
+            out = await fn(session)
+            best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+async def _run(args) -> dict:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    tmpdir = None
+    url = args.database_url
+    if not url:
+        tmpdir = tempfile.mkdtemp(prefix="cohort_bench_")
+        url = f"sqlite+aiosqlite:///{os.path.join(tmpdir, 'bench.db')}"
+
+    engine = create_async_engine(url, echo=False)
+    try:
+        print(f"Seeding {args.rows:,} emotion logs for {args.users:,} users → {engine.dialect.name}")
+        seed_s = await _seed(engine, args.rows, args.users, args.seed)
+        print(f"  seeded in {seed_s:.1f}s")
+
+        factory = async_sessionmaker(engine, expire_on_commit=False)
+        report: dict = {
+            "dialect": engine.dialect.name,
+            "rows": args.rows,
+            "users": args.users,
+            "seed_seconds": round(seed_s, 2),
+        }
+
+        sql_s, sql_out = await _time(factory, _sql_path, args.repeat)
+        report["sql_seconds"] = round(sql_s, 4)
+        print(f"  sql     : {sql_s:8.3f}s")
+
+        if not args.skip_python:
+            py_s, py_out = await _time(factory, _python_path, args.repeat)
+            report["python_seconds"] = round(py_s, 4)
+            report["speedup"] = round(py_s / sql_s, 1) if sql_s else None
+            report["outputs_match"] = (
+                sql_out["emotion_distribution"] == py_out["emotion_distribution"]
+                and sql_out["risk_trend"] == py_out["risk_trend"]
+                and {k: v for k, v in sql_out["research_summary"].items() if k != "generated_at"}
+                == {k: v for k, v in py_out["research_summary"].items() if k != "generated_at"}
+            )
+            print(f"  python  : {py_s:8.3f}s  (×{report['speedup']} slower, "
+                  f"outputs_match={report['outputs_match']})")
+        return report
+    finally:
+        await engine.dispose()
+        if tmpdir:
+            for name in os.listdir(tmpdir):
+                os.remove(os.path.join(tmpdir, name))
+            os.rmdir(tmpdir)
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(
+        description="Benchmark SQL-side cohort analytics against Python aggregation.",
+    )
+    p.add_argument("--rows", type=int, default=1_000_000,
+                   help="Number of synthetic emotion logs (default: 1,000,000).")
+    p.add_argument("--users", type=int, default=1_000,
+                   help="Number of synthetic users (default: 1,000).")
+    p.add_argument("--database-url", default=None,
+                   help="Async SQLAlchemy URL; defaults to a temporary SQLite file. "
+                        "The emotion_logs/users tables are dropped and recreated.")
+    p.add_argument("--repeat", type=int, default=1,
+                   help="Timed repetitions per path; the best run is reported.")
+    p.add_argument("--skip-python", action="store_true",
+                   help="Only time the SQL path (the Python path needs all rows in memory).")
+    p.add_argument("--seed", type=int, default=42)
+    args = p.parse_args(argv)
+
+    # Must be set before app.config is imported by the backend modules.
+    os.environ.setdefault("SECRET_KEY", "cohort-benchmark-secret-key-not-for-production")
+
+    report = asyncio.run(_run(args))
+
+    os.makedirs(os.path.join(_ROOT, "results"), exist_ok=True)
+    out = os.path.join(_ROOT, "results", "cohort_analytics_benchmark.json")
+    with open(out, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2)
+    print(f"\n✅ Benchmark results saved to {out}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""Benchmark the JSON and SQLite DataStore engines with many local profiles.
+
+For each engine a fresh temporary data directory is populated with
+``--users`` profiles (default 10,000), each carrying ``--messages`` chat
+messages and a few emotional-history snapshots, with encryption as
+configured.  Timed operations:
+
+* ``populate``      — save_user_data for every user
+* ``list_users``    — enumerate profiles
+* ``user_exists``   — ``--lookups`` random existence checks
+* ``load``          — ``--lookups`` random full profile loads (fresh store,
+  so the JSON engine's decoded-profile cache starts cold)
+* ``save_update``   — ``--lookups`` load + append one message + save
+* ``load_section``  — SQLite only: ``--lookups`` chat_history-only reads
+
+Results are printed and saved to results/data_store_benchmark.json.
+
+Usage: python run_data_store_benchmark.py [--users N] [--messages N] [--lookups N]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+_ROOT = os.path.abspath(os.path.dirname(__file__))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+
+def _profile(uid: str, messages: int) -> dict:
+    from user_profile import UserProfile
+
+    profile = UserProfile(uid)
+    profile.save_chat_history([
+        {"role": "user" if i % 2 == 0 else "assistant",
+         "content": f"message {i} from {uid} " + "lorem ipsum " * 6}
+        for i in range(messages)
+    ])
+    profile.profile_data["emotional_history"] = [
+        {"timestamp": "2026-01-0%dT10:00:00" % (d + 1), "emotion_data": {"risk_level": "low"}}
+        for d in range(5)
+    ]
+    return profile.get_profile()
+
+
+def _timed(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def _bench_engine(engine: str, args) -> dict:
+    from data_store import open_data_store
+
+    tmpdir = tempfile.mkdtemp(prefix=f"ds_bench_{engine}_")
+    rng = random.Random(args.seed)
+    users = [f"user{i:05d}" for i in range(args.users)]
+    sample = [rng.choice(users) for _ in range(args.lookups)]
+    report: dict = {}
+    try:
+        store = open_data_store(tmpdir, engine=engine)
+        template = _profile("template", args.messages)
+
+        def populate():
+            for uid in users:
+                data = dict(template, user_id=uid)
+                store.save_user_data(uid, data)
+            store.flush()
+
+        report["populate_s"] = _timed(populate)
+        if hasattr(store, "close"):
+            store.close()
+
+        # Fresh instance: no warm caches from populate().
+        store = open_data_store(tmpdir, engine=engine)
+        listed: list = []
+        report["list_users_s"] = _timed(lambda: listed.extend(store.list_users()))
+        assert len(listed) == args.users, (engine, len(listed))
+        report["user_exists_s"] = _timed(lambda: [store.user_exists(u) for u in sample])
+        report["load_s"] = _timed(lambda: [store.load_user_data(u) for u in sample])
+
+        def save_update():
+            for uid in sample:
+                data = store.load_user_data(uid)
+                data["chat_history"].append({"role": "user", "content": "one more"})
+                store.save_user_data(uid, data)
+            store.flush()
+
+        report["save_update_s"] = _timed(save_update)
+        if engine == "sqlite":
+            report["load_section_s"] = _timed(
+                lambda: [store.load_user_section(u, "chat_history") for u in sample])
+            store.close()
+
+        report["disk_bytes"] = sum(
+            os.path.getsize(os.path.join(tmpdir, f)) for f in os.listdir(tmpdir))
+        return {k: round(v, 4) if isinstance(v, float) else v for k, v in report.items()}
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(
+        description="Benchmark JSON vs SQLite DataStore engines.",
+    )
+    p.add_argument("--users", type=int, default=10_000,
+                   help="Number of local profiles (default: 10,000).")
+    p.add_argument("--messages", type=int, default=40,
+                   help="Chat messages per profile (default: 40).")
+    p.add_argument("--lookups", type=int, default=1_000,
+                   help="Random lookups / loads / updates per operation (default: 1,000).")
+    p.add_argument("--engines", nargs="+", default=["json", "sqlite"],
+                   choices=["json", "sqlite"])
+    p.add_argument("--seed", type=int, default=42)
+    args = p.parse_args(argv)
+
+    report = {"users": args.users, "messages": args.messages, "lookups": args.lookups}
+    for engine in args.engines:
+        print(f"Benchmarking {engine} engine with {args.users:,} users …")
+        report[engine] = _bench_engine(engine, args)
+        for key, value in report[engine].items():
+            print(f"  {key:16s} {value}")
+
+    os.makedirs(os.path.join(_ROOT, "results"), exist_ok=True)
+    out = os.path.join(_ROOT, "results", "data_store_benchmark.json")
+    with open(out, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2)
+    print(f"\n✅ Benchmark results saved to {out}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Benchmark cold import / construction time of the AI core.
+
+Each target is timed in ``--repeat`` fresh interpreters (so nothing is
+already in ``sys.modules``) and the median is compared with its budget:
+
+* ``emotion_analyzer``  — ``import emotion_analyzer``
+* ``analyzer_init``     — import + ``EmotionAnalyzer()`` (no model loads)
+* ``wellness_buddy``    — ``import wellness_buddy``
+* ``ui_app``            — ``import ui_app`` (Streamlit itself dominates)
+
+A target also fails when it pulls in a deferred heavy module (TextBlob /
+NLTK, transformers, torch) or loads a model.  The script exits with status
+1 on any failure, so it can gate CI against startup regressions.
+Results are printed and saved to results/import_benchmark.json.
+
+Usage: python run_import_benchmark.py [--repeat N] [--budget-scale X] [--only NAME]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+_ROOT = os.path.abspath(os.path.dirname(__file__))
+
+# name → (statement, budget in seconds)
+TARGETS = {
+    "emotion_analyzer": ("import emotion_analyzer", 0.25),
+    "analyzer_init": ("import emotion_analyzer; emotion_analyzer.EmotionAnalyzer()", 0.35),
+    "wellness_buddy": ("import wellness_buddy", 0.40),
+    "ui_app": ("import ui_app", 1.50),
+}
+
+# Modules that must only be imported on first use.
+DEFERRED_MODULES = ("textblob", "nltk", "transformers", "torch")
+
+_PROBE = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+t0 = time.perf_counter()
+{stmt}
+elapsed = time.perf_counter() - t0
+import model_registry
+print(json.dumps({{
+    "seconds": elapsed,
+    "deferred_loaded": [m for m in {deferred!r} if m in sys.modules],
+    "models_loaded": [s["model"] for s in model_registry.registry.stats() if s["loaded"]],
+}}))
+"""
+
+
+def probe(stmt: str) -> dict:
+    """Run *stmt* in a fresh interpreter and return its timing / module report."""
+    code = _PROBE.format(root=_ROOT, stmt=stmt, deferred=DEFERRED_MODULES)
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=_ROOT, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Benchmark cold import time of the AI core.")
+    p.add_argument("--repeat", type=int, default=5,
+                   help="Fresh interpreters per target (default: 5).")
+    p.add_argument("--budget-scale", type=float, default=1.0,
+                   help="Multiply every budget, e.g. 2 on slow CI machines (default: 1).")
+    p.add_argument("--only", choices=sorted(TARGETS), action="append",
+                   help="Benchmark only this target (repeatable).")
+    args = p.parse_args(argv)
+
+    report = {"repeat": args.repeat, "budget_scale": args.budget_scale, "targets": {}}
+    failed = []
+    for name in args.only or TARGETS:
+        stmt, budget = TARGETS[name]
+        budget *= args.budget_scale
+        runs = [probe(stmt) for _ in range(args.repeat)]
+        median = statistics.median(r["seconds"] for r in runs)
+        deferred = sorted({m for r in runs for m in r["deferred_loaded"]})
+        models = sorted({m for r in runs for m in r["models_loaded"]})
+        ok = median <= budget and not deferred and not models
+        report["targets"][name] = {
+            "median_ms": round(median * 1e3, 1), "budget_ms": round(budget * 1e3, 1),
+            "deferred_loaded": deferred, "models_loaded": models, "ok": ok,
+        }
+        print(f"{name:17s} {median * 1e3:8.1f} ms  (budget {budget * 1e3:6.0f} ms)  "
+              f"{'ok' if ok else 'FAIL'}"
+              + (f"  eager imports: {', '.join(deferred)}" if deferred else "")
+              + (f"  models loaded: {', '.join(models)}" if models else ""))
+        if not ok:
+            failed.append(name)
+
+    os.makedirs(os.path.join(_ROOT, "results"), exist_ok=True)
+    out = os.path.join(_ROOT, "results", "import_benchmark.json")
+    with open(out, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2)
+    print(f"\n✅ Benchmark results saved to {out}")
+    if failed:
+        print(f"❌ Startup regression: {', '.join(failed)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
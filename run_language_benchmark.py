@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Benchmark Tamil / Tanglish script detection and keyword emotion matching.
+
+Builds three corpora of ``--messages`` chat-style messages each (English,
+Tanglish, Tamil Unicode) plus a mixed one, then times per message:
+
+* ``legacy``  — the original per-keyword substring scans
+  (detect_script followed by detect_tanglish_emotion /
+  detect_tamil_unicode_emotion, as classify_emotion used to call them)
+* ``scan``    — LanguageHandler.scan (compiled matcher, one pass)
+
+Every message is checked to give identical script and emotion from both.
+Results are printed and saved to results/language_benchmark.json.
+
+Usage: python run_language_benchmark.py [--messages N] [--repeat N] [--seed N]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+_ROOT = os.path.abspath(os.path.dirname(__file__))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+_ENGLISH = ("i have been feeling really tired and low after work this week, "
+            "my manager keeps adding deadlines and i can't sleep properly").split()
+_TANGLISH = "naan romba tired ah iruken, office la work adhigam, enna pannuradhu theriyala".split()
+_TAMIL = "நான் இன்று மிகவும் சோர்வாக இருக்கிறேன் வேலை அதிகம் தூக்கம் இல்லை".split()
+_SEVERITY = ('crisis', 'sadness', 'fear', 'anxiety', 'anger', 'joy')
+
+
+def _corpora(n: int, seed: int) -> dict[str, list[str]]:
+    from language_handler import TAMIL_UNICODE_EMOTION_KEYWORDS, TANGLISH_EMOTION_KEYWORDS
+
+    rng = random.Random(seed)
+    tanglish_kw = [w for ws in TANGLISH_EMOTION_KEYWORDS.values() for w in ws]
+    tamil_kw = [w for ws in TAMIL_UNICODE_EMOTION_KEYWORDS.values() for w in ws]
+
+    def build(words, keywords, kw_rate):
+        msgs = []
+        for _ in range(n):
+            msg = rng.choices(words, k=rng.randint(6, 30))
+            if keywords and rng.random() < kw_rate:
+                msg.insert(rng.randrange(len(msg)), rng.choice(keywords))
+            msgs.append(" ".join(msg))
+        return msgs
+
+    corpora = {
+        "english": build(_ENGLISH, None, 0),
+        "tanglish": build(_TANGLISH + _ENGLISH[:8], tanglish_kw, 0.6),
+        "tamil": build(_TAMIL, tamil_kw, 0.6),
+    }
+    corpora["mixed"] = [m for group in zip(*corpora.values()) for m in group][:n]
+    return corpora
+
+
+def _legacy(lh, text: str):
+    from language_handler import _TAMIL_UNICODE_RANGE
+
+    def most_severe(flat, target):
+        matched = {}
+        for kw, emotion in flat.items():
+            if kw in target:
+                matched[emotion] = matched.get(emotion, 0) + 1
+        return next((e for e in _SEVERITY if e in matched), None)
+
+    if _TAMIL_UNICODE_RANGE.search(text):
+        return 'tamil', most_severe(lh._tamil_flat, text)
+    lower = text.lower()
+    for kw in lh._tanglish_flat:
+        if kw in lower:
+            return 'tanglish', most_severe(lh._tanglish_flat, lower)
+    return 'english', None
+
+
+def _time(fn, texts, repeat: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            fn(text)
+    return (time.perf_counter() - t0) / (repeat * len(texts))
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(
+        description="Benchmark Tamil/Tanglish script detection and keyword matching.",
+    )
+    p.add_argument("--messages", type=int, default=2000,
+                   help="Messages per corpus (default: 2000).")
+    p.add_argument("--repeat", type=int, default=5,
+                   help="Timed passes over each corpus (default: 5).")
+    p.add_argument("--seed", type=int, default=42, help="Corpus random seed (default: 42).")
+    args = p.parse_args(argv)
+
+    from language_handler import LanguageHandler
+
+    lh = LanguageHandler()
+    report = {"messages": args.messages, "repeat": args.repeat}
+    for name, texts in _corpora(args.messages, args.seed).items():
+        for text in texts:
+            scanned = lh.scan(text)
+            assert (scanned['script'], scanned['emotion']) == _legacy(lh, text), text
+        legacy_s = _time(lambda t: _legacy(lh, t), texts, args.repeat)
+        scan_s = _time(lh.scan, texts, args.repeat)
+        report[name] = {"legacy_us": round(legacy_s * 1e6, 2), "scan_us": round(scan_s * 1e6, 2),
+                        "speedup": round(legacy_s / scan_s, 2) if scan_s else None}
+        print(f"{name:9s} legacy {report[name]['legacy_us']:8.2f} µs/msg   "
+              f"scan {report[name]['scan_us']:8.2f} µs/msg   x{report[name]['speedup']}")
+
+    os.makedirs(os.path.join(_ROOT, "results"), exist_ok=True)
+    out = os.path.join(_ROOT, "results", "language_benchmark.json")
+    with open(out, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2)
+    print(f"\n✅ Benchmark results saved to {out}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Benchmark per-message persistence cost of ``ui_app._persist_chat_history``.
+
+Simulates a chat session of ``--messages`` turns.  After each turn the chat,
+emotion and risk histories grow by one entry and ``_persist_chat_history`` is
+called exactly as the Streamlit UI does.  Each run uses a fresh encrypted
+DataStore in a temporary directory and is timed in two modes:
+
+* ``write_through`` — every call decrypts, re-encrypts and atomically
+  rewrites the profile file (``write_back_ms=0``)
+* ``write_back``    — calls update the decoded-profile cache and the file is
+  written once by the final flush (the UI's configuration)
+
+Reports mean / p50 / p95 / max per-message latency and the total including
+the final flush, and saves results/persistence_benchmark.json.
+
+Usage: python run_persistence_benchmark.py [--messages N] [--write-back-ms MS]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+_ROOT = os.path.abspath(os.path.dirname(__file__))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def _run_mode(ui_app, st, messages: int, write_back_ms: int) -> dict:
+    from data_store import DataStore
+    from session_manager import SessionManager
+    from user_profile import UserProfile
+
+    class _Buddy:
+        """Minimal stand-in: _persist_chat_history only checks user_profile."""
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        # Long flush interval so the timer never fires mid-run; the final
+        # flush is timed explicitly.
+        ds = DataStore(data_dir=tmpdir, write_back_ms=write_back_ms)
+        uid = "bench_user"
+        profile = UserProfile(uid)
+        profile.set_password("BenchPass1!")
+        ds.save_user_data(uid, profile.get_profile())
+        ds.flush()
+
+        buddy = _Buddy()
+        buddy.user_profile = profile
+        mgr = SessionManager(ds)
+        mgr.create_session(uid)
+
+        st.session_state.buddy = buddy
+        st.session_state.session_mgr = mgr
+        st.session_state.user_id = uid
+        st.session_state.chat_history = []
+        st.session_state.emotion_history = []
+        st.session_state.risk_history = []
+
+        latencies = []
+        for i in range(messages):
+            now = datetime.now().isoformat()
+            st.session_state.chat_history.append(
+                {"role": "user", "content": f"message {i} " + "lorem ipsum " * 8})
+            st.session_state.chat_history.append(
+                {"role": "assistant", "content": f"reply {i} " + "dolor sit amet " * 12})
+            st.session_state.emotion_history.append(
+                {"timestamp": now, "emotion": "sadness", "confidence": 0.7})
+            st.session_state.risk_history.append(
+                {"timestamp": now, "risk_score": 0.3, "risk_level": "low"})
+            t0 = time.perf_counter()
+            ui_app._persist_chat_history()
+            latencies.append(time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        mgr.end_session(uid)
+        flush_s = time.perf_counter() - t0
+
+        reloaded = SessionManager(DataStore(data_dir=tmpdir)).load_session(uid)
+        assert reloaded and len(reloaded["chat_history"]) == 2 * messages
+
+    ms = [x * 1000 for x in latencies]
+    return {
+        "mean_ms": round(statistics.fmean(ms), 3),
+        "p50_ms": round(_percentile(ms, 50), 3),
+        "p95_ms": round(_percentile(ms, 95), 3),
+        "max_ms": round(max(ms), 3),
+        "final_flush_ms": round(flush_s * 1000, 3),
+        "total_ms": round(sum(ms) + flush_s * 1000, 3),
+    }
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(
+        description="Benchmark ui_app._persist_chat_history per-message cost.",
+    )
+    p.add_argument("--messages", type=int, default=200,
+                   help="Chat turns to simulate (default: 200).")
+    p.add_argument("--write-back-ms", type=int, default=3_600_000,
+                   help="Flush interval for the write-back run (default: 1h, "
+                        "i.e. only the explicit end-of-session flush).")
+    args = p.parse_args(argv)
+
+    import streamlit as st
+    import ui_app
+
+    report = {"messages": args.messages}
+    for mode, wb in (("write_through", 0), ("write_back", args.write_back_ms)):
+        report[mode] = _run_mode(ui_app, st, args.messages, wb)
+        r = report[mode]
+        print(f"{mode:14s} mean={r['mean_ms']:8.3f}ms  p95={r['p95_ms']:8.3f}ms  "
+              f"total={r['total_ms']:10.1f}ms")
+
+    os.makedirs(os.path.join(_ROOT, "results"), exist_ok=True)
+    out = os.path.join(_ROOT, "results", "persistence_benchmark.json")
+    with open(out, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2)
+    print(f"\n✅ Benchmark results saved to {out}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""Benchmark total memory of N inference workers with and without pre-fork sharing.
+
+Two modes, each measured in a fresh interpreter that forks ``--workers``
+children (like a gunicorn master):
+
+* ``per_worker`` — every worker loads its own models after fork
+* ``prefork``    — the master loads the models through model_registry,
+  calls ``freeze_for_fork()`` and the workers inherit them copy-on-write
+
+Every worker then runs inference (``set_inference_threads(1)`` first) and
+the master + workers are measured from /proc/<pid>/smaps_rollup:
+
+* ``rss_mb``     — sum of RSS (counts shared pages once per process)
+* ``pss_mb``     — sum of PSS (shared pages split between sharers; the
+  real total)
+* ``private_mb`` — memory each worker holds privately, on average
+
+By default the "model" is a ``--model-mb`` float32 weight matrix, so the
+benchmark runs without transformers; ``--real`` loads the configured
+DistilRoBERTa / BART-MNLI models through EmotionAnalyzer instead.
+Linux only.  Results are printed and saved to results/prefork_memory_benchmark.json.
+
+Usage: python run_prefork_memory_benchmark.py [--workers N] [--model-mb MB] [--real]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+_ROOT = os.path.abspath(os.path.dirname(__file__))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+_MODES = ("per_worker", "prefork")
+_TEXT = "I feel really low and tired today, nothing seems to go right."
+
+
+def _smaps(pid: int) -> dict[str, int]:
+    """kB values of /proc/<pid>/smaps_rollup."""
+    out = {}
+    with open(f"/proc/{pid}/smaps_rollup") as fh:
+        for line in fh:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                out[parts[0].rstrip(":")] = int(parts[1])
+    return out
+
+
+class _FakeModel:
+    def __init__(self, model_mb: int):
+        import numpy as np
+
+        self.weights = np.ones(model_mb * 1024 * 1024 // 4, dtype=np.float32)
+
+    def __call__(self, text):
+        return float(self.weights[:: 4096].sum())
+
+
+def _load(model_mb: int, real: bool):
+    """Load the model(s) through the registry; returns an inference callable."""
+    import model_registry
+
+    if real:
+        from emotion_analyzer import EmotionAnalyzer
+
+        analyzer = EmotionAnalyzer()
+        analyzer.warmup()
+        return analyzer.classify_emotion
+    return model_registry.get_model("benchmark", f"fake-{model_mb}mb",
+                                    loader=lambda task, model: _FakeModel(model_mb))
+
+
+def _measure(mode: str, workers: int, model_mb: int, real: bool) -> dict:
+    import model_registry
+
+    if mode == "prefork":
+        _load(model_mb, real)
+        model_registry.freeze_for_fork()
+
+    children = []
+    for _ in range(workers):
+        ready_r, ready_w = os.pipe()
+        stop_r, stop_w = os.pipe()
+        pid = os.fork()
+        if pid == 0:  # worker
+            os.close(ready_r)
+            os.close(stop_w)
+            model_registry.set_inference_threads(1)
+            infer = _load(model_mb, real)  # registry hit when pre-forked
+            infer(_TEXT)
+            os.write(ready_w, b"1")
+            os.read(stop_r, 1)
+            os._exit(0)
+        os.close(ready_w)
+        os.close(stop_r)
+        os.read(ready_r, 1)
+        children.append((pid, stop_w))
+
+    master = _smaps(os.getpid())
+    per_child = [_smaps(pid) for pid, _ in children]
+    for pid, stop_w in children:
+        os.write(stop_w, b"1")
+        os.waitpid(pid, 0)
+
+    everyone = [master] + per_child
+    private = [c.get("Private_Clean", 0) + c.get("Private_Dirty", 0) for c in per_child]
+    return {
+        "rss_mb": round(sum(p.get("Rss", 0) for p in everyone) / 1024, 1),
+        "pss_mb": round(sum(p.get("Pss", 0) for p in everyone) / 1024, 1),
+        "private_mb": round(sum(private) / len(private) / 1024, 1),
+    }
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Benchmark total RSS of N workers with pre-fork model sharing.")
+    p.add_argument("--workers", type=int, default=4, help="Forked workers (default: 4).")
+    p.add_argument("--model-mb", type=int, default=256,
+                   help="Size of the stand-in model in MB (default: 256).")
+    p.add_argument("--real", action="store_true",
+                   help="Load the configured transformer models instead of a stand-in.")
+    p.add_argument("--mode", choices=_MODES, help=argparse.SUPPRESS)  # internal: one measurement
+    args = p.parse_args(argv)
+
+    if args.mode:
+        print(json.dumps(_measure(args.mode, args.workers, args.model_mb, args.real)))
+        return 0
+
+    report = {"workers": args.workers, "model": "real" if args.real else f"{args.model_mb} MB stand-in"}
+    for mode in _MODES:
+        cmd = [sys.executable, os.path.abspath(__file__), "--mode", mode,
+               "--workers", str(args.workers), "--model-mb", str(args.model_mb)]
+        if args.real:
+            cmd.append("--real")
+        out = subprocess.run(cmd, cwd=_ROOT, capture_output=True, text=True, check=True).stdout
+        report[mode] = json.loads(out.strip().splitlines()[-1])
+        print(f"{mode:10s} total RSS {report[mode]['rss_mb']:8.1f} MB   "
+              f"total PSS {report[mode]['pss_mb']:8.1f} MB   "
+              f"private/worker {report[mode]['private_mb']:7.1f} MB")
+    report["pss_saving"] = round(1 - report["prefork"]["pss_mb"] / report["per_worker"]["pss_mb"], 3)
+    print(f"\nPre-fork sharing saves {report['pss_saving']:.0%} of total memory "
+          f"with {args.workers} workers.")
+
+    os.makedirs(os.path.join(_ROOT, "results"), exist_ok=True)
+    out = os.path.join(_ROOT, "results", "prefork_memory_benchmark.json")
+    with open(out, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2)
+    print(f"\n✅ Benchmark results saved to {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
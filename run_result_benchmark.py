@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Benchmark the classify_emotion result object.
+
+Times ``--repeat`` classify_emotion calls over a small mixed-message corpus
+and measures the bytes allocated per call (tracemalloc) for two consumers:
+
+* ``hot_path``    — reads the handful of fields the chat pipeline uses
+                    (primary_emotion, confidence_score, is_crisis, …); the
+                    explanations and aliases are never computed
+* ``materialize`` — ``dict(result)``, i.e. every field, the cost the eager
+                    dict used to pay on every call
+
+Results are printed and saved to results/result_benchmark.json.
+
+Usage: python run_result_benchmark.py [--repeat N]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+_ROOT = os.path.abspath(os.path.dirname(__file__))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+_MESSAGES = [
+    "I feel so sad and hopeless, I keep crying",
+    "Today was great, I finally finished my project!",
+    "I'm anxious about the exam tomorrow and can't sleep",
+    "Everything is fine I guess",
+    "He keeps shouting at me and I'm scared to go home",
+]
+
+_HOT_FIELDS = ("primary_emotion", "confidence_score", "is_crisis",
+               "concern_level", "emotion_probabilities", "uncertainty_score")
+
+
+def _hot_path(result) -> None:
+    for key in _HOT_FIELDS:
+        result[key]
+
+
+def _bench(analyzer, consume, repeat: int) -> dict:
+    texts = [_MESSAGES[i % len(_MESSAGES)] for i in range(repeat)]
+    t0 = time.perf_counter()
+    for text in texts:
+        consume(analyzer.classify_emotion(text))
+    per_call_s = (time.perf_counter() - t0) / repeat
+
+    tracemalloc.start()
+    allocated = 0
+    for text in texts[:50]:
+        before = tracemalloc.get_traced_memory()[0]
+        result = analyzer.classify_emotion(text)
+        consume(result)
+        allocated += tracemalloc.get_traced_memory()[0] - before
+        del result
+    tracemalloc.stop()
+    return {"per_call_us": round(per_call_s * 1e6, 1),
+            "retained_bytes_per_result": allocated // min(50, repeat)}
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(
+        description="Benchmark the classify_emotion result object.",
+    )
+    p.add_argument("--repeat", type=int, default=500,
+                   help="classify_emotion calls per consumer (default: 500).")
+    args = p.parse_args(argv)
+
+    from emotion_analyzer import EmotionAnalyzer
+
+    analyzer = EmotionAnalyzer()
+    for text in _MESSAGES:  # warm the caches
+        dict(analyzer.classify_emotion(text))
+
+    report = {"repeat": args.repeat}
+    for name, consume in (("hot_path", _hot_path), ("materialize", dict)):
+        print(f"Benchmarking {name} …")
+        report[name] = _bench(analyzer, consume, args.repeat)
+        for key, value in report[name].items():
+            print(f"  {key:26s} {value}")
+
+    os.makedirs(os.path.join(_ROOT, "results"), exist_ok=True)
+    out = os.path.join(_ROOT, "results", "result_benchmark.json")
+    with open(out, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2)
+    print(f"\n✅ Benchmark results saved to {out}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
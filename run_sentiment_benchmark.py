@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Verify and benchmark sentiment_lexicon against TextBlob.
+
+Scores a reference corpus with ``TextBlob(text).sentiment`` and with
+``sentiment_lexicon.sentiment`` and reports:
+
+* ``mismatches``       — texts whose (polarity, subjectivity) differ
+                         (beyond ``--tolerance``; default exact)
+* ``textblob_us``      — per-call time of TextBlob
+* ``lexicon_us``       — per-call time of the lexicon scorer
+
+The corpus is the analyzer's built-in benchmark messages, a set of
+negation / intensifier / emoticon / punctuation edge cases, ``--generated``
+seeded random sentences over the lexicon, and optionally a GoEmotions file
+(``--dataset``).
+
+Results are printed and saved to results/sentiment_benchmark.json.
+
+Usage: python run_sentiment_benchmark.py [--dataset PATH] [--generated N] [--repeat N] [--tolerance X]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+_ROOT = os.path.abspath(os.path.dirname(__file__))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+EDGE_CASES = [
+    "I don't like it", "not good", "not bad", "never been happier :) :) <3",
+    "I am not very happy :( !", "really not good", "not really that good",
+    "very very very good", "Wow!!! Amazing :D", "I'm so so happy!!!",
+    "absolutely not happy", "unbelievably bad", "Mr. Smith was terribly rude",
+    "He said \"I'm fine\" but he isn't.", "e.g. the U.S. is big... really big!",
+    "“Great,” she said. ‘Terrible’", "This is (!) great", "(!) sarcasm ( ! ) marks",
+    "line one\n\nline two is awful", "first part\r\n\r\nsecond part is lovely",
+    "it's sooo good xD", "I feel :'( today", "totally :-/ confused", "no. O well",
+    "Honestly? Not bad at all.", "Best. Day. Ever!", "I can't stand this awful pain",
+    "kinda ok I guess -_-", "", "   ", "!!!",
+    "I feel so sad and hopeless, I keep crying",
+    "Today was great, I finally finished my project!",
+    "He keeps shouting at me and I'm scared to go home",
+]
+
+_FILLER = ["not", "no", "never", "very", "really", "extremely", "a", "the", "I", "is",
+           "!", "?", ".", "...", ",", "(!)", ":)", ":(", ":-D", "'", "\"", "don't", "\n\n"]
+
+
+def reference_corpus(generated=1000, seed=0, dataset=None):
+    """Texts to compare TextBlob and the lexicon scorer on."""
+    from emotion_analyzer import _BENCHMARK_TEST_CASES
+    from sentiment_lexicon import load_lexicon
+
+    corpus = [text for text, _ in _BENCHMARK_TEST_CASES] + list(EDGE_CASES)
+    rng = random.Random(seed)
+    vocab = sorted(load_lexicon()) + _FILLER * 20
+    for _ in range(generated):
+        corpus.append(" ".join(rng.choice(vocab) for _ in range(rng.randint(1, 20))))
+    if dataset:
+        from datasets.goemotions_loader import load_goemotions
+        corpus.extend(sample["text"] for sample in load_goemotions(dataset))
+    return corpus
+
+
+def _per_call_us(fn, texts, repeat):
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            fn(text)
+    return round((time.perf_counter() - t0) / (repeat * len(texts)) * 1e6, 2)
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(
+        description="Verify and benchmark sentiment_lexicon against TextBlob.",
+    )
+    p.add_argument("--dataset", default=None,
+                   help="Optional GoEmotions .jsonl/.csv file added to the corpus.")
+    p.add_argument("--generated", type=int, default=1000,
+                   help="Seeded random lexicon sentences in the corpus (default: 1000).")
+    p.add_argument("--repeat", type=int, default=3,
+                   help="Timed passes over the corpus (default: 3).")
+    p.add_argument("--tolerance", type=float, default=0.0,
+                   help="Allowed absolute difference per score (default: 0, exact).")
+    args = p.parse_args(argv)
+
+    from textblob import TextBlob
+
+    import sentiment_lexicon
+
+    corpus = reference_corpus(args.generated, dataset=args.dataset)
+    mismatches = []
+    for text in corpus:
+        expected = tuple(TextBlob(text).sentiment)
+        got = sentiment_lexicon.sentiment(text)
+        if any(abs(a - b) > args.tolerance for a, b in zip(expected, got)):
+            mismatches.append({"text": text, "textblob": expected, "lexicon": got})
+
+    report = {
+        "texts": len(corpus),
+        "mismatches": len(mismatches),
+        "textblob_us": _per_call_us(lambda t: TextBlob(t).sentiment, corpus, args.repeat),
+        "lexicon_us": _per_call_us(sentiment_lexicon.sentiment, corpus, args.repeat),
+        "mismatch_examples": mismatches[:20],
+    }
+    for key, value in report.items():
+        if key != "mismatch_examples":
+            print(f"  {key:18s} {value}")
+
+    os.makedirs(os.path.join(_ROOT, "results"), exist_ok=True)
+    out = os.path.join(_ROOT, "results", "sentiment_benchmark.json")
+    with open(out, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2)
+    print(f"\n✅ Benchmark results saved to {out}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
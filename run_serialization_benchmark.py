@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""Benchmark DataStore save/load of a year-long profile.
+
+Builds one profile with ``--days`` daily emotional-history snapshots and
+``--messages-per-day`` timestamped chat messages per day (defaults: 365 and
+10, i.e. a year of daily use), then times ``--repeat`` rounds of:
+
+* ``save``        — save_user_data (write-through)
+* ``load``        — load_user_data from a fresh store (cold cache, disk read)
+* ``load_cached`` — load_user_data served from the decoded-profile cache
+
+for plain-JSON and encrypted stores.  When orjson is installed the run is
+repeated with the standard-library fallback forced (``json_fallback``) for
+comparison.
+
+Results are printed and saved to results/serialization_benchmark.json.
+
+Usage: python run_serialization_benchmark.py [--days N] [--messages-per-day N] [--repeat N]
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from unittest import mock
+
+_ROOT = os.path.abspath(os.path.dirname(__file__))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+
+def _year_profile(days: int, per_day: int) -> dict:
+    from user_profile import UserProfile
+
+    profile = UserProfile("benchmark")
+    start = datetime(2025, 1, 1, 9, 0, 0)
+    chat = []
+    history = []
+    for d in range(days):
+        day = start + timedelta(days=d)
+        for i in range(per_day):
+            chat.append({
+                "role": "user" if i % 2 == 0 else "assistant",
+                "content": f"day {d} message {i} " + "feeling a bit low today " * 3,
+                "timestamp": day + timedelta(minutes=i),
+            })
+        history.append({
+            "date": day.date().isoformat(),
+            "timestamp": day,
+            "emotion_data": {"messages_count": per_day, "distress_messages": d % 3,
+                             "abuse_indicators": 0, "risk_level": "low",
+                             "stability_index": 0.8},
+            "session_summary": {"total_messages": per_day, "distress_ratio": 0.2,
+                                "emotion_distribution": {"sad": 3, "neutral": 5, "joy": 2},
+                                "trend": "stable", "risk_level": "low"},
+        })
+    profile.save_chat_history(chat)
+    profile.profile_data["emotional_history"] = history
+    profile.add_trusted_contact("Friend", "friend", "555-0100")
+    return profile.get_profile()
+
+
+def _bench(data: dict, encrypted: bool, repeat: int) -> dict:
+    import config
+    from data_store import DataStore
+
+    tmpdir = tempfile.mkdtemp(prefix="serialization_bench_")
+    try:
+        with mock.patch.object(config, "ENABLE_DATA_ENCRYPTION", encrypted):
+            store = DataStore(data_dir=tmpdir)
+            t0 = time.perf_counter()
+            for _ in range(repeat):
+                # A fresh store each round so encrypted saves rewrite the
+                # whole container instead of appending nothing.
+                DataStore(data_dir=tmpdir).save_user_data("benchmark", data)
+            save_s = (time.perf_counter() - t0) / repeat
+
+            t0 = time.perf_counter()
+            for _ in range(repeat):
+                loaded = DataStore(data_dir=tmpdir).load_user_data("benchmark")
+            load_s = (time.perf_counter() - t0) / repeat
+            assert len(loaded["chat_history"]) == len(data["chat_history"])
+            assert isinstance(loaded["chat_history"][0]["timestamp"], datetime)
+
+            store.load_user_data("benchmark")
+            t0 = time.perf_counter()
+            for _ in range(repeat):
+                store.load_user_data("benchmark")
+            cached_s = (time.perf_counter() - t0) / repeat
+
+            size = sum(os.path.getsize(os.path.join(tmpdir, f)) for f in os.listdir(tmpdir)
+                       if not f.startswith("."))
+        return {"save_ms": round(save_s * 1000, 2), "load_ms": round(load_s * 1000, 2),
+                "load_cached_ms": round(cached_s * 1000, 2), "file_bytes": size}
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(
+        description="Benchmark DataStore save/load of a year-long profile.",
+    )
+    p.add_argument("--days", type=int, default=365,
+                   help="Days of history in the profile (default: 365).")
+    p.add_argument("--messages-per-day", type=int, default=10,
+                   help="Chat messages per day (default: 10).")
+    p.add_argument("--repeat", type=int, default=10,
+                   help="Timed rounds per operation (default: 10).")
+    args = p.parse_args(argv)
+
+    data = _year_profile(args.days, args.messages_per_day)
+    report = {"days": args.days, "messages": len(data["chat_history"]), "repeat": args.repeat}
+
+    backends = ["default"]
+    try:
+        import serialization
+    except ImportError:  # pre-serialization-layer tree
+        serialization = None
+    if serialization is not None and serialization.ORJSON_AVAILABLE:
+        backends = ["orjson", "json_fallback"]
+
+    for backend in backends:
+        patch = (mock.patch.object(serialization, "ORJSON_AVAILABLE", False)
+                 if backend == "json_fallback" else contextlib.nullcontext())
+        with patch:
+            for encrypted in (False, True):
+                name = f"{backend}_{'encrypted' if encrypted else 'plain'}"
+                print(f"Benchmarking {name} …")
+                report[name] = _bench(data, encrypted, args.repeat)
+                for key, value in report[name].items():
+                    print(f"  {key:16s} {value}")
+
+    os.makedirs(os.path.join(_ROOT, "results"), exist_ok=True)
+    out = os.path.join(_ROOT, "results", "serialization_benchmark.json")
+    with open(out, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2)
+    print(f"\n✅ Benchmark results saved to {out}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
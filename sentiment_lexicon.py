@@ -0,0 +1,274 @@
+"""
+Fast lexicon sentiment scorer – TextBlob-compatible polarity and subjectivity.
+
+``TextBlob(text).sentiment`` builds a blob, imports NLTK on first use and
+runs the pattern tokenizer and assessment loop for every call.  This module
+reproduces the same computation directly:
+
+* the pattern adjective lexicon shipped with TextBlob (``en-sentiment.xml``)
+  is compiled once per process into a flat ``{word: (polarity,
+  subjectivity, intensity, is_adverb)}`` dict – sense and part-of-speech
+  averaging and the derived ``-ly`` adverbs included;
+* tokens come from a port of pattern's ``find_tokens`` (contraction,
+  punctuation, abbreviation, sarcasm-mark and emoticon handling);
+* the assessment loop applies pattern's rules: intensifiers ("very
+  good"), negation ("not good" = -0.5 × good), exclamation marks and
+  emoticons.
+
+:func:`sentiment` returns the same ``(polarity, subjectivity)`` as
+TextBlob's default PatternAnalyzer (checked against it on a reference
+corpus in test_sentiment_lexicon.py and run_sentiment_benchmark.py).
+Nothing about the scored text is retained: EmotionAnalyzer.classify_emotion
+scores a message once and passes the polarity on within the turn.  Only the
+lexicon file is read from the TextBlob package; TextBlob and NLTK are never
+imported.
+"""
+
+import importlib.util
+import os
+import re
+from functools import lru_cache
+from xml.etree import ElementTree
+
+# ---------------------------------------------------------------------------
+# Tokenizer tables (pattern.text, as bundled in textblob/_text.py)
+# ---------------------------------------------------------------------------
+
+PUNCTUATION = ".,;:!?()[]{}`''\"@#$^&*+-|=~_"
+_LEADING = tuple(PUNCTUATION.replace(".", ""))
+_TRAILING = _LEADING + (".",)
+_LEADING_SET, _TRAILING_SET = frozenset(_LEADING), frozenset(_TRAILING)
+
+ABBREVIATIONS = frozenset((
+    "a.", "adj.", "adv.", "al.", "a.m.", "c.", "cf.", "comp.", "conf.", "def.",
+    "ed.", "e.g.", "esp.", "etc.", "ex.", "f.", "fig.", "gen.", "id.", "i.e.",
+    "int.", "l.", "m.", "Med.", "Mil.", "Mr.", "n.", "n.q.", "orig.", "pl.",
+    "pred.", "pres.", "p.m.", "ref.", "v.", "vs.", "w/",
+))
+_RE_ABBR1 = re.compile(r"^[A-Za-z]\.$")       # single letter, "T. De Smedt"
+_RE_ABBR2 = re.compile(r"^([A-Za-z]\.)+$")    # alternating letters, "U.S."
+_RE_ABBR3 = re.compile("^[A-Z][" + "|".join("bcdfghjklmnpqrstvwxz") + "]+.$")  # "Mr."
+
+# (facial expression, polarity) → emoticons
+EMOTICONS = {
+    ("love", +1.00): ("<3", "♥"),
+    ("grin", +1.00): (">:D", ":-D", ":D", "=-D", "=D", "X-D", "x-D", "XD", "xD", "8-D"),
+    ("taunt", +0.75): (">:P", ":-P", ":P", ":-p", ":p", ":-b", ":b", ":c)", ":o)", ":^)"),
+    ("smile", +0.50): (">:)", ":-)", ":)", "=)", "=]", ":]", ":}", ":>", ":3", "8)", "8-)"),
+    ("wink", +0.25): (">;]", ";-)", ";)", ";-]", ";]", ";D", ";^)", "*-)", "*)"),
+    ("gasp", +0.05): (">:o", ":-O", ":O", ":o", ":-o", "o_O", "o.O", "°O°", "°o°"),
+    ("worry", -0.25): (">:/", ":-/", ":/", ":\\", ">:\\", ":-.", ":-s", ":s", ":S", ":-S", ">.>"),
+    ("frown", -0.75): (">:[", ":-(", ":(", "=(", ":-[", ":[", ":{", ":-<", ":c", ":-c", "=/"),
+    ("cry", -1.00): (":'(", ":'''(", ";'("),
+}
+_RE_EMOTICONS = re.compile(r"(%s)($|\s)" % "|".join(
+    r" ?".join(re.escape(ch) for ch in e) for group in EMOTICONS.values() for e in group
+))
+_RE_SARCASM = re.compile(r"\( ?\! ?\)")
+
+# Lower-cased emoticon → polarity; the first expression listing it wins
+_EMOTICON_POLARITY = {}
+for (_, _polarity), _group in EMOTICONS.items():
+    for _e in _group:
+        _EMOTICON_POLARITY.setdefault(_e.lower(), _polarity)
+
+EOS = "END-OF-SENTENCE"  # paragraph break marker
+_SENTENCE_END = frozenset(("...", ".", "!", "?", EOS))
+_SENTENCE_TAIL = frozenset(("'", '"', "”", "’", "...", ".", "!", "?", ")", EOS))
+_QUOTES = (("“", " “ "), ("”", " ” "), ("‘", " ‘ "), ("’", " ’ "), ("'", " ' "), ('"', ' " '))
+
+NEGATIONS = frozenset(("no", "not", "n't", "never"))
+
+
+def _split_punctuation(token, tokens):
+    """Append *token* to *tokens* with leading/trailing punctuation split off."""
+    tail = []
+    while token.startswith(_LEADING):
+        tokens.append(token[0])
+        token = token[1:]
+    while token.endswith(_TRAILING):
+        if token.endswith(_LEADING):
+            tail.append(token[-1])
+            token = token[:-1]
+        # Split ellipsis (...) before splitting period
+        if token.endswith("..."):
+            tail.append("...")
+            token = token[:-3].rstrip(".")
+        # Split period (if not an abbreviation)
+        if token.endswith("."):
+            if (token in ABBREVIATIONS or _RE_ABBR1.match(token) or _RE_ABBR2.match(token)
+                    or _RE_ABBR3.match(token)):
+                break
+            tail.append(".")
+            token = token[:-1]
+    if token:
+        tokens.append(token)
+    tokens.extend(reversed(tail))
+
+
+def tokenize(text):
+    """Lower-cased tokens of *text*, as pattern's sentiment analyzer sees them."""
+    # Of pattern's contraction rules only "n't" changes the tokens: every
+    # apostrophe is split off as its own token right after
+    text = text.replace("n't", " n't")
+    for quote, padded in _QUOTES:
+        if quote in text:
+            text = text.replace(quote, padded)
+    if "\n" in text:
+        text = re.sub(r"\n{2,}", " %s " % EOS, text.replace("\r\n", "\n"))
+
+    tokens = []
+    for token in text.split():
+        if token[0] in _LEADING_SET or token[-1] in _TRAILING_SET:
+            _split_punctuation(token, tokens)
+        else:
+            tokens.append(token)
+
+    # Sentence boundaries: sarcasm marks and emoticons never span two sentences
+    sentences, current, j = [], [], 0
+    while j < len(tokens):
+        if tokens[j] in _SENTENCE_END:
+            # Citations, trailing parenthesis, repeated punctuation (!?)
+            while j < len(tokens) and tokens[j] in _SENTENCE_TAIL:
+                # pattern checks quote balance against a sentence that is
+                # still empty at this point, so a quote always starts the next
+                if tokens[j] in ("'", '"'):
+                    break
+                if tokens[j] != EOS:
+                    current.append(tokens[j])
+                j += 1
+            sentences.append(current)
+            current = []
+            if j < len(tokens):
+                current.append(tokens[j])
+        else:
+            current.append(tokens[j])
+        j += 1
+    if current:
+        sentences.append(current)
+
+    words = []
+    for sentence in sentences:
+        s = " ".join(sentence)
+        if "(" in s:
+            s = _RE_SARCASM.sub("(!)", s)
+        s = _RE_EMOTICONS.sub(lambda m: m.group(1).replace(" ", "") + m.group(2), s)
+        words.extend(s.lower().split())
+    return words
+
+
+# ---------------------------------------------------------------------------
+# Lexicon
+# ---------------------------------------------------------------------------
+
+def _lexicon_path():
+    spec = importlib.util.find_spec("textblob")
+    if spec is None or not spec.submodule_search_locations:
+        raise ImportError(
+            "TextBlob not installed. Run: pip install textblob && python -m textblob.download_corpora"
+        )
+    return os.path.join(list(spec.submodule_search_locations)[0], "en", "en-sentiment.xml")
+
+
+def _avg(values):
+    return sum(values) / float(len(values) or 1)
+
+
+@lru_cache(maxsize=1)
+def load_lexicon(path=None):
+    """Compile the pattern adjective lexicon into ``{word: (p, s, i, is_adverb)}``.
+
+    Mirrors pattern's ``Sentiment.load``: scores are averaged over the senses
+    of each part of speech, then over parts of speech, and every adjective
+    also gets its ``-ly`` adverb ("terrible" → "terribly").
+    """
+    words = {}
+    for w in ElementTree.parse(path or _lexicon_path()).getroot().findall("word"):
+        form = w.attrib.get("form")
+        if form:
+            psi = (float(w.attrib.get("polarity", 0.0)), float(w.attrib.get("subjectivity", 0.0)),
+                   float(w.attrib.get("intensity", 1.0)))
+            words.setdefault(form, {}).setdefault(w.attrib.get("pos"), []).append(psi)
+    for form, by_pos in words.items():
+        words[form] = {pos: [_avg(each) for each in zip(*psi)] for pos, psi in by_pos.items()}
+    for by_pos in words.values():
+        by_pos[None] = [_avg(each) for each in zip(*by_pos.values())]
+    for form, by_pos in list(words.items()):
+        if "JJ" in by_pos:
+            if form.endswith("y"):
+                form = form[:-1] + "i"
+            if form.endswith("le"):
+                form = form[:-2]
+            adverb = words.setdefault(form + "ly", {})
+            adverb["RB"] = adverb[None] = tuple(by_pos["JJ"])
+    return {form: (*by_pos[None], "RB" in by_pos) for form, by_pos in words.items()}
+
+
+# ---------------------------------------------------------------------------
+# Scoring
+# ---------------------------------------------------------------------------
+
+def assessments(words, lexicon=None):
+    """``[polarity, subjectivity, intensity, negated]`` per scored chunk of *words*.
+
+    A chunk is a known word, optionally preceded by an intensifier ("very
+    good") and/or a negation ("not good"), or an emoticon / sarcasm mark.
+    """
+    lexicon = lexicon if lexicon is not None else load_lexicon()
+    a = []
+    m = None  # preceding modifier (adverb) – the word itself
+    n = None  # preceding negation
+    for w in words:
+        entry = lexicon.get(w)
+        if entry is not None:
+            p, s, i, is_adverb = entry
+            if m is None:
+                # Known word not preceded by a modifier ("good")
+                a.append([p, s, i, False])
+            else:
+                # Known word preceded by a modifier ("really good")
+                last = a[-1]
+                last[0] = max(-1.0, min(p * last[2], +1.0))
+                last[1] = max(-1.0, min(s * last[2], +1.0))
+                last[2] = i
+            if n is not None:
+                # Known word preceded by a negation ("not really good")
+                a[-1][2] = 1.0 / a[-1][2]
+                a[-1][3] = True
+            m = w if is_adverb else None
+            n = w if w in NEGATIONS else None
+        else:
+            if w in NEGATIONS:
+                n = w
+            elif n and len(w.strip("'")) > 1:
+                n = None  # retain negation across small words ("not a good")
+            if n is not None and m is not None and m.endswith("ly"):
+                # Negation preceded by a modifier ("really not good")
+                a[-1][3] = True
+                n = None
+            elif m and len(w) > 2:
+                m = None  # retain modifier across small words ("really is a good")
+            if w == "!" and a:
+                a[-1][0] = max(-1.0, min(a[-1][0] * 1.25, +1.0))
+            if w == "(!)":
+                a.append([0.0, 1.0, 1.0, False])
+            if w.isalpha() is False and len(w) <= 5 and w not in PUNCTUATION:
+                polarity = _EMOTICON_POLARITY.get(w)
+                if polarity is not None:
+                    a.append([polarity, 1.0, 1.0, False])
+    return a
+
+
+def sentiment(text):
+    """``(polarity, subjectivity)`` of *text*, equal to ``TextBlob(text).sentiment``.
+
+    Polarity is in [-1, 1] and subjectivity in [0, 1].
+    """
+    chunks = assessments(tokenize(text))
+    n = float(len(chunks) or 1)
+    polarity = subjectivity = 0
+    for p, s, _, negated in chunks:
+        # "not good" = slightly bad, "not bad" = slightly good
+        polarity += p * -0.5 if negated else p
+        subjectivity += s
+    return polarity / n, subjectivity / n
@@ -0,0 +1,249 @@
+"""
+JSON serialization for stored profiles and session logs
+
+Encodes with orjson when it is installed (datetimes are encoded natively, in
+C) and falls back to the standard library ``json`` module otherwise.  Either
+way the output is the format the data store has always written: plain JSON
+with datetimes as ISO-8601 strings, so files written by one backend are read
+by the other.
+
+Decoding parses into fresh objects and then converts known datetime fields
+back to ``datetime`` *in place*, guided by ``PROFILE_SCHEMA``.  Nothing is
+copied, and parts of the profile the schema knows hold no datetimes are
+skipped.  Keys the schema does not describe are still searched for the
+datetime field names in ``DATETIME_FIELDS``, exactly like the old recursive
+restore, so unknown or free-form data round-trips unchanged.
+"""
+
+import json
+from collections.abc import Mapping
+from datetime import date, datetime
+
+try:
+    import orjson as _orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    _orjson = None
+    ORJSON_AVAILABLE = False
+
+# Field names restored to ``datetime`` wherever they hold a string.
+DATETIME_FIELDS = frozenset((
+    'timestamp', 'created_at', 'last_session', 'added_at', 'marked_at',
+    'last_activity', 'lockout_until',
+))
+
+# Schema markers: an ISO datetime string, or a value holding no datetimes.
+DATETIME = 'datetime'
+SCALAR = 'scalar'
+
+_MESSAGE = {'role': SCALAR, 'content': SCALAR, 'timestamp': DATETIME}
+# emotion_data / session_summary are computed summaries (counts, scores,
+# distributions) and never hold datetimes.
+_SNAPSHOT = {'date': SCALAR, 'timestamp': DATETIME, 'snapshots': SCALAR,
+             'emotion_data': SCALAR, 'session_summary': SCALAR}
+
+# Where datetimes live in a profile.  A dict describes a record's fields and
+# a one-item list a list of such records; unlisted keys are searched by name.
+PROFILE_SCHEMA = {
+    'user_id': SCALAR,
+    'created_at': DATETIME,
+    'last_session': DATETIME,
+    'last_activity': DATETIME,
+    'lockout_until': DATETIME,
+    'password_hash': SCALAR,
+    'salt': SCALAR,
+    'gender': SCALAR,
+    'response_style': SCALAR,
+    'language_preference': SCALAR,
+    'personal_triggers': SCALAR,
+    'primary_concerns': SCALAR,
+    'chat_history': [_MESSAGE],
+    'chat_history_daily': SCALAR,
+    'emotional_history': [_SNAPSHOT],
+    'trusted_contacts': [{'name': SCALAR, 'relationship': SCALAR,
+                          'contact_info': SCALAR, 'added_at': DATETIME}],
+    'unsafe_contacts': [{'relationship': SCALAR, 'marked_at': DATETIME}],
+    'session': {
+        'session_id': SCALAR,
+        'created_at': DATETIME,
+        'last_activity': DATETIME,
+        'chat_history': [_MESSAGE],
+        'emotion_history': [{'emotion': SCALAR, 'timestamp': DATETIME}],
+        'risk_history': [{'risk_level': SCALAR, 'timestamp': DATETIME}],
+    },
+}
+
+
+def _default(obj):
+    """Encode values a backend does not handle natively"""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, float):
+        # float subclasses such as numpy.float64, which orjson rejects
+        return float(obj)
+    if isinstance(obj, Mapping):
+        # dict-compatible results such as emotion_result.EmotionResult
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj, indent=False, sort_keys=False):
+    """Encode *obj* to UTF-8 JSON bytes, datetimes as ISO-8601 strings"""
+    if ORJSON_AVAILABLE:
+        options = _orjson.OPT_NON_STR_KEYS
+        if indent:
+            options |= _orjson.OPT_INDENT_2
+        if sort_keys:
+            options |= _orjson.OPT_SORT_KEYS
+        try:
+            return _orjson.dumps(obj, default=_default, option=options)
+        except TypeError:
+            # Integers beyond 64 bits and other values orjson rejects but
+            # the json module accepts
+            pass
+    return json.dumps(
+        obj, default=_default, ensure_ascii=False, sort_keys=sort_keys,
+        indent=2 if indent else None, separators=None if indent else (',', ':'),
+    ).encode('utf-8')
+
+
+def loads(data):
+    """Decode JSON ``bytes`` or ``str`` (datetimes stay strings)"""
+    if ORJSON_AVAILABLE:
+        try:
+            return _orjson.loads(data)
+        except _orjson.JSONDecodeError:
+            # NaN / Infinity, which the json module writes by default
+            pass
+    return json.loads(data)
+
+
+def to_plain(obj):
+    """Return a JSON-compatible copy of *obj* (datetimes as strings)"""
+    return loads(dumps(obj))
+
+
+def _parse_datetime(value):
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return value
+
+
+def _restore_any(obj):
+    """Restore ``DATETIME_FIELDS`` anywhere below *obj*, in place"""
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            if isinstance(value, str):
+                if key in DATETIME_FIELDS:
+                    obj[key] = _parse_datetime(value)
+            elif isinstance(value, (dict, list)):
+                _restore_any(value)
+    elif isinstance(obj, list):
+        for value in obj:
+            if isinstance(value, (dict, list)):
+                _restore_any(value)
+
+
+class _Record:
+    """A dict schema split up front so restoring a record is a few lookups"""
+
+    __slots__ = ('datetimes', 'nested', 'known')
+
+    def __init__(self, schema):
+        self.datetimes = tuple(k for k, f in schema.items() if f is DATETIME)
+        self.nested = {k: _compile(f) for k, f in schema.items() if isinstance(f, (dict, list))}
+        self.known = frozenset(schema)
+
+
+class _ListOf:
+    __slots__ = ('item',)
+
+    def __init__(self, item):
+        self.item = item
+
+
+def _compile(schema):
+    if isinstance(schema, list):
+        return _ListOf(_compile(schema[0]))
+    if isinstance(schema, dict):
+        return _Record(schema)
+    return schema
+
+
+def _restore_record(obj, record):
+    for key in record.datetimes:
+        value = obj.get(key)
+        if isinstance(value, str):
+            obj[key] = _parse_datetime(value)
+        elif isinstance(value, (dict, list)):
+            _restore_any(value)
+    if record.nested:
+        for key, schema in record.nested.items():
+            value = obj.get(key)
+            if value is not None:
+                _restore(value, schema)
+    if obj.keys() <= record.known:
+        return
+    # Keys the schema does not know are searched like before
+    for key in obj.keys() - record.known:
+        value = obj[key]
+        if isinstance(value, str):
+            if key in DATETIME_FIELDS:
+                obj[key] = _parse_datetime(value)
+        elif isinstance(value, (dict, list)):
+            _restore_any(value)
+
+
+def _restore(obj, schema):
+    if isinstance(schema, _ListOf) and isinstance(obj, list):
+        item = schema.item
+        if isinstance(item, _Record):
+            for value in obj:
+                if isinstance(value, dict):
+                    _restore_record(value, item)
+                elif isinstance(value, list):
+                    _restore_any(value)
+        else:
+            for value in obj:
+                _restore(value, item)
+    elif isinstance(schema, _Record) and isinstance(obj, dict):
+        _restore_record(obj, schema)
+    elif isinstance(obj, (dict, list)):
+        _restore_any(obj)
+
+
+def restore_datetimes(obj, schema=PROFILE_SCHEMA):
+    """Convert datetime strings in decoded *obj* back to ``datetime`` in place
+
+    *schema* describes *obj* (``PROFILE_SCHEMA`` for a whole profile; see
+    :func:`schema_for` for one section).  Returns *obj*; a bare string is
+    parsed when *schema* is ``DATETIME``.
+    """
+    if schema is DATETIME:
+        return _parse_datetime(obj) if isinstance(obj, str) else obj
+    if schema is SCALAR:
+        return obj
+    if schema is None:
+        _restore_any(obj)
+        return obj
+    _restore(obj, _COMPILED_PROFILE if schema is PROFILE_SCHEMA else _compile(schema))
+    return obj
+
+
+_COMPILED_PROFILE = _compile(PROFILE_SCHEMA)
+
+
+def schema_for(path):
+    """Schema of the profile value at dotted *path*, or ``None`` if unknown"""
+    schema = PROFILE_SCHEMA
+    for key in path.split('.'):
+        if not isinstance(schema, dict):
+            return None
+        schema = schema.get(key)
+    return schema
+
+
+def decode_profile(data, path=None):
+    """Parse a stored profile (or the section at *path*) with datetimes restored"""
+    return restore_datetimes(loads(data), PROFILE_SCHEMA if path is None else schema_for(path))
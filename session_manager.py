@@ -41,15 +41,7 @@ class SessionManager:
 
         Returns the session dict.
         """
-        session = {
-            "session_id": str(uuid.uuid4()),
-            "user_id": user_id,
-            "created_at": datetime.now().isoformat(),
-            "chat_history": [],
-            "emotion_history": [],
-            "risk_history": [],
-            "coping_tools_used": [],
-        }
+        session = self._new_session(user_id)
         self._persist(user_id, session)
         return session
 
@@ -93,13 +85,10 @@ class SessionManager:
         unchanged.  Returns the updated session dict.
         """
         profile = self._load_profile(user_id)
-        if profile is None:
+        session = profile.profile_data.get("session") if profile else None
+        if session is None:
             # First save for a brand-new user – bootstrap a session.
-            session = self.create_session(user_id)
-        else:
-            session = profile.profile_data.get("session")
-            if session is None:
-                session = self.create_session(user_id)
+            session = self._new_session(user_id)
 
         if session_id is not None:
             session["session_id"] = session_id
@@ -112,13 +101,33 @@ class SessionManager:
         if coping_tools_used is not None:
             session["coping_tools_used"] = list(coping_tools_used)
 
-        self._persist(user_id, session)
+        self._persist(user_id, session, profile)
         return dict(session)
 
+    def end_session(self, user_id: str) -> None:
+        """Flush any write-back state for *user_id* to disk.
+
+        Call when the user logs out or the session otherwise ends; with a
+        write-through :class:`DataStore` this is a no-op.
+        """
+        self.data_store.flush(user_id)
+
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
 
+    @staticmethod
+    def _new_session(user_id: str) -> Dict:
+        return {
+            "session_id": str(uuid.uuid4()),
+            "user_id": user_id,
+            "created_at": datetime.now().isoformat(),
+            "chat_history": [],
+            "emotion_history": [],
+            "risk_history": [],
+            "coping_tools_used": [],
+        }
+
     def _load_profile(self, user_id: str) -> Optional[UserProfile]:
         """Load a :class:`UserProfile` from the data-store."""
         data = self.data_store.load_user_data(user_id)
@@ -128,9 +137,16 @@ class SessionManager:
         profile.load_from_data(data)
         return profile
 
-    def _persist(self, user_id: str, session: Dict) -> None:
-        """Write *session* into the user's profile and flush to disk."""
-        profile = self._load_profile(user_id)
+    def _persist(
+        self, user_id: str, session: Dict, profile: Optional[UserProfile] = None,
+    ) -> None:
+        """Write *session* into the user's profile and hand it to the data-store.
+
+        *profile* is reused when the caller has already loaded it, so a
+        save costs one load instead of two.
+        """
+        if profile is None:
+            profile = self._load_profile(user_id)
         if profile is None:
             profile = UserProfile(user_id)
         profile.profile_data["session"] = session
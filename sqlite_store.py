@@ -0,0 +1,561 @@
+"""
+SQLite storage engine for user profiles, chat/emotional history and
+research session logs.
+
+Drop-in alternative to the one-JSON-file-per-user :class:`DataStore`: the
+public API (``save_user_data``, ``load_user_data``, ``list_users``,
+``save_session_log``, ...) is the same, but everything lives in a single
+WAL-mode database (``wellness_buddy.db``) in the data directory.
+
+Large, growing profile fields (``SPLIT_SECTIONS``) are stored as separate
+rows so they can be read on their own (:meth:`load_user_section`) and are
+only rewritten when their content changes.  Every row is encrypted
+individually with the store's Fernet key when encryption is enabled.
+
+Migrate an existing JSON data directory with::
+
+    python sqlite_store.py migrate [DATA_DIR]
+"""
+
+import argparse
+import hashlib
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+from datetime import datetime
+
+import config
+import retention
+import serialization
+from data_store import DataStore
+
+logger = logging.getLogger(__name__)
+
+DB_FILENAME = 'wellness_buddy.db'
+
+# Profile keys kept in their own rows for partial reads / partial writes.
+SPLIT_SECTIONS = ('chat_history', 'emotional_history', 'session')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    user_id    TEXT PRIMARY KEY,
+    data       BLOB NOT NULL,
+    encrypted  INTEGER NOT NULL,
+    digest     TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS profile_sections (
+    user_id    TEXT NOT NULL REFERENCES profiles(user_id) ON DELETE CASCADE,
+    section    TEXT NOT NULL,
+    data       BLOB NOT NULL,
+    encrypted  INTEGER NOT NULL,
+    digest     TEXT NOT NULL,
+    PRIMARY KEY (user_id, section)
+);
+CREATE TABLE IF NOT EXISTS session_log (
+    id         INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id    TEXT NOT NULL,
+    data       BLOB NOT NULL,
+    encrypted  INTEGER NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_session_log_user_id ON session_log (user_id, id);
+CREATE TABLE IF NOT EXISTS session_summary (
+    user_id    TEXT NOT NULL,
+    day        TEXT NOT NULL,
+    data       BLOB NOT NULL,
+    encrypted  INTEGER NOT NULL,
+    PRIMARY KEY (user_id, day)
+);
+"""
+
+
+class SQLiteDataStore(DataStore):
+    """Single-database storage engine with the :class:`DataStore` API"""
+
+    def __init__(self, data_dir=None, encryption_key=None, db_path=None, **kwargs):
+        """Open (or create) the database in *data_dir*
+
+        ``db_path`` overrides the database location; the encryption key is
+        still read from / written to *data_dir*.
+        """
+        super().__init__(data_dir, encryption_key, **kwargs)
+        self.db_path = db_path or (self.data_dir / DB_FILENAME)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        # 'always' asks for an fsync per commit; otherwise WAL's NORMAL
+        # mode only syncs at checkpoints.
+        synchronous = 'FULL' if self.session_log_fsync == 'always' else 'NORMAL'
+        self._conn.execute(f'PRAGMA synchronous={synchronous}')
+        self._conn.execute('PRAGMA foreign_keys=ON')
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Row encryption
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _encode(obj):
+        """Return ``(raw_json_bytes, sha256_hexdigest)`` for a profile value (datetimes allowed)"""
+        raw = serialization.dumps(obj, sort_keys=True)
+        return raw, hashlib.sha256(raw).hexdigest()
+
+    def _seal(self, raw):
+        """Return ``(blob, encrypted_flag)`` for encoded JSON bytes"""
+        if self.encryption_enabled and self.cipher:
+            return self.cipher.encrypt(raw), 1
+        return raw, 0
+
+    def _unseal(self, blob, encrypted):
+        if encrypted:
+            if not self.cipher:
+                raise ValueError("Row is encrypted but no encryption key is configured")
+            try:
+                blob = self.cipher.decrypt(bytes(blob))
+            except Exception as e:
+                logger.error(f"Decryption failed: {e}")
+                raise ValueError(f"Failed to decrypt data. The encryption key may be incorrect or the data may be corrupted: {e}")
+        return serialization.loads(bytes(blob))
+
+    # ------------------------------------------------------------------
+    # Profiles
+    # ------------------------------------------------------------------
+
+    def save_user_data(self, user_id, data):
+        """Save user profile and history data with optional encryption
+
+        The core profile and each section are only re-encrypted and
+        rewritten when their content changed.  The whole save is one transaction.
+        """
+        core = {k: v for k, v in data.items() if k not in SPLIT_SECTIONS}
+        sections = {k: data[k] for k in SPLIT_SECTIONS if k in data}
+
+        with self._lock, self._conn:
+            # Unchanged content is skipped only if it is also stored with
+            # the current encryption setting.
+            want_encrypted = int(bool(self.encryption_enabled and self.cipher))
+            stored = {
+                section: (digest, encrypted)
+                for section, digest, encrypted in self._conn.execute(
+                    'SELECT section, digest, encrypted FROM profile_sections WHERE user_id = ?',
+                    (user_id,),
+                )
+            }
+            core_row = self._conn.execute(
+                'SELECT digest, encrypted FROM profiles WHERE user_id = ?', (user_id,)
+            ).fetchone()
+
+            raw, digest = self._encode(core)
+            if core_row != (digest, want_encrypted):
+                blob, encrypted = self._seal(raw)
+                self._conn.execute(
+                    'INSERT INTO profiles (user_id, data, encrypted, digest, updated_at) '
+                    'VALUES (?, ?, ?, ?, ?) '
+                    'ON CONFLICT(user_id) DO UPDATE SET data = excluded.data, '
+                    'encrypted = excluded.encrypted, digest = excluded.digest, '
+                    'updated_at = excluded.updated_at',
+                    (user_id, blob, encrypted, digest, datetime.now().isoformat()),
+                )
+            for section, value in sections.items():
+                raw, digest = self._encode(value)
+                if stored.get(section) == (digest, want_encrypted):
+                    continue
+                blob, encrypted = self._seal(raw)
+                self._conn.execute(
+                    'INSERT INTO profile_sections (user_id, section, data, encrypted, digest) '
+                    'VALUES (?, ?, ?, ?, ?) '
+                    'ON CONFLICT(user_id, section) DO UPDATE SET data = excluded.data, '
+                    'encrypted = excluded.encrypted, digest = excluded.digest',
+                    (user_id, section, blob, encrypted, digest),
+                )
+            removed = [s for s in stored if s not in sections]
+            if removed:
+                self._conn.executemany(
+                    'DELETE FROM profile_sections WHERE user_id = ? AND section = ?',
+                    [(user_id, s) for s in removed],
+                )
+
+    def load_user_data(self, user_id):
+        """Load user profile and history data with optional decryption"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT data, encrypted FROM profiles WHERE user_id = ?', (user_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            sections = self._conn.execute(
+                'SELECT section, data, encrypted FROM profile_sections WHERE user_id = ?',
+                (user_id,),
+            ).fetchall()
+        data = self._unseal(*row)
+        for section, blob, encrypted in sections:
+            data[section] = self._unseal(blob, encrypted)
+        return serialization.restore_datetimes(data)
+
+    def load_user_section(self, user_id, section):
+        """Load one of ``SPLIT_SECTIONS`` without reading the rest of the profile
+
+        Returns ``None`` when the user or section does not exist.
+        """
+        if section not in SPLIT_SECTIONS:
+            raise ValueError(f"section must be one of {SPLIT_SECTIONS}, got {section!r}")
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT data, encrypted FROM profile_sections WHERE user_id = ? AND section = ?',
+                (user_id, section),
+            ).fetchone()
+        if row is None:
+            return None
+        return serialization.restore_datetimes(self._unseal(*row), serialization.schema_for(section))
+
+    def user_exists(self, user_id):
+        """Check if a user profile exists"""
+        with self._lock:
+            return self._conn.execute(
+                'SELECT 1 FROM profiles WHERE user_id = ?', (user_id,)
+            ).fetchone() is not None
+
+    def list_users(self):
+        """List all user IDs with profiles"""
+        with self._lock:
+            return [r[0] for r in self._conn.execute(
+                'SELECT user_id FROM profiles ORDER BY user_id')]
+
+    def delete_user_data(self, user_id):
+        """Delete a user's profile, history sections and session log (user control)"""
+        with self._lock, self._conn:
+            cur = self._conn.execute('DELETE FROM profiles WHERE user_id = ?', (user_id,))
+            self._conn.execute('DELETE FROM session_log WHERE user_id = ?', (user_id,))
+            self._conn.execute('DELETE FROM session_summary WHERE user_id = ?', (user_id,))
+            return cur.rowcount > 0
+
+    def flush(self, user_id=None):
+        """Saves are committed immediately; nothing to flush"""
+        return 0
+
+    def rotate_encryption_key(self, new_key=None):
+        """Re-encrypt every encrypted row under a new key; returns rows rewritten"""
+        retired_file = self._begin_key_rotation(new_key)
+        rewritten = 0
+        with self._lock, self._conn:
+            for table, key_col in (('profiles', 'user_id'),
+                                   ('profile_sections', 'rowid'),
+                                   ('session_log', 'id'),
+                                   ('session_summary', 'rowid')):
+                rows = self._conn.execute(
+                    f'SELECT {key_col}, data FROM {table} WHERE encrypted = 1').fetchall()
+                self._conn.executemany(
+                    f'UPDATE {table} SET data = ? WHERE {key_col} = ?',
+                    [(self.cipher.rotate(bytes(blob)), key) for key, blob in rows],
+                )
+                rewritten += len(rows)
+        self._finish_key_rotation(retired_file)
+        logger.info("Rotated encryption key; re-encrypted %d row(s)", rewritten)
+        return rewritten
+
+    # Backups cover the profile; the research session log is append-only
+    # and not rolled back by a restore.
+    _BACKUP_TABLES = ('profiles', 'profile_sections')
+
+    def _backup_payload(self, user_id):
+        """Export the user's profile rows (still encrypted) as a standalone SQLite file"""
+        if not self.user_exists(user_id):
+            return None
+        fd, tmp_name = tempfile.mkstemp(dir=self.data_dir, prefix=f".{user_id}.", suffix='.db')
+        os.close(fd)
+        try:
+            with self._lock:
+                dst = sqlite3.connect(tmp_name)
+                try:
+                    with dst:
+                        dst.executescript(_SCHEMA)
+                        for table in self._BACKUP_TABLES:
+                            cols = [c[1] for c in self._conn.execute(f'PRAGMA table_info({table})')]
+                            rows = self._conn.execute(
+                                f'SELECT {", ".join(cols)} FROM {table} WHERE user_id = ?', (user_id,)
+                            ).fetchall()
+                            dst.executemany(
+                                f'INSERT INTO {table} ({", ".join(cols)}) '
+                                f'VALUES ({", ".join("?" * len(cols))})',
+                                rows,
+                            )
+                    dst.execute('VACUUM')
+                finally:
+                    dst.close()
+            with open(tmp_name, 'rb') as f:
+                return f.read(), '.db'
+        finally:
+            os.unlink(tmp_name)
+
+    def _restore_payload(self, user_id, data, suffix):
+        """Replace the user's rows with those of an exported SQLite file"""
+        fd, tmp_name = tempfile.mkstemp(dir=self.data_dir, prefix=f".{user_id}.", suffix='.db')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            src = sqlite3.connect(tmp_name)
+            try:
+                tables = {
+                    table: ([c[1] for c in src.execute(f'PRAGMA table_info({table})')],
+                            src.execute(f'SELECT * FROM {table} WHERE user_id = ?', (user_id,)).fetchall())
+                    for table in self._BACKUP_TABLES
+                }
+            finally:
+                src.close()
+        finally:
+            os.unlink(tmp_name)
+        with self._lock, self._conn:
+            for table in reversed(self._BACKUP_TABLES):
+                self._conn.execute(f'DELETE FROM {table} WHERE user_id = ?', (user_id,))
+            for table, (cols, rows) in tables.items():
+                self._conn.executemany(
+                    f'INSERT INTO {table} ({", ".join(cols)}) '
+                    f'VALUES ({", ".join("?" * len(cols))})',
+                    rows,
+                )
+
+    def get_data_integrity_hash(self, user_id):
+        """Calculate integrity hash over the user's stored profile rows"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT data FROM profiles WHERE user_id = ?', (user_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            h = hashlib.sha256(bytes(row[0]))
+            for (blob,) in self._conn.execute(
+                'SELECT data FROM profile_sections WHERE user_id = ? ORDER BY section',
+                (user_id,),
+            ):
+                h.update(bytes(blob))
+        return h.hexdigest()
+
+    # ------------------------------------------------------------------
+    # Research session logging
+    # ------------------------------------------------------------------
+
+    def save_session_log(self, user_id: str, entry: dict) -> None:
+        """Append a research log entry to the ``session_log`` table"""
+        blob, encrypted = self._seal(self._encode(entry)[0])
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT INTO session_log (user_id, data, encrypted, created_at) '
+                'VALUES (?, ?, ?, ?)',
+                (user_id, blob, encrypted, datetime.now().isoformat()),
+            )
+
+    def iter_session_log(self, user_id: str, include_rotated: bool = True,
+                         migrate_legacy: bool = True, batch_size: int = 500):
+        """Yield session log entries oldest-first, fetching *batch_size* rows at a time"""
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    'SELECT id, data, encrypted FROM session_log '
+                    'WHERE user_id = ? AND id > ? ORDER BY id LIMIT ?',
+                    (user_id, last_id, batch_size),
+                ).fetchall()
+            if not rows:
+                return
+            for row_id, blob, encrypted in rows:
+                yield self._unseal(blob, encrypted)
+            last_id = rows[-1][0]
+
+    # ------------------------------------------------------------------
+    # Retention (see retention.py)
+    # ------------------------------------------------------------------
+
+    def list_session_log_users(self):
+        """User ids with session log rows, including ones without a profile"""
+        with self._lock:
+            return [r[0] for r in self._conn.execute(
+                'SELECT DISTINCT user_id FROM session_log ORDER BY user_id')]
+
+    def iter_session_summary(self, user_id):
+        """Yield the daily session log summaries written by retention, oldest day first"""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT data, encrypted FROM session_summary WHERE user_id = ? ORDER BY day',
+                (user_id,),
+            ).fetchall()
+        for blob, encrypted in rows:
+            yield self._unseal(blob, encrypted)
+
+    def compact_session_log(self, user_id, before, summary_cutoff=None, batch_size=None):
+        """Fold session log rows older than *before* into ``session_summary``
+
+        Rows are processed oldest-first, *batch_size* (default
+        ``RETENTION_BATCH_SIZE``) at a time; each batch's summary upsert and
+        row delete commit together, so the lock is held only briefly and an
+        interrupted run loses nothing.  Entries are dated by their
+        ``timestamp`` (``created_at`` for entries without one).
+
+        Returns ``{'entries': summarized, 'days': day summaries touched}``.
+        """
+        batch_size = batch_size or config.RETENTION_BATCH_SIZE
+        removed, days = 0, set()
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    'SELECT id, data, encrypted, created_at FROM session_log '
+                    'WHERE user_id = ? ORDER BY id LIMIT ?',
+                    (user_id, batch_size),
+                ).fetchall()
+            summaries, old_ids = {}, []
+            for row_id, blob, encrypted, created_at in rows:
+                entry = self._unseal(blob, encrypted)
+                sent = retention.parse_timestamp(entry.get('timestamp')) or \
+                    retention.parse_timestamp(created_at)
+                if sent is None or sent >= before:
+                    break
+                entry.setdefault('timestamp', created_at)
+                retention.summarize_session_entries((entry,), summaries)
+                old_ids.append((row_id,))
+            if not old_ids:
+                break
+            with self._lock, self._conn:
+                for day, summary in summaries.items():
+                    row = self._conn.execute(
+                        'SELECT data, encrypted FROM session_summary WHERE user_id = ? AND day = ?',
+                        (user_id, day),
+                    ).fetchone()
+                    if row is not None:
+                        summary = retention.merge_session_summary(self._unseal(*row), summary)
+                    blob, encrypted = self._seal(self._encode(summary)[0])
+                    self._conn.execute(
+                        'INSERT OR REPLACE INTO session_summary (user_id, day, data, encrypted) '
+                        'VALUES (?, ?, ?, ?)',
+                        (user_id, day, blob, encrypted),
+                    )
+                self._conn.executemany('DELETE FROM session_log WHERE id = ?', old_ids)
+            removed += len(old_ids)
+            days.update(summaries)
+            if len(old_ids) < len(rows):
+                break
+        if summary_cutoff is not None:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    'DELETE FROM session_summary WHERE user_id = ? AND day < ? AND day != ?',
+                    (user_id, summary_cutoff, retention.UNDATED),
+                )
+        if removed:
+            logger.info("Summarized %d session log entries for %s", removed, user_id)
+        return {'entries': removed, 'days': len(days)}
+
+    def compact_profile(self, user_id):
+        """Rows are rewritten on save; free pages are reclaimed by :meth:`vacuum`"""
+        return False
+
+    def vacuum(self):
+        """Rebuild the database to return free pages to the OS; returns bytes reclaimed"""
+        before = self.storage_bytes()
+        with self._lock:
+            self._conn.execute('VACUUM')
+            self._conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        return before - self.storage_bytes()
+
+    def storage_bytes(self):
+        """Size of the database file plus its write-ahead log"""
+        total = 0
+        for suffix in ('', '-wal'):
+            try:
+                total += os.path.getsize(f"{self.db_path}{suffix}")
+            except OSError:
+                pass
+        return total
+
+    def migrate_legacy_session_log(self, user_id: str) -> int:
+        """JSON session files are imported by :func:`migrate_json_to_sqlite`"""
+        return 0
+
+    def migrate_legacy_session_logs(self) -> dict:
+        """JSON session files are imported by :func:`migrate_json_to_sqlite`"""
+        return {}
+
+
+def migrate_json_to_sqlite(source_dir=None, target=None, encryption_key=None):
+    """Import every profile and session log from a JSON data directory
+
+    *target* defaults to a :class:`SQLiteDataStore` in *source_dir*, so the
+    existing encryption key is reused.  Source files are left untouched.
+    Re-running is safe: users that already have a profile, and session logs
+    that already have rows, in *target* are skipped rather than overwritten
+    or duplicated.  Imported entries keep their ``timestamp`` as
+    ``created_at``.  Returns ``{'users': n, 'session_entries': m}``.
+    """
+    source = DataStore(source_dir, encryption_key)
+    if target is None:
+        target = SQLiteDataStore(source.data_dir, encryption_key)
+
+    users = 0
+    for user_id in source.list_users():
+        if target.user_exists(user_id):
+            logger.info("Skipping %s: profile already migrated", user_id)
+            continue
+        data = source.load_user_data(user_id)
+        if not isinstance(data, dict):
+            logger.warning("Skipping unreadable profile %s", user_id)
+            continue
+        target.save_user_data(user_id, data)
+        users += 1
+
+    # Session logs may exist without a profile (e.g. 'anonymous').
+    log_owners = set()
+    for pattern, suffix in (('*_session_log.jsonl', '_session_log'),
+                            ('*_session_data.json', '_session_data')):
+        for path in source.data_dir.glob(pattern):
+            log_owners.add(path.name[:path.name.index(suffix)])
+
+    entries = 0
+    for user_id in sorted(log_owners):
+        with target._lock:
+            migrated = target._conn.execute(
+                'SELECT 1 FROM session_log WHERE user_id = ? LIMIT 1', (user_id,)
+            ).fetchone() is not None
+        if migrated:
+            logger.info("Skipping %s: session log already migrated", user_id)
+            continue
+        batch = []
+        for entry in source.iter_session_log(user_id, migrate_legacy=False):
+            blob, encrypted = target._seal(target._encode(entry)[0])
+            sent = retention.parse_timestamp(entry.get('timestamp')) or datetime.now()
+            batch.append((user_id, blob, encrypted, sent.isoformat()))
+        if batch:
+            with target._lock, target._conn:
+                target._conn.executemany(
+                    'INSERT INTO session_log (user_id, data, encrypted, created_at) '
+                    'VALUES (?, ?, ?, ?)',
+                    batch,
+                )
+            entries += len(batch)
+    logger.info("Migrated %d profiles and %d session log entries to %s",
+                users, entries, target.db_path)
+    return {'users': users, 'session_entries': entries}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SQLite storage engine utilities")
+    sub = parser.add_subparsers(dest='command', required=True)
+    migrate = sub.add_parser('migrate', help="Import a JSON data directory into SQLite")
+    migrate.add_argument('data_dir', nargs='?', default=None,
+                         help="JSON data directory (default: ~/.wellness_buddy)")
+    args = parser.parse_args(argv)
+
+    if args.command == 'migrate':
+        result = migrate_json_to_sqlite(args.data_dir)
+        print(f"Migrated {result['users']} profile(s) and "
+              f"{result['session_entries']} session log entr(ies)")
+        return result
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,219 @@
+"""Tests for backup_store.py – content-addressed incremental backups.
+
+Validates content-defined chunking, Merkle roots, deduplicated snapshots,
+compression, verification (incremental and full), retention, garbage
+collection and the DataStore / SQLiteDataStore backup API.
+"""
+
+import json
+import os
+import random
+import sys
+from datetime import datetime
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from backup_store import BackupStore, chunk_boundaries, merkle_root
+from data_store import DataStore
+from sqlite_store import SQLiteDataStore
+from user_profile import UserProfile
+
+
+def _text(n, seed=0):
+    rng = random.Random(seed)
+    words = ['calm', 'tired', 'hopeful', 'anxious', 'okay', 'sleep', 'work', 'family']
+    return ' '.join(rng.choice(words) + str(rng.randrange(1000)) for _ in range(n)).encode()
+
+
+@pytest.fixture()
+def backups(tmp_path):
+    return BackupStore(tmp_path / 'backups', compression='zlib')
+
+
+def _chunks(data):
+    start, out = 0, []
+    for end in chunk_boundaries(data):
+        out.append(data[start:end])
+        start = end
+    return out
+
+
+class TestChunking:
+    def test_boundaries_cover_data_within_limits(self):
+        data = _text(60_000)
+        ends = chunk_boundaries(data, min_size=1024, avg_size=4096, max_size=16384)
+        assert ends[-1] == len(data)
+        sizes = [b - a for a, b in zip([0] + ends, ends)]
+        assert all(s <= 16384 for s in sizes)
+        assert all(s >= 1024 for s in sizes[:-1])
+
+    def test_insertion_only_changes_nearby_chunks(self):
+        data = _text(100_000)
+        edited = data[:200_000] + b'a brand new sentence in the middle' + data[200_000:]
+        before, after = set(_chunks(data)), _chunks(edited)
+        assert len([c for c in after if c not in before]) <= 2
+
+    def test_merkle_root(self):
+        a, b, c = ('%064x' % i for i in (1, 2, 3))
+        assert merkle_root([a, b]) != merkle_root([b, a])
+        assert merkle_root([a, b, c]) != merkle_root([a, b])
+        assert merkle_root([a]) == merkle_root([a])
+
+
+class TestSnapshots:
+    def test_round_trip_and_dedup(self, backups):
+        data = _text(50_000)
+        first = backups.snapshot('alice', data, '.json')
+        assert backups.read('alice')[0] == data
+        # Unchanged data: no new snapshot
+        assert backups.snapshot('alice', data, '.json')['snapshot_id'] == first['snapshot_id']
+
+        appended = data + b' one more message'
+        second = backups.snapshot('alice', appended, '.json')
+        assert second['snapshot_id'] != first['snapshot_id']
+        assert second['new_bytes'] < 0.2 * len(appended)
+        assert backups.read('alice', first['snapshot_id'])[0] == data
+        assert backups.read('alice')[0] == appended
+        assert backups.list_snapshots('alice') == [first['snapshot_id'], second['snapshot_id']]
+
+    def test_compression_and_raw_fallback(self, backups, tmp_path):
+        text = _text(20_000)
+        noise = os.urandom(50_000)
+        backups.snapshot('bob', text)
+        backups.snapshot('carl', noise)
+        stored = sum(p.stat().st_size for p in (tmp_path / 'backups' / 'chunks').glob('*/*'))
+        assert stored < len(text) * 0.6 + len(noise) + 64
+        assert backups.read('carl')[0] == noise
+
+    def test_unknown_snapshot(self, backups):
+        with pytest.raises(KeyError):
+            backups.read('nobody')
+        with pytest.raises(ValueError):
+            backups.manifest_path('bob', '../../etc')
+
+
+class TestVerification:
+    def test_incremental_verify_reads_only_new_chunks(self, backups):
+        data = _text(60_000)
+        backups.snapshot('dana', data)
+        first = backups.verify('dana')
+        assert first['ok'] and first['chunks_checked'] > 0
+        assert backups.verify('dana')['chunks_checked'] == 0
+
+        backups.snapshot('dana', data + b' appended')
+        report = backups.verify('dana')
+        assert report['ok']
+        assert report['chunks_checked'] <= 2
+        assert report['chunks_skipped'] >= first['chunks_checked'] - 2
+
+    def test_corrupt_chunk_detected(self, backups):
+        manifest = backups.snapshot('erin', _text(10_000))
+        chunk = backups._chunk_path(manifest['chunks'][0])
+        chunk.write_bytes(chunk.read_bytes()[:-5] + b'xxxxx')
+        assert not backups.verify('erin')['ok']
+        with pytest.raises(ValueError):
+            backups.read('erin')
+
+    def test_full_verify_rechecks_verified_chunks(self, backups):
+        manifest = backups.snapshot('finn', _text(10_000))
+        assert backups.verify('finn')['ok']
+        backups._chunk_path(manifest['chunks'][0]).write_bytes(b'0garbage')
+        assert backups.verify('finn')['ok']  # trusted from the last run
+        assert not backups.verify('finn', full=True)['ok']
+
+    def test_tampered_manifest_detected(self, backups):
+        manifest = backups.snapshot('gail', _text(10_000))
+        path = backups.manifest_path('gail', manifest['snapshot_id'])
+        manifest['chunks'] = list(reversed(manifest['chunks']))
+        path.write_text(json.dumps(manifest))
+        report = backups.verify('gail')
+        assert not report['ok'] and 'Merkle' in report['errors'][0]
+
+
+class TestRetention:
+    def _snapshot_at(self, backups, user_id, when, payload):
+        manifest = backups.snapshot(user_id, payload)
+        old = backups.manifest_path(user_id, manifest['snapshot_id'])
+        manifest['snapshot_id'] = when.strftime('%Y%m%dT%H%M%S%f')
+        backups.manifest_path(user_id, manifest['snapshot_id']).write_text(json.dumps(manifest))
+        old.unlink()
+        return manifest['snapshot_id']
+
+    def test_policy_keeps_last_daily_and_weekly(self, backups):
+        ids = [self._snapshot_at(backups, 'hugo', datetime(2026, 3, day, hour), _text(100, day * 24 + hour))
+               for day in range(1, 31) for hour in (9, 18)]
+        deleted = backups.apply_retention('hugo', keep_last=3, keep_daily=3, keep_weekly=2)
+        kept = backups.list_snapshots('hugo')
+        assert set(kept) | set(deleted) == set(ids)
+        assert ids[-3:] == kept[-3:]
+        # plus the newest of the last 3 days (28-30 March) and the last 2
+        # ISO weeks (Monday 30 March, and the week ending Sunday 29 March)
+        assert kept == ['20260328T180000000000', '20260329T180000000000',
+                        '20260330T090000000000', '20260330T180000000000']
+        for snapshot_id in kept:
+            backups.read('hugo', snapshot_id)
+
+    def test_garbage_collection(self, backups, tmp_path):
+        first = backups.snapshot('iris', _text(30_000, seed=1))
+        backups.snapshot('iris', _text(30_000, seed=2))
+        before = len(list((tmp_path / 'backups' / 'chunks').glob('*/*')))
+        backups.delete_snapshot('iris', first['snapshot_id'])
+        assert backups.collect_garbage() > 0
+        assert len(list((tmp_path / 'backups' / 'chunks').glob('*/*'))) < before
+        assert backups.verify('iris', full=True)['ok']
+
+
+def _profile(uid, messages):
+    profile = UserProfile(uid)
+    profile.save_chat_history(
+        [{"role": "user", "content": f"message {i} " + "x" * 100} for i in range(messages)])
+    return profile.get_profile()
+
+
+class TestDataStoreBackups:
+    def test_backup_and_restore(self, tmp_path):
+        store = DataStore(data_dir=str(tmp_path))
+        data = _profile('jade', 50)
+        store.save_user_data('jade', data)
+        manifest_file = store.create_backup('jade')
+        assert manifest_file.exists()
+
+        data['chat_history'] = []
+        store.save_user_data('jade', data)
+        store.create_backup('jade')
+        assert len(store.list_backups('jade')) == 2
+        assert store.verify_backups('jade')['ok']
+
+        store.restore_backup('jade', store.list_backups('jade')[0])
+        assert len(store.load_user_data('jade')['chat_history']) == 50
+        assert len(DataStore(data_dir=str(tmp_path)).load_user_data('jade')['chat_history']) == 50
+        assert store.list_users() == ['jade']
+        assert store.create_backup('nobody') is None
+
+    def test_incremental_backup_of_appended_container(self, tmp_path):
+        store = DataStore(data_dir=str(tmp_path))
+        data = _profile('kim', 2000)
+        store.save_user_data('kim', data)
+        store.create_backup('kim')
+        data['chat_history'].append({"role": "user", "content": "new"})
+        store.save_user_data('kim', data)
+        path = store.create_backup('kim')
+        manifest = json.loads(path.read_text())
+        assert manifest['new_bytes'] < 0.2 * manifest['size']
+
+    def test_sqlite_backup_and_restore(self, tmp_path):
+        store = SQLiteDataStore(data_dir=str(tmp_path))
+        try:
+            data = _profile('lena', 5)
+            store.save_user_data('lena', data)
+            store.save_session_log('lena', {'message': 'kept'})
+            store.create_backup('lena')
+            data['chat_history'] = []
+            store.save_user_data('lena', data)
+            store.restore_backup('lena')
+            assert len(store.load_user_data('lena')['chat_history']) == 5
+            assert [e['message'] for e in store.iter_session_log('lena')] == ['kept']
+        finally:
+            store.close()
@@ -457,6 +457,100 @@ def test_calm_mode_suggestion_for_repeated_stress():
     print("✓ Calm mode suggestion is triggered for repeated stress")
 
 
+def test_template_index_pools_and_no_repeat_bitset():
+    """Template pools are precompiled and selection skips the last 5 picks."""
+    from conversation_handler import ConversationHandler, _TEMPLATE_INDEX, ANXIETY_RESPONSES
+
+    pool = _TEMPLATE_INDEX.get('empathy', emotion='anxiety', language='english')
+    assert [_TEMPLATE_INDEX.templates[i] for i in pool.ids] == list(ANXIETY_RESPONSES)
+    assert not _TEMPLATE_INDEX.get('empathy', emotion='unknown', language='english')
+
+    handler = ConversationHandler()
+    picks = [handler._choose_unique(pool) for _ in range(40)]
+    for i in range(1, len(picks)):
+        window = picks[max(0, i - 5):i]
+        if len(set(ANXIETY_RESPONSES) - set(window)) > 0:
+            assert picks[i] not in window
+    expected = 0
+    for template_id in handler._recent_template_ids:
+        expected |= 1 << template_id
+    assert handler._recent_template_mask == expected
+    print("✓ Template index pools + bitset no-repeat selection")
+
+
+def test_topic_mask_matches_keyword_order():
+    """Topic detection keeps the first-listed topic when several match."""
+    from conversation_handler import ConversationHandler, _topic_mask, _first_topic
+
+    handler = ConversationHandler()
+    assert handler._detect_topic("") is None
+    assert handler._detect_topic("Nothing in particular") is None
+    assert handler._detect_topic("My BOSS keeps adding deadlines") == 'work_stress'
+    both = "my partner and my boss"
+    assert _first_topic(_topic_mask(both)) == handler._detect_topic(both) == 'work_stress'
+    assert bin(_topic_mask(both)).count('1') == 2
+    print("✓ Topic masks follow keyword order")
+
+
+def test_topic_masks_cached_per_handler_window():
+    """Topic masks are kept per handler, only for messages in the topic window."""
+    from conversation_handler import ConversationHandler, _TOPIC_CONTEXT_WINDOW, _topic_mask
+    from emotion_analyzer import EmotionAnalyzer
+
+    assert not hasattr(_topic_mask, 'cache_info')
+    analyzer = EmotionAnalyzer()
+    handler = ConversationHandler()
+    messages = [f"my boss moved deadline {i}" for i in range(_TOPIC_CONTEXT_WINDOW + 4)]
+    for msg in messages:
+        emotion_data = analyzer.classify_emotion(msg)
+        handler.add_message(msg, emotion_data)
+        handler.generate_response(emotion_data)
+    assert set(handler._topic_masks) <= set(messages[-_TOPIC_CONTEXT_WINDOW:])
+    assert messages[-1] in handler._topic_masks
+    assert ConversationHandler()._topic_masks == {}
+    print("✓ Topic masks cached per handler window")
+
+
+def test_ring_buffer_memory_matches_list_semantics():
+    """ConversationMemory keeps the last maxlen turns and incremental stats."""
+    from conversation_memory import ConversationMemory
+
+    memory = ConversationMemory(4)
+    reference = []
+    emotions = ['joy', 'stress', 'stress', 'sadness', 'stress', 'stress', 'stress']
+    for i, emotion in enumerate(emotions):
+        entry = {'user_message': f"msg {i % 3}", 'emotion_data': {'primary_emotion': emotion}}
+        memory.append(entry, emotion=emotion, topic='work_stress' if i % 2 else None)
+        reference = (reference + [entry])[-4:]
+        assert list(memory) == reference
+        assert memory[-2:] == reference[-2:] and memory[0] is reference[0]
+        assert memory.chat_history() == [{"role": "user", "content": e['user_message']} for e in reference]
+
+    assert memory.streak('stress') == 3 and memory.streak('joy') == 0
+    assert dict(memory.emotion_counts) == {'sadness': 1, 'stress': 3}
+    assert dict(memory.topic_counts) == {'work_stress': 2}
+    assert memory.has_message("msg 0") and memory.recent_messages(2) == ["msg 2", "msg 0"]
+
+    # Streak never exceeds what is retained
+    for _ in range(6):
+        memory.append({'user_message': 'x'}, emotion='stress')
+    assert memory.streak('stress') == 4
+    assert not memory.has_message("msg 1")
+    print("✓ Ring-buffer memory matches list semantics")
+
+
+def test_rolling_counter_window_counts():
+    """RollingCounter.count follows the bounded window as values are evicted."""
+    from conversation_memory import RollingCounter
+
+    counter = RollingCounter(3)
+    for value in ['a', 'b', 'a', 'c', 'c']:
+        counter.append(value)
+    assert list(counter) == ['a', 'c', 'c']
+    assert counter.count('a') == 1 and counter.count('b') == 0 and counter.count('c') == 2
+    print("✓ Rolling counter window counts")
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Runner
 # ─────────────────────────────────────────────────────────────────────────────
@@ -481,6 +575,11 @@ if __name__ == '__main__':
         test_memory_structures_and_timeline_tracking,
         test_response_metadata_and_research_export,
         test_calm_mode_suggestion_for_repeated_stress,
+        test_template_index_pools_and_no_repeat_bitset,
+        test_topic_mask_matches_keyword_order,
+        test_topic_masks_cached_per_handler_window,
+        test_ring_buffer_memory_matches_list_semantics,
+        test_rolling_counter_window_counts,
     ]
 
     print("\n" + "=" * 70)
@@ -0,0 +1,88 @@
+"""Tests for emotion_result.py – lazy, dict-compatible classify_emotion result."""
+
+import os
+import pickle
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import pytest
+
+import emotion_result
+import serialization
+from emotion_analyzer import EmotionAnalyzer
+from emotion_result import FIELDS, LAZY_FIELDS, EmotionResult
+
+TEXT = "I feel so sad and hopeless, I keep crying"
+
+
+@pytest.fixture(scope='module')
+def analyzer():
+    return EmotionAnalyzer()
+
+
+class TestDictCompatibility:
+    def test_keys_and_order_match_legacy_dict(self, analyzer):
+        result = analyzer.classify_emotion(TEXT)
+        assert list(result) == list(FIELDS)
+        assert len(result) == len(FIELDS) == len(dict(result))
+
+    def test_lazy_fields_match_eager_values(self, analyzer):
+        result = analyzer.classify_emotion(TEXT)
+        primary = result['primary_emotion']
+        assert result['explanation'] == result['keyword_explanation'] == analyzer.explain_emotion(TEXT, primary)
+        assert result['dominant_emotion'] == primary
+        assert result['crisis_detected'] is result['is_crisis']
+        assert result['emotion_confidence'] == round(result['emotion_probabilities'][primary], 4)
+        assert result['severity_score'] in (0.0, 2.0, 4.0, 7.0, 10.0)
+        assert result['xai_explanation']['primary_emotion'] == primary
+
+    def test_mutation(self, analyzer):
+        result = analyzer.classify_emotion(TEXT)
+        original = result['primary_emotion']
+        result['primary_emotion'] = 'joy'
+        result['inference_mode'] = 'full'
+        assert result['primary_emotion'] == 'joy' and result['inference_mode'] == 'full'
+        # Lazy fields describe the classification, as the legacy dict did
+        assert result['dominant_emotion'] == original
+        assert list(result)[-1] == 'inference_mode' and len(result) == len(FIELDS) + 1
+
+        del result['timestamp']
+        del result['inference_mode']
+        assert 'timestamp' not in result and 'inference_mode' not in result
+        assert result.get('timestamp', 'gone') == 'gone'
+        with pytest.raises(KeyError):
+            del result['timestamp']
+        with pytest.raises(KeyError):
+            result['no_such_key']
+
+    def test_equality_copy_and_pickle(self, analyzer):
+        result = analyzer.classify_emotion(TEXT)
+        plain = result.copy()
+        assert type(plain) is dict and result == plain
+        restored = pickle.loads(pickle.dumps(result))
+        assert type(restored) is dict and restored == plain
+
+    def test_serializes_like_a_dict(self, analyzer):
+        result = analyzer.classify_emotion(TEXT)
+        decoded = serialization.loads(serialization.dumps({'emotion_data': result}))
+        assert decoded['emotion_data']['primary_emotion'] == result['primary_emotion']
+        assert set(decoded['emotion_data']) == set(FIELDS)
+
+
+class TestLaziness:
+    def test_xai_explanation_computed_once_on_access(self, analyzer, monkeypatch):
+        calls = []
+        real = emotion_result.generate_explanation
+        monkeypatch.setattr(emotion_result, 'generate_explanation',
+                            lambda *a, **kw: calls.append(1) or real(*a, **kw))
+        result = analyzer.classify_emotion(TEXT)
+        result['primary_emotion'], result.get('final_probabilities')
+        assert calls == []
+        first = result['xai_explanation']
+        assert result['xai_explanation'] is first and calls == [1]
+
+    def test_every_lazy_field_is_a_field(self):
+        assert set(LAZY_FIELDS) <= set(FIELDS)
+        for method in LAZY_FIELDS.values():
+            assert callable(getattr(EmotionResult, method))
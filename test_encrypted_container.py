@@ -0,0 +1,181 @@
+"""Tests for encrypted_container.py and its use by DataStore.
+
+Validates incremental appends, selective section reads, crash-truncated
+records, compaction, legacy single-token profile migration and key
+rotation.
+"""
+
+import base64
+import json
+import os
+import sys
+
+import pytest
+from cryptography.fernet import Fernet
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from data_store import DataStore
+from encrypted_container import (
+    MAGIC, EncryptedContainer, diff_profile, merge_profile, split_profile,
+)
+from user_profile import UserProfile
+
+
+def _profile(uid, messages):
+    profile = UserProfile(uid)
+    profile.set_password("TestPass1!")
+    profile.save_chat_history(
+        [{"role": "user", "content": f"message {i} " + "x" * 200} for i in range(messages)])
+    return profile.get_profile()
+
+
+@pytest.fixture()
+def store(tmp_path):
+    return DataStore(data_dir=str(tmp_path))
+
+
+class TestContainerFormat:
+    def test_split_and_merge_round_trip(self):
+        data = {"user_id": "u", "chat_history": [1, 2],
+                "session": {"session_id": "s", "chat_history": [3], "risk_history": []}}
+        core, sections = split_profile(data)
+        assert "chat_history" not in core and "chat_history" not in core["session"]
+        assert sections == {"chat_history": [1, 2], "session.chat_history": [3],
+                            "session.risk_history": []}
+        # split_profile must not mutate its input
+        assert data["session"]["chat_history"] == [3]
+        assert merge_profile(core, sections) == data
+
+    def test_diff_profile(self):
+        old = {"a": 1, "chat_history": [1, 2]}
+        assert diff_profile(old, {"a": 1, "chat_history": [1, 2, 3]}) == (
+            None, {"chat_history": [3]}, {}, {})
+        assert diff_profile(old, {"a": 2, "chat_history": [9]}) == (
+            {"a": 2}, {}, {"chat_history": [9]}, {})
+        assert diff_profile(old, {"a": 1}) is None
+        # A capped history that shifted: trim the head, append the tail
+        assert diff_profile(old, {"a": 1, "chat_history": [2, 3]}) == (
+            None, {"chat_history": [3]}, {}, {"chat_history": 1})
+
+    def test_file_has_magic_and_no_base64(self, store):
+        store.save_user_data("alice", _profile("alice", 1))
+        raw = store._get_container_file("alice").read_bytes()
+        assert raw.startswith(MAGIC)
+        assert b"message 0" not in raw
+        # The legacy format wrapped a base64 Fernet token in base64 again
+        assert not store._get_user_file("alice").exists()
+
+
+class TestIncrementalWrites:
+    def test_append_grows_file_by_one_record(self, store):
+        data = _profile("bob", 200)
+        store.save_user_data("bob", data)
+        path = store._get_container_file("bob")
+        size_before = path.stat().st_size
+
+        data["chat_history"].append({"role": "user", "content": "one more"})
+        store.save_user_data("bob", data)
+        growth = path.stat().st_size - size_before
+        # Header record + one small append, far below the 40 KB+ history
+        assert 0 < growth < 4096
+        assert store.load_user_data("bob")["chat_history"][-1]["content"] == "one more"
+
+    def test_fresh_store_reads_appended_records(self, store, tmp_path):
+        data = _profile("carl", 3)
+        store.save_user_data("carl", data)
+        for i in range(3):
+            data["chat_history"].append({"role": "user", "content": f"extra {i}"})
+            store.save_user_data("carl", data)
+        reloaded = DataStore(data_dir=str(tmp_path)).load_user_data("carl")
+        assert [m["content"] for m in reloaded["chat_history"][-3:]] == ["extra 0", "extra 1", "extra 2"]
+
+    def test_edited_history_is_snapshotted(self, store, tmp_path):
+        data = _profile("dana", 3)
+        store.save_user_data("dana", data)
+        data["chat_history"] = data["chat_history"][1:]
+        store.save_user_data("dana", data)
+        reloaded = DataStore(data_dir=str(tmp_path)).load_user_data("dana")
+        assert len(reloaded["chat_history"]) == 2
+
+    def test_capped_history_is_trimmed_not_snapshotted(self, store, tmp_path):
+        data = _profile("hana", 1)
+        data["emotional_history"] = [{"day": i, "note": "x" * 100} for i in range(365)]
+        store.save_user_data("hana", data)
+        path = store._get_container_file("hana")
+        size_before = path.stat().st_size
+
+        data["emotional_history"].append({"day": 365, "note": "new"})
+        del data["emotional_history"][:-365]
+        store.save_user_data("hana", data)
+        # Header + trim + one small append, far below the ~40 KB section
+        assert 0 < path.stat().st_size - size_before < 4096
+        history = DataStore(data_dir=str(tmp_path)).load_user_data("hana")["emotional_history"]
+        assert len(history) == 365
+        assert (history[0]["day"], history[-1]["day"]) == (1, 365)
+        assert DataStore(data_dir=str(tmp_path)).load_user_section("hana", "emotional_history") == history
+
+    def test_compaction_after_record_limit(self, store):
+        store.container_compact_records = 5
+        data = _profile("eve", 1)
+        for i in range(10):
+            data["chat_history"].append({"role": "user", "content": f"m{i}"})
+            store.save_user_data("eve", data)
+        container = EncryptedContainer(store._get_container_file("eve"), store.cipher)
+        assert container.record_count() <= 5
+        assert len(store.load_user_data("eve")["chat_history"]) == 11
+
+    def test_truncated_tail_is_ignored_and_rewritten(self, store, tmp_path):
+        data = _profile("finn", 2)
+        store.save_user_data("finn", data)
+        path = store._get_container_file("finn")
+        with open(path, "ab") as f:
+            f.write(b"\x00\x00\x10\x00A partial")
+        fresh = DataStore(data_dir=str(tmp_path))
+        assert len(fresh.load_user_data("finn")["chat_history"]) == 2
+        data["chat_history"].append({"role": "user", "content": "after crash"})
+        fresh.save_user_data("finn", data)
+        assert DataStore(data_dir=str(tmp_path)).load_user_data("finn")["chat_history"][-1][
+            "content"] == "after crash"
+
+    def test_load_section_only(self, store, tmp_path):
+        store.save_user_data("gail", _profile("gail", 4))
+        fresh = DataStore(data_dir=str(tmp_path))
+        assert len(fresh.load_user_section("gail", "chat_history")) == 4
+        assert fresh.load_user_section("gail", "response_style") == "balanced"
+        assert fresh.load_user_section("gail", "missing") is None
+        assert fresh.load_user_section("nobody", "chat_history") is None
+
+
+class TestLegacyAndRotation:
+    def test_legacy_single_token_file_is_migrated(self, store, tmp_path):
+        payload = {"user_id": "hugo", "chat_history": [{"role": "user", "content": "old"}]}
+        token = store.cipher.encrypt(json.dumps(payload).encode())
+        with open(tmp_path / "hugo.json", "w") as f:
+            json.dump({"encrypted": True, "data": base64.b64encode(token).decode()}, f)
+
+        assert store.list_users() == ["hugo"]
+        data = store.load_user_data("hugo")
+        assert data["chat_history"][0]["content"] == "old"
+        store.save_user_data("hugo", data)
+        assert not (tmp_path / "hugo.json").exists()
+        assert store._get_container_file("hugo").exists()
+        assert store.list_users() == ["hugo"]
+
+    def test_key_rotation(self, store, tmp_path):
+        store.save_user_data("iris", _profile("iris", 2))
+        old_key = store.encryption_key
+        assert store.rotate_encryption_key() == 1
+        assert store.encryption_key != old_key
+        assert not (tmp_path / ".encryption_key.retired").exists()
+
+        fresh = DataStore(data_dir=str(tmp_path))
+        assert len(fresh.load_user_data("iris")["chat_history"]) == 2
+        with pytest.raises(ValueError):
+            DataStore(data_dir=str(tmp_path), encryption_key=old_key).load_user_data("iris")
+
+    def test_wrong_key_raises(self, store, tmp_path):
+        store.save_user_data("jade", _profile("jade", 1))
+        other = DataStore(data_dir=str(tmp_path), encryption_key=Fernet.generate_key())
+        with pytest.raises(ValueError):
+            other.load_user_data("jade")
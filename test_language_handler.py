@@ -0,0 +1,85 @@
+"""Tests for language_handler.py – script detection and keyword matching.
+
+The compiled matcher must give exactly the results of the original
+substring scans over the keyword tables, including overlapping keywords
+and keywords embedded inside longer words.
+"""
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from language_handler import (
+    LanguageHandler,
+    TAMIL_UNICODE_EMOTION_KEYWORDS,
+    TANGLISH_EMOTION_KEYWORDS,
+    _TAMIL_UNICODE_RANGE,
+)
+
+_SEVERITY = ['crisis', 'sadness', 'fear', 'anxiety', 'anger', 'joy']
+
+
+def _reference_counts(flat, text):
+    counts = {}
+    for kw, emotion in flat.items():
+        if kw in text:
+            counts[emotion] = counts.get(emotion, 0) + 1
+    return counts
+
+
+def _reference_emotion(flat, text):
+    counts = _reference_counts(flat, text)
+    return next((e for e in _SEVERITY if e in counts), None)
+
+
+def _reference_script(lh, text):
+    if _TAMIL_UNICODE_RANGE.search(text):
+        return 'tamil'
+    return 'tanglish' if any(kw in text.lower() for kw in lh._tanglish_flat) else 'english'
+
+
+def _corpus(n=400, seed=7):
+    rng = random.Random(seed)
+    words = ['i', 'feel', 'attention', 'superb', 'naan', 'romba', 'today', 'work',
+             'VALIKUDU', 'Thalai', 'நான்', 'மிகவும்', 'இருக்கிறேன்']
+    words += [w for ws in TANGLISH_EMOTION_KEYWORDS.values() for w in ws]
+    words += [w for ws in TAMIL_UNICODE_EMOTION_KEYWORDS.values() for w in ws]
+    texts = []
+    for _ in range(n):
+        picked = rng.sample(words, rng.randint(0, 6))
+        # Glue some words together so keywords also appear mid-word
+        texts.append(rng.choice([' ', '', ', ']).join(picked))
+    return texts
+
+
+class TestKeywordMatcher:
+    def test_matches_reference_substring_scans(self):
+        lh = LanguageHandler()
+        for text in _corpus():
+            assert lh.detect_script(text) == _reference_script(lh, text), text
+            assert lh.detect_tanglish_emotion(text) == _reference_emotion(lh._tanglish_flat, text.lower())
+            assert lh.detect_tamil_unicode_emotion(text) == _reference_emotion(lh._tamil_flat, text)
+
+    def test_scan_single_pass_result(self):
+        lh = LanguageHandler()
+        for text in _corpus(200, seed=11):
+            result = lh.scan(text)
+            script = _reference_script(lh, text)
+            flat, target = ((lh._tamil_flat, text) if script == 'tamil'
+                            else (lh._tanglish_flat, text.lower()))
+            assert result['script'] == script
+            assert result['emotion_counts'] == _reference_counts(flat, target)
+            assert sorted(result['keywords']) == sorted(kw for kw in flat if kw in target)
+            assert result['emotion'] == (_reference_emotion(flat, target) if script != 'english' else None)
+
+    def test_overlapping_keywords_all_reported(self):
+        result = LanguageHandler().scan("thalai valikudu")
+        assert set(result['keywords']) == {'thalai valikudu', 'valikudu', 'vali'}
+        assert result['emotion_counts'] == {'anxiety': 1, 'sadness': 2}
+        assert result['emotion'] == 'sadness'
+
+    def test_english_has_no_matches(self):
+        assert LanguageHandler().scan("just a normal day") == {
+            'script': 'english', 'keywords': [], 'emotion_counts': {}, 'emotion': None}
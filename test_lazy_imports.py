@@ -0,0 +1,56 @@
+"""Tests for lazy loading of the AI core – cheap imports, models on first use.
+
+Import checks run in a fresh interpreter (see run_import_benchmark.py) so
+modules already imported by other tests do not hide an eager import.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import config
+import model_registry
+from emotion_analyzer import ContextualCrisisAdapter, EmotionAnalyzer, MLEmotionAdapter
+from run_import_benchmark import TARGETS, probe
+
+
+class TestColdImport:
+    def test_core_import_defers_heavy_modules(self):
+        for name in ('analyzer_init', 'wellness_buddy'):
+            report = probe(TARGETS[name][0])
+            assert report['deferred_loaded'] == [], name
+            assert report['models_loaded'] == [], name
+
+
+class TestLazyAdapters:
+    def _fake_registry(self, monkeypatch):
+        calls = []
+
+        def loader(task, model):
+            calls.append(model)
+            return lambda *args, **kwargs: None
+
+        monkeypatch.setattr(model_registry, 'registry', model_registry.ModelRegistry())
+        monkeypatch.setitem(model_registry._BACKEND_LOADERS, 'transformers', loader)
+        return calls
+
+    def test_construction_loads_nothing(self, monkeypatch):
+        calls = self._fake_registry(monkeypatch)
+        analyzer = EmotionAnalyzer()
+        assert calls == []
+        assert analyzer.crisis_adapter.available
+        assert calls == ['facebook/bart-large-mnli']
+
+    def test_warmup_loads_all_models(self, monkeypatch):
+        calls = self._fake_registry(monkeypatch)
+        status = EmotionAnalyzer().warmup()
+        assert status['sentiment'] and status['ml_adapter'] and status['crisis_adapter']
+        assert sorted(set(calls)) == ['facebook/bart-large-mnli', MLEmotionAdapter._MODEL]
+
+    def test_crisis_model_can_be_disabled(self, monkeypatch):
+        calls = self._fake_registry(monkeypatch)
+        monkeypatch.setattr(config, 'CONTEXTUAL_CRISIS_MODEL_ENABLED', False)
+        adapter = ContextualCrisisAdapter()
+        assert not adapter.available and adapter.classify("I can't go on") is None
+        assert calls == []
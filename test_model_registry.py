@@ -0,0 +1,161 @@
+"""Tests for model_registry.py – process-wide model cache.
+
+Uses stand-in loaders so no transformers model is downloaded.
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import pytest
+
+import model_registry
+from model_registry import ModelRegistry, ModelUnavailable
+
+
+class FakeLoader:
+    def __init__(self, fail=False, delay=0.0):
+        self.calls = []
+        self.fail = fail
+        self.delay = delay
+
+    def __call__(self, task, model):
+        self.calls.append((task, model))
+        if self.delay:
+            time.sleep(self.delay)
+        if self.fail:
+            raise OSError("model not downloaded")
+        return object()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestSharing:
+    def test_same_key_loaded_once(self):
+        reg, loader = ModelRegistry(), FakeLoader()
+        first = reg.get('text-classification', 'distilroberta', loader=loader)
+        again = reg.get('text-classification', 'distilroberta', loader=loader)
+        other = reg.get('zero-shot-classification', 'bart', loader=loader)
+        assert first is again and first is not other
+        assert len(loader.calls) == 2
+        stats = {s['model']: s for s in reg.stats()}
+        assert stats['distilroberta']['hits'] == 1 and stats['distilroberta']['loaded']
+
+    def test_concurrent_callers_single_flight(self):
+        reg, loader = ModelRegistry(), FakeLoader(delay=0.05)
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(reg.get('t', 'm', loader=loader)))
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(loader.calls) == 1
+        assert len(results) == 8 and all(r is results[0] for r in results)
+
+    def test_analyzer_and_transformer_share_distilroberta(self, monkeypatch):
+        import emotion_analyzer
+        from models import emotion_transformer
+
+        loader = FakeLoader()
+        reg = ModelRegistry()
+        monkeypatch.setattr(model_registry, 'registry', reg)
+        monkeypatch.setitem(model_registry._BACKEND_LOADERS, 'transformers', loader)
+        assert emotion_analyzer.load_ml_emotion_pipeline() is emotion_transformer.load_emotion_pipeline()
+        assert loader.calls == [('text-classification', 'j-hartmann/emotion-english-distilroberta-base')]
+
+
+class TestNegativeCache:
+    def test_failure_not_retried_until_backoff_expires(self):
+        clock = FakeClock()
+        reg = ModelRegistry(retry_seconds=10, retry_max_seconds=25, clock=clock)
+        loader = FakeLoader(fail=True)
+        with pytest.raises(ModelUnavailable):
+            reg.get('t', 'm', loader=loader)
+        with pytest.raises(ModelUnavailable) as exc_info:
+            reg.get('t', 'm', loader=loader)
+        assert len(loader.calls) == 1
+        assert isinstance(exc_info.value.cause, OSError)
+
+        clock.now = 10.0  # first backoff over; second failure doubles it
+        with pytest.raises(ModelUnavailable):
+            reg.get('t', 'm', loader=loader)
+        assert len(loader.calls) == 2
+        assert reg.stats()[0]['retry_in_seconds'] == 20.0
+
+        clock.now = 30.0
+        loader.fail = False
+        assert reg.get('t', 'm', loader=loader) is not None
+        assert reg.stats()[0]['failures'] == 0 and reg.stats()[0]['error'] is None
+
+    def test_backoff_capped(self):
+        clock = FakeClock()
+        reg = ModelRegistry(retry_seconds=10, retry_max_seconds=25, clock=clock)
+        loader = FakeLoader(fail=True)
+        for _ in range(4):
+            with pytest.raises(ModelUnavailable):
+                reg.get('t', 'm', loader=loader)
+            clock.now += 100
+        assert len(loader.calls) == 4
+        assert reg.stats()[0]['retry_in_seconds'] <= 25
+
+
+class TestUnload:
+    def test_unload_releases_and_reloads(self):
+        reg, loader = ModelRegistry(), FakeLoader()
+        first = reg.get('t', 'm', loader=loader)
+        assert reg.unload('t', 'm') is True
+        assert not reg.is_loaded('t', 'm') and reg.unload('t', 'm') is False
+        assert reg.get('t', 'm', loader=loader) is not first
+        assert len(loader.calls) == 2
+
+    def test_unload_clears_cached_failure(self):
+        reg, loader = ModelRegistry(retry_seconds=3600), FakeLoader(fail=True)
+        with pytest.raises(ModelUnavailable):
+            reg.get('t', 'm', loader=loader)
+        assert reg.unload('t', 'm') is False
+        loader.fail = False
+        assert reg.get('t', 'm', loader=loader) is not None
+
+    def test_unload_all(self):
+        reg, loader = ModelRegistry(), FakeLoader()
+        reg.get('a', 'm', loader=loader)
+        reg.get('b', 'm', loader=loader)
+        assert reg.unload_all() == 2 and reg.stats() == []
+
+
+class TestPreFork:
+    def test_forked_worker_reuses_master_model(self, monkeypatch):
+        import gc
+
+        reg, loader = ModelRegistry(), FakeLoader()
+        monkeypatch.setattr(model_registry, 'registry', reg)
+        model = model_registry.get_model('t', 'm', loader=loader)
+        try:
+            assert model_registry.freeze_for_fork() > 0
+        finally:
+            gc.unfreeze()
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            ok = (model_registry.get_model('t', 'm', loader=loader) is model
+                  and len(loader.calls) == 1
+                  and model_registry.set_inference_threads(0) == 1)
+            os.write(write_fd, b'1' if ok else b'0')
+            os._exit(0)
+        os.close(write_fd)
+        result = os.read(read_fd, 1)
+        os.close(read_fd)
+        os.waitpid(pid, 0)
+        assert result == b'1'
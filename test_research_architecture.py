@@ -344,10 +344,10 @@ class TestDataStoreSessionLog:
                 'risk_level': 'medium',
             }
             ds.save_session_log('test_user', entry)
-            log_file = os.path.join(tmpdir, 'test_user_session_data.json')
+            log_file = os.path.join(tmpdir, 'test_user_session_log.jsonl')
             assert os.path.exists(log_file)
             with open(log_file) as f:
-                data = json.load(f)
+                data = [json.loads(line) for line in f]
             assert len(data) == 1
             assert data[0]['emotion'] == 'sadness'
 
@@ -356,10 +356,104 @@ class TestDataStoreSessionLog:
             ds = DataStore(data_dir=tmpdir)
             for i in range(3):
                 ds.save_session_log('test_user', {'message': f'msg {i}'})
-            log_file = os.path.join(tmpdir, 'test_user_session_data.json')
-            with open(log_file) as f:
-                data = json.load(f)
-            assert len(data) == 3
+            data = list(ds.iter_session_log('test_user'))
+            assert [d['message'] for d in data] == ['msg 0', 'msg 1', 'msg 2']
+
+    def test_session_log_rotation(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            ds = DataStore(data_dir=tmpdir, session_log_max_bytes=200,
+                           session_log_backup_count=2)
+            for i in range(30):
+                ds.save_session_log('test_user', {'message': f'message number {i:02d}'})
+            assert os.path.exists(os.path.join(tmpdir, 'test_user_session_log.1.jsonl'))
+            assert os.path.exists(os.path.join(tmpdir, 'test_user_session_log.2.jsonl'))
+            assert not os.path.exists(os.path.join(tmpdir, 'test_user_session_log.3.jsonl'))
+            messages = [d['message'] for d in ds.iter_session_log('test_user')]
+            # Oldest entries were dropped, the rest are in order
+            assert messages[-1] == 'message number 29'
+            assert messages == sorted(messages)
+            assert len(messages) < 30
+
+    def test_iter_session_log_skips_truncated_line(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            ds = DataStore(data_dir=tmpdir, session_log_fsync='always')
+            ds.save_session_log('test_user', {'message': 'complete'})
+            with open(os.path.join(tmpdir, 'test_user_session_log.jsonl'), 'a') as f:
+                f.write('{"message": "trunc')
+            assert [d['message'] for d in ds.iter_session_log('test_user')] == ['complete']
+
+    def test_append_after_truncated_line_is_kept(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            ds = DataStore(data_dir=tmpdir, session_log_fsync='always')
+            ds.save_session_log('test_user', {'message': 'a'})
+            with open(os.path.join(tmpdir, 'test_user_session_log.jsonl'), 'a') as f:
+                f.write('{"message": "trunc')
+            ds.save_session_log('test_user', {'message': 'after crash'})
+            messages = [d['message'] for d in ds.iter_session_log('test_user')]
+            assert messages == ['a', 'after crash']
+
+    def test_concurrent_append_and_migration(self):
+        import threading
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with open(os.path.join(tmpdir, 'test_user_session_data.json'), 'w') as f:
+                json.dump([{'message': f'old {i}'} for i in range(200)], f)
+            ds = DataStore(data_dir=tmpdir, session_log_fsync='never')
+            barrier = threading.Barrier(8, timeout=10)
+            errors = []
+
+            def append(n):
+                barrier.wait()
+                try:
+                    for i in range(20):
+                        ds.save_session_log('test_user', {'message': f'new {n}.{i}'})
+                except Exception as e:  # pragma: no cover - reported below
+                    errors.append(e)
+
+            def migrate():
+                barrier.wait()
+                try:
+                    list(ds.iter_session_log('test_user'))
+                except Exception as e:  # pragma: no cover - reported below
+                    errors.append(e)
+
+            threads = [threading.Thread(target=append, args=(n,), daemon=True) for n in range(4)]
+            threads += [threading.Thread(target=migrate, daemon=True) for _ in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join(timeout=30)
+            assert not any(t.is_alive() for t in threads)
+            assert errors == []
+            messages = [d['message'] for d in ds.iter_session_log('test_user')]
+            assert messages[:200] == [f'old {i}' for i in range(200)]
+            assert sorted(messages[200:]) == sorted(f'new {n}.{i}' for n in range(4) for i in range(20))
+            assert not [p for p in os.listdir(tmpdir) if p.endswith('.tmp')]
+
+    def test_legacy_array_is_migrated(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            legacy = os.path.join(tmpdir, 'test_user_session_data.json')
+            with open(legacy, 'w') as f:
+                json.dump([{'message': 'old 0'}, {'message': 'old 1'}], f, indent=2)
+            ds = DataStore(data_dir=tmpdir)
+            ds.save_session_log('test_user', {'message': 'new'})
+            messages = [d['message'] for d in ds.iter_session_log('test_user')]
+            assert messages == ['old 0', 'old 1', 'new']
+            assert not os.path.exists(legacy)
+            assert os.path.exists(legacy + '.migrated')
+
+    def test_migrate_all_legacy_logs(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for user in ('alice', 'bob'):
+                with open(os.path.join(tmpdir, f'{user}_session_data.json'), 'w') as f:
+                    json.dump([{'message': user}], f)
+            ds = DataStore(data_dir=tmpdir)
+            assert ds.migrate_legacy_session_logs() == {'alice': 1, 'bob': 1}
+            assert ds.migrate_legacy_session_logs() == {}
+
+    def test_invalid_fsync_policy_rejected(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with pytest.raises(ValueError):
+                DataStore(data_dir=tmpdir, session_log_fsync='sometimes')
 
 
 # ---------------------------------------------------------------------------
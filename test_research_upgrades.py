@@ -1,3 +1,8 @@
+import asyncio
+import time
+
+import pytest
+
 from emotion_analyzer import EmotionAnalyzer
 from prediction_agent import SimpleGRUForecaster, compare_models
 from pattern_tracker import PatternTracker
@@ -70,3 +75,70 @@ def test_agent_pipeline_process_turn():
     assert 'forecasting' in result
     assert 'alert' in result
     assert 'response' in result
+
+
+class _FixedCrisisModel:
+    available = True
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+
+    def classify(self, text):
+        time.sleep(self.delay)
+        return {'crisis_probability': 0.8, 'suicidal_ideation_probability': 0.8,
+                'severe_distress_probability': 0.3, 'safety_probability': 0.1}
+
+
+def test_process_turn_async_matches_sync():
+    sync_pipeline, async_pipeline = WellnessAgentPipeline(), WellnessAgentPipeline()
+    for p in (sync_pipeline, async_pipeline):
+        p.emotion_agent.analyzer.crisis_adapter = _FixedCrisisModel()
+    message = "I can't take this anymore, everything is hopeless"
+
+    expected = sync_pipeline.process_turn(message)
+    result = asyncio.run(async_pipeline.process_turn_async(message))
+    assert result['missed_stages'] == []
+    assert result['emotion']['primary_emotion'] == expected['emotion']['primary_emotion']
+    assert result['emotion']['final_probabilities'] == expected['emotion']['final_probabilities']
+    assert result['emotion']['crisis_probability'] == expected['emotion']['crisis_probability'] == 0.8
+    assert set(result) - set(expected) == {'missed_stages'}
+
+
+def test_process_turn_async_partial_result_on_missed_deadline():
+    pipeline = WellnessAgentPipeline()
+    pipeline.emotion_agent.analyzer.crisis_adapter = _FixedCrisisModel(delay=0.5)
+
+    result = asyncio.run(pipeline.process_turn_async(
+        "I feel a bit low today", deadlines={'crisis_model': 0.05},
+    ))
+    assert result['missed_stages'] == ['crisis_model']
+    assert result['emotion']['crisis_probability'] == 0.0  # keyword-only crisis check
+    assert result['response']
+
+
+def test_keyword_only_inference_mode_skips_models():
+    class _Spy:
+        available = True
+
+        def __init__(self, wrapped):
+            self.wrapped = wrapped
+            self.calls = 0
+
+        def classify(self, text):
+            self.calls += 1
+            return {}
+
+        def classify_keywords_only(self, text):
+            return self.wrapped.classify_keywords_only(text)
+
+    analyzer = EmotionAnalyzer()
+    analyzer._emotion_transformer = transformer = _Spy(analyzer._emotion_transformer)
+    analyzer.crisis_adapter = crisis = _Spy(analyzer.crisis_adapter)
+
+    result = analyzer.classify_emotion_ml("I want to end my life", inference_mode='keyword_only')
+    assert transformer.calls == 0 and crisis.calls == 0
+    assert result['inference_mode'] == 'keyword_only' and result['ml_available'] is False
+    assert result['is_crisis']
+
+    analyzer.classify_emotion_ml("I feel okay", inference_mode='no_nli')
+    assert crisis.calls == 0
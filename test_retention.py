@@ -0,0 +1,188 @@
+"""Tests for retention.py – downsampling and compaction of stored history.
+
+Covers merging of emotional snapshots into daily aggregates, chat history
+caps with per-day counts, session log summarisation for the JSON and
+SQLite engines, and the store-wide job's report.
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from unittest import mock
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import config
+import retention
+from data_store import DataStore
+from sqlite_store import SQLiteDataStore
+from user_profile import UserProfile
+
+NOW = datetime(2026, 6, 30, 12, 0, 0)
+
+
+def _snapshot(when, distress, stability, risk='low'):
+    return {'date': when.date().isoformat(), 'timestamp': when,
+            'emotion_data': {'messages_count': 10, 'distress_messages': distress,
+                             'stability_index': stability, 'risk_level': risk},
+            'session_summary': {'total_messages': 10,
+                                'emotion_distribution': {'sad': distress, 'neutral': 10 - distress}}}
+
+
+def _log_entry(when, emotion='sad', confidence=0.5, risk='low'):
+    return {'timestamp': when.isoformat(), 'message': 'private text',
+            'emotion': emotion, 'confidence': confidence, 'risk_level': risk}
+
+
+class TestEmotionalHistory:
+    def test_old_days_merged_recent_kept_expired_dropped(self):
+        old_day = NOW - timedelta(days=200)
+        history = [_snapshot(NOW - timedelta(days=400), 1, 0.5),
+                   _snapshot(old_day, 2, 0.4), _snapshot(old_day + timedelta(hours=3), 4, 0.8, 'high'),
+                   _snapshot(NOW - timedelta(days=150), 1, 0.9),
+                   _snapshot(NOW - timedelta(days=1), 3, 0.7),
+                   _snapshot(NOW - timedelta(days=1, hours=-1), 3, 0.7)]
+        recent = history[-2:]
+        removed = retention.compact_emotional_history(history, NOW, raw_days=90, keep_days=365)
+        assert removed == 2
+        assert len(history) == 4
+        merged = history[0]
+        assert merged['snapshots'] == 2
+        assert merged['emotion_data'] == {'messages_count': 20, 'distress_messages': 6,
+                                          'stability_index': pytest.approx(0.6), 'risk_level': 'high'}
+        assert merged['session_summary']['emotion_distribution'] == {'sad': 6, 'neutral': 14}
+        assert history[-2:] == recent
+
+    def test_idempotent_and_weighted(self):
+        day = NOW - timedelta(days=120)
+        history = [_snapshot(day, 1, 1.0), _snapshot(day, 1, 1.0)]
+        retention.compact_emotional_history(history, NOW)
+        history.append(_snapshot(day, 1, 0.1))
+        retention.compact_emotional_history(history, NOW)
+        assert retention.compact_emotional_history(history, NOW) == 0
+        assert history[0]['snapshots'] == 3
+        assert history[0]['emotion_data']['stability_index'] == pytest.approx(0.7)
+
+    def test_add_snapshot_trims_in_place(self):
+        profile = UserProfile('trim')
+        history = profile.profile_data['emotional_history']
+        with mock.patch.object(config, 'EMOTIONAL_HISTORY_DAYS', 3):
+            for _ in range(5):
+                profile.add_emotional_snapshot({}, {})
+        assert profile.profile_data['emotional_history'] is history
+        assert len(history) == 3
+
+
+class TestChatHistory:
+    def test_old_and_excess_messages_counted_per_day(self):
+        old = NOW - timedelta(days=200)
+        profile = {'chat_history': [
+            {'role': 'user', 'content': 'abc', 'timestamp': old},
+            {'role': 'assistant', 'content': 'hello', 'timestamp': old.isoformat()},
+            {'role': 'user', 'content': 'recent', 'timestamp': NOW},
+            {'role': 'user', 'content': 'undated'},
+            {'role': 'user', 'content': 'last'},
+        ]}
+        removed = retention.compact_chat_history(profile, NOW, raw_days=180, max_messages=2)
+        assert removed == 3
+        assert [m['content'] for m in profile['chat_history']] == ['undated', 'last']
+        day = old.date().isoformat()
+        assert profile['chat_history_daily'][day] == {'messages': 2, 'user_messages': 1, 'characters': 8}
+        assert profile['chat_history_daily'][NOW.date().isoformat()]['messages'] == 1
+
+    def test_profile_retention_prunes_expired_daily_counts(self):
+        profile = {'chat_history': [], 'emotional_history': [],
+                   'chat_history_daily': {'2020-01-01': {'messages': 1}, retention.UNDATED: {'messages': 1}}}
+        assert retention.apply_profile_retention(profile, NOW) == {
+            'emotional_snapshots_removed': 0, 'chat_messages_removed': 0}
+        assert list(profile['chat_history_daily']) == [retention.UNDATED]
+
+
+@pytest.fixture(params=['json', 'sqlite'])
+def store(request, tmp_path):
+    if request.param == 'json':
+        yield DataStore(data_dir=str(tmp_path), session_log_max_bytes=1000)
+    else:
+        s = SQLiteDataStore(data_dir=str(tmp_path))
+        yield s
+        s.close()
+
+
+class TestSessionLogCompaction:
+    def test_old_entries_summarized_recent_untouched(self, store):
+        old = NOW - timedelta(days=40)
+        for i in range(12):
+            store.save_session_log('ana', _log_entry(old + timedelta(minutes=i), confidence=0.25,
+                                                     risk='high' if i == 0 else 'low'))
+        for i in range(3):
+            store.save_session_log('ana', _log_entry(NOW - timedelta(hours=i), emotion='joy'))
+
+        with mock.patch.object(config, 'RETENTION_BATCH_SIZE', 5):
+            result = store.compact_session_log('ana', NOW - timedelta(days=30))
+        assert result == {'entries': 12, 'days': 1}
+        remaining = list(store.iter_session_log('ana'))
+        assert [e['emotion'] for e in remaining] == ['joy'] * 3
+        [summary] = store.iter_session_summary('ana')
+        assert summary['date'] == old.date().isoformat()
+        assert summary['entries'] == 12
+        assert summary['confidence_sum'] == pytest.approx(3.0)
+        assert summary['risk_levels'] == {'high': 1, 'low': 11}
+        assert 'message' not in summary
+
+        # Nothing left to compact; later runs merge into the same day
+        assert store.compact_session_log('ana', NOW - timedelta(days=30))['entries'] == 0
+        store.save_session_log('ana', _log_entry(NOW))
+        store.compact_session_log('ana', NOW + timedelta(days=1))
+        days = {s['date']: s['entries'] for s in store.iter_session_summary('ana')}
+        assert days == {old.date().isoformat(): 12, NOW.date().isoformat(): 4}
+        assert list(store.iter_session_log('ana')) == []
+
+    def test_expired_summaries_dropped(self, store):
+        store.save_session_log('ben', _log_entry(NOW - timedelta(days=900)))
+        store.compact_session_log('ben', NOW, summary_cutoff='2025-01-01')
+        assert list(store.iter_session_summary('ben')) == []
+        assert list(store.iter_session_log('ben')) == []
+
+
+class TestRunRetention:
+    def test_report_and_reclaimed_space(self, store):
+        profile = UserProfile('cara').get_profile()
+        start = NOW - timedelta(days=300)
+        profile['emotional_history'] = [_snapshot(start + timedelta(days=d // 4, hours=d % 4), 1, 0.5)
+                                        for d in range(1000)]
+        profile['chat_history'] = [{'role': 'user', 'content': 'x' * 200,
+                                    'timestamp': start + timedelta(hours=h)} for h in range(3000)]
+        store.save_user_data('cara', profile)
+        for i in range(30):
+            store.save_session_log('cara', _log_entry(start + timedelta(hours=i)))
+        store.save_session_log('anonymous', _log_entry(start))
+
+        report = retention.run_retention(store, now=NOW)
+        assert report['users'] == 1 and report['profiles_changed'] == 1
+        assert report['emotional_snapshots_removed'] > 0
+        assert report['chat_messages_removed'] >= 3000 - config.CHAT_HISTORY_MAX_MESSAGES
+        assert report['session_entries_summarized'] == 31
+        assert report['bytes_reclaimed'] > 0
+
+        loaded = store.load_user_data('cara')
+        assert len(loaded['chat_history']) <= config.CHAT_HISTORY_MAX_MESSAGES
+        assert len(loaded['emotional_history']) < 1000
+        assert isinstance(loaded['emotional_history'][0]['timestamp'], datetime)
+
+        again = retention.run_retention(store, now=NOW)
+        assert again['profiles_changed'] == 0 and again['session_entries_summarized'] == 0
+
+    def test_scheduler_runs_and_stops(self, store):
+        scheduler = retention.RetentionScheduler(store, interval_hours=1, initial_delay_seconds=0.01)
+        with mock.patch.object(retention, 'run_retention', return_value={'ok': True}) as run:
+            scheduler.start()
+            for _ in range(200):
+                if scheduler.last_report:
+                    break
+                time.sleep(0.01)
+            scheduler.stop()
+        assert run.called and scheduler.last_report == {'ok': True}
+        assert scheduler._timer is None
@@ -0,0 +1,64 @@
+"""Tests for sentiment_lexicon.py – TextBlob-compatible lexicon sentiment scorer."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import pytest
+
+import sentiment_lexicon
+from emotion_analyzer import EmotionAnalyzer
+from run_sentiment_benchmark import reference_corpus
+
+
+class TestTextBlobEquivalence:
+    def test_reference_corpus_matches_textblob(self):
+        TextBlob = pytest.importorskip('textblob').TextBlob
+        for text in reference_corpus(generated=300):
+            assert sentiment_lexicon.sentiment(text) == tuple(TextBlob(text).sentiment), repr(text)
+
+
+class TestRules:
+    def _polarity(self, text):
+        return sentiment_lexicon.sentiment(text)[0]
+
+    def test_negation_flips_and_halves(self):
+        assert self._polarity("not good") == pytest.approx(-0.5 * self._polarity("good"))
+
+    def test_intensifier_and_exclamation(self):
+        assert self._polarity("very good") > self._polarity("good") > 0
+        assert self._polarity("good!") > self._polarity("good")
+
+    def test_emoticons_and_unknown_words(self):
+        assert self._polarity(":(") < 0 < self._polarity(":)")
+        assert sentiment_lexicon.sentiment("the table is here") == (0.0, 0.0)
+
+    def test_tokenizer_splits_punctuation_and_contractions(self):
+        assert sentiment_lexicon.tokenize("I don't know, Mr. Smith!") == [
+            'i', 'do', 'n', "'", 't', 'know', ',', 'mr.', 'smith', '!']
+
+    def test_adjectives_get_ly_adverbs(self):
+        lexicon = sentiment_lexicon.load_lexicon()
+        assert lexicon['terribly'][3] is True and lexicon['terrible'][3] is False
+        assert lexicon['happily'][0] > 0 > lexicon['terribly'][0]
+
+
+class TestAnalyzerIntegration:
+    def test_text_is_scored_once_per_turn(self, monkeypatch):
+        calls = []
+        real = sentiment_lexicon.tokenize
+        monkeypatch.setattr(sentiment_lexicon, 'tokenize', lambda t: calls.append(t) or real(t))
+
+        analyzer = EmotionAnalyzer()
+        text = "the table is here"  # no keywords → polarity fallback
+        assert not any(analyzer.detect_emotion_scores(text).values())
+        assert not any(kw in text for kw in analyzer.crisis_keywords)
+        result = analyzer.classify_emotion(text)
+        assert calls == [text]
+        assert (result['polarity'], result['subjectivity']) == sentiment_lexicon.sentiment(text)
+
+    def test_warmup_compiles_lexicon(self):
+        sentiment_lexicon.load_lexicon.cache_clear()
+        assert EmotionAnalyzer().warmup()['sentiment'] is True
+        assert sentiment_lexicon.load_lexicon.cache_info().currsize == 1
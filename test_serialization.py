@@ -0,0 +1,237 @@
+"""Tests for serialization.py – the JSON layer under DataStore.
+
+Round-trip property tests run over seeded random profiles and compare the
+schema-guided, in-place restore against the previous copy-and-walk
+implementation, for both the orjson and the standard-library backends.
+Backward compatibility is checked against files written the old way.
+"""
+
+import json
+import math
+import os
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import config
+import serialization
+from data_store import DataStore
+
+
+# ---------------------------------------------------------------------------
+# Reference: the recursive implementation DataStore used before
+# ---------------------------------------------------------------------------
+
+_LEGACY_FIELDS = ['timestamp', 'created_at', 'last_session', 'added_at', 'marked_at',
+                  'last_activity', 'lockout_until']
+
+
+def _legacy_prepare(data):
+    if isinstance(data, dict):
+        return {k: _legacy_prepare(v) for k, v in data.items()}
+    if isinstance(data, list):
+        return [_legacy_prepare(item) for item in data]
+    if isinstance(data, datetime):
+        return data.isoformat()
+    return data
+
+
+def _legacy_restore(data):
+    if isinstance(data, dict):
+        result = {}
+        for k, v in data.items():
+            if k in _LEGACY_FIELDS and isinstance(v, str):
+                try:
+                    result[k] = datetime.fromisoformat(v)
+                except (ValueError, TypeError):
+                    result[k] = v
+            else:
+                result[k] = _legacy_restore(v)
+        return result
+    if isinstance(data, list):
+        return [_legacy_restore(item) for item in data]
+    return data
+
+
+# ---------------------------------------------------------------------------
+# Random profile generator
+# ---------------------------------------------------------------------------
+
+_WORDS = ['calm', 'tired', 'வணக்கம்', 'naan', 'okay', '😊', 'stress', '"quoted"', 'line\nbreak']
+
+
+def _rand_datetime(rng):
+    dt = datetime(2024, 1, 1) + timedelta(seconds=rng.randrange(400 * 86400),
+                                          microseconds=rng.choice([0, rng.randrange(10 ** 6)]))
+    if rng.random() < 0.2:
+        dt = dt.replace(tzinfo=timezone(timedelta(hours=rng.choice([0, 5.5, -4]))))
+    return dt
+
+
+def _rand_scalar(rng):
+    return rng.choice([
+        lambda: rng.randrange(-1000, 1000),
+        lambda: round(rng.uniform(-1, 1), 6),
+        lambda: ' '.join(rng.choice(_WORDS) for _ in range(rng.randrange(4))),
+        lambda: rng.random() < 0.5,
+        lambda: None,
+    ])()
+
+
+def _rand_free(rng, depth=0, allow_datetimes=True):
+    """Free-form value; may hide datetime fields at any depth."""
+    roll = rng.random()
+    if depth < 3 and roll < 0.25:
+        out = {}
+        for _ in range(rng.randrange(4)):
+            if allow_datetimes and rng.random() < 0.3:
+                key = rng.choice(_LEGACY_FIELDS)
+                out[key] = rng.choice([_rand_datetime(rng), 'not a date', 7])
+            else:
+                out[rng.choice(['a', 'b', 'score', 'note', 'nested'])] = _rand_free(
+                    rng, depth + 1, allow_datetimes)
+        return out
+    if depth < 3 and roll < 0.4:
+        return [_rand_free(rng, depth + 1, allow_datetimes) for _ in range(rng.randrange(4))]
+    return _rand_scalar(rng)
+
+
+def _rand_message(rng):
+    msg = {'role': rng.choice(['user', 'assistant']), 'content': _rand_scalar(rng) or '',
+           'timestamp': rng.choice([_rand_datetime(rng), _rand_datetime(rng).isoformat()])}
+    if rng.random() < 0.3:
+        msg['meta'] = _rand_free(rng)
+    return msg
+
+
+def _rand_profile(rng):
+    profile = {
+        'user_id': f"user{rng.randrange(100)}",
+        'created_at': _rand_datetime(rng),
+        'last_session': _rand_datetime(rng),
+        'last_activity': _rand_datetime(rng),
+        'lockout_until': rng.choice([None, _rand_datetime(rng)]),
+        'response_style': 'balanced',
+        'personal_triggers': [rng.choice(_WORDS) for _ in range(rng.randrange(3))],
+        'chat_history': [_rand_message(rng) for _ in range(rng.randrange(30))],
+        'emotional_history': [
+            {'date': '2025-01-01', 'timestamp': _rand_datetime(rng),
+             # computed summaries: never hold datetimes (see PROFILE_SCHEMA)
+             'emotion_data': _rand_free(rng, allow_datetimes=False),
+             'session_summary': _rand_free(rng, allow_datetimes=False)}
+            for _ in range(rng.randrange(10))
+        ],
+        'trusted_contacts': [{'name': 'A', 'relationship': 'friend', 'contact_info': None,
+                              'added_at': _rand_datetime(rng)}],
+        'unsafe_contacts': [{'relationship': 'uncle', 'marked_at': _rand_datetime(rng)}],
+        'demographics': _rand_free(rng),
+        'extra': _rand_free(rng),
+    }
+    if rng.random() < 0.7:
+        profile['session'] = {
+            'session_id': 'abc', 'created_at': _rand_datetime(rng),
+            'last_activity': _rand_datetime(rng).isoformat(),
+            'chat_history': [_rand_message(rng) for _ in range(rng.randrange(5))],
+            'emotion_history': [{'emotion': 'sad', 'timestamp': _rand_datetime(rng),
+                                 'confidence': 0.5} for _ in range(rng.randrange(5))],
+            'risk_history': [{'risk_level': 'low', 'timestamp': _rand_datetime(rng),
+                              'extra': _rand_free(rng)} for _ in range(rng.randrange(5))],
+        }
+    return profile
+
+
+@pytest.fixture(params=['orjson', 'json'])
+def backend(request):
+    if request.param == 'orjson':
+        if not serialization.ORJSON_AVAILABLE:
+            pytest.skip("orjson not installed")
+        yield request.param
+    else:
+        with mock.patch.object(serialization, 'ORJSON_AVAILABLE', False):
+            yield request.param
+
+
+# ---------------------------------------------------------------------------
+# Round-trip properties
+# ---------------------------------------------------------------------------
+
+class TestRoundTripProperties:
+    @pytest.mark.parametrize('seed', range(40))
+    def test_decode_matches_legacy_restore(self, backend, seed):
+        profile = _rand_profile(random.Random(seed))
+        expected = _legacy_restore(_legacy_prepare(profile))
+        assert serialization.decode_profile(serialization.dumps(profile)) == expected
+
+    @pytest.mark.parametrize('seed', range(40))
+    def test_encoding_matches_legacy_json(self, backend, seed):
+        profile = _rand_profile(random.Random(seed))
+        legacy = json.dumps(_legacy_prepare(profile), indent=2)
+        assert json.loads(serialization.dumps(profile)) == json.loads(legacy)
+        # ... and the old format decodes to the same profile
+        assert serialization.decode_profile(legacy) == _legacy_restore(json.loads(legacy))
+
+    @pytest.mark.parametrize('seed', range(10))
+    def test_sections_decode_like_whole_profile(self, seed):
+        profile = _rand_profile(random.Random(seed))
+        whole = serialization.decode_profile(serialization.dumps(profile))
+        for path in ('chat_history', 'emotional_history', 'trusted_contacts', 'created_at'):
+            section = serialization.decode_profile(serialization.dumps(profile[path]), path)
+            assert section == whole[path]
+
+    def test_does_not_mutate_input(self):
+        profile = _rand_profile(random.Random(1))
+        snapshot = _legacy_prepare(profile)
+        serialization.dumps(profile)
+        assert _legacy_prepare(profile) == snapshot
+
+
+class TestEdgeValues:
+    def test_values_the_json_module_accepts(self, backend):
+        np = pytest.importorskip('numpy')
+        data = {'big': 2 ** 70, 1: 'int key', 'np': np.float64(0.25), 'date': datetime(2025, 3, 1).date()}
+        assert serialization.loads(serialization.dumps(data)) == {
+            'big': 2 ** 70, '1': 'int key', 'np': 0.25, 'date': '2025-03-01'}
+
+    def test_reads_nan_written_by_json_module(self, backend):
+        assert math.isnan(serialization.loads(json.dumps({'x': float('nan')}))['x'])
+
+    def test_unserializable_raises_type_error(self, backend):
+        with pytest.raises(TypeError):
+            serialization.dumps({'x': object()})
+
+    def test_unparseable_datetime_is_left_as_string(self):
+        assert serialization.decode_profile(b'{"created_at": "yesterday"}') == {'created_at': 'yesterday'}
+
+
+class TestDataStoreCompatibility:
+    def test_reads_profile_written_by_old_format(self, tmp_path):
+        profile = _rand_profile(random.Random(3))
+        with open(tmp_path / 'old.json', 'w') as f:
+            json.dump(_legacy_prepare(profile), f, indent=2)
+        with mock.patch.object(config, 'ENABLE_DATA_ENCRYPTION', False):
+            loaded = DataStore(data_dir=str(tmp_path)).load_user_data('old')
+        assert loaded == _legacy_restore(_legacy_prepare(profile))
+
+    @pytest.mark.parametrize('encrypted', [False, True])
+    def test_store_round_trip(self, tmp_path, encrypted):
+        profile = _rand_profile(random.Random(4))
+        expected = _legacy_restore(_legacy_prepare(profile))
+        with mock.patch.object(config, 'ENABLE_DATA_ENCRYPTION', encrypted):
+            store = DataStore(data_dir=str(tmp_path))
+            store.save_user_data('u', profile)
+            assert store.load_user_data('u') == expected  # cached
+            assert DataStore(data_dir=str(tmp_path)).load_user_data('u') == expected
+            assert DataStore(data_dir=str(tmp_path)).load_user_section(
+                'u', 'chat_history') == expected['chat_history']
+
+    def test_cached_loads_are_independent(self, tmp_path):
+        store = DataStore(data_dir=str(tmp_path))
+        store.save_user_data('u', {'chat_history': [{'role': 'user', 'content': 'hi'}]})
+        first = store.load_user_data('u')
+        first['chat_history'].append({'role': 'user', 'content': 'mutated'})
+        assert len(store.load_user_data('u')['chat_history']) == 1
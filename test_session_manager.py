@@ -207,3 +207,73 @@ class TestSurvivalScenarios:
         loaded = mgr2.load_session(uid)
         assert loaded is not None
         assert loaded["chat_history"] == [{"role": "user", "content": "persist"}]
+
+
+# ------------------------------------------------------------------
+# Write-back cache and atomic writes
+# ------------------------------------------------------------------
+
+class TestWriteBack:
+    def test_save_session_loads_profile_once(self, mgr, seeded_user, monkeypatch):
+        mgr.create_session(seeded_user)
+        calls = []
+        original = mgr.data_store.load_user_data
+        monkeypatch.setattr(mgr.data_store, "load_user_data",
+                            lambda uid: calls.append(uid) or original(uid))
+        mgr.save_session(seeded_user, chat_history=[{"role": "user", "content": "x"}])
+        assert calls == [seeded_user]
+
+    def test_saves_are_coalesced_until_flush(self, tmp_path):
+        ds = DataStore(data_dir=str(tmp_path), write_back_ms=60_000)
+        mgr = SessionManager(ds)
+        uid = "wb_user"
+        mgr.create_session(uid)
+        for i in range(5):
+            mgr.save_session(uid, chat_history=[{"role": "user", "content": str(i)}])
+        # Nothing on disk yet, but reads through the same store see the data
+        assert not ds._profile_file(uid).exists()
+        assert ds.user_exists(uid)
+        assert mgr.load_session(uid)["chat_history"][0]["content"] == "4"
+
+        mgr.end_session(uid)
+        fresh = SessionManager(DataStore(data_dir=str(tmp_path)))
+        assert fresh.load_session(uid)["chat_history"][0]["content"] == "4"
+
+    def test_timer_flushes_dirty_profiles(self, tmp_path):
+        import time
+        ds = DataStore(data_dir=str(tmp_path), write_back_ms=20)
+        ds.save_user_data("timer_user", {"user_id": "timer_user"})
+        deadline = time.monotonic() + 2.0
+        while not ds._profile_file("timer_user").exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert ds._profile_file("timer_user").exists()
+        assert ds.flush() == 0
+
+    def test_cached_load_returns_independent_copy(self, tmp_store, seeded_user):
+        first = tmp_store.load_user_data(seeded_user)
+        first["injected"] = True
+        assert "injected" not in tmp_store.load_user_data(seeded_user)
+
+    def test_external_write_invalidates_cache(self, tmp_path):
+        ds1 = DataStore(data_dir=str(tmp_path))
+        ds2 = DataStore(data_dir=str(tmp_path))
+        ds1.save_user_data("shared", {"user_id": "shared", "v": 1})
+        assert ds2.load_user_data("shared")["v"] == 1
+        ds1.save_user_data("shared", {"user_id": "shared", "v": 2, "pad": "x"})
+        assert ds2.load_user_data("shared")["v"] == 2
+
+    def test_failed_write_leaves_previous_file_intact(self, tmp_store, seeded_user, monkeypatch):
+        # A second store has no record of the file's contents, so it must
+        # rewrite (temp file + rename) rather than append.
+        tmp_store = DataStore(data_dir=str(tmp_store.data_dir))
+        user_file = tmp_store._profile_file(seeded_user)
+        before = user_file.read_bytes()
+
+        def boom(*args, **kwargs):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(os, "replace", boom)
+        with pytest.raises(OSError):
+            tmp_store.save_user_data(seeded_user, {"user_id": seeded_user})
+        assert user_file.read_bytes() == before
+        assert not [p for p in os.listdir(tmp_store.data_dir) if p.endswith(".tmp")]
@@ -0,0 +1,197 @@
+"""Tests for sqlite_store.py – SQLite storage engine with the DataStore API.
+
+Validates profile round-trips, partial section reads, per-row encryption,
+session logs, the JSON → SQLite migrator, the open_data_store factory and
+the DataStore.list_users fix for backup / session files.
+"""
+
+import json
+import os
+import sqlite3
+import sys
+from datetime import datetime
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from data_store import DataStore, open_data_store
+from session_manager import SessionManager
+from sqlite_store import SQLiteDataStore, migrate_json_to_sqlite
+from user_profile import UserProfile
+
+
+@pytest.fixture()
+def store(tmp_path):
+    s = SQLiteDataStore(data_dir=str(tmp_path))
+    yield s
+    s.close()
+
+
+def _profile(uid, messages=0):
+    profile = UserProfile(uid)
+    profile.set_password("TestPass1!")
+    profile.save_chat_history(
+        [{"role": "user", "content": f"hello {i}"} for i in range(messages)])
+    return profile.get_profile()
+
+
+class TestProfiles:
+    def test_round_trip_restores_datetimes(self, store):
+        store.save_user_data("alice", _profile("alice", messages=2))
+        data = store.load_user_data("alice")
+        assert data["user_id"] == "alice"
+        assert isinstance(data["created_at"], datetime)
+        assert [m["content"] for m in data["chat_history"]] == ["hello 0", "hello 1"]
+
+    def test_missing_user(self, store):
+        assert store.load_user_data("nobody") is None
+        assert not store.user_exists("nobody")
+
+    def test_list_users_and_delete(self, store):
+        for uid in ("bob", "alice"):
+            store.save_user_data(uid, _profile(uid))
+        assert store.list_users() == ["alice", "bob"]
+        assert store.delete_user_data("bob") is True
+        assert store.list_users() == ["alice"]
+        assert store.delete_user_data("bob") is False
+
+    def test_load_user_section_is_partial(self, store):
+        store.save_user_data("carol", _profile("carol", messages=3))
+        history = store.load_user_section("carol", "chat_history")
+        assert len(history) == 3
+        assert store.load_user_section("nobody", "chat_history") is None
+        with pytest.raises(ValueError):
+            store.load_user_section("carol", "password_hash")
+
+    def test_unchanged_sections_are_not_rewritten(self, store):
+        data = _profile("dave", messages=5)
+        store.save_user_data("dave", data)
+        before = store._conn.execute(
+            "SELECT data FROM profile_sections WHERE user_id='dave' AND section='chat_history'"
+        ).fetchone()[0]
+        data["mood_streak"] = 3
+        store.save_user_data("dave", data)
+        after = store._conn.execute(
+            "SELECT data FROM profile_sections WHERE user_id='dave' AND section='chat_history'"
+        ).fetchone()[0]
+        # Fernet tokens differ on every encryption, so equality means no rewrite
+        assert before == after
+        assert store.load_user_data("dave")["mood_streak"] == 3
+
+    def test_rows_are_encrypted_at_rest(self, store):
+        store.save_user_data("erin", _profile("erin", messages=1))
+        db = sqlite3.connect(str(store.db_path))
+        blobs = [bytes(r[0]) for r in db.execute(
+            "SELECT data FROM profiles UNION ALL SELECT data FROM profile_sections")]
+        db.close()
+        assert blobs and all(b"hello 0" not in b and b"erin" not in b for b in blobs)
+
+    def test_key_rotation(self, store, tmp_path):
+        store.save_user_data("rita", _profile("rita", messages=2))
+        store.save_session_log("rita", {"message": "x"})
+        old_key = store.encryption_key
+        assert store.rotate_encryption_key() >= 3
+        store.close()
+        fresh = SQLiteDataStore(data_dir=str(tmp_path))
+        try:
+            assert len(fresh.load_user_data("rita")["chat_history"]) == 2
+        finally:
+            fresh.close()
+        stale = SQLiteDataStore(data_dir=str(tmp_path), encryption_key=old_key)
+        try:
+            with pytest.raises(ValueError):
+                stale.load_user_data("rita")
+        finally:
+            stale.close()
+
+    def test_wal_mode(self, store):
+        assert store._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_session_manager_round_trip(self, store):
+        mgr = SessionManager(store)
+        mgr.create_session("frank")
+        mgr.save_session("frank", chat_history=[{"role": "user", "content": "hi"}])
+        assert mgr.load_session("frank")["chat_history"] == [{"role": "user", "content": "hi"}]
+
+
+class TestSessionLog:
+    def test_append_and_iterate(self, store):
+        for i in range(5):
+            store.save_session_log("gina", {"message": f"m{i}", "timestamp": datetime(2026, 1, 1)})
+        entries = list(store.iter_session_log("gina", batch_size=2))
+        assert [e["message"] for e in entries] == ["m0", "m1", "m2", "m3", "m4"]
+        assert entries[0]["timestamp"] == "2026-01-01T00:00:00"
+
+    def test_delete_removes_session_log(self, store):
+        store.save_user_data("hank", _profile("hank"))
+        store.save_session_log("hank", {"message": "x"})
+        store.delete_user_data("hank")
+        assert list(store.iter_session_log("hank")) == []
+
+
+class TestMigration:
+    def test_migrates_profiles_and_session_logs(self, tmp_path):
+        json_store = DataStore(data_dir=str(tmp_path))
+        json_store.save_user_data("ivy", _profile("ivy", messages=2))
+        json_store.save_user_data("jack", _profile("jack"))
+        json_store.create_backup("ivy")
+        json_store.save_session_log("ivy", {"message": "new"})
+        with open(tmp_path / "anonymous_session_data.json", "w") as f:
+            json.dump([{"message": "legacy"}], f)
+
+        result = migrate_json_to_sqlite(str(tmp_path))
+        assert result == {"users": 2, "session_entries": 2}
+
+        store = SQLiteDataStore(data_dir=str(tmp_path))
+        try:
+            assert store.list_users() == ["ivy", "jack"]
+            assert len(store.load_user_data("ivy")["chat_history"]) == 2
+            assert [e["message"] for e in store.iter_session_log("anonymous")] == ["legacy"]
+        finally:
+            store.close()
+        # Source files are left untouched
+        assert (tmp_path / "anonymous_session_data.json").exists()
+
+    def test_rerun_is_idempotent_and_keeps_timestamps(self, tmp_path):
+        json_store = DataStore(data_dir=str(tmp_path))
+        json_store.save_user_data("lena", _profile("lena"))
+        json_store.save_session_log("lena", {"message": "old", "timestamp": "2020-03-04T05:06:07"})
+
+        assert migrate_json_to_sqlite(str(tmp_path)) == {"users": 1, "session_entries": 1}
+        assert migrate_json_to_sqlite(str(tmp_path)) == {"users": 0, "session_entries": 0}
+
+        store = SQLiteDataStore(data_dir=str(tmp_path))
+        try:
+            assert [e["message"] for e in store.iter_session_log("lena")] == ["old"]
+            created = store._conn.execute(
+                "SELECT created_at FROM session_log WHERE user_id = 'lena'").fetchall()
+            assert created == [("2020-03-04T05:06:07",)]
+        finally:
+            store.close()
+
+
+class TestJsonEngine:
+    def test_list_users_skips_backups_and_session_files(self, tmp_path):
+        ds = DataStore(data_dir=str(tmp_path))
+        ds.save_user_data("kim", _profile("kim"))
+        ds.create_backup("kim")
+        (tmp_path / "kim_session_data.json").write_text("[]")
+        assert ds.list_users() == ["kim"]
+
+
+class TestFactory:
+    def test_default_engine_is_json(self, tmp_path):
+        store = open_data_store(str(tmp_path))
+        assert type(store) is DataStore
+
+    def test_sqlite_engine(self, tmp_path):
+        store = open_data_store(str(tmp_path), engine="sqlite")
+        try:
+            assert isinstance(store, SQLiteDataStore)
+        finally:
+            store.close()
+
+    def test_unknown_engine(self, tmp_path):
+        with pytest.raises(ValueError):
+            open_data_store(str(tmp_path), engine="redis")
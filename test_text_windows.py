@@ -0,0 +1,148 @@
+"""Tests for text_windows.py – token windows and length-bucketed batching.
+
+Uses stand-in pipelines so no transformers model is downloaded.
+"""
+
+import os
+import re
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import text_windows
+from emotion_analyzer import ContextualCrisisAdapter, MLEmotionAdapter
+from models.emotion_transformer import EmotionTransformer
+
+FILLER = "Today I went to work and came home and cooked dinner as usual. " * 40
+DISCLOSURE = "I have decided I want to end my life tonight."
+
+
+class FastTokenizer:
+    """Whitespace tokenizer exposing a fast tokenizer's offset mapping."""
+
+    is_fast = True
+
+    def __call__(self, text, add_special_tokens=False, return_offsets_mapping=False):
+        return {'offset_mapping': [m.span() for m in re.finditer(r"\S+", text)]}
+
+
+class EmotionPipeline:
+    """Emotion pipeline stand-in: sadness if the window mentions 'cried'."""
+
+    tokenizer = FastTokenizer()
+
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, inputs, truncation=False, batch_size=None):
+        self.batches.append(list(inputs))
+        return [[{'label': 'sadness', 'score': 0.9 if 'cried' in text else 0.1},
+                 {'label': 'neutral', 'score': 0.1 if 'cried' in text else 0.9}]
+                for text in inputs]
+
+
+class CrisisPipeline:
+    """Zero-shot pipeline stand-in: flags windows containing 'end my life'."""
+
+    tokenizer = FastTokenizer()
+
+    def __init__(self):
+        self.windows = []
+
+    def __call__(self, inputs, labels, multi_label=False, batch_size=None):
+        self.windows.extend(inputs)
+        out = []
+        for text in inputs:
+            crisis = 'end my life' in text
+            out.append({'labels': ['suicidal ideation', 'severe distress', 'safe statement'],
+                        'scores': [0.95 if crisis else 0.02, 0.3 if crisis else 0.05,
+                                   0.05 if crisis else 0.9]})
+        return out
+
+
+class TestSlidingWindows:
+    def test_short_text_is_one_window(self):
+        assert text_windows.sliding_windows("I feel fine", max_tokens=10) == ["I feel fine"]
+
+    def test_windows_respect_budget_overlap_and_reach_the_end(self):
+        words = [f"w{i}" for i in range(100)]
+        windows = text_windows.sliding_windows(" ".join(words), FastTokenizer(),
+                                               max_tokens=30, overlap=5)
+        assert all(len(w.split()) <= 30 for w in windows)
+        assert windows[0].split()[-5:] == windows[1].split()[:5]
+        assert windows[0].startswith("w0 ") and windows[-1].endswith("w99")
+
+    def test_non_ascii_text_counted_by_tokens_not_characters(self):
+        tamil = "நான் மிகவும் சோகமாக இருக்கிறேன் " * 20
+        windows = text_windows.sliding_windows(tamil, max_tokens=len(tamil))
+        assert windows == [tamil]
+        assert len(text_windows.sliding_windows(tamil, max_tokens=20, overlap=0)) > 1
+
+
+class TestBatching:
+    def test_length_buckets_group_similar_lengths(self):
+        texts = ["a" * n for n in (50, 1, 30, 2, 40, 3)]
+        buckets = text_windows.length_buckets(texts, batch_size=2)
+        assert [[len(texts[i]) for i in b] for b in buckets] == [[1, 2], [3, 30], [40, 50]]
+
+    def test_run_windowed_returns_window_outputs_per_text(self):
+        texts = ["short", " ".join(f"w{i}" for i in range(50)), "tiny"]
+        per_text = text_windows.run_windowed(texts, lambda batch: [len(w) for w in batch],
+                                             max_tokens=20, overlap=0, batch_size=2)
+        assert len(per_text) == 3
+        assert per_text[0] == [5] and per_text[2] == [4] and len(per_text[1]) == 3
+
+    def test_aggregation(self):
+        windows = [{'a': 0.2, 'b': 0.8}, {'a': 0.6}]
+        assert text_windows.mean_scores(windows) == {'a': 0.4, 'b': 0.4}
+        assert text_windows.max_scores(windows) == {'a': 0.6, 'b': 0.8}
+
+
+class TestAdapters:
+    def test_crisis_disclosure_at_end_of_long_text_is_kept(self):
+        adapter = ContextualCrisisAdapter()
+        adapter._pipeline = pipeline = CrisisPipeline()
+        text = FILLER + DISCLOSURE
+        assert DISCLOSURE not in text[:512]
+        scores = adapter.classify(text)
+        assert scores['suicidal_ideation_probability'] == 0.95
+        assert scores['crisis_probability'] == 0.95
+        assert scores['safety_probability'] == 0.05
+        assert len(pipeline.windows) > 1
+
+    def test_emotion_scores_are_averaged_over_windows(self):
+        adapter = MLEmotionAdapter()
+        adapter._pipeline = EmotionPipeline()
+        text = "I cried all night. " + FILLER
+        scores = adapter.classify(text)
+        assert 0.1 < scores['sadness'] < 0.9
+        assert abs(scores['sadness'] + scores['neutral'] - 1.0) < 1e-9
+
+    def test_classify_batch_buckets_windows_by_length(self):
+        adapter = MLEmotionAdapter()
+        adapter._pipeline = pipeline = EmotionPipeline()
+        texts = ["I cried", FILLER, "ok", "I cried a lot today"]
+        results = adapter.classify_batch(texts, batch_size=2)
+        assert len(results) == 4
+        assert results[0]['sadness'] == 0.9 and results[2]['neutral'] == 0.9
+        lengths = [[len(w) for w in batch] for batch in pipeline.batches]
+        flat = [n for batch in lengths for n in batch]
+        assert flat == sorted(flat) and all(len(b) <= 2 for b in lengths)
+
+    def test_unavailable_adapters_return_none_per_text(self, monkeypatch):
+        import config
+        monkeypatch.setattr(config, 'CONTEXTUAL_CRISIS_MODEL_ENABLED', False)
+        assert ContextualCrisisAdapter().classify_batch(["a", "b"]) == [None, None]
+
+    def test_emotion_transformer_batch(self):
+        et = EmotionTransformer()
+        et._load_attempted, et._available, et._pipeline = True, True, EmotionPipeline()
+        results = et.classify_batch(["I cried", "all fine"])
+        assert results[0]['sadness'] > results[0]['neutral']
+        assert results[1]['neutral'] > results[1]['sadness']
+        assert all(abs(sum(r.values()) - 1.0) < 1e-3 for r in results)
+
+    def test_emotion_transformer_batch_falls_back_to_keywords(self):
+        et = EmotionTransformer()
+        et._load_attempted, et._available = True, False
+        assert et.classify_batch(["I am so happy"]) == [et.classify_keywords_only("I am so happy")]
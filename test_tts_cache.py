@@ -0,0 +1,97 @@
+"""Tests for tts_cache.py – content-addressed TTS clip cache.
+
+Uses a local stand-in engine so nothing is sent to a TTS service.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import tts_cache
+from tts_cache import TTSCache
+from voice_handler import VoiceHandler
+
+
+class FakeEngine:
+    name = 'fake'
+
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+
+    def synthesize(self, text, lang):
+        self.calls.append((text, lang))
+        if self.fail:
+            raise RuntimeError("offline")
+        return f"{lang}:{text}".encode('utf-8')
+
+
+def _handler(tmp_path, **cache_kwargs):
+    engine = FakeEngine()
+    return VoiceHandler(tts_engine=engine, cache=TTSCache(tmp_path, **cache_kwargs)), engine
+
+
+class TestTextToSpeechCache:
+    def test_repeated_text_synthesized_once(self, tmp_path):
+        vh, engine = _handler(tmp_path)
+        first = vh.text_to_speech("I'm **here**  for you.\n", 'english')
+        again = vh.text_to_speech("I'm here for you.", 'english')
+        assert first == again == b"en:I'm here for you."
+        assert engine.calls == [("I'm here for you.", 'en')]
+
+    def test_key_includes_language_and_engine(self, tmp_path):
+        vh, engine = _handler(tmp_path)
+        vh.text_to_speech("Hello", 'english')
+        vh.text_to_speech("Hello", 'tamil')
+        vh.text_to_speech("Hello", 'bilingual')  # same 'ta' code as tamil
+        assert engine.calls == [("Hello", 'en'), ("Hello", 'ta')]
+        other = FakeEngine()
+        other.name = 'other'
+        VoiceHandler(tts_engine=other, cache=vh.tts_cache).text_to_speech("Hello", 'english')
+        assert len(other.calls) == 1
+
+    def test_disk_tier_survives_restart(self, tmp_path):
+        vh, _ = _handler(tmp_path)
+        vh.text_to_speech("Take a slow breath.", 'english')
+        vh2, engine2 = _handler(tmp_path)
+        assert vh2.is_tts_cached("Take a slow breath.")
+        assert vh2.text_to_speech("Take a slow breath.") == b"en:Take a slow breath."
+        assert engine2.calls == []
+
+    def test_failures_not_cached(self, tmp_path):
+        vh = VoiceHandler(tts_engine=FakeEngine(fail=True), cache=TTSCache(tmp_path))
+        assert vh.text_to_speech("Hello") is None
+        assert len(vh.tts_cache) == 0
+
+
+class TestTTSCacheBounds:
+    def test_disk_size_bound_evicts_least_recent(self, tmp_path):
+        cache = TTSCache(tmp_path, max_bytes=25, memory_items=1)
+        cache.put('a' * 64, b'x' * 10)
+        cache.put('b' * 64, b'x' * 10)
+        assert cache.get('a' * 64) is not None  # 'b' is now least recent
+        cache.put('c' * 64, b'x' * 10)
+        assert 'b' * 64 not in cache and cache.get('b' * 64) is None
+        assert cache.disk_bytes == 20 and len(cache) == 2
+        assert len(list(tmp_path.glob('*/*.mp3'))) == 2
+
+    def test_memory_tier_bounded(self, tmp_path):
+        cache = TTSCache(tmp_path, memory_items=2)
+        for ch in 'abc':
+            cache.put(ch * 64, ch.encode())
+        assert list(cache._memory) == ['b' * 64, 'c' * 64]
+        assert cache.get('a' * 64) == b'a'  # served from disk
+
+
+class TestPrewarm:
+    def test_prewarm_static_templates(self, tmp_path):
+        vh, engine = _handler(tmp_path)
+        pairs = tts_cache.static_templates()
+        assert any(lang == 'tamil' for _, lang in pairs)
+        report = tts_cache.prewarm(vh, pairs)
+        assert report['failed'] == 0 and report['synthesized'] == len(engine.calls)
+        assert report['synthesized'] + report['cached'] == len(pairs)
+
+        again = tts_cache.prewarm(vh, pairs)
+        assert again['synthesized'] == 0 and again['cached'] == len(pairs)
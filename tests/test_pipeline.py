@@ -6,6 +6,8 @@ Validates:
 - Output structure (emotion, pattern, forecasting, alert, response)
 """
 
+from collections.abc import Mapping
+
 from agent_pipeline import (
     WellnessAgentPipeline,
     EmotionAnalysisAgent,
@@ -24,7 +26,7 @@ def test_emotion_analysis_agent_runs():
     """EmotionAnalysisAgent must classify a message."""
     agent = EmotionAnalysisAgent()
     result = agent.run("I feel anxious about work tomorrow.")
-    assert isinstance(result, dict)
+    assert isinstance(result, Mapping)
     assert 'primary_emotion' in result
 
 
@@ -89,7 +91,7 @@ def test_pipeline_output_has_emotion():
     pipeline = WellnessAgentPipeline()
     result = pipeline.process_turn("I feel anxious about work tomorrow.")
     assert 'emotion' in result
-    assert isinstance(result['emotion'], dict)
+    assert isinstance(result['emotion'], Mapping)
     assert 'primary_emotion' in result['emotion']
 
 
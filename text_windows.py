@@ -0,0 +1,108 @@
+"""
+Token-aware windowing and length bucketing for transformer inputs.
+
+The emotion (DistilRoBERTa) and crisis (BART-MNLI) models read a bounded
+number of word-piece tokens.  Rather than cutting a message at a character
+count — which drops the end of a long journal entry, crisis disclosure
+included — long texts are split into overlapping windows of at most
+``max_tokens`` tokens.  Each window is classified and the caller aggregates
+the per-window scores: the mean for emotions, the max for crisis, so a
+disclosure in any one paragraph is kept.
+
+For bulk scoring, :func:`run_windowed` flattens the windows of many texts,
+orders them by length and feeds them to the model in batches of similar
+length, so short messages are not padded to the longest one in a batch.
+
+Token counts come from the model's tokenizer (offset mapping of a fast
+tokenizer) when one is given; otherwise words and punctuation marks are
+counted, an approximation callers back up with ``truncation=True``.
+"""
+
+import re
+
+import config
+
+_WORD_RE = re.compile(r"\w+|[^\w\s]")
+
+
+def token_spans(text, tokenizer=None):
+    """Character ``(start, end)`` span of every token of *text*."""
+    if tokenizer is not None and getattr(tokenizer, 'is_fast', False):
+        encoding = tokenizer(text, add_special_tokens=False, return_offsets_mapping=True)
+        return [tuple(span) for span in encoding['offset_mapping']]
+    return [m.span() for m in _WORD_RE.finditer(text)]
+
+
+def sliding_windows(text, tokenizer=None, max_tokens=None, overlap=None):
+    """Split *text* into windows of at most *max_tokens* tokens.
+
+    Consecutive windows share *overlap* tokens so a phrase crossing a window
+    boundary is seen whole by one of them.  Text that fits is returned
+    unchanged as a single window.
+    """
+    max_tokens = max_tokens or config.TRANSFORMER_WINDOW_TOKENS
+    overlap = config.TRANSFORMER_WINDOW_OVERLAP if overlap is None else overlap
+    # Every token of ASCII text covers at least one character
+    if text.isascii() and len(text) <= max_tokens:
+        return [text]
+    spans = token_spans(text, tokenizer)
+    if len(spans) <= max_tokens:
+        return [text]
+    step = max(1, max_tokens - overlap)
+    windows = []
+    for start in range(0, len(spans), step):
+        chunk = spans[start:start + max_tokens]
+        windows.append(text[chunk[0][0]:chunk[-1][1]])
+        if start + max_tokens >= len(spans):
+            break
+    return windows
+
+
+def length_buckets(texts, batch_size=None):
+    """Indices of *texts* in batches of similar length, shortest first."""
+    batch_size = batch_size or config.TRANSFORMER_BATCH_SIZE
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+    return [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
+
+
+def run_windowed(texts, call, tokenizer=None, max_tokens=None, overlap=None, batch_size=None):
+    """Run *call* over the token windows of *texts* in length-bucketed batches.
+
+    *call* ``(list[str]) -> list`` classifies one batch of windows.  Returns,
+    for each text, the list of *call* outputs for its windows in text order.
+    """
+    owners, windows = [], []
+    for i, text in enumerate(texts):
+        for window in sliding_windows(text, tokenizer, max_tokens, overlap):
+            owners.append(i)
+            windows.append(window)
+
+    outputs = [None] * len(windows)
+    for bucket in length_buckets(windows, batch_size):
+        for k, output in zip(bucket, call([windows[k] for k in bucket])):
+            outputs[k] = output
+
+    per_text = [[] for _ in texts]
+    for owner, output in zip(owners, outputs):
+        per_text[owner].append(output)
+    return per_text
+
+
+def mean_scores(score_dicts):
+    """Per-label mean of *score_dicts* (a label missing from a window counts as 0)."""
+    totals = {}
+    for scores in score_dicts:
+        for label, value in scores.items():
+            totals[label] = totals.get(label, 0.0) + value
+    n = len(score_dicts)
+    return {label: total / n for label, total in totals.items()}
+
+
+def max_scores(score_dicts):
+    """Per-label max of *score_dicts*."""
+    merged = {}
+    for scores in score_dicts:
+        for label, value in scores.items():
+            if value > merged.get(label, float('-inf')):
+                merged[label] = value
+    return merged
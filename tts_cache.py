@@ -0,0 +1,230 @@
+"""
+Content-addressed cache for synthesized speech.
+
+Audio is keyed on ``sha256(engine, language code, normalized text)``, so the
+same reply spoken twice — fixed greetings, crisis messages, template
+responses — is synthesized once and then served locally without another
+round-trip to the TTS service.
+
+Two tiers:
+
+  - an in-memory LRU of the most recently used clips
+    (``TTS_CACHE_MEMORY_ITEMS``), and
+  - a disk store under ``<data_dir>/tts_cache`` (``TTS_CACHE_DIR``) bounded
+    to ``TTS_CACHE_MAX_BYTES``; least recently used files are deleted once
+    the bound is exceeded.
+
+Failed syntheses are never cached.  ``python tts_cache.py`` pre-warms the
+cache with every static template (greetings, crisis and joy responses,
+bilingual/Tamil templates) so the first user to hear them does not pay
+the synthesis latency.
+"""
+
+import argparse
+import hashlib
+import logging
+import os
+import re
+import tempfile
+import threading
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+
+import config
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form of *text* for cache keys: NFC, whitespace collapsed."""
+    return _WHITESPACE.sub(' ', unicodedata.normalize('NFC', text)).strip()
+
+
+def cache_key(text: str, lang: str, engine: str) -> str:
+    """Content address of one clip (*text* should already be normalized)."""
+    return hashlib.sha256(f"{engine}\0{lang}\0{text}".encode('utf-8')).hexdigest()
+
+
+class TTSCache:
+    """In-memory LRU in front of a size-bounded on-disk clip store. Thread-safe."""
+
+    SUFFIX = '.mp3'
+
+    def __init__(self, cache_dir=None, max_bytes=None, memory_items=None):
+        if cache_dir is None:
+            cache_dir = config.TTS_CACHE_DIR or Path.home() / '.wellness_buddy' / 'tts_cache'
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = config.TTS_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.memory_items = config.TTS_CACHE_MEMORY_ITEMS if memory_items is None else memory_items
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()   # key → bytes, most recent last
+        self._disk = OrderedDict()     # key → size, least recently used first
+        self._disk_bytes = 0
+        self.hits = self.misses = 0
+        self._load_index()
+
+    def _load_index(self):
+        entries = []
+        for path in self.cache_dir.glob(f'*/*{self.SUFFIX}'):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, path.stem, st.st_size))
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_bytes += size
+
+    def _path(self, key):
+        return self.cache_dir / key[:2] / f"{key}{self.SUFFIX}"
+
+    # ------------------------------------------------------------------
+    # Lookup / store
+    # ------------------------------------------------------------------
+
+    def get(self, key):
+        """Cached audio for *key*, or ``None``."""
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                if key in self._disk:
+                    self._disk.move_to_end(key)
+                self.hits += 1
+                return data
+            if key not in self._disk:
+                self.misses += 1
+                return None
+            path = self._path(key)
+            try:
+                data = path.read_bytes()
+                os.utime(path)  # keeps LRU order across restarts
+            except OSError:
+                self._forget(key)
+                self.misses += 1
+                return None
+            self._disk.move_to_end(key)
+            self._remember(key, data)
+            self.hits += 1
+            return data
+
+    def put(self, key, data):
+        """Store *data* under *key* in both tiers."""
+        if not data:
+            return
+        with self._lock:
+            self._remember(key, data)
+            if key in self._disk:
+                self._disk.move_to_end(key)
+                return
+            path = self._path(key)
+            tmp_name = None
+            try:
+                path.parent.mkdir(exist_ok=True)
+                fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{key[:8]}.", suffix='.tmp')
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_name, path)
+            except OSError as exc:
+                logger.warning("TTS cache write failed (%s): %s", path, exc)
+                if tmp_name is not None:
+                    Path(tmp_name).unlink(missing_ok=True)
+                return
+            self._disk[key] = len(data)
+            self._disk_bytes += len(data)
+            self._evict_disk()
+
+    def _remember(self, key, data):
+        self._memory[key] = data
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def _forget(self, key):
+        self._disk_bytes -= self._disk.pop(key, 0)
+
+    def _evict_disk(self):
+        while self._disk_bytes > self.max_bytes and len(self._disk) > 1:
+            key, _ = next(iter(self._disk.items()))
+            self._forget(key)
+            self._memory.pop(key, None)
+            self._path(key).unlink(missing_ok=True)
+
+    # ------------------------------------------------------------------
+    # Stats
+    # ------------------------------------------------------------------
+
+    @property
+    def disk_bytes(self):
+        return self._disk_bytes
+
+    def __len__(self):
+        return len(self._disk)
+
+    def __contains__(self, key):
+        return key in self._memory or key in self._disk
+
+
+# ---------------------------------------------------------------------------
+# Pre-warming
+# ---------------------------------------------------------------------------
+
+def static_templates():
+    """``(text, language_preference)`` pairs for every fixed reply the app speaks."""
+    import conversation_handler
+    from language_handler import BILINGUAL_RESPONSES, TAMIL_RESPONSES, LanguageHandler
+
+    pairs = [(text, 'english') for text in config.GREETING_MESSAGES]
+    lh = LanguageHandler()
+    for lang in ('tamil', 'bilingual'):
+        pairs.append((lh.get_greeting(lang), lang))
+    for emotion in ('crisis', 'joy'):
+        for templates in conversation_handler._RESPONSES[emotion].values():
+            pairs.extend((text, 'english') for text in templates)
+    for templates in BILINGUAL_RESPONSES.values():
+        pairs.extend((text, 'bilingual') for text in templates)
+    for templates in TAMIL_RESPONSES.values():
+        pairs.extend((text, 'tamil') for text in templates)
+    return pairs
+
+
+def prewarm(voice_handler, pairs=None):
+    """Synthesize every ``(text, language_preference)`` pair not yet cached.
+
+    Returns ``{'templates', 'synthesized', 'cached', 'failed'}`` counts.
+    """
+    pairs = static_templates() if pairs is None else pairs
+    report = {'templates': len(pairs), 'synthesized': 0, 'cached': 0, 'failed': 0}
+    for text, lang in pairs:
+        if voice_handler.is_tts_cached(text, lang):
+            report['cached'] += 1
+        elif voice_handler.text_to_speech(text, lang):
+            report['synthesized'] += 1
+        else:
+            report['failed'] += 1
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-warm the TTS cache with all static templates.")
+    parser.add_argument('--cache-dir', default=None, help="Cache directory (default: TTS_CACHE_DIR)")
+    args = parser.parse_args(argv)
+
+    from voice_handler import VoiceHandler
+
+    handler = VoiceHandler(cache=TTSCache(args.cache_dir))
+    if not handler.tts_available:
+        print("No TTS engine available (install gTTS).")
+        return 1
+    report = prewarm(handler)
+    print(f"TTS cache pre-warm: {report} — {len(handler.tts_cache)} clips, "
+          f"{handler.tts_cache.disk_bytes} bytes in {handler.tts_cache.cache_dir}")
+    return 0 if not report['failed'] else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
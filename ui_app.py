@@ -10,11 +10,9 @@ import streamlit as st
 import logging
 import time
 from datetime import datetime
-from wellness_buddy import WellnessBuddy
+from typing import TYPE_CHECKING
 from user_profile import UserProfile
-from data_store import DataStore
-from prediction_agent import PredictionAgent
-from voice_handler import VoiceHandler
+from data_store import open_data_store
 from auth_manager import AuthManager
 from session_manager import SessionManager
 from emotion_predictor import predict_next_emotion, detect_trend
@@ -22,6 +20,11 @@ from risk_escalation import detect_escalation, escalation_score
 import config
 import os
 
+# The AI stack (WellnessBuddy, voice, prediction) is imported on first use so
+# the login page renders without loading it.
+if TYPE_CHECKING:
+    from voice_handler import VoiceHandler
+
 # Modular UI components
 from ui.theme import get_theme_css
 from ui.charts import (
@@ -59,6 +62,10 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Profile saves happen on every chat message; batch them to disk at most
+# this often (see DataStore write-back cache).
+_PROFILE_WRITE_BACK_MS = 500
+
 # -----------------------------------------------------------------------
 # Session state initialisation
 # -----------------------------------------------------------------------
@@ -184,9 +191,14 @@ def _count_emotions_from_history(history: list) -> dict[str, int]:
 
 def init_buddy():
     """Initialize wellness buddy instance"""
+    from wellness_buddy import WellnessBuddy
+    from voice_handler import VoiceHandler
+
     if st.session_state.buddy is None:
         st.session_state.buddy = WellnessBuddy()
-        st.session_state.buddy.data_store = DataStore()
+        # Coalesce the per-message profile saves from _persist_chat_history;
+        # the buddy flushes on session end.
+        st.session_state.buddy.data_store = open_data_store(write_back_ms=_PROFILE_WRITE_BACK_MS)
     if st.session_state.voice_handler is None:
         st.session_state.voice_handler = VoiceHandler()
     if st.session_state.get('session_mgr') is None:
@@ -283,7 +295,7 @@ def _render_login_form():
             st.warning("Please enter both username and password.")
             return
 
-        data_store = DataStore()
+        data_store = open_data_store()
         if not data_store.user_exists(username):
             st.error("Invalid username or password.")
             st.session_state.failed_attempts += 1
@@ -416,7 +428,7 @@ def create_new_profile():
                 return
 
             # Check if username already exists
-            data_store = DataStore()
+            data_store = open_data_store()
             if data_store.user_exists(username):
                 st.error("Username already taken. Please choose a different one.")
                 return
@@ -972,6 +984,7 @@ def render_trends_tab(show_header: bool = True):
                 hist_data.append(avg)
 
         if hist_data:
+            from prediction_agent import PredictionAgent
             predictor = PredictionAgent()
             forecast = predictor.predict_next_sentiment(hist_data)
             st.plotly_chart(
@@ -1152,6 +1165,7 @@ def render_risk_tab():
         st.plotly_chart(create_risk_history_chart(risk_hist), width="stretch")
 
         # Risk escalation forecast
+        from prediction_agent import PredictionAgent
         predictor = PredictionAgent()
         esc = predictor.predict_risk_escalation(risk_hist)
         if esc:
@@ -1220,6 +1234,7 @@ def render_weekly_report_tab(show_header: bool = True):
 
             # Forecasted mood trend
             if len(sentiments) >= 3:
+                from prediction_agent import PredictionAgent
                 predictor = PredictionAgent()
                 forecast = predictor.predict_next_sentiment(sentiments)
                 if forecast:
@@ -342,12 +342,14 @@ class UserProfile:
             'emotion_data': emotion_data,
             'session_summary': session_summary
         }
-        self.profile_data['emotional_history'].append(snapshot)
+        history = self.profile_data['emotional_history']
+        history.append(snapshot)
         
-        # Keep last year of data (365 days) for extended tracking
+        # Keep last year of data (365 days) for extended tracking; older
+        # days are downsampled by retention.py rather than on every add
         max_snapshots = config.EMOTIONAL_HISTORY_DAYS
-        if len(self.profile_data['emotional_history']) > max_snapshots:
-            self.profile_data['emotional_history'] = self.profile_data['emotional_history'][-max_snapshots:]
+        if len(history) > max_snapshots:
+            del history[:-max_snapshots]
     
     def get_emotional_history(self, days=None):
         """Get emotional history for specified number of days"""
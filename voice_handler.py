@@ -2,7 +2,8 @@
 Voice handler for the AI Wellness Buddy.
 
 Provides:
-  - text_to_speech(text, lang) → MP3 bytes  (via gTTS, requires internet)
+  - text_to_speech(text, lang) → MP3 bytes  (via gTTS, requires internet;
+    results are cached by tts_cache.TTSCache so repeated replies are local)
   - transcribe_audio(wav_bytes, lang_hint)  → str  (via SpeechRecognition)
 
 Both functions return None / empty string gracefully when dependencies are
@@ -18,6 +19,9 @@ Audio format support:
 import io
 import logging
 
+import config
+from tts_cache import TTSCache, cache_key, normalize_text
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -50,6 +54,22 @@ except ImportError:
     _RECOGNIZER = None
 
 
+class GTTSEngine:
+    """Google TTS synthesis engine (network call per clip).
+
+    Any object with a ``name`` and ``synthesize(text, lang) -> bytes`` can
+    be passed to :class:`VoiceHandler` instead, e.g. a local stand-in in tests.
+    """
+
+    name = 'gtts'
+
+    def synthesize(self, text: str, lang: str) -> bytes:
+        tts = _gTTS(text=text, lang=lang, slow=False)
+        buf = io.BytesIO()
+        tts.write_to_fp(buf)
+        return buf.getvalue()
+
+
 class VoiceHandler:
     """Encapsulates TTS and speech-to-text operations."""
 
@@ -80,9 +100,34 @@ class VoiceHandler:
     _MAGIC_MP3  = (b'\xff\xfb', b'\xff\xf3', b'\xff\xf2', b'ID3')
     _MAGIC_MP4  = b'ftyp'  # at offset 4
 
-    def __init__(self):
-        self.tts_available = _GTTS_AVAILABLE
+    def __init__(self, tts_engine=None, cache=None):
+        if tts_engine is None and _GTTS_AVAILABLE:
+            tts_engine = GTTSEngine()
+        self.tts_engine = tts_engine
+        self.tts_available = tts_engine is not None
         self.stt_available = _SR_AVAILABLE
+        self._tts_cache = cache
+
+    @property
+    def tts_cache(self) -> TTSCache | None:
+        """The TTS clip cache (created on first use; ``None`` when disabled)."""
+        if self._tts_cache is None and config.TTS_CACHE_ENABLED:
+            self._tts_cache = TTSCache()
+        return self._tts_cache
+
+    def _tts_key(self, text: str, language_preference: str) -> tuple[str, str, str] | None:
+        clean = normalize_text(_strip_markdown(text))
+        if not clean:
+            return None
+        lang = self._LANG_CODES.get(language_preference, 'en')
+        return clean, lang, cache_key(clean, lang, self.tts_engine.name)
+
+    def is_tts_cached(self, text: str, language_preference: str = 'english') -> bool:
+        """True if speech for *text* is already in the TTS cache."""
+        if not self.tts_available or self.tts_cache is None:
+            return False
+        key = self._tts_key(text, language_preference)
+        return key is not None and key[2] in self.tts_cache
 
     # ------------------------------------------------------------------
     # Text-to-Speech
@@ -90,7 +135,8 @@ class VoiceHandler:
 
     def text_to_speech(self, text: str, language_preference: str = 'english') -> bytes | None:
         """
-        Convert *text* to MP3 audio bytes using Google TTS.
+        Convert *text* to MP3 audio bytes using the TTS engine (Google TTS
+        by default), serving repeated text from the TTS cache.
 
         Parameters
         ----------
@@ -105,23 +151,28 @@ class VoiceHandler:
         bytes
             MP3 audio data, or ``None`` if TTS is unavailable / fails.
         """
-        if not _GTTS_AVAILABLE:
+        if not self.tts_available:
             return None
 
         # Strip Markdown annotations and XAI lines
-        clean = _strip_markdown(text)
-        if not clean.strip():
+        key = self._tts_key(text, language_preference)
+        if key is None:
             return None
+        clean, lang, digest = key
 
-        lang = self._LANG_CODES.get(language_preference, 'en')
+        cache = self.tts_cache
+        if cache is not None:
+            audio = cache.get(digest)
+            if audio is not None:
+                return audio
         try:
-            tts = _gTTS(text=clean, lang=lang, slow=False)
-            buf = io.BytesIO()
-            tts.write_to_fp(buf)
-            return buf.getvalue()
+            audio = self.tts_engine.synthesize(clean, lang)
         except Exception as exc:
             logger.warning("TTS failed: %s", exc)
             return None
+        if audio and cache is not None:
+            cache.put(digest, audio)
+        return audio or None
 
     # ------------------------------------------------------------------
     # Audio format helpers
@@ -155,21 +206,7 @@ class VoiceHandler:
 
         Returns ``None`` when conversion is not possible.
         """
-        if not _PYDUB_AVAILABLE:
-            logger.warning(
-                "pydub is not installed — cannot convert %s audio to WAV. "
-                "Install pydub and ffmpeg for WebM/MP3 support.",
-                src_format,
-            )
-            return None
-        try:
-            seg = _AudioSegment.from_file(io.BytesIO(audio_bytes), format=src_format)
-            buf = io.BytesIO()
-            seg.export(buf, format='wav')
-            return buf.getvalue()
-        except Exception as exc:
-            logger.warning("Audio conversion (%s → wav) failed: %s", src_format, exc)
-            return None
+        return convert_to_wav(audio_bytes, src_format)
 
     # ------------------------------------------------------------------
     # Speech-to-Text
@@ -259,6 +296,30 @@ class VoiceHandler:
 # Helpers
 # ---------------------------------------------------------------------------
 
+def convert_to_wav(audio_bytes: bytes, src_format: str) -> bytes | None:
+    """
+    Convert *audio_bytes* to WAV using pydub (requires ffmpeg).
+
+    Module-level so it can run in a worker process (see the backend
+    transcription pipeline).  Returns ``None`` when conversion is not possible.
+    """
+    if not _PYDUB_AVAILABLE:
+        logger.warning(
+            "pydub is not installed — cannot convert %s audio to WAV. "
+            "Install pydub and ffmpeg for WebM/MP3 support.",
+            src_format,
+        )
+        return None
+    try:
+        seg = _AudioSegment.from_file(io.BytesIO(audio_bytes), format=src_format)
+        buf = io.BytesIO()
+        seg.export(buf, format='wav')
+        return buf.getvalue()
+    except Exception as exc:
+        logger.warning("Audio conversion (%s → wav) failed: %s", src_format, exc)
+        return None
+
+
 def _strip_markdown(text: str) -> str:
     """Remove Markdown annotations and XAI lines from a response string."""
     import re
@@ -12,7 +12,7 @@ from pattern_tracker import PatternTracker
 from alert_system import AlertSystem
 from conversation_handler import ConversationHandler
 from user_profile import UserProfile
-from data_store import DataStore
+from data_store import open_data_store
 from prediction_agent import PredictionAgent
 from language_handler import LanguageHandler
 from clinical_indicators import (
@@ -40,7 +40,7 @@ class WellnessBuddy:
         self.lang_handler = LanguageHandler()
         self.intervention_engine = InterventionEngine()
         self.user_profile = None
-        self.data_store = DataStore(data_dir)
+        self.data_store = open_data_store(data_dir)
         self.session_active = False
         self.user_id = None
         self._last_response_metadata = {}
@@ -388,19 +388,19 @@ class WellnessBuddy:
         if context is not None and isinstance(context, list):
             # Seed the conversation handler with context messages that
             # are not already tracked (idempotent for repeated calls).
-            existing_msgs = {
-                e['user_message'] for e in self.conversation_handler.conversation_history
-            }
+            history = self.conversation_handler.conversation_history
+            seeded = set()
             _ctx_new = 0
             _t_ctx = None
             for msg in context:
                 content = msg.get('content')
-                if msg.get('role') == 'user' and content and content not in existing_msgs:
+                if (msg.get('role') == 'user' and content and content not in seeded
+                        and not history.has_message(content)):
                     if _t_ctx is None:
                         _t_ctx = time.perf_counter()
                     emotion_data = self.emotion_analyzer.classify_emotion(content)
                     self.conversation_handler.add_message(content, emotion_data)
-                    existing_msgs.add(content)
+                    seeded.add(content)
                     _ctx_new += 1
             if _ctx_new and _t_ctx is not None:
                 _logger.info(
@@ -655,8 +655,9 @@ class WellnessBuddy:
             recovered_from_distress=recovered
         )
 
-        # Save profile
+        # Save profile and flush any write-back state so nothing is lost
         self._save_profile()
+        self.data_store.flush()
 
         message = "\n" + "="*70 + "\n"
         message += "Thank you for sharing with me today. Remember:\n\n"